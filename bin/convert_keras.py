@@ -6,18 +6,17 @@ import argparse
 import importlib.util
 import inspect
 import os
-import sys
 import traceback
 from os import path
 
 import keras
 
 from webdnn import Placeholder, Shape
-from webdnn.backend import generate_descriptor
+from webdnn.backend import generate_descriptor, generate_descriptors
 from webdnn.frontend.keras import KerasConverter
 from webdnn.graph import traverse
 from webdnn.graph.traverse import dump_dot
-from webdnn.util import flags, console
+from webdnn.util import flags, console, profiler
 
 
 def _load_plugin(filepath: str):
@@ -29,7 +28,6 @@ def _load_plugin(filepath: str):
 
 
 def main():
-    sys.setrecursionlimit(10000)  # workaround for deep copying large graph
     parser = argparse.ArgumentParser()
     parser.add_argument("kerasmodel")
     parser.add_argument("--backend", default="webgpu,webgl,webassembly,fallback",
@@ -42,8 +40,15 @@ def main():
     parser.add_argument("--encoding", help="name of weight encoder")
     parser.add_argument("--visualize_ir", action="store_true")
     parser.add_argument("--plugin", action="append", help="plugin python files which are imported before transpiling")
+    parser.add_argument("--parallel", action="store_true",
+                        help="generate descriptors for all backends in parallel with process pool")
+    parser.add_argument("--profile", action="store_true",
+                        help="record elapsed time of each conversion phase and optimize rule into profile_<backend>.json")
     args = parser.parse_args()
 
+    if args.profile:
+        flags.PROFILE = True
+
     console.stderr(f"[{path.basename(__file__)}] Generating feedforward graph")
     class_list = []
     if args.plugin:
@@ -60,7 +65,14 @@ def main():
     model = keras.models.load_model(args.kerasmodel, custom_objects=custom_objects, compile=False)
     model.build(input_shape=None)
     converter = KerasConverter(batch_size=input_shapes[0][0])
-    graph = converter.convert(model)
+    frontend_profile = profiler.Profiler()
+    if flags.PROFILE:
+        with profiler.profile(frontend_profile), profiler.phase("frontend"):
+            graph = converter.convert(model)
+
+    else:
+        graph = converter.convert(model)
+
     traverse.dump(graph)
 
     for graph_input, input_shape in zip(graph.inputs, input_shapes):
@@ -90,11 +102,28 @@ def main():
 
     any_backend_failed = False
     backends = args.backend.split(",")
+
+    if args.parallel:
+        graph_exec_data_dict = generate_descriptors(backends, graph, return_exceptions=True, constant_encoder_name=args.encoding)
+    else:
+        graph_exec_data_dict = None
+
     for i, backend in enumerate(backends):
         console.stderr(f"[{path.basename(__file__)}] BackendName: {console.colorize(backend, console.Color.Cyan)}")
         try:
-            graph_exec_data = generate_descriptor(backend, graph, constant_encoder_name=args.encoding)
+            if graph_exec_data_dict is None:
+                graph_exec_data = generate_descriptor(backend, graph, constant_encoder_name=args.encoding)
+
+            else:
+                graph_exec_data = graph_exec_data_dict[backend]
+                if isinstance(graph_exec_data, Exception):
+                    raise graph_exec_data
+
             graph_exec_data.save(output_dir)
+
+            if graph_exec_data.profile is not None:
+                console.stderr(f"[{path.basename(__file__)}] Profile of {backend} backend:")
+                console.stderr(graph_exec_data.profile.summary())
         except Exception as ex:
             if flags.DEBUG:
                 raise ex
@@ -104,6 +133,11 @@ def main():
             console.stderr(traceback.format_exc())
             continue
 
+    if flags.PROFILE:
+        console.stderr(f"[{path.basename(__file__)}] Profile of frontend conversion:")
+        console.stderr(frontend_profile.summary())
+        frontend_profile.save(path.join(output_dir, "profile_frontend.json"))
+
     if any_backend_failed:
         exit(1)
         # raise last_backend_exception
@@ -5,6 +5,8 @@
 
 import WeightDecoder from "./weight_decoder";
 import WeightDecoderEightbit from "./weight_decoder_eightbit";
+import WeightDecoderFloat16 from "./weight_decoder_float16";
+import WeightDecoderInt8 from "./weight_decoder_int8";
 import WeightDecoderRaw from "./weight_decoder_raw";
 
 /**
@@ -16,6 +18,10 @@ export default function get_weight_decoder(name: string): WeightDecoder {
             return new WeightDecoderRaw();
         case 'eightbit':
             return new WeightDecoderEightbit();
+        case 'float16':
+            return new WeightDecoderFloat16();
+        case 'int8':
+            return new WeightDecoderInt8();
         default:
             throw new Error('Unknown weight encoding');
     }
@@ -0,0 +1,112 @@
+/**
+ * @module webdnn
+ */
+/** Don't Remove This comment block */
+
+import webdnnFetch, { readArrayBufferProgressively } from "../fetch";
+import { GraphDescriptor, WeightShard } from "../graph_descriptor/graph_descriptor";
+import get_weight_decoder from "./get_weight_decoder";
+
+/**
+ * @protected
+ */
+export interface LoadWeightOption {
+    ignoreCache: boolean,
+    progressCallback?: (loaded: number, total: number) => any
+}
+
+/**
+ * Weight file which is fetched before the graph descriptor is loaded.
+ * @protected
+ */
+export interface PrefetchedWeight {
+    data: Promise<ArrayBuffer | null>,
+    discarded: boolean
+}
+
+/**
+ * Start fetching single weight file `weight_${suffix}.bin` concurrently with the graph descriptor. Whether constants are
+ * sharded or not is not known until the descriptor is loaded, so the file is fetched speculatively. If the descriptor has
+ * weight shards, the prefetched data is discarded by {@link loadWeight}, and progress of it is not reported anymore.
+ *
+ * @param directory directory which contains the graph descriptor
+ * @param suffix suffix of the weight file name (ex. `"webgpu"`, `"webgl_4096"`)
+ * @param option fetch option
+ * @returns prefetched weight. Its data is `null` if the file cannot be fetched (ex. constants are sharded).
+ * @protected
+ */
+export function prefetchWeight(directory: string, suffix: string, option: LoadWeightOption): PrefetchedWeight {
+    let prefetched: PrefetchedWeight = {data: Promise.resolve(null), discarded: false};
+    let progressCallback = option.progressCallback;
+    let prefetchProgressCallback = progressCallback ? (loaded: number, total: number) => {
+        if (!prefetched.discarded) progressCallback!(loaded, total);
+    } : undefined;
+
+    prefetched.data = webdnnFetch(`${directory}/weight_${suffix}.bin`, {
+        ignoreCache: option.ignoreCache,
+        progressCallback: prefetchProgressCallback
+    })
+        .then(res => readArrayBufferProgressively(res, prefetchProgressCallback))
+        .catch(() => null); // If the file is required, it's fetched again by loadWeight, and the error is reported there.
+
+    return prefetched;
+}
+
+/**
+ * Fetch and decode weight binary data.
+ *
+ * If the descriptor has weight shards, all shards are fetched in parallel, and each shard is decoded and placed into the
+ * weight buffer as soon as it's downloaded. Otherwise, single file `weight_${suffix}.bin` is fetched, or the data prefetched by
+ * {@link prefetchWeight} is used.
+ *
+ * @param directory directory which contains the graph descriptor
+ * @param suffix suffix of the weight file name (ex. `"webgpu"`, `"webgl_4096"`)
+ * @param descriptor graph descriptor
+ * @param option fetch option
+ * @param prefetched weight file prefetched by {@link prefetchWeight}
+ * @returns decoded weight buffer
+ * @protected
+ */
+export default async function loadWeight(directory: string, suffix: string, descriptor: GraphDescriptor,
+                                         option: LoadWeightOption, prefetched?: PrefetchedWeight): Promise<Float32Array> {
+    let decoder = get_weight_decoder(descriptor.weight_encoding);
+
+    if (!descriptor.weight_shards) {
+        let weightRawArray = prefetched ? await prefetched.data : null;
+        if (weightRawArray === null) {
+            let res = await webdnnFetch(`${directory}/weight_${suffix}.bin`, option);
+            weightRawArray = await readArrayBufferProgressively(res, option.progressCallback);
+        }
+
+        return decoder.decode(new Uint8Array(weightRawArray));
+    }
+
+    if (prefetched) prefetched.discarded = true;
+
+    let shards = descriptor.weight_shards;
+    let weight = new Float32Array(shards.reduce((size, shard) => {
+        return shard.allocations.reduce((size, a) => Math.max(size, a.offset + a.size), size)
+    }, 0));
+
+    let total = shards.reduce((total, shard) => total + shard.byte_length, 0);
+    let loadedList = shards.map(() => 0);
+    let progressCallback = option.progressCallback;
+
+    await Promise.all(shards.map(async (shard: WeightShard, i: number) => {
+        let shardProgressCallback = progressCallback ? (loaded: number) => {
+            loadedList[i] = loaded;
+            progressCallback!(loadedList.reduce((sum, loaded) => sum + loaded, 0), total);
+        } : undefined;
+
+        let res = await webdnnFetch(`${directory}/${shard.filename}`, {
+            ignoreCache: option.ignoreCache,
+            progressCallback: shardProgressCallback
+        });
+        let shardRawArray = await readArrayBufferProgressively(res, shardProgressCallback);
+        let decoded = await decoder.decode(new Uint8Array(shardRawArray));
+
+        shard.allocations.forEach(a => weight.set(decoded.subarray(a.shard_offset, a.shard_offset + a.size), a.offset));
+    }));
+
+    return weight;
+}
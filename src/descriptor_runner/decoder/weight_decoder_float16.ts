@@ -0,0 +1,90 @@
+/**
+ * @module webdnn
+ */
+/** Don't Remove This comment block */
+
+import WeightDecoder from "./weight_decoder";
+
+/**
+ * @private
+ */
+declare const Zlib: any;
+
+/**
+ * @protected
+ */
+export default class WeightDecoderFloat16 implements WeightDecoder {
+    static FLAG_COMPRESSED = 1;
+
+    /**
+     * float16 bit pattern -> float32 value
+     */
+    private static decode_table: Float32Array | null = null;
+
+    static getDecodeTable(): Float32Array {
+        if (WeightDecoderFloat16.decode_table) return WeightDecoderFloat16.decode_table;
+
+        let table = new Float32Array(65536);
+        for (let i = 0; i < 65536; i++) {
+            let sign = (i & 0x8000) ? -1 : 1;
+            let exponent = (i >> 10) & 0x1F;
+            let fraction = i & 0x03FF;
+
+            if (exponent === 0) {
+                // zero or subnormal
+                table[i] = sign * fraction * Math.pow(2, -24);
+            } else if (exponent === 0x1F) {
+                table[i] = fraction === 0 ? sign * Infinity : NaN;
+            } else {
+                table[i] = sign * (1 + fraction / 1024) * Math.pow(2, exponent - 15);
+            }
+        }
+
+        WeightDecoderFloat16.decode_table = table;
+        return table;
+    }
+
+    async decode(data: Uint8Array): Promise<Float32Array> {
+        let table = WeightDecoderFloat16.getDecodeTable();
+        let data_view = new DataView(data.buffer, data.byteOffset, data.byteLength);
+
+        // Each chunk is [offset, size, body_size, flags] header followed by body.
+        let chunks: { offset: number, size: number, body: Uint8Array, flags: number }[] = [];
+        let total_size = 0;
+        let src_offset = 0;
+        while (src_offset < data.length) {
+            let offset = data_view.getInt32(src_offset, true);
+            let size = data_view.getInt32(src_offset + 4, true);
+            let body_size = data_view.getInt32(src_offset + 8, true);
+            let flags = data_view.getInt32(src_offset + 12, true);
+            src_offset += 16;
+
+            chunks.push({
+                offset: offset,
+                size: size,
+                body: new Uint8Array(data.buffer, data.byteOffset + src_offset, body_size),
+                flags: flags
+            });
+            total_size = Math.max(total_size, offset + size);
+            src_offset += body_size;
+        }
+
+        let dst = new Float32Array(total_size);
+        for (let chunk of chunks) {
+            let body = chunk.body;
+            if (chunk.flags & WeightDecoderFloat16.FLAG_COMPRESSED) {
+                body = new Zlib.Inflate(body).decompress();
+            }
+
+            // Uint16Array requires 2-byte aligned offset
+            if (body.byteOffset % 2 !== 0) body = new Uint8Array(body);
+            let src = new Uint16Array(body.buffer, body.byteOffset, chunk.size);
+
+            for (let i = 0; i < chunk.size; i++) {
+                dst[chunk.offset + i] = table[src[i]];
+            }
+        }
+
+        return dst;
+    }
+}
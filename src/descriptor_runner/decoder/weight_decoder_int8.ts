@@ -0,0 +1,77 @@
+/**
+ * @module webdnn
+ */
+/** Don't Remove This comment block */
+
+import WeightDecoder from "./weight_decoder";
+
+/**
+ * @private
+ */
+declare const Zlib: any;
+
+/**
+ * @protected
+ */
+export default class WeightDecoderInt8 implements WeightDecoder {
+    static FLAG_COMPRESSED = 1;
+
+    async decode(data: Uint8Array): Promise<Float32Array> {
+        let data_view = new DataView(data.buffer, data.byteOffset, data.byteLength);
+
+        // Each chunk is [offset, size, num_channels, channel_stride, body_size, flags, scales, zero_points] header
+        // followed by body.
+        let chunks: {
+            offset: number, size: number, channel_stride: number,
+            scales: Float32Array, zero_points: Uint8Array, body: Uint8Array, flags: number
+        }[] = [];
+        let total_size = 0;
+        let src_offset = 0;
+        while (src_offset < data.length) {
+            let offset = data_view.getInt32(src_offset, true);
+            let size = data_view.getInt32(src_offset + 4, true);
+            let num_channels = data_view.getInt32(src_offset + 8, true);
+            let channel_stride = data_view.getInt32(src_offset + 12, true);
+            let body_size = data_view.getInt32(src_offset + 16, true);
+            let flags = data_view.getInt32(src_offset + 20, true);
+            src_offset += 24;
+
+            let scales = new Float32Array(num_channels);
+            let zero_points = new Uint8Array(num_channels);
+            for (let c = 0; c < num_channels; c++) {
+                scales[c] = data_view.getFloat32(src_offset + c * 4, true);
+                zero_points[c] = data_view.getUint8(src_offset + num_channels * 4 + c);
+            }
+            src_offset += num_channels * 5;
+
+            chunks.push({
+                offset: offset,
+                size: size,
+                channel_stride: channel_stride,
+                scales: scales,
+                zero_points: zero_points,
+                body: new Uint8Array(data.buffer, data.byteOffset + src_offset, body_size),
+                flags: flags
+            });
+            total_size = Math.max(total_size, offset + size);
+            src_offset += body_size;
+        }
+
+        let dst = new Float32Array(total_size);
+        for (let chunk of chunks) {
+            let code = chunk.body;
+            if (chunk.flags & WeightDecoderInt8.FLAG_COMPRESSED) {
+                code = new Zlib.Inflate(code).decompress();
+            }
+
+            let num_channels = chunk.scales.length;
+            let channel_stride = chunk.channel_stride;
+            for (let i = 0; i < chunk.size; i++) {
+                let c = Math.floor(i / channel_stride) % num_channels;
+                dst[chunk.offset + i] = (code[i] - chunk.zero_points[c]) * chunk.scales[c];
+            }
+        }
+
+        return dst;
+    }
+}
@@ -3,8 +3,8 @@
  */
 /** Don't Remove This comment block */
 
-import get_weight_decoder from "../decoder/get_weight_decoder";
-import webdnnFetch, { readArrayBufferProgressively } from "../fetch"
+import loadWeight, { prefetchWeight } from "../decoder/load_weight";
+import webdnnFetch from "../fetch"
 import { GraphDescriptorFallback } from "../graph_descriptor/graph_descriptor_fallback";
 import { Allocation, ResolvedAllocation } from "../graph_descriptor/memory_layout";
 import PlaceholderContext from "../placeholder";
@@ -42,18 +42,20 @@ export default class DescriptorRunnerFallback extends DescriptorRunner<GraphDesc
     }
 
     async load(directory: string, progressCallback?: (loaded: number, total: number) => any) {
-        let [descriptor, weightRawArray] = await Promise.all([
-            webdnnFetch(`${directory}/graph_${this.backendName}.json`, {ignoreCache: this.ignoreCache, progressCallback: progressCallback})
-                .then(res => res.json() as Promise<GraphDescriptorFallback>),
+        // Weight file is fetched concurrently with the descriptor. It's discarded if the descriptor has weight shards.
+        let weightOption = {ignoreCache: this.ignoreCache, progressCallback: progressCallback};
+        let prefetchedWeight = prefetchWeight(directory, this.backendName, weightOption);
 
-            webdnnFetch(`${directory}/weight_${this.backendName}.bin`, {ignoreCache: this.ignoreCache})
-                .then(res => readArrayBufferProgressively(res, progressCallback))
-        ]);
+        let descriptor = await webdnnFetch(`${directory}/graph_${this.backendName}.json`, {ignoreCache: this.ignoreCache})
+            .then(res => res.json() as Promise<GraphDescriptorFallback>);
 
         this.setDescriptor(descriptor);
 
-        await this.compile();
-        await this.initializeStaticBuffer(weightRawArray);
+        let [weight] = await Promise.all([
+            loadWeight(directory, this.backendName, descriptor, weightOption, prefetchedWeight),
+            this.compile()
+        ]);
+        await this.initializeStaticBuffer(weight);
         if (this.placeholderContext && this.placeholderContext.isResolved) await this.initializeDynamicBuffer();
     }
 
@@ -80,7 +82,7 @@ export default class DescriptorRunnerFallback extends DescriptorRunner<GraphDesc
         this.kernelObj = dnn_fallback_kernel;
     }
 
-    private async initializeStaticBuffer(weightRawArray: ArrayBuffer) {
+    private async initializeStaticBuffer(weight: Float32Array) {
         if (!this.descriptor) throw new Error('Descriptor is not loaded');
         let descriptor = this.descriptor;
 
@@ -102,8 +104,7 @@ export default class DescriptorRunnerFallback extends DescriptorRunner<GraphDesc
                 );
             });
 
-        let decoder = get_weight_decoder(this.descriptor.weight_encoding);
-        staticBuffer.set(await decoder.decode(new Uint8Array(weightRawArray)));
+        staticBuffer.set(weight);
 
         (await this.getInputViews())
             .filter(view => !view.isDynamic)
@@ -3,8 +3,8 @@
  */
 /** Don't Remove This comment block */
 
-import get_weight_decoder from "../decoder/get_weight_decoder";
-import webDNNFetch, { readArrayBufferProgressively, transformUrl } from "../fetch";
+import loadWeight from "../decoder/load_weight";
+import webDNNFetch, { transformUrl } from "../fetch";
 import { GraphDescriptorWebassembly } from "../graph_descriptor/graph_descriptor_webassembly";
 import PlaceholderContext from "../placeholder";
 import SymbolicFloat32Array from "../symbolic_typed_array/symbolic_float32array";
@@ -66,10 +66,11 @@ export default class DescriptorRunnerWebassembly extends DescriptorRunner<GraphD
 
         await this.compile();
 
-        let weight_url = `${directory}/weight_${this.backendName}.bin`;
-        let weight_fetch = await webDNNFetch(weight_url, {ignoreCache: this.ignoreCache, progressCallback: progressCallback});
-        let weights_data_ab = await readArrayBufferProgressively(weight_fetch, progressCallback);
-        await this.loadWeights(new Uint8Array(weights_data_ab));
+        let weight_data = await loadWeight(directory, this.backendName, this.descriptor!, {
+            ignoreCache: this.ignoreCache,
+            progressCallback: progressCallback
+        });
+        await this.loadWeights(weight_data);
 
         //assign buffer to input/output buffer view
         (await this.getInputViews())
@@ -165,12 +166,10 @@ export default class DescriptorRunnerWebassembly extends DescriptorRunner<GraphD
         return promise;
     }
 
-    private async loadWeights(weightsData: Uint8Array) {
+    private async loadWeights(weight_data: Float32Array) {
         if (!this.descriptor) throw new Error('Descriptor is not loaded');
         if (!this.worker) throw new Error('Worker is not initialized');
 
-        let decoder = get_weight_decoder(this.descriptor.weight_encoding);
-        let weight_data = await decoder.decode(weightsData);
         let worker = this.worker;
 
         let promise = new Promise<void>((resolve, reject) => {
@@ -4,8 +4,8 @@
 /** Don't Remove This comment block */
 
 import BufferWebGL from "../buffer/buffer_webgl";
-import get_weight_decoder from "../decoder/get_weight_decoder";
-import webdnnFetch, { readArrayBufferProgressively } from "../fetch";
+import loadWeight, { prefetchWeight } from "../decoder/load_weight";
+import webdnnFetch from "../fetch";
 import { GraphDescriptorWebGL } from "../graph_descriptor/graph_descriptor_webgl";
 import PlaceholderContext from "../placeholder";
 import SymbolicFloat32Array from "../symbolic_typed_array/symbolic_float32array";
@@ -102,32 +102,30 @@ export default class DescriptorRunnerWebGL extends DescriptorRunner<GraphDescrip
             throw new Error(`MAX_TEXTURE_SIZE is too small: ${MAX_TEXTURE_SIZE}`);
         }
 
-        let [descriptor, weightRawArray] = await Promise.all([
-            webdnnFetch(`${directory}/graph_${this.backendName}_${MAX_TEXTURE_SIZE}.json`, {
-                ignoreCache: this.ignoreCache
-            })
-                .then(res => res.json() as Promise<GraphDescriptorWebGL>),
+        // Weight file is fetched concurrently with the descriptor. It's discarded if the descriptor has weight shards.
+        let weightOption = {ignoreCache: this.ignoreCache, progressCallback: progressCallback};
+        let prefetchedWeight = prefetchWeight(directory, `${this.backendName}_${MAX_TEXTURE_SIZE}`, weightOption);
 
-            webdnnFetch(`${directory}/weight_${this.backendName}_${MAX_TEXTURE_SIZE}.bin`, {
-                ignoreCache: this.ignoreCache,
-                progressCallback: progressCallback
-            })
-                .then(res => readArrayBufferProgressively(res, progressCallback))
-        ]);
+        let descriptor = await webdnnFetch(`${directory}/graph_${this.backendName}_${MAX_TEXTURE_SIZE}.json`, {
+            ignoreCache: this.ignoreCache
+        })
+            .then(res => res.json() as Promise<GraphDescriptorWebGL>);
 
         await this.setDescriptor(descriptor);
-        await this.compile();
 
-        await this.initializeStaticBuffer(weightRawArray);
+        let [weight] = await Promise.all([
+            loadWeight(directory, `${this.backendName}_${MAX_TEXTURE_SIZE}`, descriptor, weightOption, prefetchedWeight),
+            this.compile()
+        ]);
+
+        await this.initializeStaticBuffer(weight);
         if (this.placeholderContext && this.placeholderContext.isResolved) await this.initializeDynamicBuffer();
     }
 
-    private async initializeStaticBuffer(weightRawArray: ArrayBuffer) {
+    private async initializeStaticBuffer(weight: Float32Array) {
         if (!this.descriptor) throw new Error('Descriptor is not loaded');
         let descriptor = this.descriptor;
 
-        let decoder = get_weight_decoder(this.descriptor.weight_encoding);
-        let weight = await decoder.decode(new Uint8Array(weightRawArray));
         let buffers = this.buffers;
         let mapping = descriptor.memory_layout.mapping;
 
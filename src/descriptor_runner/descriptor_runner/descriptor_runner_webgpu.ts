@@ -4,8 +4,8 @@
 /** Don't Remove This comment block */
 
 import BufferWebGPU from "../buffer/buffer_webgpu";
-import get_weight_decoder from "../decoder/get_weight_decoder";
-import webdnnFetch, { readArrayBufferProgressively } from "../fetch";
+import loadWeight, { prefetchWeight } from "../decoder/load_weight";
+import webdnnFetch from "../fetch";
 import { GraphDescriptorWebGPU, GraphDescriptorWebGPUExecInfos } from "../graph_descriptor/graph_descriptor_webgpu";
 import PlaceholderContext from "../placeholder";
 import SymbolicFloat32Array from "../symbolic_typed_array/symbolic_float32array";
@@ -100,17 +100,20 @@ using namespace metal;
     }
 
     async load(directory: string, progressCallback?: (loaded: number, total: number) => any) {
-        let [descriptor, weightRawArray] = await Promise.all([
-            webdnnFetch(`${directory}/graph_${this.backendName}.json`, {ignoreCache: this.ignoreCache})
-                .then(res => res.json() as Promise<GraphDescriptorWebGPU>),
+        // Weight file is fetched concurrently with the descriptor. It's discarded if the descriptor has weight shards.
+        let weightOption = {ignoreCache: this.ignoreCache, progressCallback: progressCallback};
+        let prefetchedWeight = prefetchWeight(directory, this.backendName, weightOption);
 
-            webdnnFetch(`${directory}/weight_${this.backendName}.bin`, {ignoreCache: this.ignoreCache, progressCallback: progressCallback})
-                .then(res => readArrayBufferProgressively(res, progressCallback))
-        ]);
+        let descriptor = await webdnnFetch(`${directory}/graph_${this.backendName}.json`, {ignoreCache: this.ignoreCache})
+            .then(res => res.json() as Promise<GraphDescriptorWebGPU>);
 
         await this.setDescriptor(descriptor);
-        await this.compile();
-        await this.initializeStaticBuffer(weightRawArray);
+
+        let [weight] = await Promise.all([
+            loadWeight(directory, this.backendName, descriptor, weightOption, prefetchedWeight),
+            this.compile()
+        ]);
+        await this.initializeStaticBuffer(weight);
         await this.initializeMetaBuffers();
 
         await this.setPlaceholderValue({
@@ -119,15 +122,14 @@ using namespace metal;
         if (this.placeholderContext && this.placeholderContext.isResolved) await this.initializeDynamicBuffer();
     }
 
-    private async initializeStaticBuffer(weightRawArray: ArrayBuffer) {
+    private async initializeStaticBuffer(weight: Float32Array) {
         if (!this.descriptor) throw Error("GraphDescriptor is not loaded.");
         let descriptor = this.descriptor;
 
         let staticBuffer = new BufferWebGPU(descriptor.memory_layout.static.size * Float32Array.BYTES_PER_ELEMENT);
         this.staticBuffer = staticBuffer;
 
-        let decoder = get_weight_decoder(descriptor.weight_encoding);
-        await staticBuffer.write(await decoder.decode(new Uint8Array(weightRawArray)));
+        await staticBuffer.write(weight);
 
         (await this.getInputViews())
             .filter(view => !view.isDynamic)
@@ -5,6 +5,33 @@
 
 import { MemoryLayout } from "./memory_layout";
 
+/**
+ * Shard of weight binary data
+ * @protected
+ */
+export interface WeightShard {
+    /**
+     * File name relative to the directory of graph descriptor
+     */
+    filename: string;
+
+    /**
+     * Byte length of the file
+     */
+    byte_length: number;
+
+    /**
+     * Number of elements after decoding
+     */
+    size: number;
+
+    /**
+     * Elements `[shard_offset, shard_offset + size)` of the decoded shard are placed at `[offset, offset + size)` of the weight
+     * buffer.
+     */
+    allocations: { name: string, offset: number, shard_offset: number, size: number }[];
+}
+
 /**
  * Graph Descriptor
  * @protected
@@ -35,6 +62,11 @@ export interface GraphDescriptor {
      */
     weight_encoding: string;
 
+    /**
+     * Shards of weight binary data. If null, weight binary data is saved as single file.
+     */
+    weight_shards?: WeightShard[] | null;
+
     /**
      * Placeholder dict
      */
@@ -0,0 +1,115 @@
+/**
+ * @module webdnn
+ */
+/** Don't Remove This comment block */
+
+/**
+ * "WDNB" in little endian
+ * @private
+ */
+const MAGIC = 0x424E4457;
+
+/**
+ * @private
+ */
+const VERSION = 1;
+
+/**
+ * @private
+ */
+const PREAMBLE_SIZE = 20;
+
+/**
+ * @private
+ */
+declare const TextDecoder: any;
+
+/**
+ * @private
+ */
+function decodeAscii(bytes: Uint8Array): string {
+    if (typeof TextDecoder !== 'undefined') return new TextDecoder('ascii').decode(bytes);
+
+    let chunks: string[] = [];
+    for (let i = 0; i < bytes.length; i += 0x8000) {
+        chunks.push(String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000) as any));
+    }
+
+    return chunks.join('');
+}
+
+/**
+ * Restore blobs and tables in the header in place.
+ * @private
+ */
+function restore(value: any, buffer: ArrayBuffer, bodyOffset: number): any {
+    if (Array.isArray(value)) {
+        for (let i = 0; i < value.length; i++) value[i] = restore(value[i], buffer, bodyOffset);
+        return value;
+    }
+
+    if (value === null || typeof value !== 'object') return value;
+
+    let keys = Object.keys(value);
+    if (keys.length === 1 && keys[0] === '$blob') {
+        let [offset, length, dtype] = value['$blob'] as [number, number, string];
+        switch (dtype) {
+            case 'uint8':
+                return new Uint8Array(buffer, bodyOffset + offset, length);
+
+            case 'int32':
+                return new Int32Array(buffer, bodyOffset + offset, length);
+
+            default:
+                throw new Error(`Unsupported blob dtype: ${dtype}`);
+        }
+    }
+
+    if (keys.length === 1 && keys[0] === '$table') {
+        let table = value['$table'] as { index: string[] | null, columns: [string, any][] };
+        let names = table.columns.map(column => column[0]);
+        let columns = table.columns.map(column => restore(column[1], buffer, bodyOffset) as ArrayLike<any>);
+        let numRows = columns[0].length;
+
+        let rows = new Array(numRows);
+        for (let i = 0; i < numRows; i++) {
+            let row = {} as { [key: string]: any };
+            for (let j = 0; j < names.length; j++) row[names[j]] = columns[j][i];
+            rows[i] = row;
+        }
+
+        if (table.index === null) return rows;
+
+        let result = {} as { [key: string]: any };
+        for (let i = 0; i < numRows; i++) result[table.index[i]] = rows[i];
+        return result;
+    }
+
+    for (let key of keys) value[key] = restore(value[key], buffer, bodyOffset);
+    return value;
+}
+
+/**
+ * Parse the binary graph descriptor (`graph_*.wdnb`), which is generated alongside `graph_*.json` by the graph transpiler. The result
+ * is same as the descriptor parsed from `graph_*.json`, except that meta buffers and other long integer arrays are typed arrays
+ * which share the memory with given buffer.
+ *
+ * @param buffer binary graph descriptor
+ * @returns graph descriptor
+ * @protected
+ */
+export function parseBinaryGraphDescriptor<T>(buffer: ArrayBuffer): T {
+    let view = new DataView(buffer);
+    if (buffer.byteLength < PREAMBLE_SIZE || view.getUint32(0, true) !== MAGIC) {
+        throw new Error('Invalid binary graph descriptor');
+    }
+
+    let version = view.getUint32(4, true);
+    if (version !== VERSION) throw new Error(`Unsupported binary graph descriptor version: ${version}`);
+
+    let headerLength = view.getUint32(8, true);
+    let bodyOffset = view.getUint32(12, true);
+    let header = JSON.parse(decodeAscii(new Uint8Array(buffer, PREAMBLE_SIZE, headerLength)));
+
+    return restore(header, buffer, bodyOffset) as T;
+}
@@ -1,6 +1,13 @@
-import pkg_resources
+try:
+    # importlib.metadata (python>=3.8) is much faster to import than pkg_resources
+    from importlib import metadata as _metadata
 
-__version__ = pkg_resources.require("webdnn")[0].version
+    __version__ = _metadata.version("webdnn")
+
+except ImportError:
+    import pkg_resources
+
+    __version__ = pkg_resources.require("webdnn")[0].version
 
 from webdnn import backend
 from webdnn import encoder
@@ -1,12 +1,16 @@
+import bisect
+import tempfile
+import time
+from collections import OrderedDict
 from enum import auto, Enum
-from typing import Dict, List, Set, Union, Tuple
+from typing import Callable, Dict, List, Optional, Set, Union, Tuple
 
 import numpy as np
 from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
 from webdnn.graph.operator import Operator
 from webdnn.graph.operators.attributes.inplace import Inplace
-from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.placeholder import Dependency, Placeholder, PlaceholderOperator
 from webdnn.graph.variable import Variable
 from webdnn.graph.variables.constant_variable import ConstantVariable
 from webdnn.util import json, flags, console
@@ -54,9 +58,12 @@ class Allocation(json.SerializableMixin):
 
 
 class MemoryLayout(json.SerializableMixin):
-    def __init__(self, allocations: AllocationDict = None, data: np.array = None):
+    _dynamic_size = None  # type: Optional[IntLike]
+
+    def __init__(self, allocations: AllocationDict = None, data: np.array = None, dynamic_size: IntLike = None):
         self.allocations = {} if allocations is None else allocations  # type: AllocationDict
         self.data = data  # type: np.array
+        self._dynamic_size = dynamic_size
 
     def _to_serializable_(self):
         return {
@@ -94,6 +101,10 @@ class MemoryLayout(json.SerializableMixin):
 
     @property
     def dynamic_size(self) -> IntLike:
+        if self._dynamic_size is not None:
+            # Dynamic allocations may share the buffer, and their peak size can't be computed from offsets symbolically.
+            return self._dynamic_size
+
         size = 0
         for a in self.allocations.values():
             if a.buffer_type == BufferType.Dynamic:
@@ -102,7 +113,7 @@ class MemoryLayout(json.SerializableMixin):
         return size
 
 
-def allocate(graph: Graph) -> MemoryLayout:
+def allocate(graph: Graph, strategy: str = None) -> MemoryLayout:
     nodes = traverse.listup_nodes(graph)
     operators = traverse.filter_nodes(nodes, Operator)  # type: List[Operator]
     variables = traverse.filter_nodes(nodes, Variable)  # type: List[Variable]
@@ -120,18 +131,24 @@ def allocate(graph: Graph) -> MemoryLayout:
     variable_allocations = {v: allocations[v] for v in variables if not isinstance(v, ConstantVariable)}
     constant_allocations = {v: allocations[v] for v in variables if isinstance(v, ConstantVariable)}
 
-    _update_offset(variable_allocations)
-    _optimize_buffer_reuse(variable_allocations)
+    dynamic_size = _update_offset(variable_allocations)
+    _optimize_buffer_reuse(variable_allocations, strategy)
+
+    optimized_dynamic_size = _optimize_dynamic_buffer_reuse(variable_allocations, strategy)
+    if optimized_dynamic_size is not None:
+        dynamic_size = optimized_dynamic_size
 
     data = _update_constant_offset(constant_allocations)
 
     for allocation in set(variable_allocations.values()):
-        allocation.offset += data.size
+        # Dynamic allocations are placed in the dynamic buffer, which doesn't contain constants.
+        if allocation.buffer_type == BufferType.Static:
+            allocation.offset += data.size
 
     allocations = variable_allocations
     allocations.update(constant_allocations)
 
-    layout = MemoryLayout(allocations, data)
+    layout = MemoryLayout(allocations, data, dynamic_size)
 
     if flags.VISUALIZE_MEMORY_ALLOCATION:
         _visualize_allocation(operators, variables, layout)
@@ -191,40 +208,70 @@ def _get_allocations(graph: Graph, operators: List[Operator], variables: List[Va
                 # `t + 1` means that `v` will be released *AFTER* `op` will be finished.
                 allocations[v].end = t + 1
 
-        for a in allocations.values():
-            if a.begin == _T_UNKNOWN:
-                a.begin = 0
+    for a in allocations.values():
+        if a.begin == _T_UNKNOWN:
+            a.begin = 0
 
-            if a.end == _T_UNKNOWN:
-                a.end = T_LAST
+        if a.end == _T_UNKNOWN:
+            a.end = T_LAST
 
     return allocations
 
 
-def _update_offset(allocations: AllocationDict):
+def _update_offset(allocations: AllocationDict) -> IntLike:
     static_offset = 0
     dynamic_offset = 0
 
-    for allocation in allocations.values():
+    # Merged allocations are shared by multiple variables, and each of them is placed only once.
+    for allocation in OrderedDict.fromkeys(allocations.values()):
         if allocation.buffer_type == BufferType.Static:
             allocation.offset = static_offset
             static_offset = _align(static_offset + allocation.size)
 
         else:
             allocation.offset = dynamic_offset
-            dynamic_offset += _align(dynamic_offset + allocation.size)
+            dynamic_offset = dynamic_offset + allocation.size
+
+    return dynamic_offset
 
 
 def _update_constant_offset(allocations: AllocationDict):
     offset = 0
-    data = []
-
     for v, a in allocations.items():  # type: ConstantVariable, Allocation
-        data.append(v.data.flatten())
         a.offset = offset
         offset = _align(offset + v.size)
 
-    return np.concatenate(data) if len(data) > 0 else np.empty((0,))
+    return pack_constants(allocations, offset)
+
+
+def pack_constants(allocations: Dict[ConstantVariable, "Allocation"], size: int) -> np.ndarray:
+    """pack_constants(allocations, size)
+
+    Pack data of constant variables into single float32 buffer. Each data is copied directly into the buffer at the offset of the
+    corresponding allocation, without temporary flattened copies.
+
+    If the buffer size is larger than :code:`flags.CONSTANT_MEMMAP_THRESHOLD` bytes, the buffer is allocated as :class:`numpy.memmap`
+    backed by an anonymous temporary file, and encoders read the packed data from the mapping. Therefore peak memory usage is kept
+    close to one copy of constants.
+
+    Args:
+        allocations (dict of :class:`~webdnn.graph.variables.constant_variable.ConstantVariable` and allocation): allocations whose
+            offsets are already computed
+        size (int): buffer size in elements
+
+    Returns:
+        (:class:`numpy.ndarray`) packed buffer
+    """
+    if size * 4 > flags.CONSTANT_MEMMAP_THRESHOLD:
+        data = np.memmap(tempfile.TemporaryFile(), dtype=np.float32, mode="w+", shape=(size,))
+
+    else:
+        data = np.zeros((size,), dtype=np.float32)
+
+    for v, a in allocations.items():  # type: ConstantVariable, Allocation
+        np.copyto(data[a.offset:a.offset + v.size].reshape(v.data.shape), v.data)
+
+    return data
 
 
 def _optimize_inplace(operators: List[Operator], allocations_dict: AllocationDict):
@@ -237,7 +284,195 @@ def _optimize_inplace(operators: List[Operator], allocations_dict: AllocationDic
             _merge_allocation(allocations_dict, allocations_dict[attr.get_input()], allocations_dict[attr.get_output()])
 
 
-def _optimize_buffer_reuse(allocations_dict: AllocationDict):
+def _optimize_buffer_reuse(allocations_dict: AllocationDict, strategy: str = None):
+    """
+    Optimize memory size by reusing buffer if available.
+
+    Offsets are assigned by the strategy specified by :code:`strategy` or by the environment variable
+    :code:`MEMORY_ALLOCATION_STRATEGY`.
+
+    - :code:`"greedy"`: merges the pair of allocations which reduces most memory at each step. See
+      :func:`~webdnn.backend.code_generator.allocator._optimize_buffer_reuse_greedy`.
+    - :code:`"best_fit"`: places allocations in descending order of size into the smallest available gap. See
+      :func:`~webdnn.backend.code_generator.allocator._optimize_buffer_reuse_best_fit`.
+
+    If the environment variable :code:`COMPARE_MEMORY_ALLOCATION_STRATEGY` is set, all strategies are performed and peak sizes are
+    reported.
+    """
+    if not (flags.optimize.OPTIMIZE and flags.optimize.OPTIMIZE_MEMORY_ALLOCATION):
+        console.debug('_optimize_buffer_reuse is skipped')
+        return
+
+    if strategy is None:
+        strategy = flags.optimize.MEMORY_ALLOCATION_STRATEGY
+
+    if strategy not in _buffer_reuse_strategies:
+        raise NotImplementedError(f"Unknown memory allocation strategy: {strategy}")
+
+    # Allocations are deduplicated with keeping the order, so that the result doesn't depend on object ids.
+    allocations = [a for a in OrderedDict.fromkeys(allocations_dict.values()) if a.buffer_type == BufferType.Static]
+    if len(allocations) == 0:
+        return
+
+    if flags.optimize.COMPARE_MEMORY_ALLOCATION_STRATEGY:
+        for other_strategy, optimizer in _buffer_reuse_strategies.items():
+            if other_strategy == strategy:
+                continue
+
+            start = time.time()
+            optimizer(allocations)
+            elapsed = time.time() - start
+            console.stderr(f"Memory allocation strategy '{other_strategy}': peak size={_peak_size(allocations)}, "
+                           f"elapsed time={elapsed:.3f}[s]")
+
+    start = time.time()
+    _buffer_reuse_strategies[strategy](allocations)
+    elapsed = time.time() - start
+
+    message = f"Memory allocation strategy '{strategy}': peak size={_peak_size(allocations)}, elapsed time={elapsed:.3f}[s]"
+    if flags.optimize.COMPARE_MEMORY_ALLOCATION_STRATEGY:
+        console.stderr(message)
+    else:
+        console.debug(message)
+
+
+def _optimize_dynamic_buffer_reuse(allocations_dict: AllocationDict, strategy: str = None) -> Optional[IntLike]:
+    """
+    Optimize memory size of dynamic buffer by reusing buffer if available.
+
+    Algorithm:
+
+    The size of each dynamic allocation is split into integer coefficient and unresolved part (ex. :code:`<N> * 16` is split into
+    :code:`16` and :code:`<N>`), and allocations are grouped by the unresolved part. In each group, allocations are compared by
+    coefficient, therefore the strategy used for static allocations assigns their offsets in unit of the unresolved part. Groups are
+    placed contiguously, and offsets are emitted as placeholder expressions.
+
+    For example, if all dynamic allocations are proportional to batch size :code:`<N>`, the dynamic buffer size becomes
+    :code:`<N> * (peak size of the static version with N=1)`.
+
+    Returns:
+        (int or :class:`~webdnn.graph.placeholder.Placeholder`, optional) size of dynamic buffer. If the optimization is
+        skipped, :code:`None` is returned.
+    """
+    if not (flags.optimize.OPTIMIZE and flags.optimize.OPTIMIZE_MEMORY_ALLOCATION):
+        console.debug('_optimize_dynamic_buffer_reuse is skipped')
+        return None
+
+    if strategy is None:
+        strategy = flags.optimize.MEMORY_ALLOCATION_STRATEGY
+
+    allocations = [a for a in OrderedDict.fromkeys(allocations_dict.values()) if a.buffer_type == BufferType.Dynamic]
+    if len(allocations) == 0:
+        return None
+
+    groups = []  # type: List[Tuple[Placeholder, List[Allocation], List[Allocation]]]
+    for a in allocations:
+        coefficient, unit = _split_symbolic_size(a.size)
+
+        # Allocation whose size is the coefficient. The strategy assigns offset in unit of `unit`.
+        proxy = Allocation(size=coefficient, begin=a.begin, end=a.end)
+
+        for group_unit, group_allocations, group_proxies in groups:
+            if Placeholder._check_deep_equal(group_unit, unit):
+                group_allocations.append(a)
+                group_proxies.append(proxy)
+                break
+
+        else:
+            groups.append((unit, [a], [proxy]))
+
+    offset = 0
+    for unit, group_allocations, group_proxies in groups:
+        _buffer_reuse_strategies[strategy](group_proxies)
+
+        for a, proxy in zip(group_allocations, group_proxies):
+            a.offset = offset if proxy.offset == 0 else offset + unit * proxy.offset
+
+        offset = offset + unit * _peak_size(group_proxies)
+
+    console.debug(f"Dynamic memory allocation: {len(allocations)} allocations in {len(groups)} groups, size={offset}")
+    return offset
+
+
+def _split_symbolic_size(size: Placeholder) -> Tuple[int, Placeholder]:
+    """
+    Split unresolved size into integer coefficient and unresolved part, as :code:`size = coefficient * unit`.
+    """
+    if size.dependency is None or size.dependency.operator != PlaceholderOperator.Mul:
+        return 1, size
+
+    coefficient = 1
+    units = []
+    for operand in size.dependency.operands:
+        if Placeholder.check_resolved(operand):
+            coefficient *= Placeholder.force_int(operand)
+
+        else:
+            units.append(operand)
+
+    if coefficient <= 0:
+        return 1, size
+
+    return coefficient, units[0] if len(units) == 1 else Placeholder(Dependency(PlaceholderOperator.Mul, units))
+
+
+def _peak_size(allocations: List[Allocation]) -> int:
+    return max(a.offset + a.size for a in allocations) if len(allocations) > 0 else 0
+
+
+def _optimize_buffer_reuse_best_fit(allocations: List[Allocation]):
+    """
+    Assign offsets by best-fit placement over lifetime intervals.
+
+    Algorithm:
+
+    Allocations are placed in descending order of size. For each allocation, already placed allocations whose lifetime overlaps
+    with it are listed up in ascending order of offset, and the smallest gap between them which is large enough is selected.
+    If there is no such gap, the allocation is placed just after the overlapping allocations.
+
+    Unlike :func:`~webdnn.backend.code_generator.allocator._optimize_buffer_reuse_greedy`, placement is decided at once for each
+    allocation and never reconsidered. The peak size is comparable with the greedy result (use
+    :code:`COMPARE_MEMORY_ALLOCATION_STRATEGY=1` to check it), and it is much faster for large graphs.
+
+    Time order:
+        Sort: O(N log N)
+        Placement: O(N K log K), where K is the maximum number of allocations whose lifetime overlaps
+
+        Total: O(N^2) in the worst case, but almost linear for typical computation graphs.
+    """
+    allocations = sorted(allocations, key=lambda a: (a.size, a.end - a.begin), reverse=True)
+
+    # Placed allocations sorted by begin time. Only allocations whose begin time is in
+    # [a.begin - max_lifetime, a.end) can overlap with the current allocation `a`.
+    placed = []  # type: List[Allocation]
+    placed_begins = []  # type: List[int]
+    max_lifetime = 0
+
+    for a in allocations:
+        index_from = bisect.bisect_left(placed_begins, a.begin - max_lifetime)
+        index_to = bisect.bisect_left(placed_begins, a.end)
+        overlaps = sorted((a2 for a2 in placed[index_from:index_to] if a2.end > a.begin), key=lambda a2: a2.offset)
+
+        best_offset = None
+        best_gap = None
+        offset = 0
+        for a2 in overlaps:
+            gap = a2.offset - offset
+            if gap >= a.size and (best_gap is None or gap < best_gap):
+                best_offset = offset
+                best_gap = gap
+
+            offset = max(offset, _align(a2.offset + a2.size))
+
+        a.offset = offset if best_offset is None else best_offset
+
+        index = bisect.bisect_right(placed_begins, a.begin)
+        placed.insert(index, a)
+        placed_begins.insert(index, a.begin)
+        max_lifetime = max(max_lifetime, a.end - a.begin)
+
+
+def _optimize_buffer_reuse_greedy(allocations: List[Allocation]):
     """
     Optimize memory size by reusing buffer if available
 
@@ -322,15 +557,11 @@ def _optimize_buffer_reuse(allocations_dict: AllocationDict):
     Time order:
         Build Table: O(N^2)
         Iteration: O(N) times
+            search max score pair: O(N^2)
             update table: O(N)
 
-        Total: O(N^2)
+        Total: O(N^3)
     """
-    if not (flags.optimize.OPTIMIZE and flags.optimize.OPTIMIZE_MEMORY_ALLOCATION):
-        console.debug('_optimize_buffer_reuse is skipped')
-        return
-
-    allocations = list(set(filter(lambda x: Placeholder.check_resolved(x), allocations_dict.values())))
     allocations = sorted(allocations, key=lambda a: a.size, reverse=True)
 
     # Construct offset table
@@ -471,12 +702,29 @@ def _optimize_buffer_reuse(allocations_dict: AllocationDict):
         a2.offset = offset
 
 
+_buffer_reuse_strategies = {
+    "greedy": _optimize_buffer_reuse_greedy,
+    "best_fit": _optimize_buffer_reuse_best_fit
+}  # type: Dict[str, Callable[[List[Allocation]], None]]
+
+
 def _merge_allocation(allocations: AllocationDict, a1: Allocation, a2: Allocation, a_new: Allocation = None):
     """
-    merge two allocations into one new allocation
+    merge two allocations into one new allocation. :code:`a1` and :code:`a2` are the allocations of inplace operator's input and
+    output respectively.
     """
     if a_new is None:
-        a_new = Allocation(size=max(a1.size, a2.size), begin=min(a1.begin, a2.begin), end=max(a1.end, a2.end))
+        if a1.size == a2.size:
+            size = a1.size
+
+        elif _check_resolved(a1.size) and _check_resolved(a2.size):
+            size = max(a1.size, a2.size)
+
+        else:
+            # Unresolved sizes can't be compared. Input is smaller than output only when it's broadcasted, so output size is used.
+            size = a2.size
+
+        a_new = Allocation(size=size, begin=min(a1.begin, a2.begin), end=max(a1.end, a2.end))
 
     for v, lifetime in allocations.items():
         if lifetime == a1 or lifetime == a2:
@@ -1 +1,2 @@
 from webdnn.backend.code_generator.templates import elementwise
+from webdnn.backend.code_generator.templates import tensordot_epilogue
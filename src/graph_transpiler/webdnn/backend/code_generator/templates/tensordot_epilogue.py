@@ -0,0 +1,100 @@
+import textwrap
+from typing import Any, Callable, List, Union
+
+from webdnn.backend.code_generator.templates.elementwise import RegisteredItem
+from webdnn.graph.operators.attributes.tensordot_epilogue import TensordotEpilogue
+from webdnn.graph.variable import Variable
+
+
+def declare_parameter(name: str, value: Union[int, float]) -> str:
+    """declare_parameter(name, value)
+
+    Declaration statement of an elementwise kernel parameter in C++ and Metal.
+    """
+    if isinstance(value, float):
+        return f"const float {name} = {value!r};"
+
+    elif isinstance(value, int):
+        return f"const int {name} = {value};"
+
+    else:
+        raise TypeError(f"Unsupported type: {type(value)}")
+
+
+def epilogue_input_index(epilogue: TensordotEpilogue, x: Variable, index: str, mod: Callable[[str, int], str]) -> str:
+    """epilogue_input_index(epilogue, x, index, mod)
+
+    Index expression of the element of input variable :code:`x` corresponding to the element of the tensordot output.
+    Input variables of the epilogue are broadcasted along leading axes of the output (checked by
+    :class:`~webdnn.optimizer.sub_rules.fuse_tensordot_epilogue.FuseTensordotEpilogue`), therefore the index is computed as
+    :code:`index % x.size`.
+
+    Args:
+        epilogue (:class:`~webdnn.graph.operators.attributes.tensordot_epilogue.TensordotEpilogue`): epilogue
+        x (:class:`~webdnn.graph.variable.Variable`): real input variable
+        index (str): expression of the index of the element in the output variable
+        mod (callable): function which returns the expression of modulo operation
+
+    Returns:
+        (str) index expression
+    """
+    y = epilogue.base.outputs["C"]
+    if x.order == y.order and x.shape == y.shape:
+        return index
+
+    if x.size == 1:
+        return "0"
+
+    return mod(index, int(x.size))
+
+
+def generate_epilogue(epilogue: TensordotEpilogue,
+                      items: List[RegisteredItem],
+                      value: str,
+                      load: Callable[[Variable], List[Any]],
+                      declare: Callable[[str, Union[int, float]], str] = declare_parameter,
+                      indent: str = "") -> List[Any]:
+    """generate_epilogue(epilogue, items, value, load, declare=declare_parameter, indent="")
+
+    Generate a block statement which applies the epilogue to the value in place. The statement is valid in C++, Metal and GLSL.
+    Code of each operator is placed in its own block, where inputs (:code:`x0`, :code:`x1`, ...), output (:code:`y`) and
+    parameters are declared as local variables. Therefore registered code of elementwise kernels can be used without renaming.
+
+    Args:
+        epilogue (:class:`~webdnn.graph.operators.attributes.tensordot_epilogue.TensordotEpilogue`): epilogue
+        items (list of :class:`~webdnn.backend.code_generator.templates.elementwise.RegisteredItem`): registered item of each
+            operator in :code:`epilogue.ops`
+        value (str): name of the float variable which holds the result of tensordot. The result of the epilogue is written back.
+        load (callable): function which returns fragments of the expression to load the element of given real input variable
+        declare (callable): function which returns declaration statement of a parameter
+        indent (str): indent of each line
+
+    Returns:
+        (list) code fragments. If :code:`load` returns only strings, fragments can be joined simply.
+    """
+    names = {epilogue.x: value}
+    fragments = [f"{indent}{{\n"]
+
+    for dummy, real in epilogue.dummy2real.items():
+        name = f"epilogue_v{len(names)}"
+        fragments += [f"{indent}    float {name} = "] + list(load(real)) + [";\n"]
+        names[dummy] = name
+
+    for op, item in zip(epilogue.ops, items):
+        y = op.outputs["y"]
+        y_name = f"epilogue_v{len(names)}"
+        fragments.append(f"{indent}    float {y_name};\n{indent}    {{\n")
+
+        for key, fn in item.parameters.items():
+            fragments.append(f"{indent}        {declare(key, fn(op))}\n")
+
+        for key, x in op.inputs.items():
+            fragments.append(f"{indent}        float {key} = {names[x]};\n")
+
+        fragments.append(f"{indent}        float y;\n")
+        fragments.append(textwrap.indent(textwrap.dedent(item.code).strip(), f"{indent}        ") + "\n")
+        fragments.append(f"{indent}        {y_name} = y;\n{indent}    }}\n")
+        names[y] = y_name
+
+    fragments.append(f"{indent}    {value} = {names[epilogue.y]};\n{indent}}}\n")
+    return fragments
@@ -1,4 +1,4 @@
 from webdnn.backend.fallback import generator
 from webdnn.backend.fallback import graph_descriptor
 from webdnn.backend.fallback import kernel
-from webdnn.backend.fallback import kernels
+from webdnn.backend.fallback import optimize_rules
@@ -68,7 +68,9 @@ def encode_command(builder: CommandBuffer):
 
         elif code[0] == "enterBlockScope":
             #  (EnterBlockScope,)
-            generated_lines.append(f"{indent_text}(function(){{")
+            # Plain block instead of closure call per element. "var" declared in the block is function-scoped, but it's safe
+            # because each value is assigned before it's used in the same block.
+            generated_lines.append(f"{indent_text}{{")
             indent_level += 1
             indent_text = "    " * indent_level
 
@@ -76,7 +78,7 @@ def encode_command(builder: CommandBuffer):
             #  (ExitBlockScope,)
             indent_level -= 1
             indent_text = "    " * indent_level
-            generated_lines.append(f"{indent_text}}})();")
+            generated_lines.append(f"{indent_text}}}")
 
         elif code[0] == "comment":
             #  (comment, text)
@@ -8,23 +8,26 @@ Kernel Builder for Fallback (pure js)
 """
 import os
 import os.path as path
+from typing import Optional
 
 from webdnn.backend.code_generator.allocator import allocate
+from webdnn.backend.fallback import kernels
 from webdnn.backend.fallback.graph_descriptor import GraphDescriptor
 from webdnn.backend.fallback.kernel import Kernel
+from webdnn.backend.fallback.optimize_rules.fallback_optimize_rule import FallbackOptimizeRule
 from webdnn.backend.interface.generator import DescriptorGenerator
 from webdnn.backend.interface.graph_descriptor import IGraphExecutionData
 from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.encoder import weight_shard
 from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
-from webdnn.util import console, flags
-from webdnn.util.json import json
+from webdnn.util import console, flags, profiler
 
 
 class GraphExecutionData(IGraphExecutionData):
     descriptor: GraphDescriptor
 
-    def __init__(self, graph: Graph, descriptor: GraphDescriptor, constants: bytes):
+    def __init__(self, graph: Graph, descriptor: GraphDescriptor, constants: Optional[weight_shard.EncodedConstants]):
         self.graph = graph
         self.descriptor = descriptor
         self.constants = constants
@@ -33,42 +36,56 @@ class GraphExecutionData(IGraphExecutionData):
     def save(self, dirname: str):
         os.makedirs(dirname, exist_ok=True)
 
-        with open(path.join(dirname, "graph_{}.json".format(self.backend_suffix)), "w") as f:
-            json.dump(self.descriptor, f, indent=2)
+        self.save_descriptor(dirname, self.descriptor, "graph_{}".format(self.backend_suffix))
 
         with open(path.join(dirname, "kernels_{}.js".format(self.backend_suffix)), "w") as f:
             f.write(self.descriptor.concat_kernel_sources())
 
-        with open(path.join(dirname, "weight_{}.bin".format(self.backend_suffix)), "wb") as f:
-            f.write(self.constants)
+        weight_shard.write_constants(dirname, "weight_{}.bin".format(self.backend_suffix), self.constants,
+                                     self.descriptor.weight_shards)
+
+        self.save_profile(dirname)
 
 
 class FallbackDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData]):
     @classmethod
     def generate(cls, graph: Graph, **kwargs):
+        with profiler.phase("backend_optimize"):
+            graph, _ = FallbackOptimizeRule().optimize(graph)
+
         if flags.DEBUG:
             traverse.dump(graph)
 
-        memory_layout = allocate(graph)
+        with profiler.phase("allocate"):
+            memory_layout = allocate(graph)
 
         console.debug(f"[FallbackDescriptorGenerator] memory_layout total size: {memory_layout.total_size * 4}")
         console.debug(f"[FallbackDescriptorGenerator] memory_layout static size: {memory_layout.static_size * 4}")
         console.debug(f"[FallbackDescriptorGenerator] memory_layout dynamic size: {memory_layout.dynamic_size * 4}")
 
-        constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None))
-        constants_bytes = constant_encoder.encode(memory_layout)
+        constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None),
+                                                       **kwargs.get("constant_encoder_options", {}))
+        with profiler.phase("encode_constants"):
+            constants, weight_shards = weight_shard.encode_constants(constant_encoder, graph, memory_layout,
+                                                                     kwargs.get("weight_shard_size", flags.WEIGHT_SHARD_SIZE),
+                                                                     "weight_fallback_{}.bin")
 
-        console.debug(f"[FallbackDescriptorGenerator] constants encoded size: {len(constants_bytes)}")
+        with profiler.phase("generate_kernels"):
+            kernels = cls.generate_kernels(graph, memory_layout)
 
         descriptor = GraphDescriptor(
-            kernels=cls.generate_kernels(graph, memory_layout),
+            kernels=kernels,
             memory_layout=memory_layout,
             inputs=graph.inputs,
             outputs=graph.outputs,
             constants_encoding=constant_encoder.name,
-            licenses=graph.licenses)
+            licenses=graph.licenses,
+            weight_shards=weight_shards)
+
+        return GraphExecutionData(graph, descriptor, constants)
+
 
-        return GraphExecutionData(graph, descriptor, constants_bytes)
+FallbackDescriptorGenerator.register_handler_manifest(kernels.__name__, kernels.MANIFEST)
 
 
 def generate(graph: Graph, **kwargs):
@@ -1,36 +1,51 @@
-from webdnn.backend.fallback.kernels import abs
-from webdnn.backend.fallback.kernels import average_pooling_2d
-from webdnn.backend.fallback.kernels import broadcast
-from webdnn.backend.fallback.kernels import clipped_relu
-from webdnn.backend.fallback.kernels import concat
-from webdnn.backend.fallback.kernels import convolution_2d
-from webdnn.backend.fallback.kernels import elementwise
-from webdnn.backend.fallback.kernels import elementwise_add
-from webdnn.backend.fallback.kernels import elementwise_div
-from webdnn.backend.fallback.kernels import elementwise_mul
-from webdnn.backend.fallback.kernels import elementwise_pow
-from webdnn.backend.fallback.kernels import elu
-from webdnn.backend.fallback.kernels import exp
-from webdnn.backend.fallback.kernels import greater
-from webdnn.backend.fallback.kernels import greater_equal
-from webdnn.backend.fallback.kernels import hard_sigmoid
-from webdnn.backend.fallback.kernels import leaky_relu
-from webdnn.backend.fallback.kernels import linear
-from webdnn.backend.fallback.kernels import local_response_normalization
-from webdnn.backend.fallback.kernels import max_pooling_2d
-from webdnn.backend.fallback.kernels import reinterpret_axis
-from webdnn.backend.fallback.kernels import relu
-from webdnn.backend.fallback.kernels import reshape
-from webdnn.backend.fallback.kernels import rsqrt
-from webdnn.backend.fallback.kernels import scalar_add
-from webdnn.backend.fallback.kernels import scalar_mul
-from webdnn.backend.fallback.kernels import scalar_pow
-from webdnn.backend.fallback.kernels import select
-from webdnn.backend.fallback.kernels import sigmoid
-from webdnn.backend.fallback.kernels import softmax
-from webdnn.backend.fallback.kernels import softplus
-from webdnn.backend.fallback.kernels import softsign
-from webdnn.backend.fallback.kernels import split_axis
-from webdnn.backend.fallback.kernels import tanh
-from webdnn.backend.fallback.kernels import tensordot
-from webdnn.backend.fallback.kernels import threshold_relu
+"""
+Kernel handlers of Fallback backend.
+
+Kernel modules are not imported by this package. Each kernel module registers its handlers when it's imported, and
+:class:`~webdnn.backend.fallback.generator.FallbackDescriptorGenerator` imports the module listed in :data:`MANIFEST` when
+the handler of the operator is requested at first. When a kernel module is added, register its operators in :data:`MANIFEST`.
+"""
+
+# operator type name -> kernel module name
+MANIFEST = {
+    "Abs": "abs",
+    "AveragePooling2D": "average_pooling_2d",
+    "AxiswiseBias": "elementwise_add",
+    "AxiswiseScale": "elementwise_mul",
+    "Broadcast": "broadcast",
+    "ClippedRelu": "clipped_relu",
+    "Concat": "concat",
+    "Convolution2D": "convolution_2d",
+    "ElementwiseAdd": "elementwise_add",
+    "ElementwiseDiv": "elementwise_div",
+    "ElementwiseMul": "elementwise_mul",
+    "ElementwisePow": "elementwise_pow",
+    "Elu": "elu",
+    "Exp": "exp",
+    "FusedElementwise": "elementwise",
+    "Greater": "greater",
+    "GreaterEqual": "greater_equal",
+    "HardSigmoid": "hard_sigmoid",
+    "Im2Col": "im2col",
+    "LeakyRelu": "leaky_relu",
+    "Linear": "linear",
+    "LocalResponseNormalization": "local_response_normalization",
+    "MaxPooling2D": "max_pooling_2d",
+    "ReinterpretAxis": "reinterpret_axis",
+    "Relu": "relu",
+    "Reshape": "reshape",
+    "Rsqrt": "rsqrt",
+    "ScalarAdd": "scalar_add",
+    "ScalarMul": "scalar_mul",
+    "ScalarPow": "scalar_pow",
+    "Select": "select",
+    "Sigmoid": "sigmoid",
+    "Softmax": "softmax",
+    "Softplus": "softplus",
+    "Softsign": "softsign",
+    "SplitAxis": "split_axis",
+    "Tanh": "tanh",
+    "Tensordot": "tensordot",
+    "ThresholdRelu": "threshold_relu",
+    "Transpose": "transpose",
+}
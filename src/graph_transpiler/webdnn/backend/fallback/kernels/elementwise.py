@@ -18,6 +18,10 @@ _registered_items = {}  # type: Dict[Type[Elementwise], RegisteredItem]
 @FallbackDescriptorGenerator.register_handler(FusedElementwise)
 def merged_elementwise_kernel(op: FusedElementwise, memory_layout: MemoryLayout) -> List[Kernel]:
     ops = traverse.listup_operators(op.sub_graph)
+    for sub_op in ops:
+        # Kernel module of each operator is loaded lazily, and it registers the item into `_registered_items`.
+        FallbackDescriptorGenerator.get_handler(FallbackDescriptorGenerator.serialize_operator_type(sub_op))
+
     command_buffer, buffer_injector = generate_elementwise_command_buffer(ops,
                                                                           [_registered_items[op.__class__] for op in ops],
                                                                           memory_layout,
@@ -0,0 +1,101 @@
+from typing import List
+
+from webdnn.backend.code_generator.allocator import MemoryLayout
+from webdnn.backend.fallback.generator import FallbackDescriptorGenerator
+from webdnn.backend.fallback.kernel import Kernel
+from webdnn.graph.axis import Axis
+from webdnn.graph.operators.im2col import Im2Col
+
+# im: (n, h1, w1, c), col: (n, h2, w2, kh, kw, c). Any memory order is supported by strides.
+# EcmaScript3 to support older browsers
+source = """
+im2col: function(input_arrays, output_arrays, option) {
+var im = input_arrays[0];
+var col = output_arrays[0];
+var N = option.N | 0;
+var C1 = option.C1 | 0;
+var H1 = option.H1 | 0;
+var W1 = option.W1 | 0;
+var H2 = option.H2 | 0;
+var W2 = option.W2 | 0;
+var KH = option.KH | 0;
+var KW = option.KW | 0;
+var SH = option.SH | 0;
+var SW = option.SW | 0;
+var PH = option.PH | 0;
+var PW = option.PW | 0;
+var DH = option.DH | 0;
+var DW = option.DW | 0;
+var im_stride_n = option.strides_im[0] | 0;
+var im_stride_h = option.strides_im[1] | 0;
+var im_stride_w = option.strides_im[2] | 0;
+var im_stride_c = option.strides_im[3] | 0;
+var col_stride_n = option.strides_col[0] | 0;
+var col_stride_h = option.strides_col[1] | 0;
+var col_stride_w = option.strides_col[2] | 0;
+var col_stride_kh = option.strides_col[3] | 0;
+var col_stride_kw = option.strides_col[4] | 0;
+var col_stride_c = option.strides_col[5] | 0;
+
+var n, h2, w2, kh, kw, c, h1, w1, im_index, col_index;
+for (n = 0; n < N; n++) {
+  for (h2 = 0; h2 < H2; h2++) {
+    for (w2 = 0; w2 < W2; w2++) {
+      for (kh = 0; kh < KH; kh++) {
+        h1 = h2 * SH - PH + kh * DH;
+
+        for (kw = 0; kw < KW; kw++) {
+          w1 = w2 * SW - PW + kw * DW;
+          col_index = n * col_stride_n + h2 * col_stride_h + w2 * col_stride_w + kh * col_stride_kh + kw * col_stride_kw;
+
+          if (h1 < 0 || h1 >= H1 || w1 < 0 || w1 >= W1) {
+            for (c = 0; c < C1; c++) {
+              col[col_index + c * col_stride_c] = 0;
+            }
+
+          } else {
+            im_index = n * im_stride_n + h1 * im_stride_h + w1 * im_stride_w;
+            for (c = 0; c < C1; c++) {
+              col[col_index + c * col_stride_c] = im[im_index + c * im_stride_c];
+            }
+          }
+        }
+      }
+    }
+  }
+}
+
+},
+
+"""
+
+
+@FallbackDescriptorGenerator.register_handler(Im2Col)
+def im2col(op: Im2Col, memory_layout: MemoryLayout) -> List[Kernel]:
+    im = op.inputs["im"]
+    col = op.outputs["col"]
+
+    kernel = Kernel(
+        {"im2col": source},
+        "im2col",
+        inputs=[memory_layout[im]],
+        outputs=[memory_layout[col]],
+        call_option={"N": im.shape_dict[Axis.N],
+                     "C1": im.shape_dict[Axis.C],
+                     "H1": im.shape_dict[Axis.H],
+                     "W1": im.shape_dict[Axis.W],
+                     "H2": col.shape_dict[Axis.H],
+                     "W2": col.shape_dict[Axis.W],
+                     "KH": op.KH,
+                     "KW": op.KW,
+                     "SH": op.SH,
+                     "SW": op.SW,
+                     "PH": op.PH,
+                     "PW": op.PW,
+                     "DH": op.DH,
+                     "DW": op.DW,
+                     "strides_im": [im.stride_dict[a] for a in [Axis.N, Axis.H, Axis.W, Axis.C]],
+                     "strides_col": [col.stride_dict[a] for a in [Axis.N, Axis.H, Axis.W, Axis.KH, Axis.KW, Axis.C]]}
+    )
+
+    return [kernel]
@@ -6,42 +6,68 @@ from webdnn.backend.fallback.kernel import Kernel
 from webdnn.graph.operators.tensordot import Tensordot
 from webdnn.util.misc import mul
 
+# A and B are gathered into contiguous buffers, so that the innermost loop is a sequential dot product over typed arrays.
+# Any memory order of A, B and C is supported by offset tables. Reduced axes of A and B are iterated in C-order separately,
+# because the number of reduced axes can be different between A and B (ex. [[C], [KH, KW, C]] when KH = KW = 1).
+# EcmaScript3 to support older browsers
 source = """
 tensordot: function(input_arrays, output_arrays, option) {
 var A = input_arrays[0];
 var B = input_arrays[1];
 var C = output_arrays[0];
+var M = option.M | 0;
+var N = option.N | 0;
+var K = option.K | 0;
 
-var index2pos = function(index, stride, shape) {
-    var i = 0, pos = [];
-    for (i = 0; i < stride.length; i++) pos[i] = Math.floor(index / stride[i]) % shape[i];
-    return pos;
+// offsets[i] = (memory offset of i-th element in C-order iteration over "shape")
+var offsets = function(shape, stride, length) {
+    var result = new Int32Array(length);
+    var i, d, index, offset;
+    for (i = 0; i < length; i++) {
+        index = i;
+        offset = 0;
+        for (d = shape.length - 1; d >= 0; d--) {
+            offset += (index % shape[d]) * stride[d];
+            index = (index / shape[d]) | 0;
+        }
+        result[i] = offset;
+    }
+    return result;
 };
 
-var pos2index = function(pos, stride) {
-    var i = 0, index = 0;
-    for (i = 0; i < stride.length; i++) index += pos[i] * stride[i];
-    return index;
-};
+var a_offsets = offsets(option.shape_A_remained, option.stride_A_remained, M);
+var b_offsets = offsets(option.shape_B_remained, option.stride_B_remained, N);
+var c_a_offsets = offsets(option.shape_A_remained, option.stride_C_for_A_remained, M);
+var c_b_offsets = offsets(option.shape_B_remained, option.stride_C_for_B_remained, N);
+var a_k_offsets = offsets(option.shape_A_reduced, option.stride_A_reduced, K);
+var b_k_offsets = offsets(option.shape_B_reduced, option.stride_B_reduced, K);
+
+var packed_a = new Float32Array(K);
+var packed_b = new Float32Array(N * K);
+var m, n, k, base, c_base, sum;
+
+for (n = 0; n < N; n++) {
+    base = b_offsets[n];
+    for (k = 0; k < K; k++) {
+        packed_b[n * K + k] = B[base + b_k_offsets[k]];
+    }
+}
+
+for (m = 0; m < M; m++) {
+    base = a_offsets[m];
+    for (k = 0; k < K; k++) {
+        packed_a[k] = A[base + a_k_offsets[k]];
+    }
 
-var c_index, c_pos;
-var a_base_index, a_offset; 
-var b_base_index, b_offset;
-var reduction_index;
-var sum = 0;
-for (c_index = 0; c_index < C.length; c_index++) {
-    c_pos = index2pos(c_index, option.stride_C, option.shape_C);
-    a_base_index = pos2index(c_pos, option.stride_A_for_C_axes);
-    b_base_index = pos2index(c_pos, option.stride_B_for_C_axes);
-    
-    sum = 0;
-    for (reduction_index = 0; reduction_index < option.reduction_size; reduction_index++) {
-        a_offset = pos2index(index2pos(reduction_index, option.stride_A_reduced_axes, option.shape_A_reduced_axes), option.stride_A_reduced_axes_for_whole);
-        b_offset = pos2index(index2pos(reduction_index, option.stride_B_reduced_axes, option.shape_B_reduced_axes), option.stride_B_reduced_axes_for_whole);
-        
-        sum += A[a_base_index + a_offset] * B[b_base_index + b_offset];
-    } 
-    C[c_index] = sum;
+    c_base = c_a_offsets[m];
+    for (n = 0; n < N; n++) {
+        base = n * K;
+        sum = 0;
+        for (k = 0; k < K; k++) {
+            sum += packed_a[k] * packed_b[base + k];
+        }
+        C[c_base + c_b_offsets[n]] = sum;
+    }
 }
 
 },
@@ -56,26 +82,29 @@ def tensordot(op: Tensordot, memory_layout: MemoryLayout) -> List[Kernel]:
     B = op.inputs["B"]
     C = op.outputs["C"]
 
-    shape_A_reduced_axes = [A.shape_dict[a] for a in op.axes[0]]
-    shape_B_reduced_axes = [B.shape_dict[a] for a in op.axes[1]]
+    a_remained_axes = [a for a in A.order.axes if a not in op.axes[0]]
+    b_remained_axes = [a for a in B.order.axes if a not in op.axes[1]]
+    shape_A_remained = [A.shape_dict[a] for a in a_remained_axes]
+    shape_B_remained = [B.shape_dict[a] for a in b_remained_axes]
+
     kernel = Kernel(
         {"tensordot": source},
         "tensordot",
         inputs=[memory_layout[A], memory_layout[B]],
         outputs=[memory_layout[C]],
-        call_option={"reduction_size": mul(A.shape_dict[a] for a in op.axes[0]),
-                     "stride_A": A.stride,
-                     "stride_B": B.stride,
-                     "stride_C": C.stride,
-                     "shape_C": C.shape,
-                     "stride_A_for_C_axes": [0 if a not in A.order.axes or a in op.axes[0] else A.stride_dict[a] for a in C.order.axes],
-                     "stride_B_for_C_axes": [0 if a not in B.order.axes or a in op.axes[1] else B.stride_dict[a] for a in C.order.axes],
-                     "shape_A_reduced_axes": shape_A_reduced_axes,
-                     "stride_A_reduced_axes": [mul(shape_A_reduced_axes[i + 1:]) for i in range(len(shape_A_reduced_axes))],
-                     "stride_A_reduced_axes_for_whole": [A.stride_dict[a] for a in op.axes[0]],
-                     "shape_B_reduced_axes": shape_B_reduced_axes,
-                     "stride_B_reduced_axes": [mul(shape_B_reduced_axes[i + 1:]) for i in range(len(shape_B_reduced_axes))],
-                     "stride_B_reduced_axes_for_whole": [B.stride_dict[a] for a in op.axes[1]]}
+        call_option={"M": mul(shape_A_remained),
+                     "N": mul(shape_B_remained),
+                     "K": mul(A.shape_dict[a] for a in op.axes[0]),
+                     "shape_A_remained": shape_A_remained,
+                     "stride_A_remained": [A.stride_dict[a] for a in a_remained_axes],
+                     "stride_C_for_A_remained": [C.stride_dict[a] for a in a_remained_axes],
+                     "shape_B_remained": shape_B_remained,
+                     "stride_B_remained": [B.stride_dict[a] for a in b_remained_axes],
+                     "stride_C_for_B_remained": [C.stride_dict[a] for a in b_remained_axes],
+                     "shape_A_reduced": [A.shape_dict[a] for a in op.axes[0]],
+                     "stride_A_reduced": [A.stride_dict[a] for a in op.axes[0]],
+                     "shape_B_reduced": [B.shape_dict[a] for a in op.axes[1]],
+                     "stride_B_reduced": [B.stride_dict[a] for a in op.axes[1]]}
     )
 
     return [kernel]
@@ -0,0 +1,4 @@
+from webdnn.backend.fallback.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.transpose import Transpose
+
+register_elementwise_kernel(Transpose, "y = x0;")
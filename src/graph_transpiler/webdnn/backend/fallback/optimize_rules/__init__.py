@@ -0,0 +1,2 @@
+from webdnn.backend.fallback.optimize_rules import fallback_optimize_rule
+from webdnn.backend.fallback.optimize_rules import merge_tensordot_and_transpose
@@ -0,0 +1,26 @@
+from webdnn.backend.fallback.optimize_rules.merge_tensordot_and_transpose import MergeTensordotAndTranspose
+from webdnn.graph.optimize_rule import OptimizeRuleGroup
+from webdnn.optimizer.sub_rules.constant_folding import ConstantFolding
+from webdnn.optimizer.sub_rules.dump_graph import DumpGraph
+from webdnn.optimizer.sub_rules.elementwise_kernel_fusion import ElementwiseKernelFusion
+from webdnn.optimizer.sub_rules.replace_convolution_by_im2col import ReplaceConvolutionByIm2Col
+from webdnn.optimizer.sub_rules.replace_linear_by_tensordot import ReplaceLinearByTensordot
+from webdnn.util import flags
+
+
+class FallbackOptimizeRule(OptimizeRuleGroup):
+    def __init__(self):
+        sub_rules = [
+            OptimizeRuleGroup([
+                ReplaceConvolutionByIm2Col(),
+                ReplaceLinearByTensordot(),
+                MergeTensordotAndTranspose(),
+                ConstantFolding()
+            ]),
+            ElementwiseKernelFusion()
+        ]
+
+        if flags.DEBUG:
+            sub_rules.append(DumpGraph("cg{count}.dot"))
+
+        super(FallbackOptimizeRule, self).__init__(sub_rules)
@@ -0,0 +1,41 @@
+from typing import Tuple
+
+from webdnn.graph import traverse
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.operators.transpose import Transpose
+from webdnn.graph.optimize_rule import OptimizeRule
+
+
+class MergeTensordotAndTranspose(OptimizeRule):
+    """
+    Remove transpose operator after tensordot by changing the order of tensordot's output. Tensordot kernel of fallback backend
+    supports any memory order of output variable.
+
+    before)
+
+        A -+
+           +-{Tensordot}- h -{Transpose}- y
+        B -+
+
+    after)
+
+        A -+
+           +-{Tensordot}- y
+        B -+
+    """
+
+    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
+        flag_changed = False
+        for op in traverse.filter_nodes(traverse.listup_operators(graph), Transpose):  # type: Transpose
+            h = op.inputs["x0"]
+            y = op.outputs["y"]
+
+            if not isinstance(h.output_from, Tensordot) or len(h.input_to) != 1 or h in graph.outputs:
+                continue
+
+            op.remove_all()
+            OptimizeRule.replace_variable(graph, h, y, with_assert=False)
+            flag_changed = True
+
+        return graph, flag_changed
@@ -0,0 +1,319 @@
+"""
+On-disk cache of generated graph descriptors.
+
+Each entry is keyed by a content hash of the IR graph (topology, operator parameters, attributes and digests of constant data), the
+backend name, the constant encoder, other generator options and :mod:`webdnn.util.flags.optimize` settings. Names of graph inputs,
+graph outputs and constant variables are included in the key because they are embedded in the generated descriptor (ex. input and
+output names of WebGL descriptor) and in the cached graph. Names of other nodes are not included.
+
+.. code::
+
+    cache = DescriptorCache("./.webdnn_cache", max_size=1024 ** 3)
+    exec_data = generate_descriptor("webgpu", graph, cache=cache)
+
+    console.stderr(f"hits: {cache.hits}, misses: {cache.misses}")
+
+The cache is also enabled for all conversions by the environment variable :code:`DESCRIPTOR_CACHE_DIR`.
+"""
+
+import hashlib
+import os
+import os.path as path
+import tempfile
+from enum import Enum
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from webdnn.backend.interface.graph_descriptor import IGraphExecutionData
+from webdnn.graph import pickler, traverse
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.node import Node
+from webdnn.graph.order import Order
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import console, flags
+
+_FORMAT_VERSION = 1
+
+
+class _Canonicalizer:
+    """
+    Converts graph objects into nested tuples of primitive values which don't depend on object identities.
+    """
+
+    def __init__(self, nodes):
+        self.node_indices = {node: i for i, node in enumerate(nodes)}
+        self.axis_indices = {}  # type: Dict[int, int]
+
+    def __call__(self, value: Any):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+
+        if isinstance(value, Node):
+            return "node", self.node_indices.get(value, value.__class__.__name__)
+
+        if isinstance(value, Axis):
+            if value.resolved:
+                return "axis", value.name
+
+            # anonymous axes are identified by the order of appearance
+            return "axis", self.axis_indices.setdefault(value.id, len(self.axis_indices))
+
+        if isinstance(value, Order):
+            return "order", tuple(self(a) for a in value.axes)
+
+        if isinstance(value, Placeholder):
+            return "placeholder", repr(value)
+
+        if isinstance(value, Enum):
+            return "enum", str(value)
+
+        if isinstance(value, np.ndarray):
+            return "ndarray", str(value.dtype), value.shape, _digest(value)
+
+        if isinstance(value, np.generic):
+            return value.item()
+
+        if isinstance(value, (list, tuple)):
+            return tuple(self(v) for v in value)
+
+        if isinstance(value, dict):
+            return "dict", tuple(sorted((repr(self(k)), self(v)) for k, v in value.items()))
+
+        if isinstance(value, (set, frozenset)):
+            return "set", tuple(sorted(repr(self(v)) for v in value))
+
+        if hasattr(value, "__dict__"):
+            return value.__class__.__name__, self(vars(value))
+
+        return value.__class__.__name__, repr(value)
+
+
+def _digest(array: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(array).view(np.uint8)).hexdigest()
+
+
+def _canonicalize_node(node: Node, canonicalize: _Canonicalizer):
+    attributes = sorted(repr((attr.__class__.__name__, canonicalize({k: v for k, v in vars(attr).items() if k != "base"})))
+                        for attr in node.attributes)
+    parameters = {k: v for k, v in node.parameters.items() if k != "name"}
+    result = [node.__class__.__name__, canonicalize(parameters), tuple(attributes)]
+
+    if isinstance(node, Variable):
+        result += [canonicalize(node.shape), canonicalize(node.order)]
+
+        if isinstance(node, ConstantVariable):
+            result.append(canonicalize(node.data))
+
+    else:
+        result += [canonicalize(dict(node.inputs)), canonicalize(dict(node.outputs))]
+
+    return tuple(result)
+
+
+def graph_hash(graph: Graph) -> str:
+    """graph_hash(graph)
+
+    Compute a content hash of the graph. The hash is stable over processes. It depends on names of graph inputs, graph outputs and
+    constant variables, but not on names of other nodes.
+
+    Args:
+        graph (:class:`~webdnn.Graph`): graph
+
+    Returns:
+        (str) hex digest
+    """
+    nodes = traverse.listup_nodes(graph)
+    canonicalize = _Canonicalizer(nodes)
+
+    h = hashlib.sha256()
+    for node in nodes:
+        h.update(repr(_canonicalize_node(node, canonicalize)).encode())
+
+    h.update(repr((canonicalize(graph.inputs), canonicalize(graph.outputs), canonicalize(graph.licenses))).encode())
+    h.update(repr(([v.name for v in graph.inputs], [v.name for v in graph.outputs],
+                   [v.name for v in nodes if isinstance(v, ConstantVariable)])).encode())
+    return h.hexdigest()
+
+
+def _optimize_flags():
+    return {name: getattr(flags.optimize, name) for name in dir(flags.optimize) if name.isupper()}
+
+
+def descriptor_key(backend: str, digest: str, **kwargs) -> str:
+    """descriptor_key(backend, digest, **kwargs)
+
+    Compute the cache key of the graph descriptor.
+
+    Args:
+        backend (str): target backend
+        digest (str): hash of the graph computed by :func:`~webdnn.backend.interface.descriptor_cache.graph_hash`
+        **kwargs: other arguments passed to :func:`~webdnn.backend.interface.generator.generate_descriptor` (ex.
+            :code:`constant_encoder_name`)
+
+    Returns:
+        (str) hex digest
+    """
+    canonicalize = _Canonicalizer([])
+    h = hashlib.sha256()
+    h.update(repr((_FORMAT_VERSION, _webdnn_version(), backend, canonicalize(kwargs), canonicalize(_optimize_flags()),
+                   flags.DEBUG, flags.WEIGHT_SHARD_SIZE)).encode())
+    h.update(digest.encode())
+    return h.hexdigest()
+
+
+def _webdnn_version():
+    import webdnn
+    return webdnn.__version__
+
+
+class DescriptorCache:
+    """DescriptorCache(dirname, max_size=None)
+
+    On-disk cache of :class:`~webdnn.backend.interface.graph_descriptor.IGraphExecutionData`, with size-bounded LRU eviction.
+
+    Args:
+        dirname (str): cache directory
+        max_size (int, optional): max total size of cache entries in bytes. If :code:`None`, :code:`flags.DESCRIPTOR_CACHE_SIZE` is
+            used. When the total size exceeds this limit, least recently used entries are removed.
+
+    Attributes:
+        hits (int): number of cache hits
+        misses (int): number of cache misses
+    """
+
+    def __init__(self, dirname: str, max_size: Optional[int] = None):
+        self.dirname = dirname
+        self.max_size = flags.DESCRIPTOR_CACHE_SIZE if max_size is None else max_size
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, key: str) -> str:
+        return path.join(self.dirname, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[IGraphExecutionData]:
+        """get(key)
+
+        Args:
+            key (str): cache key computed by :func:`~webdnn.backend.interface.descriptor_cache.descriptor_key`
+
+        Returns:
+            (:class:`~webdnn.backend.interface.graph_descriptor.IGraphExecutionData`, optional) cached data, or :code:`None` if the
+            entry is not found
+        """
+        filename = self._entry_path(key)
+        try:
+            with open(filename, "rb") as f:
+                exec_data = pickler.loads(f.read())
+
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        except Exception as ex:
+            console.warning(f"[DescriptorCache] Broken cache entry is removed: {filename} ({ex})")
+            self._remove(filename)
+            self.misses += 1
+            return None
+
+        # Update access time for LRU eviction
+        os.utime(filename, None)
+        self.hits += 1
+        return exec_data
+
+    def put(self, key: str, exec_data: IGraphExecutionData):
+        """put(key, exec_data)
+
+        Store the data and evict least recently used entries if the total size exceeds :code:`max_size`.
+
+        Args:
+            key (str): cache key
+            exec_data (:class:`~webdnn.backend.interface.graph_descriptor.IGraphExecutionData`): generated data
+        """
+        os.makedirs(self.dirname, exist_ok=True)
+
+        profile = exec_data.profile
+        exec_data.profile = None
+        try:
+            data = pickler.dumps(exec_data)
+
+        finally:
+            exec_data.profile = profile
+
+        # Write into temporary file and rename it, so that other processes never read incomplete entry
+        fd, tmp_filename = tempfile.mkstemp(dir=self.dirname, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        os.replace(tmp_filename, self._entry_path(key))
+        self._evict()
+
+    def clear(self):
+        """clear()
+
+        Remove all entries.
+        """
+        for filename, _, _ in self._list_entries():
+            self._remove(filename)
+
+    def _list_entries(self):
+        if not path.isdir(self.dirname):
+            return []
+
+        entries = []
+        for name in os.listdir(self.dirname):
+            if not name.endswith(".pkl"):
+                continue
+
+            filename = path.join(self.dirname, name)
+            try:
+                stat = os.stat(filename)
+
+            except FileNotFoundError:
+                continue
+
+            entries.append((filename, stat.st_mtime, stat.st_size))
+
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._list_entries(), key=lambda entry: entry[1])
+        total_size = sum(size for _, _, size in entries)
+
+        for filename, _, size in entries:
+            if total_size <= self.max_size:
+                break
+
+            self._remove(filename)
+            total_size -= size
+
+    @staticmethod
+    def _remove(filename: str):
+        try:
+            os.remove(filename)
+
+        except FileNotFoundError:
+            pass
+
+
+_default_cache = None  # type: Optional[DescriptorCache]
+
+
+def get_default_cache() -> Optional[DescriptorCache]:
+    """get_default_cache()
+
+    Returns:
+        (:class:`DescriptorCache`, optional) cache in :code:`flags.DESCRIPTOR_CACHE_DIR`, or :code:`None` if the directory is not
+        specified
+    """
+    global _default_cache
+    if flags.DESCRIPTOR_CACHE_DIR is None:
+        return None
+
+    if _default_cache is None or _default_cache.dirname != flags.DESCRIPTOR_CACHE_DIR:
+        _default_cache = DescriptorCache(flags.DESCRIPTOR_CACHE_DIR)
+
+    return _default_cache
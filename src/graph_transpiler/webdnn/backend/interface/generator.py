@@ -1,26 +1,31 @@
-import copy
-import sys
-from collections import defaultdict
-from typing import Generic, TypeVar, Type, Callable, List, Dict
+import importlib
+import multiprocessing
+import os
+import traceback
+from collections import defaultdict, OrderedDict
+from typing import Generic, TypeVar, Type, Callable, List, Dict, Sequence, Optional, Tuple, Any, Union
 
+from webdnn.backend.code_generator import allocator
 from webdnn.backend.code_generator.allocator import MemoryLayout
+from webdnn.backend.interface import descriptor_cache
+from webdnn.backend.interface.descriptor_cache import DescriptorCache
 from webdnn.backend.interface.graph_descriptor import IGraphExecutionData
-from webdnn.graph import traverse
+from webdnn.graph import node, pickler, placeholder, traverse
 from webdnn.graph.graph import Graph
 from webdnn.graph.operator import Operator
 from webdnn.optimizer.general_optimize_rule import GeneralOptimizeRule
-from webdnn.util import console
+from webdnn.util import console, profiler
 
 backend_names = ["webgpu", "webassembly", "fallback"]
 
 T_KERNEL = TypeVar("T_KERNEL")
 T_EXEC_DATA = TypeVar("T_EXEC_DATA")
 
-sys.setrecursionlimit(10000)
-
 
 class DescriptorGenerator(Generic[T_KERNEL, T_EXEC_DATA]):
     _handler_map = defaultdict(dict)  # type: Dict[str, Dict[str, Callable[[Operator, MemoryLayout], List[T_KERNEL]]]]
+    _handler_manifest = {}  # type: Dict[str, Tuple[str, Dict[str, str]]]
+    _loading_handler_module = False
 
     @classmethod
     def generate(cls, graph: Graph, constant_encoder_name: str = None) -> T_EXEC_DATA:
@@ -37,12 +42,67 @@ class DescriptorGenerator(Generic[T_KERNEL, T_EXEC_DATA]):
 
         def decorator(handler: Callable[[Operator, MemoryLayout], List[T_KERNEL]]):
             if key in cls._handler_map[cls.__name__]:
+                if cls._loading_handler_module:
+                    # Handler registered by user before the built-in kernel module is loaded lazily takes precedence.
+                    return
+
                 console.warning(f"[{cls.__name__}] Generator handler of '{key}' is already registered and overwritten.")
 
             cls._handler_map[cls.__name__][key] = handler
 
         return decorator
 
+    @classmethod
+    def register_handler_manifest(cls, package: str, manifest: Dict[str, str]):
+        """register_handler_manifest(package, manifest)
+
+        Register kernel modules which are imported lazily. When the handler of an operator is requested at first, the module
+        corresponding to the operator is imported, and the module registers its handlers by
+        :func:`~webdnn.backend.interface.generator.DescriptorGenerator.register_handler`.
+
+        Args:
+            package (str): package name of kernel modules
+            manifest (dict of str and str): dictionary which maps operator type names into kernel module names
+        """
+        cls._handler_manifest[cls.__name__] = (package, manifest)
+
+    @classmethod
+    def get_handler(cls, key: str) -> Optional[Callable]:
+        """get_handler(key)
+
+        Args:
+            key (str): operator type name
+
+        Returns:
+            (callable, optional) the handler of the operator, or :code:`None` if no handler is registered
+        """
+        handlers = cls._handler_map[cls.__name__]
+        if key not in handlers and key in cls._handler_manifest.get(cls.__name__, ("", {}))[1]:
+            package, manifest = cls._handler_manifest[cls.__name__]
+            cls._load_handler_module(f"{package}.{manifest[key]}")
+
+        return handlers.get(key, None)
+
+    @classmethod
+    def load_all_handlers(cls):
+        """load_all_handlers()
+
+        Import all kernel modules registered by :func:`~webdnn.backend.interface.generator.DescriptorGenerator.register_handler_manifest`.
+        """
+        package, manifest = cls._handler_manifest.get(cls.__name__, ("", {}))
+        for module_name in OrderedDict.fromkeys(manifest.values()):
+            cls._load_handler_module(f"{package}.{module_name}")
+
+    @classmethod
+    def _load_handler_module(cls, module_name: str):
+        loading = DescriptorGenerator._loading_handler_module
+        DescriptorGenerator._loading_handler_module = True
+        try:
+            importlib.import_module(module_name)
+
+        finally:
+            DescriptorGenerator._loading_handler_module = loading
+
     @classmethod
     def serialize_operator_type(cls, operator: Operator):
         return operator.__class__.__name__
@@ -53,10 +113,11 @@ class DescriptorGenerator(Generic[T_KERNEL, T_EXEC_DATA]):
 
         for op in traverse.listup_operators(graph):
             key = cls.serialize_operator_type(op)
-            if key not in cls._handler_map[cls.__name__]:
+            handler = cls.get_handler(key)
+            if handler is None:
                 raise NotImplementedError(f"[{cls.__name__}] Operator {op} is not handled by any generator handler")
 
-            kernels += cls._handler_map[cls.__name__][key](op, memory_layout)
+            kernels += handler(op, memory_layout)
 
         return kernels
 
@@ -86,22 +147,202 @@ def generate_descriptor(backend: str, graph: Graph, **kwargs) -> IGraphExecution
 
     Args:
         backend (str): target backend
-        graph (:class:`~webdnn.Graph`): graph
+        graph (:class:`~webdnn.Graph`): graph. Graph loaded by :func:`~webdnn.graph.serializer.load` can be passed as is. The graph is
+            not modified, so its memory-mapped constants are never written.
+        cache (:class:`~webdnn.backend.interface.descriptor_cache.DescriptorCache`, optional): descriptor cache. If the descriptor
+            for same graph and options is cached, it is returned without optimization, allocation and encoding. If :code:`None`,
+            the cache specified by the environment variable :code:`DESCRIPTOR_CACHE_DIR` is used if any. If :code:`False`, cache
+            is not used.
 
     Returns:
         (:class:`~webdnn.backend.interface.graph_descriptor.IGraphExecutionData`) generated graph descriptor
+
+    If profiling is enabled (see :mod:`webdnn.util.profiler`), the profiling records are attached to the returned graph descriptor and
+    saved with it as :code:`profile_{backend}.json`.
     """
+    cache = _get_cache(kwargs.pop("cache", None))
+
+    if not profiler.is_enabled():
+        return _generate_descriptor_with_cache(backend, graph, cache, **kwargs)
+
+    with profiler.profile() as p:
+        with profiler.phase("generate_descriptor"):
+            graph_exec_data = _generate_descriptor_with_cache(backend, graph, cache, **kwargs)
+
+    graph_exec_data.profile = p
+    return graph_exec_data
+
+
+def _generate_descriptor_with_cache(backend: str, graph: Graph, cache: Optional[DescriptorCache], **kwargs) -> IGraphExecutionData:
+    if cache is None:
+        return _generate_descriptor(backend, graph, **kwargs)
+
+    with profiler.phase("cache_lookup"):
+        key = descriptor_cache.descriptor_key(backend, descriptor_cache.graph_hash(graph), **kwargs)
+        graph_exec_data = cache.get(key)
+
+    if graph_exec_data is not None:
+        console.debug(f"[generate_descriptor] cache hit: {backend} ({key})")
+        return graph_exec_data
+
+    graph_exec_data = _generate_descriptor(backend, graph, **kwargs)
+
+    with profiler.phase("cache_store"):
+        cache.put(key, graph_exec_data)
+
+    return graph_exec_data
+
+
+def _get_cache(cache: Union[DescriptorCache, bool, None]) -> Optional[DescriptorCache]:
+    if cache is None:
+        return descriptor_cache.get_default_cache()
+
+    if cache is False:
+        return None
+
+    return cache
+
+
+def _generate_descriptor(backend: str, graph: Graph, **kwargs) -> IGraphExecutionData:
     generator = get_generator(backend)
 
+    # Each backend starts from same name counters, so that generated descriptor doesn't depend on previously generated backends
+    # and is same whether backends are generated serially or in parallel.
+    name_counters = get_name_counters()
     try:
-        # Graph is transformed by backend-specific optimization
-        graph = copy.deepcopy(graph)
-    except RecursionError:
-        # Occurs when the graph has many nodes (e.g. ResNet)
-        raise RecursionError("Recursion error occurred when copying graph." +
-                             " sys.setrecursionlimit(10000) may help fixing it.")
+        with profiler.phase("copy_graph"):
+            # Graph is transformed by backend-specific optimization
+            graph = graph.clone()
+
+        # some optimize rule work even when OPTIMIZE=0
+        with profiler.phase("general_optimize"):
+            graph, _ = GeneralOptimizeRule().optimize(graph)
+
+        return generator(graph, **kwargs)
+
+    finally:
+        set_name_counters(name_counters)
+
 
-    # some optimize rule work even when OPTIMIZE=0
-    graph, _ = GeneralOptimizeRule().optimize(graph)
+def generate_descriptors(backends: Sequence[str], graph: Graph, processes: Optional[int] = None, return_exceptions: bool = False,
+                         **kwargs) -> Dict[str, IGraphExecutionData]:
+    """generate_descriptors(backends, graph, processes=None, return_exceptions=False, **kwargs)
 
-    return generator(graph, **kwargs)
+    Generate graph descriptors for multiple backends. Backends are generated in parallel by process pool, and each generated descriptor
+    is same as the descriptor generated by :func:`~webdnn.backend.interface.generator.generate_descriptor` serially.
+
+    The graph is sent to each worker process only once.
+
+    Args:
+        backends (list of str): target backends
+        graph (:class:`~webdnn.Graph`): graph
+        processes (int, optional): number of worker processes. If :code:`None`, :code:`min(len(backends), os.cpu_count())` is
+            used. If :code:`1`, backends are generated serially in this process.
+        return_exceptions (bool): If :code:`True`, exception raised in generating a backend is returned as the result of the backend
+            instead of raised.
+        **kwargs: other arguments passed to :func:`~webdnn.backend.interface.generator.generate_descriptor`
+
+    Returns:
+        (dict of str and :class:`~webdnn.backend.interface.graph_descriptor.IGraphExecutionData`) generated graph descriptors, in
+        same order as :code:`backends`
+    """
+    if processes is None:
+        processes = min(len(backends), os.cpu_count() or 1)
+
+    results = OrderedDict((backend, None) for backend in backends)  # type: Dict[str, IGraphExecutionData]
+
+    if processes <= 1:
+        for backend in backends:
+            try:
+                results[backend] = generate_descriptor(backend, graph, **kwargs)
+
+            except Exception as ex:
+                if not return_exceptions:
+                    raise ex
+
+                results[backend] = ex
+
+        return results
+
+    # Cache is looked up and updated in this process, and only missed backends are sent to workers.
+    cache = _get_cache(kwargs.pop("cache", None))
+    keys = {}  # type: Dict[str, str]
+    if cache is not None:
+        digest = descriptor_cache.graph_hash(graph)
+        for backend in backends:
+            keys[backend] = descriptor_cache.descriptor_key(backend, digest, **kwargs)
+            results[backend] = cache.get(keys[backend])
+
+    missed_backends = [backend for backend in backends if results[backend] is None]
+    if len(missed_backends) == 0:
+        return results
+
+    payload = pickler.dumps((graph, get_name_counters()))
+    worker_kwargs = dict(kwargs, cache=False)
+    with multiprocessing.Pool(min(processes, len(missed_backends)), initializer=_initialize_worker, initargs=(payload,)) as pool:
+        worker_results = pool.map(_generate_descriptor_in_worker, [(backend, worker_kwargs) for backend in missed_backends],
+                                  chunksize=1)
+
+    for backend, (succeeded, data) in zip(missed_backends, worker_results):
+        if succeeded:
+            results[backend] = pickler.loads(data)
+            if cache is not None:
+                cache.put(keys[backend], results[backend])
+
+            continue
+
+        ex = RuntimeError(f"Failed generating descriptor for {backend} backend in worker process:\n{data}")
+        if not return_exceptions:
+            raise ex
+
+        results[backend] = ex
+
+    return results
+
+
+_worker_payload = None  # type: Tuple[Graph, tuple]
+
+
+def _initialize_worker(payload: bytes):
+    global _worker_payload
+    _worker_payload = pickler.loads(payload)
+
+
+def _generate_descriptor_in_worker(args: Tuple[str, Dict[str, Any]]) -> Tuple[bool, Union[bytes, str]]:
+    backend, kwargs = args
+    graph, name_counters = _worker_payload
+
+    # Start from same state as the parent process
+    set_name_counters(name_counters)
+
+    try:
+        return True, pickler.dumps(generate_descriptor(backend, graph, **kwargs))
+
+    except Exception:
+        return False, traceback.format_exc()
+
+
+def get_name_counters():
+    """get_name_counters()
+
+    Returns snapshot of global counters used for naming nodes, allocations and placeholders. The snapshot can be restored by
+    :func:`~webdnn.backend.interface.generator.set_name_counters`.
+
+    Returns:
+        (tuple) snapshot of counters
+    """
+    from webdnn.backend.webgl import allocator as webgl_allocator
+    return node.get_name_counters(), allocator._count, webgl_allocator._count, placeholder._id
+
+
+def set_name_counters(counters):
+    """set_name_counters(counters)
+
+    Restore global counters used for naming nodes, allocations and placeholders.
+
+    Args:
+        counters (tuple): snapshot returned by :func:`~webdnn.backend.interface.generator.get_name_counters`
+    """
+    from webdnn.backend.webgl import allocator as webgl_allocator
+    node_counters, allocator._count, webgl_allocator._count, placeholder._id = counters
+    node.set_name_counters(node_counters)
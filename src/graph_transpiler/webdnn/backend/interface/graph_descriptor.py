@@ -1,8 +1,12 @@
-from typing import Generic, TypeVar, Iterable, Dict, Tuple, List
+import os
+from os import path
+from typing import Generic, TypeVar, Iterable, Dict, Tuple, List, Optional
 
 from webdnn.graph.graph import Graph
 from webdnn.backend.code_generator.allocator import MemoryLayout
 from webdnn.graph.placeholder import Placeholder
+from webdnn.util import console, json
+from webdnn.util.profiler import Profiler
 
 T_KERNEL = TypeVar("T_KERNEL")
 
@@ -17,7 +21,13 @@ class IGraphDescriptor(Generic[T_KERNEL]):
 class IGraphExecutionData(Generic[T_KERNEL]):
     """
     Container class for graph descriptor and related datum.
+
+    Attributes:
+        profile (:class:`~webdnn.util.profiler.Profiler`, optional): profiling records of the generation, if profiling is enabled.
     """
+    backend_suffix: str
+    profile = None  # type: Optional[Profiler]
+
     def save(self, dirname: str):
         """save(dirname)
 
@@ -34,3 +44,39 @@ class IGraphExecutionData(Generic[T_KERNEL]):
             dirname (str): destination directory name
         """
         raise NotImplementedError()
+
+    def save_descriptor(self, dirname: str, descriptor: IGraphDescriptor, basename: str):
+        """save_descriptor(dirname, descriptor, basename)
+
+        Save graph descriptor into specified directory as :code:`{basename}.json` and as compact binary container
+        :code:`{basename}.wdnb` (see :mod:`webdnn.util.json.binary`).
+
+        Args:
+            dirname (str): destination directory name
+            descriptor: graph descriptor
+            basename (str): file name without extension
+        """
+        json_path = path.join(dirname, f"{basename}.json")
+        with open(json_path, "w") as f:
+            json.dump(descriptor, f, indent=2)
+
+        binary_path = path.join(dirname, f"{basename}.wdnb")
+        with open(binary_path, "wb") as f:
+            json.dump_binary(descriptor, f)
+
+        console.debug(f"[{self.__class__.__name__}] {basename}.json: {os.stat(json_path).st_size} bytes, "
+                      f"{basename}.wdnb: {os.stat(binary_path).st_size} bytes")
+
+    def save_profile(self, dirname: str):
+        """save_profile(dirname)
+
+        Save profiling records into specified directory as :code:`profile_{backend_suffix}.json`. If profiling records is not attached,
+        nothing is saved.
+
+        Args:
+            dirname (str): destination directory name
+        """
+        if self.profile is None:
+            return
+
+        self.profile.save(path.join(dirname, f"profile_{self.backend_suffix}.json"))
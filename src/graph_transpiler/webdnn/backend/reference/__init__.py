@@ -0,0 +1 @@
+from webdnn.backend.reference import executor
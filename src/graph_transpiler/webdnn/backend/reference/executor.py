@@ -0,0 +1,161 @@
+import importlib
+from typing import Callable, Dict, Optional, Type
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import Allocation, BufferType, MemoryLayout, allocate
+from webdnn.backend.reference import kernels
+from webdnn.graph import traverse
+from webdnn.graph.graph import Graph
+from webdnn.graph.operator import Operator
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.util import console
+
+T_HANDLER = Callable[[Operator, Dict[str, np.ndarray]], Dict[str, np.ndarray]]
+
+
+def _cast_to(data: np.ndarray, v: Variable) -> np.ndarray:
+    shape = tuple(Placeholder.force_int(s) for s in v.shape)
+    return np.broadcast_to(np.asarray(data, dtype=np.float32), shape)
+
+
+class ReferenceExecutor:
+    """
+    Reference executor which evaluates IR graph with NumPy.
+
+    Each operator is computed by the handler registered with
+    :func:`~webdnn.backend.reference.executor.ReferenceExecutor.register_handler`. Intermediate arrays are placed in buffers assigned
+    by the memory allocator, and buffers are recycled based on the lifetime computed by the allocator, in the same way as the
+    generated descriptors do in the browser.
+
+    This backend is not imported by :mod:`webdnn.backend`. Import :mod:`webdnn.backend.reference.executor` explicitly to use it.
+    """
+    _handler_map = {}  # type: Dict[str, T_HANDLER]
+    _loading_handler_module = False
+
+    @classmethod
+    def register_handler(cls, OperatorClass: Type[Operator]):
+        """
+        Decorator to register the handler which computes :code:`OperatorClass`.
+
+        Handler receives the operator and input arrays dictionary keyed by input name, and returns output arrays dictionary keyed
+        by output name. Each array is aligned in the order of corresponding variable.
+        """
+        key = OperatorClass.__name__
+
+        def decorator(handler: T_HANDLER):
+            if key in cls._handler_map:
+                if cls._loading_handler_module:
+                    # Handler registered by user before the built-in kernel module is loaded lazily takes precedence.
+                    return handler
+
+                console.warning(f"[{cls.__name__}] Handler of '{key}' is already registered and overwritten.")
+
+            cls._handler_map[key] = handler
+            return handler
+
+        return decorator
+
+    @classmethod
+    def get_handler(cls, key: str) -> Optional[T_HANDLER]:
+        """get_handler(key)
+
+        Returns the handler of the operator. Kernel modules listed in :data:`webdnn.backend.reference.kernels.MANIFEST` are imported
+        when the handler is requested at first.
+
+        Args:
+            key (str): operator type name
+
+        Returns:
+            (callable, optional) the handler, or :code:`None` if no handler is registered
+        """
+        if key not in cls._handler_map and key in kernels.MANIFEST:
+            cls._loading_handler_module = True
+            try:
+                importlib.import_module(f"{kernels.__name__}.{kernels.MANIFEST[key]}")
+
+            finally:
+                cls._loading_handler_module = False
+
+        return cls._handler_map.get(key, None)
+
+    @classmethod
+    def serialize_operator_type(cls, operator: Operator):
+        return operator.__class__.__name__
+
+    @classmethod
+    def run(cls, graph: Graph, inputs: Dict[Variable, np.ndarray], memory_layout: MemoryLayout = None) -> Dict[Variable, np.ndarray]:
+        """
+        Execute the graph.
+
+        Args:
+            graph: computation graph
+            inputs: input arrays dictionary keyed by input variables of the graph
+            memory_layout: memory layout. If it's not specified, the layout is computed by
+                :func:`~webdnn.backend.code_generator.allocator.allocate`.
+
+        Returns:
+            output arrays dictionary keyed by output variables of the graph
+        """
+        for v in graph.inputs:
+            if v not in inputs:
+                raise ValueError(f"[{cls.__name__}] Input array for {v} is not specified.")
+
+        if memory_layout is None:
+            memory_layout = allocate(graph)
+
+        static_buffer = np.zeros((memory_layout.static_size,), dtype=np.float32)
+        static_buffer[:memory_layout.data.size] = memory_layout.data
+        dynamic_buffers = {}  # type: Dict[Allocation, np.ndarray]
+
+        def get_array(v: Variable) -> np.ndarray:
+            allocation = memory_layout[v]
+            size = Placeholder.force_int(v.size)
+            shape = tuple(Placeholder.force_int(s) for s in v.shape)
+
+            if allocation.buffer_type == BufferType.Static:
+                return static_buffer[allocation.offset:allocation.offset + size].reshape(shape)
+
+            if allocation not in dynamic_buffers:
+                dynamic_buffers[allocation] = np.zeros((Placeholder.force_int(allocation.size),), dtype=np.float32)
+
+            return dynamic_buffers[allocation][:size].reshape(shape)
+
+        for v in graph.inputs:
+            get_array(v)[...] = _cast_to(inputs[v], v)
+
+        for t, op in enumerate(traverse.listup_operators(graph)):
+            key = cls.serialize_operator_type(op)
+            handler = cls.get_handler(key)
+            if handler is None:
+                raise NotImplementedError(f"[{cls.__name__}] Operator {op} is not handled by any handler")
+
+            outputs = handler(op, {name: get_array(v) for name, v in op.inputs.items()})
+
+            for name, v in op.outputs.items():
+                get_array(v)[...] = _cast_to(outputs[name], v)
+
+            for v in op.inputs.values():
+                allocation = memory_layout[v]
+                if allocation.buffer_type == BufferType.Dynamic and allocation.end <= t + 1 and v not in graph.outputs:
+                    # Buffer is not referred anymore
+                    dynamic_buffers.pop(allocation, None)
+
+        return {v: get_array(v).copy() for v in graph.outputs}
+
+
+def run(graph: Graph, inputs: Dict[Variable, np.ndarray], memory_layout: MemoryLayout = None) -> Dict[Variable, np.ndarray]:
+    """run(graph, inputs, memory_layout=None)
+
+    Execute the graph with :class:`~webdnn.backend.reference.executor.ReferenceExecutor`.
+
+    Args:
+        graph (:class:`~webdnn.Graph`): computation graph
+        inputs (dict of :class:`~webdnn.Variable` and np.ndarray): input arrays
+        memory_layout (:class:`~webdnn.backend.code_generator.allocator.MemoryLayout`): memory layout
+
+    Returns:
+        (dict of :class:`~webdnn.Variable` and np.ndarray) output arrays
+    """
+    return ReferenceExecutor.run(graph, inputs, memory_layout)
@@ -0,0 +1,68 @@
+"""
+Kernel handlers of reference backend.
+
+Kernel modules are not imported by this package. Each kernel module registers its handlers when it's imported, and
+:class:`~webdnn.backend.reference.executor.ReferenceExecutor` imports the module listed in :data:`MANIFEST` when
+the handler of the operator is requested at first. When a kernel module is added, register its operators in :data:`MANIFEST`.
+"""
+
+# operator type name -> kernel module name
+MANIFEST = {
+    "Abs": "abs",
+    "AveragePooling2D": "average_pooling_2d",
+    "AxiswiseBias": "elementwise_add",
+    "AxiswiseScale": "elementwise_mul",
+    "Broadcast": "broadcast",
+    "ClippedRelu": "clipped_relu",
+    "Col2Im": "col2im",
+    "Concat": "concat",
+    "Convolution2D": "convolution2d",
+    "Deconvolution2D": "deconvolution2d",
+    "Depth2Space": "depth2space",
+    "ElementwiseAdd": "elementwise_add",
+    "ElementwiseDiv": "elementwise_div",
+    "ElementwiseMul": "elementwise_mul",
+    "ElementwisePow": "elementwise_pow",
+    "ElementwiseSum": "elementwise_add",
+    "Elu": "elu",
+    "Embedding": "embedding",
+    "Exp": "exp",
+    "FusedElementwise": "elementwise",
+    "Greater": "greater",
+    "GreaterEqual": "greater_equal",
+    "HardSigmoid": "hard_sigmoid",
+    "Im2Col": "im2col",
+    "LSTM": "lstm",
+    "LeakyRelu": "leaky_relu",
+    "Linear": "linear",
+    "LocalResponseNormalization": "local_response_normalization",
+    "Max": "max",
+    "MaxPooling2D": "max_pooling_2d",
+    "Min": "min",
+    "Prod": "prod",
+    "ReinterpretAxis": "reinterpret_axis",
+    "Relu": "relu",
+    "Reshape": "reshape",
+    "Rsqrt": "rsqrt",
+    "ScalarAdd": "scalar_add",
+    "ScalarAffine": "scalar_affine",
+    "ScalarMul": "scalar_mul",
+    "ScalarPow": "scalar_pow",
+    "Select": "select",
+    "Sgemm": "sgemm",
+    "Sigmoid": "sigmoid",
+    "Softmax": "softmax",
+    "Softplus": "softplus",
+    "Softsign": "softsign",
+    "Space2Depth": "space2depth",
+    "SplitAxis": "split_axis",
+    "Sum": "sum",
+    "Tanh": "tanh",
+    "Tensordot": "tensordot",
+    "ThresholdRelu": "threshold_relu",
+    "Tile": "tile",
+    "Transpose": "transpose",
+    "Unpooling2D": "unpooling_2d",
+    "ZeroPadding1D": "zero_padding_1d",
+    "ZeroPadding2D": "zero_padding_2d",
+}
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.abs import Abs
+
+register_elementwise_kernel(Abs, lambda op, x0: np.abs(x0))
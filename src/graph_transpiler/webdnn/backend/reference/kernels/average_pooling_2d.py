@@ -0,0 +1,19 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order, im2col
+from webdnn.graph.operators.average_pooling_2d import AveragePooling2D
+from webdnn.graph.order import OrderNHWC
+
+
+@ReferenceExecutor.register_handler(AveragePooling2D)
+def average_pooling_2d(op: AveragePooling2D, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNHWC)
+    col = im2col(x, op.ksize, op.stride, op.padding, ceil_mode=True)
+
+    # Padding area is counted in the divisor, as same as other backends
+    y = np.sum(col, axis=(3, 4)) / (op.ksize[0] * op.ksize[1])
+
+    return {"y": change_order(y, OrderNHWC, op.outputs["y"].order)}
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.clipped_relu import ClippedRelu
+
+register_elementwise_kernel(ClippedRelu, lambda op, x0: np.clip(x0, 0, op.parameters["cap"]))
@@ -0,0 +1,17 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order, col2im as _col2im
+from webdnn.graph.axis import Axis
+from webdnn.graph.operators.col2im import Col2Im
+from webdnn.graph.order import Order, OrderNHWC
+
+
+@ReferenceExecutor.register_handler(Col2Im)
+def col2im(op: Col2Im, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    im = op.outputs["im"]
+    col = change_order(inputs["col"], op.inputs["col"].order, Order([Axis.N, Axis.H, Axis.W, Axis.KH, Axis.KW, Axis.C]))
+
+    return {"im": change_order(_col2im(col, op.stride, op.padding, (im.shape_dict[Axis.H], im.shape_dict[Axis.W])), OrderNHWC, im.order)}
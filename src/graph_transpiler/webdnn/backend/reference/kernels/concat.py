@@ -0,0 +1,15 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.concat import Concat
+
+
+@ReferenceExecutor.register_handler(Concat)
+def concat(op: Concat, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    y = op.outputs["y"]
+    xs = [change_order(inputs[f"x{i}"], op.inputs[f"x{i}"].order, y.order) for i in range(len(op.inputs))]
+
+    return {"y": np.concatenate(xs, axis=y.order.axes_dict[op.parameters["axis"]])}
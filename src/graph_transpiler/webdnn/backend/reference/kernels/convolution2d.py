@@ -0,0 +1,20 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order, im2col
+from webdnn.graph.axis import Axis
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.order import Order, OrderNHWC
+
+
+@ReferenceExecutor.register_handler(Convolution2D)
+def convolution2d(op: Convolution2D, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNHWC)
+    w = change_order(inputs["w"], op.inputs["w"].order, Order([Axis.N, Axis.KH, Axis.KW, Axis.C]))
+
+    col = im2col(x, op.ksize, op.stride, op.padding, op.dilation_rate)
+    y = np.tensordot(col, w, axes=((3, 4, 5), (1, 2, 3)))
+
+    return {"y": change_order(y, OrderNHWC, op.outputs["y"].order)}
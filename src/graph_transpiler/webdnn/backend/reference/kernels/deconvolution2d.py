@@ -0,0 +1,22 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order, col2im
+from webdnn.graph.axis import Axis
+from webdnn.graph.operators.deconvolution2d import Deconvolution2D
+from webdnn.graph.order import Order, OrderNHWC
+
+
+@ReferenceExecutor.register_handler(Deconvolution2D)
+def deconvolution2d(op: Deconvolution2D, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    y = op.outputs["y"]
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNHWC)
+    w = change_order(inputs["w"], op.inputs["w"].order, Order([Axis.N, Axis.KH, Axis.KW, Axis.C]))
+
+    col = np.tensordot(x, w, axes=((3,), (3,)))  # [N, H1, W1, C2, KH, KW]
+    col = np.transpose(col, (0, 1, 2, 4, 5, 3))
+    im = col2im(col, op.stride, op.padding, (y.shape_dict[Axis.H], y.shape_dict[Axis.W]))
+
+    return {"y": change_order(im, OrderNHWC, y.order)}
@@ -0,0 +1,19 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.depth2space import Depth2Space
+from webdnn.graph.order import OrderNHWC
+
+
+@ReferenceExecutor.register_handler(Depth2Space)
+def depth2space(op: Depth2Space, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    r = op.parameters["r"]
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNHWC)
+    N, H1, W1, C1 = x.shape
+
+    y = x.reshape(N, H1, W1, r, r, C1 // r // r).transpose(0, 1, 3, 2, 4, 5).reshape(N, H1 * r, W1 * r, C1 // r // r)
+
+    return {"y": change_order(y, OrderNHWC, op.outputs["y"].order)}
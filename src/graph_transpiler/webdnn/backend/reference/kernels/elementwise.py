@@ -0,0 +1,46 @@
+from typing import Callable, Dict, Type
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.elementwise import Elementwise
+from webdnn.graph.operators.fused_elementwise import FusedElementwise
+
+_registered_items = {}  # type: Dict[Type[Elementwise], Callable[..., np.ndarray]]
+
+
+@ReferenceExecutor.register_handler(FusedElementwise)
+def fused_elementwise(op: FusedElementwise, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    sub_inputs = {op.sub_graph.inputs[i]: inputs[f"x{i}"] for i in range(len(op.sub_graph.inputs))}
+    sub_outputs = ReferenceExecutor.run(op.sub_graph, sub_inputs)
+
+    return {"y": sub_outputs[op.sub_graph.outputs[0]]}
+
+
+def elementwise(op: Elementwise, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    y = op.outputs["y"]
+    xs = [change_order(inputs[f"x{i}"], op.inputs[f"x{i}"].order, y.order) for i in range(len(op.inputs))]
+
+    return {"y": np.broadcast_to(_registered_items[op.__class__](op, *xs), y.shape)}
+
+
+def register_elementwise_kernel(OperatorClass: Type[Elementwise], func: Callable[..., np.ndarray]):
+    """
+    Utility function to define elementwise operation kernel in reference executor.
+
+    :code:`func` is called with the operator and input arrays :code:`x0`, :code:`x1`, ..., :code:`x_{n-1}`. Input arrays are already
+    transposed into the output variable's order and can be broadcast into the output variable's shape.::
+
+        # With expression code
+        register_elementwise_kernel(ElementwiseAdd, lambda op, x0, x1: x0 + x1)
+
+        # With hyper parameters
+        register_elementwise_kernel(ClippedRelu, lambda op, x0: np.clip(x0, 0, op.parameters["cap"]))
+
+    Args:
+        OperatorClass: Operator class which the handler is bound to
+        func: Function which computes the output array
+    """
+    ReferenceExecutor.register_handler(OperatorClass)(elementwise)
+    _registered_items[OperatorClass] = func
@@ -0,0 +1,8 @@
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.axiswise_bias import AxiswiseBias
+from webdnn.graph.operators.elementwise_add import ElementwiseAdd
+from webdnn.graph.operators.elementwise_sum import ElementwiseSum
+
+register_elementwise_kernel(ElementwiseAdd, lambda op, x0, x1: x0 + x1)
+register_elementwise_kernel(ElementwiseSum, lambda op, x0, x1: x0 + x1)
+register_elementwise_kernel(AxiswiseBias, lambda op, x0, x1: x0 + x1)
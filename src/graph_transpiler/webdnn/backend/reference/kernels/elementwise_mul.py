@@ -0,0 +1,6 @@
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.axiswise_scale import AxiswiseScale
+from webdnn.graph.operators.elementwise_mul import ElementwiseMul
+
+register_elementwise_kernel(ElementwiseMul, lambda op, x0, x1: x0 * x1)
+register_elementwise_kernel(AxiswiseScale, lambda op, x0, x1: x0 * x1)
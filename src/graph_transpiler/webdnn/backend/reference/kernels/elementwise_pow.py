@@ -0,0 +1,4 @@
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.elementwise_pow import ElementwisePow
+
+register_elementwise_kernel(ElementwisePow, lambda op, x0, x1: x0 ** x1)
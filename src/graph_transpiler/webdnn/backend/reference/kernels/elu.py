@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.elu import Elu
+
+register_elementwise_kernel(Elu, lambda op, x0: np.where(x0 < 0, np.exp(x0) - 1, x0))
@@ -0,0 +1,16 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.embedding import Embedding
+from webdnn.graph.order import OrderCN, OrderNT, OrderNTC
+
+
+@ReferenceExecutor.register_handler(Embedding)
+def embedding(op: Embedding, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNT)
+    w = change_order(inputs["w"], op.inputs["w"].order, OrderCN)
+
+    return {"y": change_order(w[x.astype(np.int32)], OrderNTC, op.outputs["y"].order)}
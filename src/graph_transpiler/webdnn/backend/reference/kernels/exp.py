@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.exp import Exp
+
+register_elementwise_kernel(Exp, lambda op, x0: np.exp(x0))
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.greater import Greater
+
+register_elementwise_kernel(Greater, lambda op, x0, x1: (x0 > x1).astype(np.float32))
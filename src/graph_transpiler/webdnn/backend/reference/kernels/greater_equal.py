@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.greater_equal import GreaterEqual
+
+register_elementwise_kernel(GreaterEqual, lambda op, x0, x1: (x0 >= x1).astype(np.float32))
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.hard_sigmoid import HardSigmoid
+
+register_elementwise_kernel(HardSigmoid, lambda op, x0: np.clip(x0 * 0.2 + 0.5, 0, 1))
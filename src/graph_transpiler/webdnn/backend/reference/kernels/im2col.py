@@ -0,0 +1,17 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order, im2col as _im2col
+from webdnn.graph.axis import Axis
+from webdnn.graph.operators.im2col import Im2Col
+from webdnn.graph.order import Order, OrderNHWC
+
+
+@ReferenceExecutor.register_handler(Im2Col)
+def im2col(op: Im2Col, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    im = change_order(inputs["im"], op.inputs["im"].order, OrderNHWC)
+    col = _im2col(im, op.ksize, op.stride, op.padding, op.dilation_rate)
+
+    return {"col": change_order(col, Order([Axis.N, Axis.H, Axis.W, Axis.KH, Axis.KW, Axis.C]), op.outputs["col"].order)}
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.leaky_relu import LeakyRelu
+
+register_elementwise_kernel(LeakyRelu, lambda op, x0: np.where(x0 > 0, x0, x0 * op.parameters["slope"]))
@@ -0,0 +1,22 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.axis import Axis
+from webdnn.graph.operators.linear import Linear
+from webdnn.graph.order import Order, OrderNC
+
+
+@ReferenceExecutor.register_handler(Linear)
+def linear(op: Linear, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = op.inputs["x"]
+    w = op.inputs["w"]
+    reduced_axes = [a for a in x.order.axes if a != Axis.N]
+
+    x_data = change_order(inputs["x"], x.order, Order([Axis.N] + reduced_axes))
+    w_data = change_order(inputs["w"], w.order, Order([Axis.N] + reduced_axes))
+    y = np.tensordot(x_data, w_data, axes=(list(range(1, x.ndim)), list(range(1, w.ndim))))
+
+    return {"y": change_order(y, OrderNC, op.outputs["y"].order)}
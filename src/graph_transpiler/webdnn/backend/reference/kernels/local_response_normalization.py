@@ -0,0 +1,24 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.local_response_normalization import LocalResponseNormalization
+from webdnn.graph.order import OrderNHWC
+
+
+@ReferenceExecutor.register_handler(LocalResponseNormalization)
+def local_response_normalization(op: LocalResponseNormalization, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNHWC)
+    C = x.shape[3]
+    half_n = int(op.parameters["n"] // 2)
+
+    sq = np.pad(x ** 2, ((0, 0), (0, 0), (0, 0), (half_n, half_n)), mode="constant")
+    sq_sum = np.zeros_like(x)
+    for i in range(2 * half_n + 1):
+        sq_sum += sq[:, :, :, i:i + C]
+
+    y = x * (sq_sum * op.parameters["alpha"] + op.parameters["k"]) ** -op.parameters["beta"]
+
+    return {"y": change_order(y, OrderNHWC, op.outputs["y"].order)}
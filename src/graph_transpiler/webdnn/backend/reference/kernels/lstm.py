@@ -0,0 +1,57 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.lstm import LSTM
+from webdnn.graph.order import OrderCN, OrderNC, OrderNTC
+
+
+def _hard_sigmoid(x: np.ndarray) -> np.ndarray:
+    return np.clip(x * 0.2 + 0.5, 0, 1)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-x))
+
+
+@ReferenceExecutor.register_handler(LSTM)
+def lstm(op: LSTM, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNTC)
+    w_input = change_order(inputs["w_input"], op.inputs["w_input"].order, OrderCN)
+    w_hidden = change_order(inputs["w_hidden"], op.inputs["w_hidden"].order, OrderCN)
+    batch_size, sequence_len, _ = x.shape
+    hidden_dim = w_hidden.shape[0]
+
+    activation = np.tanh
+    recurrent_activation = _hard_sigmoid if op.parameters["recurrent_activation"] == "hard_sigmoid" else _sigmoid
+
+    if op.parameters["use_initial_c"]:
+        c = change_order(inputs["initial_c"], op.inputs["initial_c"].order, OrderNC)
+    else:
+        c = np.zeros((batch_size, hidden_dim), dtype=np.float32)
+
+    if op.parameters["use_initial_h"]:
+        h = change_order(inputs["initial_h"], op.inputs["initial_h"].order, OrderNC)
+    else:
+        h = np.zeros((batch_size, hidden_dim), dtype=np.float32)
+
+    ys = []
+    for t in range(sequence_len):
+        v = np.dot(x[:, t, :], w_input) + np.dot(h, w_hidden)
+        if op.parameters["use_bias"]:
+            v += inputs["b"]
+
+        # gates are aligned in order of i, f, c, o
+        i, f, g, o = np.split(v, 4, axis=1)
+        c = activation(g) * recurrent_activation(i) + c * recurrent_activation(f)
+        h = activation(c) * recurrent_activation(o)
+        ys.append(h)
+
+    if op.parameters["return_sequences"]:
+        y = change_order(np.stack(ys, axis=1), OrderNTC, op.outputs["y"].order)
+    else:
+        y = change_order(h, OrderNC, op.outputs["y"].order)
+
+    return {"y": y, "final_c": change_order(c, OrderNC, op.outputs["final_c"].order)}
@@ -0,0 +1,16 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.max import Max
+from webdnn.graph.order import Order
+
+
+@ReferenceExecutor.register_handler(Max)
+def max(op: Max, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = op.inputs["x"]
+    y = np.max(inputs["x"], axis=x.order.axes_dict[op.axis])
+
+    return {"y": change_order(y, Order([a for a in x.order.axes if a != op.axis]), op.outputs["y"].order)}
@@ -0,0 +1,17 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order, im2col
+from webdnn.graph.operators.max_pooling_2d import MaxPooling2D
+from webdnn.graph.order import OrderNHWC
+
+
+@ReferenceExecutor.register_handler(MaxPooling2D)
+def max_pooling_2d(op: MaxPooling2D, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNHWC)
+    col = im2col(x, op.ksize, op.stride, op.padding, pad_value=-np.inf, ceil_mode=True)
+    y = np.max(col, axis=(3, 4))
+
+    return {"y": change_order(y, OrderNHWC, op.outputs["y"].order)}
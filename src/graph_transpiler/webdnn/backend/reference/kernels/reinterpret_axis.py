@@ -0,0 +1,11 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.graph.operators.reinterpret_axis import ReinterpretAxis
+
+
+@ReferenceExecutor.register_handler(ReinterpretAxis)
+def reinterpret_axis(op: ReinterpretAxis, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    return {"y": inputs["x"]}
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.relu import Relu
+
+register_elementwise_kernel(Relu, lambda op, x0: np.maximum(x0, 0))
@@ -0,0 +1,17 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.reshape import Reshape
+from webdnn.graph.placeholder import Placeholder
+
+
+@ReferenceExecutor.register_handler(Reshape)
+def reshape(op: Reshape, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    y = op.outputs["y"]
+    x = change_order(inputs["x"], op.inputs["x"].order, op.parameters["in_order"])
+    x = x.reshape([Placeholder.force_int(s) for s in op.parameters["out_shape"]])
+
+    return {"y": change_order(x, op.parameters["out_order"], y.order)}
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.rsqrt import Rsqrt
+
+register_elementwise_kernel(Rsqrt, lambda op, x0: 1 / np.sqrt(x0))
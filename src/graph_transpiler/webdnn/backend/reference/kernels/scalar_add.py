@@ -0,0 +1,4 @@
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.scalar_add import ScalarAdd
+
+register_elementwise_kernel(ScalarAdd, lambda op, x0: x0 + op.parameters["value"])
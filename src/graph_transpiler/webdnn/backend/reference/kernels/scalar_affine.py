@@ -0,0 +1,4 @@
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.scalar_affine import ScalarAffine
+
+register_elementwise_kernel(ScalarAffine, lambda op, x0: x0 * op.parameters["scale"] + op.parameters["bias"])
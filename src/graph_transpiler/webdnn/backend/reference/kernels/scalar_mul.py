@@ -0,0 +1,4 @@
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.scalar_mul import ScalarMul
+
+register_elementwise_kernel(ScalarMul, lambda op, x0: x0 * op.parameters["value"])
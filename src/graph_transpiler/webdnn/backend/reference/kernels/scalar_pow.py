@@ -0,0 +1,4 @@
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.scalar_pow import ScalarPow
+
+register_elementwise_kernel(ScalarPow, lambda op, x0: x0 ** op.parameters["value"])
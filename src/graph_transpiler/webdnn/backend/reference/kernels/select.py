@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.select import Select
+
+register_elementwise_kernel(Select, lambda op, x0, x1, x2: np.where(x0 == 1, x1, x2))
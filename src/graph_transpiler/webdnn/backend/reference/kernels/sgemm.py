@@ -0,0 +1,16 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.graph.operators.sgemm import Sgemm
+from webdnn.graph.placeholder import Placeholder
+
+
+@ReferenceExecutor.register_handler(Sgemm)
+def sgemm(op: Sgemm, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    M, N, K = Placeholder.force_int(op.M), Placeholder.force_int(op.N), Placeholder.force_int(op.K)
+    A = inputs["A"].reshape(M, K) if op.transpose_A else inputs["A"].reshape(K, M).T
+    B = inputs["B"].reshape(K, N) if op.transpose_B else inputs["B"].reshape(N, K).T
+
+    return {"C": np.dot(A, B).reshape([Placeholder.force_int(s) for s in op.outputs["C"].shape])}
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.sigmoid import Sigmoid
+
+register_elementwise_kernel(Sigmoid, lambda op, x0: 1 / (1 + np.exp(-x0)))
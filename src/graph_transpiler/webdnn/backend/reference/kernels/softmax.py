@@ -0,0 +1,17 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.graph.operators.softmax import Softmax
+
+
+@ReferenceExecutor.register_handler(Softmax)
+def softmax(op: Softmax, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = op.inputs["x"]
+    axis = x.order.axes_dict[op.parameters["axis"]]
+
+    y = np.exp(inputs["x"] - np.max(inputs["x"], axis=axis, keepdims=True))
+    y /= np.sum(y, axis=axis, keepdims=True)
+
+    return {"y": y}
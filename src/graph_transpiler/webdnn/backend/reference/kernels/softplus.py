@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.softplus import Softplus
+
+register_elementwise_kernel(Softplus, lambda op, x0: np.log(1 + np.exp(op.parameters["beta"] * x0)) / op.parameters["beta"])
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.softsign import Softsign
+
+register_elementwise_kernel(Softsign, lambda op, x0: x0 / (np.abs(x0) + 1))
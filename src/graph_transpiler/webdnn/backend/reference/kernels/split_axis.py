@@ -0,0 +1,15 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.split_axis import SplitAxis
+
+
+@ReferenceExecutor.register_handler(SplitAxis)
+def split_axis(op: SplitAxis, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = op.inputs["x"]
+    ys = np.split(inputs["x"], op.parameters["sections"], axis=x.order.axes_dict[op.parameters["axis"]])
+
+    return {f"y{i}": change_order(y, x.order, op.outputs[f"y{i}"].order) for i, y in enumerate(ys)}
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.tanh import Tanh
+
+register_elementwise_kernel(Tanh, lambda op, x0: np.tanh(x0))
@@ -0,0 +1,56 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.attributes.tensordot_epilogue import TensordotEpilogue
+from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.order import Order
+from webdnn.graph.variable import Variable
+from webdnn.util.misc import mul
+
+
+@ReferenceExecutor.register_handler(Tensordot)
+def tensordot(op: Tensordot, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    A = op.inputs["A"]
+    B = op.inputs["B"]
+    C = op.outputs["C"]
+    axes_M = [a for a in A.order.axes if a not in op.axes[0]]
+    axes_N = [a for a in B.order.axes if a not in op.axes[1]]
+
+    a = change_order(inputs["A"], A.order, Order(axes_M + list(op.axes[0])))
+    b = change_order(inputs["B"], B.order, Order(list(op.axes[1]) + axes_N))
+    M = mul(a.shape[:len(axes_M)])
+    N = mul(b.shape[len(op.axes[1]):])
+    c = np.dot(a.reshape(M, a.size // M), b.reshape(b.size // N, N))
+    c = c.reshape(a.shape[:len(axes_M)] + b.shape[len(op.axes[1]):])
+
+    if not op.has_attribute(TensordotEpilogue):
+        return {"C": change_order(c, Order(axes_M + axes_N), C.order)}
+
+    epilogue = op.get_attribute(TensordotEpilogue)[0]
+    y = _apply_epilogue(op, epilogue, change_order(c, Order(axes_M + axes_N), epilogue.x.order), inputs)
+    return {"C": change_order(y, epilogue.y.order, C.order)}
+
+
+def _apply_epilogue(op: Tensordot, epilogue: TensordotEpilogue, x: np.ndarray, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Apply operators in the epilogue in order. Dummy input variables are bound to the arrays of corresponding real input variables
+    (:code:`epilogue_x0`, :code:`epilogue_x1`, ...).
+    """
+    arrays = {epilogue.x: x}  # type: Dict[Variable, np.ndarray]
+    for dummy, real in epilogue.dummy2real.items():
+        arrays[dummy] = inputs[op.get_input_name(real)]
+
+    for sub_op in epilogue.ops:
+        handler = ReferenceExecutor.get_handler(ReferenceExecutor.serialize_operator_type(sub_op))
+        if handler is None:
+            raise NotImplementedError(f"[{ReferenceExecutor.__name__}] Operator {sub_op} in the epilogue of {op} is not handled by any "
+                                      f"handler")
+
+        outputs = handler(sub_op, {name: arrays[v] for name, v in sub_op.inputs.items()})
+        for name, v in sub_op.outputs.items():
+            arrays[v] = np.broadcast_to(outputs[name], v.shape)
+
+    return arrays[epilogue.y]
@@ -0,0 +1,6 @@
+import numpy as np
+
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.threshold_relu import ThresholdRelu
+
+register_elementwise_kernel(ThresholdRelu, lambda op, x0: np.where(x0 > op.parameters["threshold"], x0, 0))
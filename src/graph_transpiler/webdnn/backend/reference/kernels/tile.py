@@ -0,0 +1,14 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.graph.operators.tile import Tile
+
+
+@ReferenceExecutor.register_handler(Tile)
+def tile(op: Tile, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = op.inputs["x"]
+    y = np.tile(inputs["x"], [op.parameters["multiplier"][a] for a in x.order.axes])
+
+    return {"y": y.transpose([x.order.axes_dict[a] for a in op.outputs["y"].order.axes])}
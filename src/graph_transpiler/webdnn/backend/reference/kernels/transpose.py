@@ -0,0 +1,4 @@
+from webdnn.backend.reference.kernels.elementwise import register_elementwise_kernel
+from webdnn.graph.operators.transpose import Transpose
+
+register_elementwise_kernel(Transpose, lambda op, x0: x0)
@@ -0,0 +1,17 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order, col2im
+from webdnn.graph.operators.unpooling_2d import Unpooling2D
+from webdnn.graph.order import OrderNHWC
+
+
+@ReferenceExecutor.register_handler(Unpooling2D)
+def unpooling_2d(op: Unpooling2D, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNHWC)
+    col = np.broadcast_to(x[:, :, :, None, None, :], x.shape[:3] + op.ksize + x.shape[3:])
+    y = col2im(col, op.stride, op.padding, op.parameters["outsize"])
+
+    return {"y": change_order(y, OrderNHWC, op.outputs["y"].order)}
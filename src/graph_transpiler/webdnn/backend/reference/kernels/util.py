@@ -0,0 +1,94 @@
+import numpy as np
+
+from webdnn.graph.axis import AxisKeyDict
+from webdnn.graph.order import Order
+
+
+def change_order(data: np.ndarray, order: Order, new_order: Order) -> np.ndarray:
+    """change_order(data, order, new_order)
+
+    Transpose data aligned in :code:`order` into :code:`new_order`.
+
+    Axes which are not contained in :code:`new_order` must be size 1, and they are removed. Axes which are not contained in
+    :code:`order` are inserted as size 1, and therefore the returned array can be broadcast.
+
+    Args:
+        data (np.ndarray): data
+        order (:class:`~webdnn.Order`): current order of data
+        new_order (:class:`~webdnn.Order`): new order
+
+    Returns:
+        (np.ndarray) transposed data
+    """
+    shape_dict = AxisKeyDict(order.axes, data.shape)
+    common_axes = [axis for axis in order.axes if axis in new_order.axes]
+
+    data = data.reshape([shape_dict[axis] for axis in common_axes])
+    data = np.transpose(data, [common_axes.index(axis) for axis in new_order.axes if axis in order.axes])
+    data = data.reshape([shape_dict[axis] if axis in order.axes else 1 for axis in new_order.axes])
+
+    return data
+
+
+def im2col(im: np.ndarray, ksize, stride, padding, dilation_rate=(1, 1), pad_value: float = 0, ceil_mode: bool = False) -> np.ndarray:
+    """im2col(im, ksize, stride, padding, dilation_rate=(1, 1), pad_value=0, ceil_mode=False)
+
+    Extract patches from an image aligned in OrderNHWC.
+
+    Args:
+        im (np.ndarray): image data aligned in OrderNHWC
+        ksize (tuple of int): kernel size
+        stride (tuple of int): stride size
+        padding (tuple of int): padding size
+        dilation_rate (tuple of int): dilation rate
+        pad_value (float): value filled in padding area
+        ceil_mode (bool): if True, output size is rounded up as pooling operators do
+
+    Returns:
+        (np.ndarray) patches aligned in :code:`[N, H2, W2, KH, KW, C]`
+    """
+    N, H1, W1, C = im.shape
+    KH, KW = ksize
+    SH, SW = stride
+    PH, PW = padding
+    DH, DW = dilation_rate
+    H2 = (H1 + 2 * PH - (DH * (KH - 1) + 1) + (SH - 1 if ceil_mode else 0)) // SH + 1
+    W2 = (W1 + 2 * PW - (DW * (KW - 1) + 1) + (SW - 1 if ceil_mode else 0)) // SW + 1
+
+    # Extra margin is needed for the edge which is ignored in pooling with ceil mode
+    im = np.pad(im, ((0, 0), (PH, PH + SH), (PW, PW + SW), (0, 0)), mode="constant", constant_values=pad_value)
+    col = np.empty((N, H2, W2, KH, KW, C), dtype=im.dtype)
+
+    for kh in range(KH):
+        for kw in range(KW):
+            col[:, :, :, kh, kw, :] = im[:, kh * DH:kh * DH + H2 * SH:SH, kw * DW:kw * DW + W2 * SW:SW, :]
+
+    return col
+
+
+def col2im(col: np.ndarray, stride, padding, outsize) -> np.ndarray:
+    """col2im(col, stride, padding, outsize)
+
+    Accumulate patches aligned in :code:`[N, H1, W1, KH, KW, C]` into an image aligned in OrderNHWC.
+
+    Args:
+        col (np.ndarray): patches
+        stride (tuple of int): stride size
+        padding (tuple of int): padding size
+        outsize (tuple of int): image size
+
+    Returns:
+        (np.ndarray) image data aligned in OrderNHWC
+    """
+    N, H1, W1, KH, KW, C = col.shape
+    SH, SW = stride
+    PH, PW = padding
+    H2, W2 = outsize
+
+    im = np.zeros((N, max((H1 - 1) * SH + KH, H2 + PH), max((W1 - 1) * SW + KW, W2 + PW), C), dtype=col.dtype)
+
+    for kh in range(KH):
+        for kw in range(KW):
+            im[:, kh:kh + H1 * SH:SH, kw:kw + W1 * SW:SW, :] += col[:, :, :, kh, kw, :]
+
+    return im[:, PH:PH + H2, PW:PW + W2, :]
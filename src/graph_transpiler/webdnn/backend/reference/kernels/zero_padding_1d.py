@@ -0,0 +1,16 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.zero_padding_1d import ZeroPadding1D
+from webdnn.graph.order import OrderNTC
+
+
+@ReferenceExecutor.register_handler(ZeroPadding1D)
+def zero_padding_1d(op: ZeroPadding1D, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNTC)
+    y = np.pad(x, ((0, 0), op.parameters["padding"], (0, 0)), mode="constant")
+
+    return {"y": change_order(y, OrderNTC, op.outputs["y"].order)}
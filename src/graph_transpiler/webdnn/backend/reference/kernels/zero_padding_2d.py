@@ -0,0 +1,17 @@
+from typing import Dict
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.backend.reference.kernels.util import change_order
+from webdnn.graph.operators.zero_padding_2d import ZeroPadding2D
+from webdnn.graph.order import OrderNHWC
+
+
+@ReferenceExecutor.register_handler(ZeroPadding2D)
+def zero_padding_2d(op: ZeroPadding2D, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    PH, PW = op.parameters["padding"]
+    x = change_order(inputs["x"], op.inputs["x"].order, OrderNHWC)
+    y = np.pad(x, ((0, 0), (PH, PH), (PW, PW), (0, 0)), mode="constant")
+
+    return {"y": change_order(y, OrderNHWC, op.outputs["y"].order)}
@@ -1,5 +1,4 @@
 from webdnn.backend.webassembly import generator
 from webdnn.backend.webassembly import graph_descriptor
 from webdnn.backend.webassembly import kernel
-from webdnn.backend.webassembly import kernels
 from webdnn.backend.webassembly import optimize_rules
@@ -1,12 +1,13 @@
 from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Iterable, List, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 import numpy as np
 
 from webdnn.backend.code_generator.allocator import MemoryLayout
 from webdnn.backend.interface.graph_descriptor import IGraphDescriptor
 from webdnn.backend.webassembly.kernel import Kernel
+from webdnn.encoder.weight_shard import WeightShard
 from webdnn.graph import traverse
 from webdnn.graph.placeholder import Placeholder
 from webdnn.graph.variable import Variable
@@ -66,6 +67,7 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
     footer_sources: Dict[str, str]
     required_heap: int
     licenses: Dict[str, str]
+    weight_shards: Optional[List[WeightShard]]
 
     def __init__(self,
                  kernels: List[Kernel],
@@ -74,7 +76,8 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
                  outputs: Iterable[Variable],
                  constants_encoding: str,
                  required_heap: int,
-                 licenses: Dict[str, str]):
+                 licenses: Dict[str, str],
+                 weight_shards: List[WeightShard] = None):
         self.kernels = kernels
         self.memory_layout = memory_layout
         self.inputs = inputs
@@ -84,6 +87,7 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
         self.footer_sources = OrderedDict()
         self.required_heap = required_heap
         self.licenses = licenses
+        self.weight_shards = weight_shards
 
     def generate_top_source(self):
         self.header_sources["top"] = source_header \
@@ -162,6 +166,7 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
         return {
             "converted_at": int(datetime.timestamp(datetime.now())),
             "weight_encoding": self.constants_encoding,
+            "weight_shards": self.weight_shards,
             "memory_layout": self.memory_layout,
             "placeholders": placeholders,
             "unresolved_value_lists": unresolved_value_lists,
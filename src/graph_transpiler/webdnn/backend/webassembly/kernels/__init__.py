@@ -1,48 +1,61 @@
-from webdnn.backend.webassembly.kernels import abs
-from webdnn.backend.webassembly.kernels import average_pooling_2d
-from webdnn.backend.webassembly.kernels import broadcast
-from webdnn.backend.webassembly.kernels import clipped_relu
-from webdnn.backend.webassembly.kernels import col2im
-from webdnn.backend.webassembly.kernels import concat
-from webdnn.backend.webassembly.kernels import depth2space
-from webdnn.backend.webassembly.kernels import elementwise
-from webdnn.backend.webassembly.kernels import elementwise_add
-from webdnn.backend.webassembly.kernels import elementwise_div
-from webdnn.backend.webassembly.kernels import elementwise_mul
-from webdnn.backend.webassembly.kernels import elementwise_pow
-from webdnn.backend.webassembly.kernels import elu
-from webdnn.backend.webassembly.kernels import embedding
-from webdnn.backend.webassembly.kernels import exp
-from webdnn.backend.webassembly.kernels import greater
-from webdnn.backend.webassembly.kernels import greater_equal
-from webdnn.backend.webassembly.kernels import hard_sigmoid
-from webdnn.backend.webassembly.kernels import im2col
-from webdnn.backend.webassembly.kernels import leaky_relu
-from webdnn.backend.webassembly.kernels import local_response_normalization
-from webdnn.backend.webassembly.kernels import lstm
-from webdnn.backend.webassembly.kernels import max
-from webdnn.backend.webassembly.kernels import max_pooling_2d
-from webdnn.backend.webassembly.kernels import min
-from webdnn.backend.webassembly.kernels import prod
-from webdnn.backend.webassembly.kernels import reinterpret_axis
-from webdnn.backend.webassembly.kernels import relu
-from webdnn.backend.webassembly.kernels import reshape
-from webdnn.backend.webassembly.kernels import rsqrt
-from webdnn.backend.webassembly.kernels import scalar_add
-from webdnn.backend.webassembly.kernels import scalar_mul
-from webdnn.backend.webassembly.kernels import scalar_pow
-from webdnn.backend.webassembly.kernels import select
-from webdnn.backend.webassembly.kernels import sigmoid
-from webdnn.backend.webassembly.kernels import softmax
-from webdnn.backend.webassembly.kernels import softplus
-from webdnn.backend.webassembly.kernels import softsign
-from webdnn.backend.webassembly.kernels import space2depth
-from webdnn.backend.webassembly.kernels import split_axis
-from webdnn.backend.webassembly.kernels import sum
-from webdnn.backend.webassembly.kernels import tanh
-from webdnn.backend.webassembly.kernels import tensordot
-from webdnn.backend.webassembly.kernels import threshold_relu
-from webdnn.backend.webassembly.kernels import tile
-from webdnn.backend.webassembly.kernels import transpose
-from webdnn.backend.webassembly.kernels import unpooling_2d
-from webdnn.backend.webassembly.kernels import zero_padding_1d
+"""
+Kernel handlers of WebAssembly backend.
+
+Kernel modules are not imported by this package. Each kernel module registers its handlers when it's imported, and
+:class:`~webdnn.backend.webassembly.generator.WebassemblyDescriptorGenerator` imports the module listed in :data:`MANIFEST` when
+the handler of the operator is requested at first. When a kernel module is added, register its operators in :data:`MANIFEST`.
+"""
+
+# operator type name -> kernel module name
+MANIFEST = {
+    "Abs": "abs",
+    "AveragePooling2D": "average_pooling_2d",
+    "AxiswiseBias": "elementwise_add",
+    "AxiswiseScale": "elementwise_mul",
+    "Broadcast": "broadcast",
+    "ClippedRelu": "clipped_relu",
+    "Col2Im": "col2im",
+    "Concat": "concat",
+    "Depth2Space": "depth2space",
+    "ElementwiseAdd": "elementwise_add",
+    "ElementwiseDiv": "elementwise_div",
+    "ElementwiseMul": "elementwise_mul",
+    "ElementwisePow": "elementwise_pow",
+    "Elu": "elu",
+    "Embedding": "embedding",
+    "Exp": "exp",
+    "FusedElementwise": "elementwise",
+    "Greater": "greater",
+    "GreaterEqual": "greater_equal",
+    "HardSigmoid": "hard_sigmoid",
+    "Im2Col": "im2col",
+    "LSTM": "lstm",
+    "LeakyRelu": "leaky_relu",
+    "LocalResponseNormalization": "local_response_normalization",
+    "Max": "max",
+    "MaxPooling2D": "max_pooling_2d",
+    "Min": "min",
+    "Prod": "prod",
+    "ReinterpretAxis": "reinterpret_axis",
+    "Relu": "relu",
+    "Reshape": "reshape",
+    "Rsqrt": "rsqrt",
+    "ScalarAdd": "scalar_add",
+    "ScalarMul": "scalar_mul",
+    "ScalarPow": "scalar_pow",
+    "Select": "select",
+    "Sigmoid": "sigmoid",
+    "Softmax": "softmax",
+    "Softplus": "softplus",
+    "Softsign": "softsign",
+    "Space2Depth": "space2depth",
+    "SplitAxis": "split_axis",
+    "Sum": "sum",
+    "Tanh": "tanh",
+    "Tensordot": "tensordot",
+    "ThresholdRelu": "threshold_relu",
+    "Tile": "tile",
+    "Transpose": "transpose",
+    "Unpooling2D": "unpooling_2d",
+    "ZeroPadding1D": "zero_padding_1d",
+}
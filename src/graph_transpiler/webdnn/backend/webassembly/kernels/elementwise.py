@@ -1,4 +1,4 @@
-from typing import List, Dict, Type, Union, Callable
+from typing import List, Dict, Type, Union, Callable, Optional
 
 from webdnn.backend.code_generator.allocator import MemoryLayout
 from webdnn.backend.code_generator.command_buffer import CommandBuffer
@@ -18,6 +18,10 @@ _registered_items = {}  # type: Dict[Type[Elementwise], RegisteredItem]
 @WebassemblyDescriptorGenerator.register_handler(FusedElementwise)
 def merged_elementwise_kernel(op: FusedElementwise, memory_layout: MemoryLayout) -> List[Kernel]:
     ops = traverse.listup_operators(op.sub_graph)
+    for sub_op in ops:
+        # Kernel module of each operator is loaded lazily, and it registers the item into `_registered_items`.
+        WebassemblyDescriptorGenerator.get_handler(WebassemblyDescriptorGenerator.serialize_operator_type(sub_op))
+
     builder, buffer_injector = generate_elementwise_command_buffer(ops,
                                                                    [_registered_items[op.__class__] for op in ops],
                                                                    memory_layout,
@@ -94,3 +98,16 @@ def register_elementwise_kernel(OperatorClass: Type[Elementwise],
         code=code,
         parameters={} if parameters is None else parameters
     )
+
+
+def get_registered_item(op: Elementwise) -> Optional[RegisteredItem]:
+    """get_registered_item(op)
+
+    Get the item registered by :func:`register_elementwise_kernel`. The kernel module of the operator is loaded lazily if needed.
+
+    Returns:
+        (:class:`~webdnn.backend.code_generator.templates.elementwise.RegisteredItem`, optional) registered item, or :code:`None`
+        if the operator is not registered as elementwise kernel
+    """
+    WebassemblyDescriptorGenerator.get_handler(WebassemblyDescriptorGenerator.serialize_operator_type(op))
+    return _registered_items.get(op.__class__, None)
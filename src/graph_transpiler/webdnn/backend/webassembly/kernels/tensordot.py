@@ -1,17 +1,217 @@
-from typing import List
+from typing import Callable, List, Tuple, Union
 
 from webdnn.backend.code_generator.allocator import MemoryLayout
 from webdnn.backend.code_generator.injectors.buffer_injector import BufferInjector
 from webdnn.backend.code_generator.injectors.kernel_name_injector import KernelNameInjector
+from webdnn.backend.code_generator.templates.tensordot_epilogue import epilogue_input_index, generate_epilogue
 from webdnn.backend.webassembly.generator import WebassemblyDescriptorGenerator
 from webdnn.backend.webassembly.kernel import Kernel
+from webdnn.backend.webassembly.kernels.elementwise import get_registered_item
 from webdnn.backend.webassembly.optimize_rules.use_eigen import UseEigenAttribute
+from webdnn.graph.operators.attributes.tensordot_epilogue import TensordotEpilogue
 from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.placeholder import Placeholder
 from webdnn.util.misc import mul
 
 
-def generate_template(transpose_A, transpose_B):
-    return """
+# Register-blocked micro kernel size. Accumulator of MR x NR elements is kept in registers, and the innermost loop over NR
+# elements is auto-vectorized.
+MR = 4
+NR = 8
+
+# Max size of cache blocks. Packed panel of A (MC x KC) is expected to fit in L2 cache, and micro panel of B (KC x NR) in L1
+# cache.
+MC_MAX = 128
+NC_MAX = 256
+KC_MAX = 256
+
+# Shared part of packed sgemm. It's included only once in the generated source even if it's used by multiple kernels.
+sgemm_packed_header = """
+#ifndef INCLUDE_WEBDNN_SGEMM_PACKED
+#define INCLUDE_WEBDNN_SGEMM_PACKED
+
+#define WEBDNN_SGEMM_MR %%MR%%
+#define WEBDNN_SGEMM_NR %%NR%%
+#define WEBDNN_SGEMM_MC_MAX %%MC_MAX%%
+#define WEBDNN_SGEMM_NC_MAX %%NC_MAX%%
+#define WEBDNN_SGEMM_KC_MAX %%KC_MAX%%
+
+static float webdnn_sgemm_packed_a[WEBDNN_SGEMM_MC_MAX * WEBDNN_SGEMM_KC_MAX];
+static float webdnn_sgemm_packed_b[WEBDNN_SGEMM_NC_MAX * WEBDNN_SGEMM_KC_MAX];
+
+// Pack rows [i0, i0+mc) and columns [p0, p0+kc) of A into micro-panels of MR rows. Each micro-panel is stored as kc x MR
+// contiguous block, and rows out of range are filled with zero.
+static void webdnn_sgemm_pack_a(const float *A, int stride_m, int stride_k, int i0, int mc, int p0, int kc, float *packed)
+{
+    for (int ir = 0; ir < mc; ir += WEBDNN_SGEMM_MR) {
+        for (int ii = 0; ii < WEBDNN_SGEMM_MR; ii++) {
+            float *dst = packed + ir * kc + ii;
+            if (ir + ii < mc) {
+                const float *src = A + (i0 + ir + ii) * stride_m + p0 * stride_k;
+                for (int p = 0; p < kc; p++) dst[p * WEBDNN_SGEMM_MR] = src[p * stride_k];
+            } else {
+                for (int p = 0; p < kc; p++) dst[p * WEBDNN_SGEMM_MR] = 0.0f;
+            }
+        }
+    }
+}
+
+// Pack rows [j0, j0+nc) and columns [p0, p0+kc) of B (stored as N x K) into micro-panels of NR columns.
+static void webdnn_sgemm_pack_b(const float *B, int stride_n, int stride_k, int j0, int nc, int p0, int kc, float *packed)
+{
+    for (int jr = 0; jr < nc; jr += WEBDNN_SGEMM_NR) {
+        for (int jj = 0; jj < WEBDNN_SGEMM_NR; jj++) {
+            float *dst = packed + jr * kc + jj;
+            if (jr + jj < nc) {
+                const float *src = B + (j0 + jr + jj) * stride_n + p0 * stride_k;
+                for (int p = 0; p < kc; p++) dst[p * WEBDNN_SGEMM_NR] = src[p * stride_k];
+            } else {
+                for (int p = 0; p < kc; p++) dst[p * WEBDNN_SGEMM_NR] = 0.0f;
+            }
+        }
+    }
+}
+
+// C[0:mr, 0:nr] (+)= a * b, where a is kc x MR micro-panel and b is kc x NR micro-panel.
+// Loop bounds are compile-time constants, so that the accumulator is kept in registers and the inner loop is vectorized.
+static inline void webdnn_sgemm_micro_kernel(int kc, const float *a, const float *b, float *C, int ldc, int mr, int nr, int accumulate)
+{
+    float acc[WEBDNN_SGEMM_MR][WEBDNN_SGEMM_NR];
+    for (int i = 0; i < WEBDNN_SGEMM_MR; i++) {
+        for (int j = 0; j < WEBDNN_SGEMM_NR; j++) acc[i][j] = 0.0f;
+    }
+
+    for (int p = 0; p < kc; p++) {
+        for (int i = 0; i < WEBDNN_SGEMM_MR; i++) {
+            const float a_i = a[i];
+            for (int j = 0; j < WEBDNN_SGEMM_NR; j++) acc[i][j] += a_i * b[j];
+        }
+        a += WEBDNN_SGEMM_MR;
+        b += WEBDNN_SGEMM_NR;
+    }
+
+    for (int i = 0; i < mr; i++) {
+        float *c = C + i * ldc;
+        if (accumulate) {
+            for (int j = 0; j < nr; j++) c[j] += acc[i][j];
+        } else {
+            for (int j = 0; j < nr; j++) c[j] = acc[i][j];
+        }
+    }
+}
+
+// Function applied to the block C[i0:i0+mc, j0:j0+nc] in place after it's computed completely.
+typedef void (*webdnn_sgemm_epilogue_t)(float *C, int ldc, int i0, int j0, int mc, int nc, const int *meta_buffer);
+
+// C(M x N, row-major) = A(M x K) * B(N x K)^T
+// If epilogue is not null, it's applied to each cache block while the block is still in cache.
+static void webdnn_sgemm_packed(const float *A, int a_stride_m, int a_stride_k,
+                                const float *B, int b_stride_n, int b_stride_k,
+                                float *C, int M, int N, int K, int mc, int nc, int kc,
+                                webdnn_sgemm_epilogue_t epilogue, const int *meta_buffer)
+{
+    if (K == 0) {
+        for (int i = 0; i < M * N; i++) C[i] = 0.0f;
+        if (epilogue) epilogue(C, N, 0, 0, M, N, meta_buffer);
+        return;
+    }
+
+    for (int jc = 0; jc < N; jc += nc) {
+        const int nc_cur = N - jc < nc ? N - jc : nc;
+
+        for (int pc = 0; pc < K; pc += kc) {
+            const int kc_cur = K - pc < kc ? K - pc : kc;
+            webdnn_sgemm_pack_b(B, b_stride_n, b_stride_k, jc, nc_cur, pc, kc_cur, webdnn_sgemm_packed_b);
+
+            for (int ic = 0; ic < M; ic += mc) {
+                const int mc_cur = M - ic < mc ? M - ic : mc;
+                webdnn_sgemm_pack_a(A, a_stride_m, a_stride_k, ic, mc_cur, pc, kc_cur, webdnn_sgemm_packed_a);
+
+                for (int jr = 0; jr < nc_cur; jr += WEBDNN_SGEMM_NR) {
+                    const int nr = nc_cur - jr < WEBDNN_SGEMM_NR ? nc_cur - jr : WEBDNN_SGEMM_NR;
+
+                    for (int ir = 0; ir < mc_cur; ir += WEBDNN_SGEMM_MR) {
+                        const int mr = mc_cur - ir < WEBDNN_SGEMM_MR ? mc_cur - ir : WEBDNN_SGEMM_MR;
+                        webdnn_sgemm_micro_kernel(kc_cur, webdnn_sgemm_packed_a + ir * kc_cur, webdnn_sgemm_packed_b + jr * kc_cur,
+                                                  C + (ic + ir) * N + jc + jr, N, mr, nr, pc > 0);
+                    }
+                }
+
+                if (epilogue && pc + kc_cur == K) epilogue(C, N, ic, jc, mc_cur, nc_cur, meta_buffer);
+            }
+        }
+    }
+}
+
+#endif
+""" \
+    .replace("%%MR%%", str(MR)) \
+    .replace("%%NR%%", str(NR)) \
+    .replace("%%MC_MAX%%", str(MC_MAX)) \
+    .replace("%%NC_MAX%%", str(NC_MAX)) \
+    .replace("%%KC_MAX%%", str(KC_MAX))
+
+
+def _block_size(size: Union[int, Placeholder], max_size: int, unit: int) -> int:
+    if not Placeholder.check_resolved(size):
+        return max_size
+
+    # Split into blocks of (almost) same size, instead of [max_size, max_size, ..., remainder].
+    size = int(size)
+    num_blocks = max((size + max_size - 1) // max_size, 1)
+    block_size = (size + num_blocks - 1) // num_blocks
+    return min(((block_size + unit - 1) // unit) * unit, max_size)
+
+
+def select_block_size(M: Union[int, Placeholder], N: Union[int, Placeholder], K: Union[int, Placeholder]) -> Tuple[int, int, int]:
+    """select_block_size(M, N, K)
+
+    Select cache block sizes of packed sgemm. If size is unresolved placeholder, the max block size is used.
+
+    Returns:
+        (tuple of int) block sizes :code:`(MC, NC, KC)`
+    """
+    return _block_size(M, MC_MAX, MR), _block_size(N, NC_MAX, NR), _block_size(K, KC_MAX, 1)
+
+
+_epilogue_template = """
+static void %%FUNC_NAME%%_epilogue(float *C, int ldc, int i0, int j0, int mc, int nc, const int * %%META_BUFFER%%)
+{
+    const int N = ldc;
+
+    for (int m = i0; m < i0 + mc; m++) {
+        for (int n = j0; n < j0 + nc; n++) {
+            float v = C[m * N + n];
+%%EPILOGUE%%
+            C[m * N + n] = v;
+        }
+    }
+}
+"""
+
+
+def generate_epilogue_template(epilogue: Callable[[str, str, str], str] = None):
+    """generate_epilogue_template(epilogue=None)
+
+    Generate the function which applies the epilogue to the block of C, named :code:`%%FUNC_NAME%%_epilogue`.
+
+    Args:
+        epilogue (callable, optional): function which returns the code to apply the epilogue to the element in place, from names of
+            the float variable, row index and column index. If :code:`None`, empty string is returned.
+
+    Returns:
+        (str) source code, and (str) expression of the function pointer passed to :code:`webdnn_sgemm_packed`
+    """
+    if epilogue is None:
+        return "", "0"
+
+    return _epilogue_template.replace("%%EPILOGUE%%", epilogue("v", "m", "n")), "%%FUNC_NAME%%_epilogue"
+
+
+def generate_template(transpose_A, transpose_B, block_size: Tuple[int, int, int], epilogue: Callable[[str, str, str], str] = None):
+    mc, nc, kc = block_size
+    epilogue_source, epilogue_func = generate_epilogue_template(epilogue)
+    return sgemm_packed_header + epilogue_source + """
 void %%FUNC_NAME%%(const int * %%META_BUFFER%%)
 {
     float *A = %%LOAD_BUFFER(sgemm_A)%%;
@@ -27,32 +227,30 @@ void %%FUNC_NAME%%(const int * %%META_BUFFER%%)
     const int b_stride_k = %%B_STRIDE_K%%;
     const int b_stride_mn = %%B_STRIDE_MN%%;
 
-    for (int i = 0; i < M; i++) {
-        for (int j = 0; j < N; j++) {
-            float sum = 0.0;
-            for (int s = 0; s < K; s++) {
-                sum += A[i * a_stride_mn + s * a_stride_k] * B[j * b_stride_mn + s * b_stride_k];
-            }
-            C[i * N + j * 1] = sum;
-        }
-    }
+    webdnn_sgemm_packed(A, a_stride_mn, a_stride_k, B, b_stride_mn, b_stride_k, C, M, N, K, %%MC%%, %%NC%%, %%KC%%,
+                        %%EPILOGUE_FUNC%%, %%META_BUFFER%%);
 }
 """ \
+        .replace("%%EPILOGUE_FUNC%%", epilogue_func) \
         .replace("%%A_STRIDE_K%%", "1" if transpose_A else "M") \
         .replace("%%B_STRIDE_K%%", "N" if transpose_B else "1") \
         .replace("%%A_STRIDE_MN%%", "K" if transpose_A else "1") \
-        .replace("%%B_STRIDE_MN%%", "1" if transpose_B else "K")
+        .replace("%%B_STRIDE_MN%%", "1" if transpose_B else "K") \
+        .replace("%%MC%%", str(mc)) \
+        .replace("%%NC%%", str(nc)) \
+        .replace("%%KC%%", str(kc))
 
 
 # sgemm using eigen
 
-def generate_template_eigen(transpose_A, transpose_B):
+def generate_template_eigen(transpose_A, transpose_B, epilogue: Callable[[str, str, str], str] = None):
+    epilogue_source, epilogue_func = generate_epilogue_template(epilogue)
     return """
 #ifndef INCLUDE_EIGEN
 #define INCLUDE_EIGEN
 #include <Eigen/Dense>
 #endif
-
+""" + epilogue_source + """
 void %%FUNC_NAME%%(const int * %%META_BUFFER%%)
 {
     float *A = %%LOAD_BUFFER(sgemm_A)%%;
@@ -64,8 +262,10 @@ void %%FUNC_NAME%%(const int * %%META_BUFFER%%)
     Eigen::Map<Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor> > c_mat(C, %%LOAD_BUFFER(sgemm_M)%%, %%LOAD_BUFFER(sgemm_N)%%);
 
     c_mat.noalias() = a_mat * b_mat;
-}
+%%EPILOGUE_CALL%%}
 """ \
+        .replace("%%EPILOGUE_CALL%%", "" if epilogue is None else
+                 f"    {epilogue_func}(C, %%LOAD_BUFFER(sgemm_N)%%, 0, 0, %%LOAD_BUFFER(sgemm_M)%%, %%LOAD_BUFFER(sgemm_N)%%, %%META_BUFFER%%);\n") \
         .replace("%%A_MAJOR%%", "RowMajor" if transpose_A else "ColMajor") \
         .replace("%%B_MAJOR%%", "RowMajor" if transpose_B else "ColMajor")
 
@@ -100,8 +300,23 @@ def tensordot(op: Tensordot, memory_layout: MemoryLayout) -> List[Kernel]:
         "sgemm_K": K
     })
 
+    epilogue = None
+    if op.has_attribute(TensordotEpilogue):
+        attr = op.get_attribute(TensordotEpilogue)[0]  # type: TensordotEpilogue
+        items = [get_registered_item(sub_op) for sub_op in attr.ops]
+        for name, x in op.inputs.items():
+            if name.startswith("epilogue_"):
+                buffer_injector.register({name: memory_layout[x]})
+
+        def epilogue(value: str, m: str, n: str):
+            def load(x):
+                index = epilogue_input_index(attr, x, f"{m} * N + {n}", lambda i, size: f"({i}) % {size}")
+                return [f"(%%LOAD_BUFFER({op.get_input_name(x)})%%)[{index}]"]
+
+            return "".join(generate_epilogue(attr, items, value, load, indent=" " * 12)).rstrip("\n")
+
     if op.has_attribute(UseEigenAttribute):
-        source = generate_template_eigen(True, False)
+        source = generate_template_eigen(True, False, epilogue)
         buffer_injector.register({
             "sgemm_A": memory_layout[A],
             "sgemm_B": memory_layout[B],
@@ -109,15 +324,7 @@ def tensordot(op: Tensordot, memory_layout: MemoryLayout) -> List[Kernel]:
         })
 
     else:
-        source = generate_template(True, False)
-        buffer_injector.register({
-            "sgemm_A": memory_layout[A],
-            "sgemm_B": memory_layout[B],
-            "sgemm_C": memory_layout[C],
-            "sgemm_M": op.M,
-            "sgemm_N": op.N,
-            "sgemm_K": op.K
-        })
+        source = generate_template(True, False, select_block_size(M, N, K), epilogue)
 
     name_injector = KernelNameInjector(op)
 
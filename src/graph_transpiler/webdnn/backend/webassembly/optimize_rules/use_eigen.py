@@ -5,6 +5,7 @@ from webdnn.graph.attribute import Attribute
 from webdnn.graph.graph import Graph
 from webdnn.graph.operators.tensordot import Tensordot
 from webdnn.graph.optimize_rule import OptimizeRule
+from webdnn.util import flags
 
 EIGEN_LICENSE = "(C) Eigen authors, MPL 2.0 License"
 
@@ -14,12 +15,18 @@ class UseEigenAttribute(Attribute[Tensordot]):
 
 
 class UseEigen(OptimizeRule):
+    def flags(self):
+        return [
+            flags.optimize.WEBASSEMBLY_USE_EIGEN
+        ]
+
     def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
         flag_changed = False
         for op in traverse.filter_nodes(traverse.listup_operators(graph), Tensordot):  # type: Tensordot
 
             if not op.has_attribute(UseEigenAttribute):
                 op.attributes.add(UseEigenAttribute(op))
+                op.mark_modified()
                 flag_changed = True
                 graph.licenses["eigen"] = EIGEN_LICENSE
 
@@ -1,9 +1,11 @@
 from webdnn.backend.webassembly.optimize_rules.insert_transpose import InsertTranspose
 from webdnn.backend.webassembly.optimize_rules.use_eigen import UseEigen
+from webdnn.graph.operators.elementwise import Elementwise
 from webdnn.graph.optimize_rule import OptimizeRuleGroup
 from webdnn.optimizer.sub_rules.constant_folding import ConstantFolding
 from webdnn.optimizer.sub_rules.dump_graph import DumpGraph
 from webdnn.optimizer.sub_rules.elementwise_kernel_fusion import ElementwiseKernelFusion
+from webdnn.optimizer.sub_rules.fuse_tensordot_epilogue import FuseTensordotEpilogue
 from webdnn.optimizer.sub_rules.merge_tensordot_and_elementwise_mul import MergeTensordotAndElementwiseMul
 from webdnn.optimizer.sub_rules.replace_convolution_by_im2col import ReplaceConvolutionByIm2Col
 from webdnn.optimizer.sub_rules.replace_deconvolution_by_col2im import ReplaceDeconvolutionByCol2Im
@@ -12,6 +14,12 @@ from webdnn.optimizer.sub_rules.update_inplace_attribute import UpdateInplaceAtt
 from webdnn.util import flags
 
 
+def _is_supported_in_epilogue(op: Elementwise) -> bool:
+    # kernel modules depend on the generator, which imports this module
+    from webdnn.backend.webassembly.kernels.elementwise import get_registered_item
+    return get_registered_item(op) is not None
+
+
 class WebassemblyOptimizeRule(OptimizeRuleGroup):
     def __init__(self):
         sub_rules = [
@@ -25,6 +33,7 @@ class WebassemblyOptimizeRule(OptimizeRuleGroup):
                 UseEigen(),
                 UpdateInplaceAttribute()
             ]),
+            FuseTensordotEpilogue(_is_supported_in_epilogue),
             ElementwiseKernelFusion()
         ]
 
@@ -1,8 +1,6 @@
 from typing import Dict, List, Set, Union
 
-import numpy as np
-
-from webdnn.backend.code_generator.allocator import MemoryLayout, Allocation, BufferType
+from webdnn.backend.code_generator.allocator import MemoryLayout, Allocation, BufferType, pack_constants
 from webdnn.backend.webgl.attributes.channel_mode import ChannelMode, ChannelModeEnum
 from webdnn.backend.webgl.attributes.texture_shape import TextureShape
 from webdnn.graph import traverse
@@ -238,16 +236,13 @@ def _update_offset(allocations: WebGLAllocationDict):
 
         else:
             allocation.offset = dynamic_offset
-            dynamic_offset += _align(dynamic_offset + allocation.size)
+            dynamic_offset = _align(dynamic_offset + allocation.size)
 
 
 def _update_constant_offset(allocations: WebGLAllocationDict):
     offset = 0
-    data = []
-
     for v, a in allocations.items():  # type: ConstantVariable, WebGLAllocation
-        data.append(v.data.flatten())
         a.offset = offset
         offset = _align(offset + v.size)
 
-    return np.concatenate(data) if len(data) > 0 else np.empty((0,))
+    return pack_constants(allocations, offset)
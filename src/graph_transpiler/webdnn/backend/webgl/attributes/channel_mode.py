@@ -35,6 +35,8 @@ class ChannelMode(Attribute[Variable]):
         else:
             base.attributes.add(ChannelMode(base, mode=mode))
 
+        base.mark_modified()
+
     @staticmethod
     def get(base: Variable):
         return base.get_attribute(ChannelMode)[0].mode if base.has_attribute(ChannelMode) else ChannelModeEnum.R
@@ -4,10 +4,15 @@ from webdnn.util import config
 
 
 class TextureShape(Attribute[Variable]):
-    def __init__(self, base: Variable):
+    """
+    Texture shape of the variable. If the shape is not specified explicitly, it's computed from the variable size and the max texture
+    size given by :code:`max_texture_size` or :func:`~webdnn.util.config.get_webgl_max_texture_size`.
+    """
+
+    def __init__(self, base: Variable, max_texture_size: int = None):
         if base.has_attribute(TextureShape):
             raise ValueError(f"\'TextureShape\' attribute has been already registered to {base}.")
-        MAX_TEXTURE_SIZE = config.WEBGL_MAX_TEXTURE_SIZE
+        MAX_TEXTURE_SIZE = config.get_webgl_max_texture_size() if max_texture_size is None else max_texture_size
         super(TextureShape, self).__init__(base)
         spacial_size = base.size
         self.width = MAX_TEXTURE_SIZE if spacial_size > MAX_TEXTURE_SIZE else spacial_size  # type: int
@@ -26,6 +31,7 @@ class TextureShape(Attribute[Variable]):
 
         attribute.width = width
         attribute.height = height
+        base.mark_modified()
 
     @staticmethod
     def get(base: Variable):
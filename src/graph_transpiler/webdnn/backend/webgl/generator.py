@@ -1,24 +1,27 @@
-import copy
+import multiprocessing
 import os
-import os.path as path
-from typing import List, Dict, Tuple
+import traceback
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Any, Optional, Union
 
-from webdnn.backend.interface.generator import DescriptorGenerator
+from webdnn.backend.interface.generator import DescriptorGenerator, get_name_counters, set_name_counters
 from webdnn.backend.interface.graph_descriptor import IGraphExecutionData
+from webdnn.backend.webgl import kernels
 from webdnn.backend.webgl.allocator import allocate
 from webdnn.backend.webgl.graph_descriptor import GraphDescriptor
 from webdnn.backend.webgl.kernel import Kernel
-from webdnn.backend.webgl.optimize_rules.webgl_optimize_rule import WebGLOptimizeRule
+from webdnn.backend.webgl.optimize_rules.webgl_optimize_rule import WebGLOptimizeRule, \
+    WebGLTextureSizeIndependentOptimizeRule
 from webdnn.encoder.constant_encoder import ConstantEncoder
-from webdnn.graph import traverse
+from webdnn.encoder import weight_shard
+from webdnn.graph import pickler, traverse
 from webdnn.graph.graph import Graph
 from webdnn.graph.variables.constant_variable import ConstantVariable
-from webdnn.util import config, flags
-from webdnn.util.json import json
+from webdnn.util import config, flags, profiler
 
 
 class GraphExecutionData(IGraphExecutionData[Kernel]):
-    def __init__(self, graph: Graph, data_dict: Dict[int, Tuple[GraphDescriptor, bytes]]):
+    def __init__(self, graph: Graph, data_dict: Dict[int, Tuple[GraphDescriptor, Optional[weight_shard.EncodedConstants]]]):
         self.graph = graph
         self.data_dict = data_dict
         self.backend_suffix = "webgl"
@@ -26,50 +29,53 @@ class GraphExecutionData(IGraphExecutionData[Kernel]):
     def save(self, dirname: str):
         os.makedirs(dirname, exist_ok=True)
 
-        for max_texture_size, (descriptor, constant_bytes) in self.data_dict.items():
-            with open(path.join(dirname, f"graph_{self.backend_suffix}_{max_texture_size}.json"), "w") as f:
-                json.dump(descriptor, f, indent=2)
+        for max_texture_size, (descriptor, constants) in self.data_dict.items():
+            self.save_descriptor(dirname, descriptor, f"graph_{self.backend_suffix}_{max_texture_size}")
+            weight_shard.write_constants(dirname, f"weight_{self.backend_suffix}_{max_texture_size}.bin", constants,
+                                         descriptor.weight_shards)
 
-            with open(path.join(dirname, f"weight_{self.backend_suffix}_{max_texture_size}.bin"), "wb") as f:
-                f.write(constant_bytes)
+        self.save_profile(dirname)
 
 
 class WebGLDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData]):
     @classmethod
     def generate(cls, graph: Graph, **kwargs):
-        data_dict = {}  # type: Dict[int, Tuple[GraphDescriptor, bytes]]
+        """generate(graph, max_texture_sizes=(4096, 8192, 16384), parallel_texture_sizes=False, **kwargs)
 
-        original_graph = graph
-        for max_texture_size in [4096, 8192, 16384]:
-            config.WEBGL_MAX_TEXTURE_SIZE = max_texture_size
-            graph, _ = WebGLOptimizeRule().optimize(copy.deepcopy(original_graph))
-            if flags.DEBUG:
-                traverse.dump(graph)
+        Generate graph descriptors for each max texture size.
 
-            memory_layout = allocate(graph)
+        Optimize rules which don't depend on max texture size are applied only once, and the result graph is shared by all max
+        texture sizes (see :class:`~webdnn.backend.webgl.optimize_rules.webgl_optimize_rule.WebGLTextureSizeIndependentOptimizeRule`).
+
+        By default, the rest of generation is performed serially. If :code:`parallel_texture_sizes` is :code:`True`, it is
+        performed in parallel by a process pool, one process for each max texture size. The graph is pickled and sent to each
+        process, so it's worth only for large graphs. Generated descriptors are same whether they are generated serially or in
+        parallel.
+        """
+        max_texture_sizes = list(kwargs.pop("max_texture_sizes", [4096, 8192, 16384]))
+        parallel = kwargs.pop("parallel_texture_sizes", False)
+
+        with profiler.phase("backend_optimize"):
+            graph, _ = WebGLTextureSizeIndependentOptimizeRule().optimize(graph)
+
+        # Each max texture size starts from same name counters
+        name_counters = get_name_counters()
+
+        if parallel and len(max_texture_sizes) > 1 and not multiprocessing.current_process().daemon:
+            results = _generate_in_parallel(graph, name_counters, max_texture_sizes, kwargs)
 
-            constants_map = {}
-            for constant in traverse.filter_nodes(traverse.listup_nodes(graph), ConstantVariable):  # type: ConstantVariable
-                constants_map[constant.name] = {
-                    "byte_offset": memory_layout[constant].offset * 4,
-                    "size": constant.size
-                }
-
-            constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None))
-            constants_bytes = constant_encoder.encode(memory_layout)
-
-            kernels = cls.generate_kernels(graph)
-
-            descriptor = GraphDescriptor(
-                kernels=kernels,
-                memory_layout=memory_layout,
-                inputs=graph.inputs,
-                outputs=graph.outputs,
-                constants_encoding=constant_encoder.name,
-                constants_map=constants_map,
-                licenses=graph.licenses
-            )
-            data_dict[max_texture_size] = (descriptor, constants_bytes)
+        else:
+            results = []
+            for max_texture_size in max_texture_sizes:
+                set_name_counters(name_counters)
+                results.append(_generate_for_texture_size(graph.clone(), max_texture_size, **kwargs))
+
+            set_name_counters(name_counters)
+
+        data_dict = OrderedDict()  # type: Dict[int, Tuple[GraphDescriptor, Optional[weight_shard.EncodedConstants]]]
+        for max_texture_size, (result_graph, descriptor, constants) in zip(max_texture_sizes, results):
+            data_dict[max_texture_size] = (descriptor, constants)
+            graph = result_graph
 
         return GraphExecutionData(graph, data_dict)
 
@@ -80,13 +86,108 @@ class WebGLDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData]):
 
         for op in traverse.listup_operators(graph):
             key = cls.serialize_operator_type(op)
-            if key not in cls._handler_map[cls.__name__]:
+            handler = cls.get_handler(key)
+            if handler is None:
                 raise NotImplementedError(f"[{cls.__name__}] Operator {op} is not handled by any generator handler")
 
-            kernels += cls._handler_map[cls.__name__][key](op)
+            kernels += handler(op)
 
         return kernels
 
 
+def _generate_for_texture_size(graph: Graph, max_texture_size: int,
+                               **kwargs) -> Tuple[Graph, GraphDescriptor, Optional[weight_shard.EncodedConstants]]:
+    with config.webgl_max_texture_size(max_texture_size):
+        with profiler.phase("backend_optimize"):
+            graph, _ = WebGLOptimizeRule(max_texture_size).optimize(graph)
+
+        if flags.DEBUG:
+            traverse.dump(graph)
+
+        with profiler.phase("allocate"):
+            memory_layout = allocate(graph)
+
+        constants_map = {}
+        for constant in traverse.filter_nodes(traverse.listup_nodes(graph), ConstantVariable):  # type: ConstantVariable
+            constants_map[constant.name] = {
+                "byte_offset": memory_layout[constant].offset * 4,
+                "size": constant.size
+            }
+
+        constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None),
+                                                       **kwargs.get("constant_encoder_options", {}))
+        with profiler.phase("encode_constants"):
+            constants, weight_shards = weight_shard.encode_constants(constant_encoder, graph, memory_layout,
+                                                                     kwargs.get("weight_shard_size", flags.WEIGHT_SHARD_SIZE),
+                                                                     f"weight_webgl_{max_texture_size}_{{}}.bin")
+
+        with profiler.phase("generate_kernels"):
+            kernels = WebGLDescriptorGenerator.generate_kernels(graph)
+
+        descriptor = GraphDescriptor(
+            kernels=kernels,
+            memory_layout=memory_layout,
+            inputs=graph.inputs,
+            outputs=graph.outputs,
+            constants_encoding=constant_encoder.name,
+            constants_map=constants_map,
+            licenses=graph.licenses,
+            weight_shards=weight_shards
+        )
+
+    return graph, descriptor, constants
+
+
+def _generate_in_parallel(graph: Graph, name_counters, max_texture_sizes: List[int], kwargs: Dict[str, Any]):
+    payload = pickler.dumps((graph, name_counters, profiler.is_enabled()))
+    with multiprocessing.Pool(len(max_texture_sizes), initializer=_initialize_worker, initargs=(payload,)) as pool:
+        worker_results = pool.map(_generate_in_worker, [(size, kwargs) for size in max_texture_sizes], chunksize=1)
+
+    results = []
+    for max_texture_size, (succeeded, data) in zip(max_texture_sizes, worker_results):
+        if not succeeded:
+            raise RuntimeError(f"Failed generating WebGL descriptor for max texture size {max_texture_size} in worker process:\n{data}")
+
+        result, worker_profile = pickler.loads(data)
+        if worker_profile is not None:
+            profiler.record_profile(worker_profile)
+
+        results.append(result)
+
+    return results
+
+
+_worker_payload = None  # type: Tuple[Graph, tuple, bool]
+
+
+def _initialize_worker(payload: bytes):
+    global _worker_payload
+    _worker_payload = pickler.loads(payload)
+
+
+def _generate_in_worker(args: Tuple[int, Dict[str, Any]]) -> Tuple[bool, Union[bytes, str]]:
+    max_texture_size, kwargs = args
+    graph, name_counters, profile_enabled = _worker_payload
+
+    set_name_counters(name_counters)
+
+    try:
+        if profile_enabled:
+            with profiler.profile() as p:
+                result = _generate_for_texture_size(graph.clone(), max_texture_size, **kwargs)
+
+        else:
+            p = None
+            result = _generate_for_texture_size(graph.clone(), max_texture_size, **kwargs)
+
+        return True, pickler.dumps((result, p))
+
+    except Exception:
+        return False, traceback.format_exc()
+
+
+WebGLDescriptorGenerator.register_handler_manifest(kernels.__name__, kernels.MANIFEST)
+
+
 def generate(graph: Graph, **kwargs):
     return WebGLDescriptorGenerator.generate(graph, **kwargs)
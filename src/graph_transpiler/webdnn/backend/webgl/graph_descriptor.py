@@ -1,10 +1,11 @@
 from collections import OrderedDict
 from datetime import datetime
-from typing import Iterable, Dict, Any
+from typing import Iterable, Dict, Any, List
 
 from webdnn.backend.interface.graph_descriptor import IGraphDescriptor
 from webdnn.backend.webgl.allocator import WebGLMemoryLayout
 from webdnn.backend.webgl.kernel import Kernel
+from webdnn.encoder.weight_shard import WeightShard
 from webdnn.graph import traverse
 from webdnn.graph.variable import Variable
 from webdnn.graph.variables.attributes.constant import Constant
@@ -19,7 +20,8 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
                  outputs: Iterable[Variable],
                  constants_encoding: str,
                  constants_map: Any,
-                 licenses: Dict[str, str]):
+                 licenses: Dict[str, str],
+                 weight_shards: List[WeightShard] = None):
         self.kernels = kernels
         self.memory_layout = memory_layout
         self.inputs = inputs
@@ -27,6 +29,7 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
         self.constants_encoding = constants_encoding
         self.constants_map = constants_map
         self.licenses = licenses
+        self.weight_shards = weight_shards
 
     def concat_kernel_sources(self):
         func_sources = OrderedDict()
@@ -56,6 +59,7 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
             "outputs": [v.parameters["name"] for v in self.outputs],
             "memory_layout": self.memory_layout,
             "weight_encoding": self.constants_encoding,
+            "weight_shards": self.weight_shards,
             "placeholders": placeholders,
 
             "shader_sources": self.concat_kernel_sources(),
@@ -1,48 +1,56 @@
-from webdnn.backend.webgl.kernels import abs
-from webdnn.backend.webgl.kernels import average_pooling_2d
-from webdnn.backend.webgl.kernels import broadcast
-from webdnn.backend.webgl.kernels import clipped_relu
-from webdnn.backend.webgl.kernels import col2im
-from webdnn.backend.webgl.kernels import concat
-from webdnn.backend.webgl.kernels import convert_r_to_rgba
-from webdnn.backend.webgl.kernels import convert_rgba_to_r
-from webdnn.backend.webgl.kernels import depth2space
-from webdnn.backend.webgl.kernels import elementwise
-from webdnn.backend.webgl.kernels import elementwise_add
-from webdnn.backend.webgl.kernels import elementwise_div
-from webdnn.backend.webgl.kernels import elementwise_mul
-from webdnn.backend.webgl.kernels import elementwise_pow
-from webdnn.backend.webgl.kernels import elu
-from webdnn.backend.webgl.kernels import exp
-from webdnn.backend.webgl.kernels import greater
-from webdnn.backend.webgl.kernels import greater_equal
-from webdnn.backend.webgl.kernels import hard_sigmoid
-from webdnn.backend.webgl.kernels import im2col
-from webdnn.backend.webgl.kernels import leaky_relu
-from webdnn.backend.webgl.kernels import max
-from webdnn.backend.webgl.kernels import max_pooling_2d
-from webdnn.backend.webgl.kernels import min
-from webdnn.backend.webgl.kernels import partial_im2col
-from webdnn.backend.webgl.kernels import prod
-from webdnn.backend.webgl.kernels import reduce
-from webdnn.backend.webgl.kernels import reinterpret_axis
-from webdnn.backend.webgl.kernels import relu
-from webdnn.backend.webgl.kernels import reshape
-from webdnn.backend.webgl.kernels import rsqrt
-from webdnn.backend.webgl.kernels import scalar_add
-from webdnn.backend.webgl.kernels import scalar_mul
-from webdnn.backend.webgl.kernels import scalar_pow
-from webdnn.backend.webgl.kernels import select
-from webdnn.backend.webgl.kernels import sigmoid
-from webdnn.backend.webgl.kernels import softplus
-from webdnn.backend.webgl.kernels import softsign
-from webdnn.backend.webgl.kernels import space2depth
-from webdnn.backend.webgl.kernels import split_axis
-from webdnn.backend.webgl.kernels import sum
-from webdnn.backend.webgl.kernels import tanh
-from webdnn.backend.webgl.kernels import tensordot
-from webdnn.backend.webgl.kernels import threshold_relu
-from webdnn.backend.webgl.kernels import tile
-from webdnn.backend.webgl.kernels import transpose
-from webdnn.backend.webgl.kernels import unpooling_2d
-from webdnn.backend.webgl.kernels import util
+"""
+Kernel handlers of WebGL backend.
+
+Kernel modules are not imported by this package. Each kernel module registers its handlers when it's imported, and
+:class:`~webdnn.backend.webgl.generator.WebGLDescriptorGenerator` imports the module listed in :data:`MANIFEST` when
+the handler of the operator is requested at first. When a kernel module is added, register its operators in :data:`MANIFEST`.
+"""
+
+# operator type name -> kernel module name
+MANIFEST = {
+    "Abs": "abs",
+    "AveragePooling2D": "average_pooling_2d",
+    "Broadcast": "broadcast",
+    "ClippedRelu": "clipped_relu",
+    "Col2Im": "col2im",
+    "Concat": "concat",
+    "ConvertRGBAtoR": "convert_rgba_to_r",
+    "ConvertRtoRGBA": "convert_r_to_rgba",
+    "Depth2Space": "depth2space",
+    "ElementwiseAdd": "elementwise_add",
+    "ElementwiseDiv": "elementwise_div",
+    "ElementwiseMul": "elementwise_mul",
+    "ElementwisePow": "elementwise_pow",
+    "Elu": "elu",
+    "Exp": "exp",
+    "Greater": "greater",
+    "GreaterEqual": "greater_equal",
+    "HardSigmoid": "hard_sigmoid",
+    "Im2Col": "im2col",
+    "LeakyRelu": "leaky_relu",
+    "Max": "max",
+    "MaxPooling2D": "max_pooling_2d",
+    "Min": "min",
+    "PartialIm2Col": "partial_im2col",
+    "Prod": "prod",
+    "ReinterpretAxis": "reinterpret_axis",
+    "Relu": "relu",
+    "Reshape": "reshape",
+    "Rsqrt": "rsqrt",
+    "ScalarAdd": "scalar_add",
+    "ScalarMul": "scalar_mul",
+    "ScalarPow": "scalar_pow",
+    "Select": "select",
+    "Sigmoid": "sigmoid",
+    "Softplus": "softplus",
+    "Softsign": "softsign",
+    "Space2Depth": "space2depth",
+    "SplitAxis": "split_axis",
+    "Sum": "sum",
+    "Tanh": "tanh",
+    "Tensordot": "tensordot",
+    "ThresholdRelu": "threshold_relu",
+    "Tile": "tile",
+    "Transpose": "transpose",
+    "Unpooling2D": "unpooling_2d",
+}
@@ -1,4 +1,4 @@
-from typing import Type, Dict, Callable, Union, List, Sequence
+from typing import Type, Dict, Callable, Union, List, Sequence, Optional
 
 from webdnn.backend.code_generator.templates.elementwise import RegisteredItem
 from webdnn.backend.webgl.generator import WebGLDescriptorGenerator
@@ -149,3 +149,16 @@ def elementwise_kernel(op: Elementwise):
     )
 
     return [kernel]
+
+
+def get_registered_item(op: Elementwise) -> Optional[RegisteredItem]:
+    """get_registered_item(op)
+
+    Get the item registered by :func:`register_elementwise_kernel`. The kernel module of the operator is loaded lazily if needed.
+
+    Returns:
+        (:class:`~webdnn.backend.code_generator.templates.elementwise.RegisteredItem`, optional) registered item, or :code:`None`
+        if the operator is not registered as elementwise kernel
+    """
+    WebGLDescriptorGenerator.get_handler(WebGLDescriptorGenerator.serialize_operator_type(op))
+    return _registered_items.get(op.__class__, None)
@@ -1,14 +1,38 @@
-from typing import List
+from typing import List, Union
 
+from webdnn.backend.code_generator.templates.tensordot_epilogue import epilogue_input_index, generate_epilogue
 from webdnn.backend.webgl.attributes.channel_mode import ChannelModeEnum, ChannelMode
 from webdnn.backend.webgl.generator import WebGLDescriptorGenerator
 from webdnn.backend.webgl.kernel import Kernel
-from webdnn.backend.webgl.kernel_code import KernelCode
-from webdnn.backend.webgl.kernels.util import texture_stride, texture_shape, convert_position, vec
+from webdnn.backend.webgl.kernel_code import KernelCode, Type
+from webdnn.backend.webgl.kernels.elementwise import get_registered_item
+from webdnn.backend.webgl.kernels.util import texture_stride, texture_shape, convert_position, convert_coord, vec
+from webdnn.graph.operators.attributes.tensordot_epilogue import TensordotEpilogue
 from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.variable import Variable
 from webdnn.util.misc import mul
 
 
+def _declare_parameter(name: str, value: Union[int, float]) -> str:
+    t = Type.Float if isinstance(value, float) else Type.Int
+    return f"{t.get_name(value)} {name} = {t.literalize(value)};"
+
+
+def _generate_epilogue(op: Tensordot, N: int):
+    if not op.has_attribute(TensordotEpilogue):
+        return ""
+
+    attr = op.get_attribute(TensordotEpilogue)[0]  # type: TensordotEpilogue
+
+    def load(x: Variable):
+        index = epilogue_input_index(attr, x, f"m * {int(N)} + n", lambda i, size: f"mod({i}, {size})")
+        return ["texture2D(", x, ", ",
+                convert_coord(f"ivec2(0, {index})", [1, x.size], [x.size, 1], texture_shape(x)[:2][::-1], texture_stride(x)[:2][::-1]),
+                ").r"]
+
+    return generate_epilogue(attr, [get_registered_item(sub_op) for sub_op in attr.ops], "v", load, _declare_parameter, " " * 4)
+
+
 @WebGLDescriptorGenerator.register_handler(Tensordot)
 def tensordot(op: Tensordot) -> List[Kernel]:
     A = op.inputs["A"]
@@ -49,8 +73,8 @@ void main() {{
         v += v_a * v_b;
     }}
 
-    gl_FragColor.r = v;
-}}
+""", _generate_epilogue(op, N), """    gl_FragColor.r = v;
+}
 """], name="Tensordot_R")
 
     elif ChannelMode.get(A) == ChannelModeEnum.RGBA:
@@ -70,8 +94,8 @@ void main() {{
         v += dot(v_a, v_b);
     }}
 
-    gl_FragColor.r = v;
-}}
+""", _generate_epilogue(op, N), """    gl_FragColor.r = v;
+}
 """], name="Tensordot_RGBA")
 
     else:
@@ -43,7 +43,10 @@ class AttachConcatWorkspace(OptimizeRule):
                 flag_changed = True
                 attr = ConcatWorkspaceAttached(concat)
                 concat.attributes.add(attr)
+                concat.mark_modified()
 
-            flag_changed |= attr.update()
+            if attr.update():
+                flag_changed = True
+                concat.mark_modified()
 
         return graph, flag_changed
@@ -1,8 +1,8 @@
 from webdnn.backend.webgl.operators.convert_r_to_rgba import ConvertRtoRGBA
 from webdnn.backend.webgl.operators.convert_rgba_to_r import ConvertRGBAtoR
-from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
 from webdnn.graph.optimize_rule import OptimizeRule
+from webdnn.graph.pattern import Pattern
 from webdnn.graph.variable import Variable
 from webdnn.util import flags
 
@@ -30,40 +30,44 @@ class SimplifyNonsenseChannelModeConversion(OptimizeRule):
         x -+
            +-{Transpose}- y -
         """
-        matches = traverse.search_sub_structure(graph, [Variable, ConvertRGBAtoR, Variable, ConvertRtoRGBA, Variable])
-        while len(matches) > 0:
-            x, rgba2r, h, r2rgba, y = matches.pop()  # type: Variable, ConvertRGBAtoR, Variable, ConvertRtoRGBA, Variable
-            flag_changed = True
+        pattern = Pattern.sequence([Variable, ConvertRGBAtoR, Variable, ConvertRtoRGBA, Variable])
+        flag_retry = True
+        while flag_retry:
+            flag_retry = False
 
-            r2rgba.remove_all()
+            for x, rgba2r, h, r2rgba, y in pattern.match(graph):  # type: Variable, ConvertRGBAtoR, Variable, ConvertRtoRGBA, Variable
+                flag_retry = True
+                flag_changed = True
 
-            if x.order == y.order:
-                OptimizeRule.replace_variable(graph, x, y)
+                r2rgba.remove_all()
 
-            else:
-                OptimizeRule.replace_variable(graph, x.transpose(y.order), y)
+                if x.order == y.order:
+                    OptimizeRule.replace_variable(graph, x, y)
 
-            if len(h.input_to) == 0:
-                rgba2r.remove_all()
+                else:
+                    OptimizeRule.replace_variable(graph, x.transpose(y.order), y)
 
-            matches = traverse.search_sub_structure(graph, [Variable, ConvertRGBAtoR, Variable, ConvertRtoRGBA, Variable])
+                if len(h.input_to) == 0:
+                    rgba2r.remove_all()
 
-        matches = traverse.search_sub_structure(graph, [Variable, ConvertRtoRGBA, Variable, ConvertRGBAtoR, Variable])
-        while len(matches) > 0:
-            x, r2rgba, h, rgba2r, y = matches.pop()  # type: Variable, ConvertRtoRGBA, Variable, ConvertRGBAtoR, Variable
-            flag_changed = True
+        pattern = Pattern.sequence([Variable, ConvertRtoRGBA, Variable, ConvertRGBAtoR, Variable])
+        flag_retry = True
+        while flag_retry:
+            flag_retry = False
 
-            rgba2r.remove_all()
+            for x, r2rgba, h, rgba2r, y in pattern.match(graph):  # type: Variable, ConvertRtoRGBA, Variable, ConvertRGBAtoR, Variable
+                flag_retry = True
+                flag_changed = True
 
-            if x.order == y.order:
-                OptimizeRule.replace_variable(graph, x, y)
+                rgba2r.remove_all()
 
-            else:
-                OptimizeRule.replace_variable(graph, x.transpose(y.order), y)
+                if x.order == y.order:
+                    OptimizeRule.replace_variable(graph, x, y)
 
-            if len(h.input_to) == 0:
-                r2rgba.remove_all()
+                else:
+                    OptimizeRule.replace_variable(graph, x.transpose(y.order), y)
 
-            matches = traverse.search_sub_structure(graph, [Variable, ConvertRtoRGBA, Variable, ConvertRGBAtoR, Variable])
+                if len(h.input_to) == 0:
+                    r2rgba.remove_all()
 
         return graph, flag_changed
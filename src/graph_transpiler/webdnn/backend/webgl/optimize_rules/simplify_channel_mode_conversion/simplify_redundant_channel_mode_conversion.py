@@ -1,9 +1,9 @@
 from webdnn.backend.webgl.attributes.channel_mode import ChannelMode, ChannelModeEnum
 from webdnn.backend.webgl.operators.convert_r_to_rgba import ConvertRtoRGBA, convert_r_to_rgba
 from webdnn.backend.webgl.operators.convert_rgba_to_r import ConvertRGBAtoR, convert_rgba_to_r
-from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
 from webdnn.graph.optimize_rule import OptimizeRule
+from webdnn.graph.pattern import Pattern
 from webdnn.graph.variable import Variable
 from webdnn.util import flags
 
@@ -27,9 +27,8 @@ class SimplifyRedundantChannelModeConversion(OptimizeRule):
 
         v0[RGBA] -{ConvertRGBAtoR}- v2[Order=v0.order][R] -{Transpose}- v3[Order=v1.order][R]-{ConvertRtoRGBA}- v1[RGBA]
         """
-        matches = traverse.search_sub_structure(graph, [Variable, ConvertRtoRGBA, Variable])
-        while len(matches) > 0:
-            v0, r2rgba, v1 = matches.pop()  # type: Variable, ConvertRtoRGBA, Variable
+        pattern = Pattern.sequence([Variable, ConvertRtoRGBA, Variable])
+        for v0, r2rgba, v1 in pattern.match(graph):  # type: Variable, ConvertRtoRGBA, Variable
             if not (ChannelMode.get(v0) == ChannelMode.get(v1) == ChannelModeEnum.RGBA):
                 continue
 
@@ -56,9 +55,8 @@ class SimplifyRedundantChannelModeConversion(OptimizeRule):
 
         v0[R] -{Transpose}- v1[R] 
         """
-        matches = traverse.search_sub_structure(graph, [Variable, ConvertRGBAtoR, Variable])
-        while len(matches) > 0:
-            v0, rgba2r, v1 = matches.pop()  # type: Variable, ConvertRGBAtoR, Variable
+        pattern = Pattern.sequence([Variable, ConvertRGBAtoR, Variable])
+        for v0, rgba2r, v1 in pattern.match(graph):  # type: Variable, ConvertRGBAtoR, Variable
             if not (ChannelMode.get(v0) == ChannelMode.get(v1) == ChannelModeEnum.R):
                 continue
 
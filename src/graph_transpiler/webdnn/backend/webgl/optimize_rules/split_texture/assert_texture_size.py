@@ -7,9 +7,13 @@ from webdnn.util import config
 
 
 class AssertTextureSize(OptimizeRule):
+    def __init__(self, max_texture_size: int = None):
+        super(AssertTextureSize, self).__init__()
+        self.max_texture_size = max_texture_size
+
     def optimize(self, graph: Graph):
         traverse.dump(graph)
-        MAX_SIZE = config.WEBGL_MAX_TEXTURE_SIZE
+        MAX_SIZE = config.get_webgl_max_texture_size() if self.max_texture_size is None else self.max_texture_size
 
         for v in traverse.listup_variables(graph):
             height, width = TextureShape.get(v)
@@ -18,6 +22,6 @@ class AssertTextureSize(OptimizeRule):
     (variable shape)={v.shape}
     (channel mode)={ChannelMode.get(v).name}
     (texture shape)=(width={width}, height={height})
-    (WEBGL_MAX_TEXTURE_SIZE)={config.WEBGL_MAX_TEXTURE_SIZE}"""
+    (WEBGL_MAX_TEXTURE_SIZE)={MAX_SIZE}"""
 
         return graph, False
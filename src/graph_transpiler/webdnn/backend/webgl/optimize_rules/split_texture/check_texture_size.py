@@ -20,10 +20,17 @@ class CheckTextureSize(OptimizeRule):
         - attach :code:`SplitTarget` attribute to :code:`v`.
         - attach :code:`SplitInput` attribute to all operators in :code:`v.input_to`.
         - attach :code:`SplitOutput` attribute to :code:`v.output_from`.
+
+    Args:
+        max_texture_size (int, optional): threshold. If :code:`None`, :func:`~webdnn.util.config.get_webgl_max_texture_size` is used.
     """
 
+    def __init__(self, max_texture_size: int = None):
+        super(CheckTextureSize, self).__init__()
+        self.max_texture_size = max_texture_size
+
     def optimize(self, graph: Graph):
-        MAX_TEXTURE_SIZE = config.WEBGL_MAX_TEXTURE_SIZE
+        MAX_TEXTURE_SIZE = config.get_webgl_max_texture_size() if self.max_texture_size is None else self.max_texture_size
         flag_changed = False
 
         for v in traverse.listup_variables(graph):
@@ -34,5 +41,6 @@ class CheckTextureSize(OptimizeRule):
             if not v.has_attribute(SplitTarget):
                 flag_changed = True
                 v.attributes.add(SplitTarget(v))
+                v.mark_modified()
 
         return graph, flag_changed
@@ -14,7 +14,8 @@ class SplitTexture(OptimizeRuleGroup):
     Procedure:
 
         - Find all variables whose texture size is larger than the threshold
-            - threshold is given by :code:`webdnn.util.config.WEBGL_MAX_TEXTURE_SIZE`.
+            - threshold is given by :code:`max_texture_size`, or :func:`webdnn.util.config.get_webgl_max_texture_size` if it's
+              :code:`None`.
             - If no variable is found, this optimization is not needed. Finish.
 
         - For each found variable, :code:`v`,
@@ -66,9 +67,9 @@ class SplitTexture(OptimizeRuleGroup):
     def flags(self):
         return [flags.optimize.WEBGL_OPTIMIZE_TEXTURE_SIZE]
 
-    def __init__(self):
+    def __init__(self, max_texture_size: int = None):
         super(SplitTexture, self).__init__([
-            CheckTextureSize(),
+            CheckTextureSize(max_texture_size),
             SplitInputTexture(),
             SplitOutputTexture(),
             SplitVariable()
@@ -1,3 +1,4 @@
+from webdnn.backend.webgl.attributes.channel_mode import ChannelMode, ChannelModeEnum
 from webdnn.backend.webgl.optimize_rules.attach_concat_workspace import AttachConcatWorkspace
 from webdnn.backend.webgl.optimize_rules.decompose_softmax import DecomposeSoftmax
 from webdnn.backend.webgl.optimize_rules.fix_tensordot_texture_shape import FixTensordotTextureShape
@@ -6,9 +7,11 @@ from webdnn.backend.webgl.optimize_rules.insert_transpose import InsertTranspose
 from webdnn.backend.webgl.optimize_rules.simplify_channel_mode_conversion.simplify_channel_mode_conversion import \
     SimplifyChannelModeConversion
 from webdnn.backend.webgl.optimize_rules.split_texture.split_texture import SplitTexture
+from webdnn.graph.operators.elementwise import Elementwise
 from webdnn.graph.optimize_rule import OptimizeRuleGroup
 from webdnn.optimizer.sub_rules.constant_folding import ConstantFolding
 from webdnn.optimizer.sub_rules.dump_graph import DumpGraph
+from webdnn.optimizer.sub_rules.fuse_tensordot_epilogue import FuseTensordotEpilogue
 from webdnn.optimizer.sub_rules.merge_tensordot_and_elementwise_mul import MergeTensordotAndElementwiseMul
 from webdnn.optimizer.sub_rules.remove_no_effect_operator import RemoveNoEffectOperator
 from webdnn.optimizer.sub_rules.remove_redundant_operator import RemoveRedundantOperator
@@ -18,28 +21,66 @@ from webdnn.optimizer.sub_rules.replace_linear_by_tensordot import ReplaceLinear
 from webdnn.util import flags, config
 
 
-class WebGLOptimizeRule(OptimizeRuleGroup):
+def _is_supported_in_epilogue(op: Elementwise) -> bool:
+    # kernel modules depend on the generator, which imports this module
+    from webdnn.backend.webgl.kernels.elementwise import get_registered_item
+    if any(ChannelMode.get(v) != ChannelModeEnum.R for v in list(op.inputs.values()) + list(op.outputs.values())):
+        return False
+
+    return get_registered_item(op) is not None
+
+
+def _texture_size_independent_rules():
+    return [
+        InsertTranspose(),
+        InsertChannelModeConversion(),
+        ReplaceConvolutionByIm2Col(),
+        ReplaceDeconvolutionByCol2Im(),
+        ReplaceLinearByTensordot(),
+        DecomposeSoftmax(),
+        FixTensordotTextureShape(),
+        MergeTensordotAndElementwiseMul(),
+        ConstantFolding(),
+        RemoveRedundantOperator(),
+        RemoveNoEffectOperator(),
+        SimplifyChannelModeConversion(),
+    ]
+
+
+class WebGLTextureSizeIndependentOptimizeRule(OptimizeRuleGroup):
+    """
+    Sub rules of :class:`WebGLOptimizeRule` which don't depend on max texture size. When descriptors are generated for multiple max
+    texture sizes, this rule is applied only once and the result graph is shared.
+
+    Because these rules are applied until the graph converges before texture splitting, rules are applied in different order from
+    single :class:`WebGLOptimizeRule`. Generated kernels are expected to be same, but memory layout and constants can be different
+    (ex. constants split by :class:`SplitTexture` can be shared or not).
+    """
+
     def __init__(self):
+        super(WebGLTextureSizeIndependentOptimizeRule, self).__init__(_texture_size_independent_rules())
+
+
+class WebGLOptimizeRule(OptimizeRuleGroup):
+    """
+    Args:
+        max_texture_size (int, optional): max texture size. If :code:`None`, :func:`~webdnn.util.config.get_webgl_max_texture_size`
+            is used.
+    """
+
+    def __init__(self, max_texture_size: int = None):
+        if max_texture_size is None:
+            max_texture_size = config.get_webgl_max_texture_size()
+
         sub_rules = [
-            OptimizeRuleGroup([
-                InsertTranspose(),
-                InsertChannelModeConversion(),
-                ReplaceConvolutionByIm2Col(),
-                ReplaceDeconvolutionByCol2Im(),
-                ReplaceLinearByTensordot(),
-                DecomposeSoftmax(),
-                FixTensordotTextureShape(),
-                MergeTensordotAndElementwiseMul(),
-                ConstantFolding(),
-                RemoveRedundantOperator(),
-                RemoveNoEffectOperator(),
-                SimplifyChannelModeConversion(),
-                SplitTexture(),
+            OptimizeRuleGroup(_texture_size_independent_rules() + [
+                SplitTexture(max_texture_size),
             ]),
+            FuseTensordotEpilogue(_is_supported_in_epilogue),
             AttachConcatWorkspace(),
         ]
 
         if flags.DEBUG:
-            sub_rules.append(DumpGraph(f"cg_{config.WEBGL_MAX_TEXTURE_SIZE}_{{count}}.dot"))
+            sub_rules.append(DumpGraph(f"cg_{max_texture_size}_{{count}}.dot"))
 
         super(WebGLOptimizeRule, self).__init__(sub_rules, repeat=False)
@@ -2,6 +2,5 @@ from webdnn.backend.webgpu import attributes
 from webdnn.backend.webgpu import generator
 from webdnn.backend.webgpu import graph_descriptor
 from webdnn.backend.webgpu import kernel
-from webdnn.backend.webgpu import kernels
 from webdnn.backend.webgpu import optimize_rules
 from webdnn.backend.webgpu import preset_placeholders
@@ -2,24 +2,26 @@ import os
 import os.path as path
 import subprocess
 import tempfile as tmp
+from typing import Optional
 
 from webdnn.backend.code_generator.allocator import allocate
 from webdnn.backend.interface.generator import DescriptorGenerator
 from webdnn.backend.interface.graph_descriptor import IGraphExecutionData
+from webdnn.backend.webgpu import kernels
 from webdnn.backend.webgpu.graph_descriptor import GraphDescriptor
 from webdnn.backend.webgpu.kernel import Kernel
 from webdnn.backend.webgpu.optimize_rules.webgpu_optimize_rule import WebGPUOptimizeRule
 from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.encoder import weight_shard
 from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
-from webdnn.util import flags, console
-from webdnn.util.json import json
+from webdnn.util import flags, console, profiler
 
 
 class GraphExecutionData(IGraphExecutionData[Kernel]):
     descriptor: GraphDescriptor
 
-    def __init__(self, graph: Graph, descriptor: GraphDescriptor, constants: bytes):
+    def __init__(self, graph: Graph, descriptor: GraphDescriptor, constants: Optional[weight_shard.EncodedConstants]):
         self.graph = graph
         self.descriptor = descriptor
         self.constants = constants
@@ -28,14 +30,15 @@ class GraphExecutionData(IGraphExecutionData[Kernel]):
     def save(self, dirname: str):
         os.makedirs(dirname, exist_ok=True)
 
-        with open(path.join(dirname, "graph_{}.json".format(self.backend_suffix)), "w") as f:
-            json.dump(self.descriptor, f, indent=2)
+        self.save_descriptor(dirname, self.descriptor, "graph_{}".format(self.backend_suffix))
 
         with open(path.join(dirname, "kernels_{}.metal".format(self.backend_suffix)), "w") as f:
             f.write(self.descriptor.concat_kernel_sources())
 
-        with open(path.join(dirname, "weight_{}.bin".format(self.backend_suffix)), "wb") as f:
-            f.write(self.constants)
+        weight_shard.write_constants(dirname, "weight_{}.bin".format(self.backend_suffix), self.constants,
+                                     self.descriptor.weight_shards)
+
+        self.save_profile(dirname)
 
 
 def validate_kernel_source(descriptor: GraphDescriptor):
@@ -84,21 +87,28 @@ def validate_kernel_source(descriptor: GraphDescriptor):
 class WebGPUDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData]):
     @classmethod
     def generate(cls, graph: Graph, **kwargs):
-        graph, _ = WebGPUOptimizeRule().optimize(graph)
+        with profiler.phase("backend_optimize"):
+            graph, _ = WebGPUOptimizeRule().optimize(graph)
+
         if flags.DEBUG:
             traverse.dump(graph)
 
-        memory_layout = allocate(graph)
+        with profiler.phase("allocate"):
+            memory_layout = allocate(graph)
+
         console.debug(f"[WebGPUDescriptorGenerator] memory_layout total size: {memory_layout.total_size * 4}[B]")
         console.debug(f"[WebGPUDescriptorGenerator] memory_layout static size: {memory_layout.static_size * 4}[B]")
         console.debug(f"[WebGPUDescriptorGenerator] memory_layout dynamic size: {memory_layout.dynamic_size * 4}[B]")
 
-        constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None))
-        constants_bytes = constant_encoder.encode(memory_layout)
+        constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None),
+                                                       **kwargs.get("constant_encoder_options", {}))
+        with profiler.phase("encode_constants"):
+            constants, weight_shards = weight_shard.encode_constants(constant_encoder, graph, memory_layout,
+                                                                     kwargs.get("weight_shard_size", flags.WEIGHT_SHARD_SIZE),
+                                                                     "weight_webgpu_{}.bin")
 
-        console.debug(f"[WebGPUDescriptorGenerator] constants encoded size: {len(constants_bytes)}[B]")
-
-        kernels = cls.generate_kernels(graph, memory_layout)
+        with profiler.phase("generate_kernels"):
+            kernels = cls.generate_kernels(graph, memory_layout)
 
         descriptor = GraphDescriptor(
             kernels=kernels,
@@ -106,13 +116,17 @@ class WebGPUDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData])
             inputs=graph.inputs,
             outputs=graph.outputs,
             constants_encoding=constant_encoder.name,
-            licenses=graph.licenses
+            licenses=graph.licenses,
+            weight_shards=weight_shards
         )
 
         if flags.optimize.VALIDATE_GENERATED_SOURCE:
             validate_kernel_source(descriptor)
 
-        return GraphExecutionData(graph, descriptor, constants_bytes)
+        return GraphExecutionData(graph, descriptor, constants)
+
+
+WebGPUDescriptorGenerator.register_handler_manifest(kernels.__name__, kernels.MANIFEST)
 
 
 def generate(graph: Graph, **kwargs):
@@ -1,10 +1,11 @@
 from collections import OrderedDict
 from datetime import datetime
-from typing import Iterable, Dict, List, Set, Tuple
+from typing import Iterable, Dict, List, Optional, Set, Tuple
 
 from webdnn.backend.code_generator.allocator import MemoryLayout
 from webdnn.backend.interface.graph_descriptor import IGraphDescriptor
 from webdnn.backend.webgpu.kernel import Kernel
+from webdnn.encoder.weight_shard import WeightShard
 from webdnn.graph import traverse
 from webdnn.graph.placeholder import Placeholder
 from webdnn.graph.variable import Variable
@@ -26,6 +27,7 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
     outputs: Iterable[Variable]
     constants_encoding: str
     licenses: Dict[str, str]
+    weight_shards: Optional[List[WeightShard]]
 
     def __init__(self,
                  kernels: Iterable[Kernel],
@@ -33,13 +35,15 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
                  inputs: Iterable[Variable],
                  outputs: Iterable[Variable],
                  constants_encoding: str,
-                 licenses: Dict[str, str]):
+                 licenses: Dict[str, str],
+                 weight_shards: List[WeightShard] = None):
         self.kernels = kernels
         self.memory_layout = memory_layout
         self.inputs = inputs
         self.outputs = outputs
         self.constants_encoding = constants_encoding
         self.licenses = licenses
+        self.weight_shards = weight_shards
 
     def concat_kernel_sources(self):
         func_sources = OrderedDict()
@@ -88,6 +92,7 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
             "kernel_source": self.concat_kernel_sources(),
             "exec_infos": [kernel.exec_info for kernel in self.kernels],
             "weight_encoding": self.constants_encoding,
+            "weight_shards": self.weight_shards,
             "memory_layout": self.memory_layout,
             "placeholders": placeholders,
             "inputs": [self.memory_layout[v].name for v in self.inputs if not traverse.check_attribute_match(v, Constant)],
@@ -1,15 +1,68 @@
-from typing import List
+from typing import Callable, List
 
 from webdnn.backend.code_generator.allocator import MemoryLayout
 from webdnn.backend.code_generator.injectors.buffer_injector import BufferInjector
 from webdnn.backend.code_generator.injectors.kernel_name_injector import KernelNameInjector
+from webdnn.backend.code_generator.templates.tensordot_epilogue import epilogue_input_index, generate_epilogue
 from webdnn.backend.webgpu.generator import WebGPUDescriptorGenerator
 from webdnn.backend.webgpu.kernel import Kernel, GPUSize
+from webdnn.backend.webgpu.kernels.elementwise import get_registered_item
+from webdnn.graph.operators.attributes.tensordot_epilogue import TensordotEpilogue
 from webdnn.graph.operators.tensordot import Tensordot
 from webdnn.util.misc import mul
 
 
-def generate_template_64(M, N, K):
+_store_scalar = """
+    #if OPTIMIZE && M_DIVIDABLE_BY_64
+                    (         n < N) ? (C[m * N + n] = result[m_sub * 2 + n_sub1][n_sub2]) : 0;
+    #else
+                    (m < M && n < N) ? (C[m * N + n] = result[m_sub * 2 + n_sub1][n_sub2]) : 0;
+    #endif
+"""[1:]
+
+_store_scalar_with_epilogue = """
+    #if OPTIMIZE && M_DIVIDABLE_BY_64
+                    if (n < N)
+    #else
+                    if (m < M && n < N)
+    #endif
+                    {
+                        float v = result[m_sub * 2 + n_sub1][n_sub2];
+%%EPILOGUE%%
+                        C[m * N + n] = v;
+                    }
+"""[1:]
+
+_epilogue_float4 = """
+            for (int n_sub2 = 0; n_sub2 < 4; n_sub2++)
+            {
+                float v0 = result0[n_sub2];
+                float v1 = result1[n_sub2];
+%%EPILOGUE0%%
+%%EPILOGUE1%%
+                result0[n_sub2] = v0;
+                result1[n_sub2] = v1;
+            }
+"""
+
+
+def generate_template_64(M, N, K, epilogue: Callable[[str, str, str, str], str] = None):
+    """generate_template_64(M, N, K, epilogue=None)
+
+    Args:
+        epilogue (callable, optional): function which returns the code to apply the epilogue to the element in place, from names of
+            the float variable, row index and column index, and the indent.
+    """
+    if epilogue is None:
+        store_scalar = _store_scalar
+        epilogue_float4 = ""
+
+    else:
+        store_scalar = _store_scalar_with_epilogue.replace("%%EPILOGUE%%", epilogue("v", "m", "n", " " * 24))
+        epilogue_float4 = _epilogue_float4 \
+            .replace("%%EPILOGUE0%%", epilogue("v0", "m", "(n + 0) * 4 + n_sub2", " " * 16)) \
+            .replace("%%EPILOGUE1%%", epilogue("v1", "m", "(n + 1) * 4 + n_sub2", " " * 16))
+
     return ("""
 kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
                           device float * %%DYNAMIC_BUFFER%%[[buffer(1)]],
@@ -307,7 +360,7 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
             const int n = group_position.y * 16 + n_offset * 2;
             float4 result0 = result[m_sub * 2 + 0];
             float4 result1 = result[m_sub * 2 + 1];
-
+%%EPILOGUE_FLOAT4%%
             C4[m * N4 + n + 0] = result0;
             C4[m * N4 + n + 1] = result1;
             
@@ -325,11 +378,7 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
                 for (int n_sub2 = 0; n_sub2 < 4; n_sub2++)
                 {
 
-    #if OPTIMIZE && M_DIVIDABLE_BY_64
-                    (         n < N) ? (C[m * N + n] = result[m_sub * 2 + n_sub1][n_sub2]) : 0;
-    #else
-                    (m < M && n < N) ? (C[m * N + n] = result[m_sub * 2 + n_sub1][n_sub2]) : 0;
-    #endif
+%%STORE_SCALAR%%
                     n++;
                 }
             }
@@ -351,7 +400,9 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
 """) \
         .replace("%%M_DIVIDABLE_BY_64%%", "1" if M % 64 == 0 else "0") \
         .replace("%%N_DIVIDABLE_BY_64%%", "1" if N % 64 == 0 else "0") \
-        .replace("%%K_DIVIDABLE_BY_8%%", "1" if K % 8 == 0 else "0")
+        .replace("%%K_DIVIDABLE_BY_8%%", "1" if K % 8 == 0 else "0") \
+        .replace("%%STORE_SCALAR%%\n", store_scalar) \
+        .replace("%%EPILOGUE_FLOAT4%%\n", epilogue_float4)
 
 
 @WebGPUDescriptorGenerator.register_handler(Tensordot)
@@ -384,9 +435,24 @@ def tensordot(op: Tensordot, memory_layout: MemoryLayout) -> List[Kernel]:
         "sgemm_K": K
     })
 
+    epilogue = None
+    if op.has_attribute(TensordotEpilogue):
+        attr = op.get_attribute(TensordotEpilogue)[0]  # type: TensordotEpilogue
+        items = [get_registered_item(sub_op) for sub_op in attr.ops]
+        for name, x in attr.base.inputs.items():
+            if name.startswith("epilogue_"):
+                buffer_injector.register({name: memory_layout[x]})
+
+        def epilogue(value: str, m: str, n: str, indent: str):
+            def load(x):
+                index = epilogue_input_index(attr, x, f"({m}) * N + ({n})", lambda i, size: f"({i}) % {size}")
+                return [f"(%%LOAD_BUFFER({attr.base.get_input_name(x)})%%)[{index}]"]
+
+            return "".join(generate_epilogue(attr, items, value, load, indent=indent)).rstrip("\n")
+
     name_injector = KernelNameInjector(op)
 
-    source = generate_template_64(M, N, K)
+    source = generate_template_64(M, N, K, epilogue)
     source = buffer_injector.inject(source)
     source = name_injector.inject(source)
 
@@ -3,7 +3,7 @@ from typing import Tuple
 import numpy as np
 
 from webdnn.backend.webgpu.attributes.lstm_optimized import LSTMOptimized
-from webdnn.graph import traverse
+from webdnn.graph import pattern
 from webdnn.graph.axis import Axis
 from webdnn.graph.graph import Graph
 from webdnn.graph.operators.concat import Concat
@@ -41,8 +41,7 @@ class ConcatLSTMInputAndHidden(OptimizeRule):
 
     def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
         flag_changed = False
-        for match in traverse.search_sub_structure(graph, [LSTM]):
-            lstm = match[0]  # type: LSTM
+        for lstm in pattern.find_nodes(graph, LSTM):  # type: LSTM
 
             if lstm.has_attribute(LSTMOptimized):
                 continue
@@ -73,6 +72,7 @@ class ConcatLSTMInputAndHidden(OptimizeRule):
             lstm.append_input("workspace", workspace)
             lstm.append_input("w_all", w_all)
             lstm.attributes.add(attr)
+            lstm.mark_modified()
 
             flag_changed = True
 
@@ -1,9 +1,11 @@
 from webdnn.backend.webgpu.optimize_rules.concat_lstm_input_and_hidden import ConcatLSTMInputAndHidden
 from webdnn.backend.webgpu.optimize_rules.insert_transpose import InsertTranspose
+from webdnn.graph.operators.elementwise import Elementwise
 from webdnn.graph.optimize_rule import OptimizeRuleGroup
 from webdnn.optimizer.sub_rules.constant_folding import ConstantFolding
 from webdnn.optimizer.sub_rules.dump_graph import DumpGraph
 from webdnn.optimizer.sub_rules.elementwise_kernel_fusion import ElementwiseKernelFusion
+from webdnn.optimizer.sub_rules.fuse_tensordot_epilogue import FuseTensordotEpilogue
 from webdnn.optimizer.sub_rules.merge_tensordot_and_elementwise_mul import MergeTensordotAndElementwiseMul
 from webdnn.optimizer.sub_rules.remove_no_effect_operator import RemoveNoEffectOperator
 from webdnn.optimizer.sub_rules.remove_redundant_operator import RemoveRedundantOperator
@@ -14,6 +16,12 @@ from webdnn.optimizer.sub_rules.update_inplace_attribute import UpdateInplaceAtt
 from webdnn.util import flags
 
 
+def _is_supported_in_epilogue(op: Elementwise) -> bool:
+    # kernel modules depend on the generator, which imports this module
+    from webdnn.backend.webgpu.kernels.elementwise import get_registered_item
+    return get_registered_item(op) is not None
+
+
 class WebGPUOptimizeRule(OptimizeRuleGroup):
     def __init__(self):
         sub_rules = [
@@ -29,6 +37,7 @@ class WebGPUOptimizeRule(OptimizeRuleGroup):
                 RemoveNoEffectOperator(),
                 UpdateInplaceAttribute()
             ]),
+            FuseTensordotEpilogue(_is_supported_in_epilogue),
             ElementwiseKernelFusion()
         ]
 
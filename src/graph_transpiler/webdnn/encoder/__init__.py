@@ -1,3 +1,6 @@
 from webdnn.encoder import constant_encoder
 from webdnn.encoder import constant_encoder_eightbit
+from webdnn.encoder import constant_encoder_float16
+from webdnn.encoder import constant_encoder_int8
 from webdnn.encoder import constant_encoder_raw
+from webdnn.encoder import weight_shard
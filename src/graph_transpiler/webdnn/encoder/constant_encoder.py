@@ -1,3 +1,5 @@
+from typing import BinaryIO
+
 from webdnn.backend.code_generator.allocator import MemoryLayout
 
 
@@ -7,14 +9,32 @@ class ConstantEncoder:
     def encode(self, memory_layout: MemoryLayout) -> bytes:
         raise NotImplementedError()
 
+    def encode_into(self, memory_layout: MemoryLayout, stream: BinaryIO):
+        stream.write(self.encode(memory_layout))
+
     @classmethod
-    def get_encoder(cls, name: str = None) -> "ConstantEncoder":
+    def get_encoder(cls, name: str = None, **kwargs) -> "ConstantEncoder":
+        """get_encoder(name=None, **kwargs)
+
+        Args:
+            name (str, optional): name of encoder. If :code:`None`, :code:`"raw"` is used.
+            **kwargs: options passed to the encoder (ex. :code:`compression_level` of :code:`"eightbit"` encoder)
+
+        Returns:
+            (:class:`ConstantEncoder`) encoder
+        """
         # FIXME
         from webdnn.encoder.constant_encoder_raw import ConstantEncoderRaw
         from webdnn.encoder.constant_encoder_eightbit import ConstantEncoderEightbit
+        from webdnn.encoder.constant_encoder_float16 import ConstantEncoderFloat16
+        from webdnn.encoder.constant_encoder_int8 import ConstantEncoderInt8
         if name is None or name == "raw":
-            return ConstantEncoderRaw()
+            return ConstantEncoderRaw(**kwargs)
         elif name == "eightbit":
-            return ConstantEncoderEightbit()
+            return ConstantEncoderEightbit(**kwargs)
+        elif name == "float16":
+            return ConstantEncoderFloat16(**kwargs)
+        elif name == "int8":
+            return ConstantEncoderInt8(**kwargs)
         else:
             raise ValueError("Unknown encoder")
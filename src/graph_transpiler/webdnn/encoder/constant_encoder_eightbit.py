@@ -1,13 +1,15 @@
 # algorithm, implementation is based on "8-Bit Approximations for Parallelism in Deep Learning" by Tim Dettmers
 # https://github.com/TimDettmers/clusterNet/blob/master/source/clusterKernels.cu
 
+import os
 import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterable, Optional, Tuple
 
 import numpy as np
 
-from webdnn.backend.code_generator.allocator import Allocation, MemoryLayout
+from webdnn.backend.code_generator.allocator import Allocation, BufferType, MemoryLayout
 from webdnn.encoder.constant_encoder import ConstantEncoder
-from webdnn.graph.variables.constant_variable import ConstantVariable
 
 tbl_floats = [2.750000021e-06, 7.249999726e-06, 1.875000089e-05, 3.624999954e-05, 5.874999624e-05, 8.624999464e-05,
               1.437500032e-04, 2.312500001e-04, 3.187500115e-04, 4.062500084e-04, 5.187499919e-04, 6.562499912e-04,
@@ -54,34 +56,80 @@ threshold_array = np.array(thresholds, dtype=np.float32)
 
 
 class ConstantEncoderEightbit(ConstantEncoder):
-    def __init__(self):
+    """ConstantEncoderEightbit(compression_level=9, num_threads=None)
+
+    Encoder which quantizes each allocation into 8bit codes and compresses them by zlib.
+
+    The encoded data is a sequence of following chunks for each allocation (all values are little-endian):
+
+    - int32: offset of the allocation
+    - int32: byte length of compressed code
+    - float32: scale (max absolute value of the allocation)
+    - int32: reserved (0)
+    - compressed code
+
+    Allocations are quantized and compressed in parallel by worker threads (numpy and zlib release GIL), and written in order of
+    allocations. Therefore the output is same as serial encoding. When descriptor is saved, chunks are streamed into the file by
+    :func:`encode_into`.
+
+    Args:
+        compression_level (int): zlib compression level (0-9)
+        num_threads (int, optional): number of worker threads. If :code:`None`, :code:`os.cpu_count()` is used. If :code:`1`,
+            allocations are encoded serially.
+    """
+
+    def __init__(self, compression_level: int = 9, num_threads: Optional[int] = None):
         self.name = "eightbit"
+        self.compression_level = compression_level
+        self.num_threads = num_threads
 
     def encode(self, memory_layout: MemoryLayout) -> bytes:
-        all_code = b""
-        for alloc in memory_layout.allocations.values():
-            if alloc.offset >= memory_layout.data.size:
-                continue
-
-            single_data = memory_layout.data[alloc.offset:alloc.offset + alloc.size]
-            all_code += self._single_encode(single_data, alloc)
-
-        return all_code
-
-    # noinspection PyMethodMayBeStatic
-    def _single_encode(self, single_data: np.ndarray, alloc: Allocation) -> bytes:
-        maxval = np.max(np.abs(single_data))
-        maxval = np.maximum(maxval, 1e-20)  # avoid zero division
-        abs_scaled_data = np.abs(single_data) / maxval
-        code = np.searchsorted(threshold_array, abs_scaled_data)
-        code += (single_data < 0.0).astype(np.int32) * 128
-        code_raw_bytes = code.astype(np.uint8).tobytes("C")
-        code_bytes = zlib.compress(code_raw_bytes, level=9)
-
-        out_data = b""
-        out_data += np.array([alloc.offset, len(code_bytes)], dtype=np.int32).tobytes()
-        out_data += np.array([maxval], dtype=np.float32).tobytes()
-        out_data += np.array([0], dtype=np.int32).tobytes()
-        out_data += code_bytes
-
-        return out_data
+        # join() allocates the result once, and chunks are copied into it directly
+        return b"".join(part for chunk in self._encode_chunks(memory_layout) for part in chunk)
+
+    def encode_into(self, memory_layout: MemoryLayout, stream: BinaryIO):
+        """encode_into(memory_layout, stream)
+
+        Encode constants and write them into the stream. Each chunk is written as soon as it and all preceding chunks are encoded.
+
+        Args:
+            memory_layout (:class:`~webdnn.backend.code_generator.allocator.MemoryLayout`): memory layout
+            stream (binary file object): destination
+        """
+        for header, code_bytes in self._encode_chunks(memory_layout):
+            stream.write(header)
+            stream.write(code_bytes)
+
+    def _encode_chunks(self, memory_layout: MemoryLayout) -> Iterable[Tuple[bytes, bytes]]:
+        data = memory_layout.data
+        # Dynamic allocations are placed in the dynamic buffer, and their offsets may be placeholders.
+        allocations = [alloc for alloc in memory_layout.allocations.values()
+                       if alloc.buffer_type == BufferType.Static and alloc.offset < data.size]
+
+        num_threads = self.num_threads if self.num_threads is not None else (os.cpu_count() or 1)
+        num_threads = min(num_threads, len(allocations))
+
+        def encode_single(alloc: Allocation):
+            return self._single_encode(data[alloc.offset:alloc.offset + alloc.size], alloc)
+
+        if num_threads <= 1:
+            yield from map(encode_single, allocations)
+            return
+
+        with ThreadPoolExecutor(num_threads) as executor:
+            # map() returns results in order of allocations
+            yield from executor.map(encode_single, allocations)
+
+    def _single_encode(self, single_data: np.ndarray, alloc: Allocation) -> Tuple[bytes, bytes]:
+        abs_data = np.abs(single_data)
+        maxval = np.maximum(np.max(abs_data), 1e-20)  # avoid zero division
+        abs_scaled_data = abs_data / maxval
+
+        code = np.searchsorted(threshold_array, abs_scaled_data).astype(np.uint8)
+        code[single_data < 0.0] += 128
+        code_bytes = zlib.compress(code.tobytes("C"), self.compression_level)
+
+        header = np.array([alloc.offset, len(code_bytes), 0, 0], dtype=np.int32)
+        header[2:3] = np.array([maxval], dtype=np.float32).view(np.int32)
+
+        return header.tobytes(), code_bytes
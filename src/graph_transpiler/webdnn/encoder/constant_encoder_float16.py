@@ -0,0 +1,105 @@
+import zlib
+from typing import BinaryIO, Iterable, Tuple
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import BufferType, MemoryLayout
+from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.util import console
+
+FLAG_COMPRESSED = 1
+
+_float16_max = float(np.finfo(np.float16).max)
+
+
+class ConstantEncoderFloat16(ConstantEncoder):
+    """ConstantEncoderFloat16(compression_level=9)
+
+    Encoder which converts each allocation into IEEE754 half precision floats. Values are rounded to nearest even, and values
+    whose magnitude exceeds the range of float16 are clipped into :code:`[-65504, 65504]`.
+
+    The encoded data is a sequence of following chunks for each allocation (all values are little-endian):
+
+    - int32: offset of the allocation (number of elements)
+    - int32: number of elements
+    - int32: byte length of body
+    - int32: flags (:code:`1` if body is compressed by zlib, otherwise :code:`0`)
+    - body: float16 array, compressed by zlib if flags is :code:`1`
+
+    Each body is compressed only when it makes the body smaller. Decoded values are placed at the offset of each chunk, and the
+    region not covered by any chunk is filled by zero.
+
+    Args:
+        compression_level (int): zlib compression level (0-9). If :code:`0`, bodies are not compressed.
+    """
+
+    def __init__(self, compression_level: int = 9):
+        self.name = "float16"
+        self.compression_level = compression_level
+
+    def encode(self, memory_layout: MemoryLayout) -> bytes:
+        return b"".join(header + body for header, body in self._encode_chunks(memory_layout))
+
+    def encode_into(self, memory_layout: MemoryLayout, stream: BinaryIO):
+        for header, body in self._encode_chunks(memory_layout):
+            stream.write(header)
+            stream.write(body)
+
+    def _encode_chunks(self, memory_layout: MemoryLayout) -> Iterable[Tuple[bytes, bytes]]:
+        data = memory_layout.data
+        for alloc in memory_layout.allocations.values():
+            # Dynamic allocations are placed in the dynamic buffer, and their offsets may be placeholders.
+            if alloc.buffer_type != BufferType.Static or alloc.offset >= data.size:
+                continue
+
+            yield self._single_encode(data[alloc.offset:alloc.offset + alloc.size], alloc.offset)
+
+    def _single_encode(self, single_data: np.ndarray, offset: int) -> Tuple[bytes, bytes]:
+        if np.any(np.abs(single_data) > _float16_max):
+            console.warning(f"[ConstantEncoderFloat16] Values out of float16 range are clipped (offset={offset})")
+            single_data = np.clip(single_data, -_float16_max, _float16_max)
+
+        body = single_data.astype("<f2").tobytes("C")
+        flags = 0
+
+        if self.compression_level > 0:
+            compressed = zlib.compress(body, self.compression_level)
+            if len(compressed) < len(body):
+                body = compressed
+                flags |= FLAG_COMPRESSED
+
+        header = np.array([offset, single_data.size, len(body), flags], dtype="<i4")
+        return header.tobytes(), body
+
+
+def decode(data: bytes) -> np.ndarray:
+    """decode(data)
+
+    Decode the data encoded by :class:`ConstantEncoderFloat16`. This is reference implementation of the runtime decoder
+    (:code:`WeightDecoderFloat16`).
+
+    Args:
+        data (bytes): encoded data
+
+    Returns:
+        (:class:`~numpy.ndarray`) decoded float32 array
+    """
+    chunks = []
+    src_offset = 0
+    while src_offset < len(data):
+        offset, size, body_size, flags = np.frombuffer(data, dtype="<i4", count=4, offset=src_offset).tolist()
+        src_offset += 16
+
+        body = data[src_offset:src_offset + body_size]
+        src_offset += body_size
+
+        if flags & FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+
+        chunks.append((offset, np.frombuffer(body, dtype="<f2", count=size)))
+
+    result = np.zeros(max((offset + chunk.size for offset, chunk in chunks), default=0), dtype=np.float32)
+    for offset, chunk in chunks:
+        result[offset:offset + chunk.size] = chunk
+
+    return result
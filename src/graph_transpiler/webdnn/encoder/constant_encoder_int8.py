@@ -0,0 +1,243 @@
+import json
+import zlib
+from typing import BinaryIO, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import Allocation, MemoryLayout
+from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.graph.axis import Axis
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import console
+
+FLAG_COMPRESSED = 1
+
+
+class QuantizationReport(NamedTuple):
+    """
+    Quantization error of single constant variable.
+    """
+    name: str
+    shape: Tuple[int, ...]
+    axis: Optional[str]
+    max_abs_error: float
+    mean_abs_error: float
+    snr: float  # signal-to-noise ratio in dB. If there is no error, it's infinity.
+
+
+def _channel_axis_index(v: ConstantVariable) -> Optional[int]:
+    for axis in (Axis.N, Axis.C):
+        if axis in v.order.axes:
+            index = v.order.axes_dict[axis]
+
+            # If the channel axis is the only non-unit axis (ex. bias), per-channel parameters are larger than the code itself.
+            if all(s == 1 for i, s in enumerate(v.shape) if i != index):
+                return None
+
+            return index
+
+    return None
+
+
+def quantize(data: np.ndarray, axis: Optional[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """quantize(data, axis)
+
+    Quantize data into unsigned 8bit codes with scale and zero point for each channel. Value is approximated as
+    :code:`scale * (code - zero_point)`. The range of each channel is extended to contain zero, so that zero is represented
+    exactly.
+
+    Args:
+        data (:class:`~numpy.ndarray`): data
+        axis (int, optional): index of channel axis. If :code:`None`, whole data is quantized as single channel.
+
+    Returns:
+        (tuple of :class:`~numpy.ndarray`) uint8 codes whose shape is same as data, float32 scales and uint8 zero points for
+        each channel
+    """
+    if axis is None:
+        data3 = data.reshape(1, 1, -1)
+
+    else:
+        data3 = data.reshape(int(np.prod(data.shape[:axis])), data.shape[axis], -1)
+
+    min_value = np.minimum(data3.min(axis=(0, 2)), 0)
+    max_value = np.maximum(data3.max(axis=(0, 2)), 0)
+
+    scale = ((max_value - min_value) / 255).astype(np.float32)
+    scale[scale == 0] = 1
+    zero_point = np.clip(np.round(-min_value / scale), 0, 255).astype(np.uint8)
+
+    code = np.round(data3 / scale[None, :, None]) + zero_point[None, :, None]
+    code = np.clip(code, 0, 255).astype(np.uint8)
+
+    return code.reshape(data.shape), scale, zero_point
+
+
+def dequantize(code: np.ndarray, scale: np.ndarray, zero_point: np.ndarray, axis: Optional[int]) -> np.ndarray:
+    """dequantize(code, scale, zero_point, axis)
+
+    Inverse of :func:`quantize`.
+    """
+    if axis is None:
+        code3 = code.reshape(1, 1, -1)
+
+    else:
+        code3 = code.reshape(int(np.prod(code.shape[:axis])), code.shape[axis], -1)
+
+    data = (code3.astype(np.float32) - zero_point.astype(np.float32)[None, :, None]) * scale[None, :, None]
+    return data.reshape(code.shape)
+
+
+class ConstantEncoderInt8(ConstantEncoder):
+    """ConstantEncoderInt8(compression_level=9, snr_threshold=30.0, report_path=None)
+
+    Encoder which quantizes each constant variable into 8bit codes with affine transform (scale and zero point) for each output
+    channel. The channel axis is :obj:`Axis.N<webdnn.graph.axis.Axis.N>` if the variable has it, otherwise
+    :obj:`Axis.C<webdnn.graph.axis.Axis.C>`. If neither exists, or if the channel axis is the only non-unit axis (ex. bias), whole
+    variable is quantized as single channel.
+
+    The encoded data is a sequence of following chunks for each constant variable (all values are little-endian):
+
+    - int32: offset of the allocation (number of elements)
+    - int32: number of elements
+    - int32: number of channels (:code:`C`)
+    - int32: stride of channel axis (:code:`S`). The channel of i-th element is :code:`floor(i / S) % C`.
+    - int32: byte length of code
+    - int32: flags (:code:`1` if code is compressed by zlib, otherwise :code:`0`)
+    - float32[C]: scales
+    - uint8[C]: zero points
+    - uint8 code, compressed by zlib if flags is :code:`1`
+
+    Decoded value is :code:`scale * (code - zero_point)`.
+
+    After encoding, quantization error of each variable is stored in :attr:`reports`. Variables whose SNR is lower than
+    :code:`snr_threshold` are reported as warnings.
+
+    Args:
+        compression_level (int): zlib compression level (0-9). If :code:`0`, code is not compressed.
+        snr_threshold (float): threshold of signal-to-noise ratio in dB for warning
+        report_path (str, optional): if specified, reports are also saved into the file as JSON
+
+    Attributes:
+        reports (list of :class:`QuantizationReport`): quantization error of each constant variable
+    """
+
+    def __init__(self, compression_level: int = 9, snr_threshold: float = 30.0, report_path: Optional[str] = None):
+        self.name = "int8"
+        self.compression_level = compression_level
+        self.snr_threshold = snr_threshold
+        self.report_path = report_path
+        self.reports = []  # type: List[QuantizationReport]
+
+    def encode(self, memory_layout: MemoryLayout) -> bytes:
+        return b"".join(header + body for header, body in self._encode_chunks(memory_layout))
+
+    def encode_into(self, memory_layout: MemoryLayout, stream: BinaryIO):
+        for header, body in self._encode_chunks(memory_layout):
+            stream.write(header)
+            stream.write(body)
+
+    def _encode_chunks(self, memory_layout: MemoryLayout) -> Iterable[Tuple[bytes, bytes]]:
+        self.reports = []
+        for v, alloc in memory_layout.allocations.items():
+            if not isinstance(v, ConstantVariable):
+                continue
+
+            yield self._single_encode(memory_layout.data[alloc.offset:alloc.offset + v.size].reshape(v.shape), v, alloc)
+
+        self._report()
+
+    def _single_encode(self, single_data: np.ndarray, v: ConstantVariable, alloc: Allocation) -> Tuple[bytes, bytes]:
+        axis = _channel_axis_index(v)
+        code, scale, zero_point = quantize(single_data, axis)
+        self.reports.append(_compute_report(single_data, dequantize(code, scale, zero_point, axis), v, axis))
+
+        body = code.tobytes("C")
+        flags = 0
+        if self.compression_level > 0:
+            compressed = zlib.compress(body, self.compression_level)
+            if len(compressed) < len(body):
+                body = compressed
+                flags |= FLAG_COMPRESSED
+
+        channel_stride = 1 if axis is None else int(np.prod(single_data.shape[axis + 1:]))
+        header = np.array([alloc.offset, single_data.size, scale.size, channel_stride, len(body), flags], dtype="<i4").tobytes() + \
+                 scale.astype("<f4").tobytes() + \
+                 zero_point.astype(np.uint8).tobytes()
+
+        return header, body
+
+    def _report(self):
+        for report in self.reports:
+            console.debug(f"[ConstantEncoderInt8] {report.name} {report.shape}: max_abs_error={report.max_abs_error:.3e}, "
+                          f"mean_abs_error={report.mean_abs_error:.3e}, snr={report.snr:.1f}dB")
+
+            if report.snr < self.snr_threshold:
+                console.warning(f"[ConstantEncoderInt8] Quantization error of {report.name} is large: "
+                                f"snr={report.snr:.1f}dB (threshold={self.snr_threshold}dB)")
+
+        if self.report_path is not None:
+            with open(self.report_path, "w") as f:
+                json.dump([report._asdict() for report in self.reports], f, indent=2)
+
+
+def _compute_report(data: np.ndarray, decoded: np.ndarray, v: ConstantVariable, axis: Optional[int]) -> QuantizationReport:
+    error = np.abs(decoded.astype(np.float64) - data)
+    signal_power = float(np.sum(np.square(data, dtype=np.float64)))
+    noise_power = float(np.sum(np.square(error)))
+
+    if noise_power == 0:
+        snr = float("inf")
+
+    elif signal_power == 0:
+        snr = float("-inf")
+
+    else:
+        snr = 10 * float(np.log10(signal_power / noise_power))
+
+    return QuantizationReport(name=v.name,
+                              shape=tuple(int(s) for s in v.shape),
+                              axis=None if axis is None else v.order.axes[axis].name,
+                              max_abs_error=float(error.max()) if error.size > 0 else 0.0,
+                              mean_abs_error=float(error.mean()) if error.size > 0 else 0.0,
+                              snr=snr)
+
+
+def decode(data: bytes) -> np.ndarray:
+    """decode(data)
+
+    Decode the data encoded by :class:`ConstantEncoderInt8`. This is reference implementation of the runtime decoder
+    (:code:`WeightDecoderInt8`).
+
+    Args:
+        data (bytes): encoded data
+
+    Returns:
+        (:class:`~numpy.ndarray`) decoded float32 array
+    """
+    chunks = []
+    src_offset = 0
+    while src_offset < len(data):
+        offset, size, num_channels, channel_stride, body_size, flags = \
+            np.frombuffer(data, dtype="<i4", count=6, offset=src_offset).tolist()
+        src_offset += 24
+
+        scale = np.frombuffer(data, dtype="<f4", count=num_channels, offset=src_offset)
+        zero_point = np.frombuffer(data, dtype=np.uint8, count=num_channels, offset=src_offset + num_channels * 4)
+        src_offset += num_channels * 5
+
+        body = data[src_offset:src_offset + body_size]
+        src_offset += body_size
+
+        if flags & FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+
+        code = np.frombuffer(body, dtype=np.uint8, count=size)
+        channel = (np.arange(size) // channel_stride) % num_channels
+        chunks.append((offset, (code.astype(np.float32) - zero_point.astype(np.float32)[channel]) * scale[channel]))
+
+    result = np.zeros(max((offset + chunk.size for offset, chunk in chunks), default=0), dtype=np.float32)
+    for offset, chunk in chunks:
+        result[offset:offset + chunk.size] = chunk
+
+    return result
@@ -1,3 +1,7 @@
+from typing import BinaryIO
+
+import numpy as np
+
 from webdnn.backend.code_generator.allocator import MemoryLayout
 from webdnn.encoder.constant_encoder import ConstantEncoder
 
@@ -8,3 +12,7 @@ class ConstantEncoderRaw(ConstantEncoder):
 
     def encode(self, memory_layout: MemoryLayout) -> bytes:
         return memory_layout.data.tobytes("C")
+
+    def encode_into(self, memory_layout: MemoryLayout, stream: BinaryIO):
+        # Packed data may be memory-mapped, so it is written directly without copying into bytes object
+        stream.write(memoryview(np.ascontiguousarray(memory_layout.data)).cast("B"))
@@ -0,0 +1,212 @@
+import os.path as path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import Allocation, MemoryLayout
+from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.graph import traverse
+from webdnn.graph.graph import Graph
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import console, json
+
+
+class WeightShard(json.SerializableMixin):
+    """WeightShard(filename, allocations)
+
+    Part of encoded constants, which is saved as separated file. Each shard is encoded independently by the constant encoder,
+    therefore the runtime can decode each shard as soon as it's downloaded.
+
+    In the graph descriptor, each shard is serialized as follows (:code:`data` is not included):
+
+    - :code:`filename`: file name relative to the descriptor
+    - :code:`byte_length`: size of the file in bytes
+    - :code:`size`: number of elements after decoding
+    - :code:`allocations`: list of :code:`{name, offset, shard_offset, size}`. Elements :code:`[shard_offset, shard_offset+size)`
+      of the decoded shard are copied into :code:`[offset, offset+size)` of the static buffer.
+
+    Args:
+        filename (str): file name
+        allocations (list of :class:`~webdnn.backend.code_generator.allocator.Allocation`): allocations of constant variables
+            in this shard, in order of placement in the shard
+    """
+
+    def __init__(self, filename: str, allocations: List[Allocation]):
+        self.filename = filename
+        self.allocations = allocations
+        self.data = b""  # type: bytes
+
+    @property
+    def size(self) -> int:
+        return sum(a.size for a in self.allocations)
+
+    def _to_serializable_(self):
+        shard_offset = 0
+        allocations = []
+        for a in self.allocations:
+            allocations.append({
+                "name": a.name,
+                "offset": a.offset,
+                "shard_offset": shard_offset,
+                "size": a.size
+            })
+            shard_offset += a.size
+
+        return {
+            "filename": self.filename,
+            "byte_length": len(self.data),
+            "size": self.size,
+            "allocations": allocations
+        }
+
+
+class EncodedConstants:
+    """EncodedConstants(encoder, memory_layout)
+
+    Constants which are not sharded. They are encoded when they are written into the file by :func:`write`, and encoded data is
+    streamed into the file by :func:`~webdnn.encoder.constant_encoder.ConstantEncoder.encode_into`. Therefore whole encoded
+    data is not kept in memory in addition to the packed constants.
+
+    Args:
+        encoder (:class:`~webdnn.encoder.constant_encoder.ConstantEncoder`): encoder
+        memory_layout (:class:`~webdnn.backend.code_generator.allocator.MemoryLayout`): memory layout
+    """
+
+    def __init__(self, encoder: ConstantEncoder, memory_layout: MemoryLayout):
+        self.encoder = encoder
+        self.memory_layout = memory_layout
+
+    def write(self, stream: BinaryIO):
+        """write(stream)
+
+        Encode constants and write them into the stream.
+        """
+        self.encoder.encode_into(self.memory_layout, stream)
+
+    def __bytes__(self):
+        return self.encoder.encode(self.memory_layout)
+
+
+def _constants_in_first_use_order(graph: Graph, memory_layout: MemoryLayout) -> List[ConstantVariable]:
+    first_use = {}  # type: Dict[ConstantVariable, int]
+    for i, op in enumerate(traverse.listup_operators(graph)):
+        for v in op.inputs.values():
+            if isinstance(v, ConstantVariable) and v not in first_use:
+                first_use[v] = i
+
+    constants = [v for v in memory_layout.allocations.keys() if isinstance(v, ConstantVariable)]
+
+    # constants which are not consumed by any operator (ex. graph outputs) are placed at last. sort() is stable.
+    constants.sort(key=lambda v: first_use.get(v, len(first_use) + 1))
+    return constants
+
+
+def split_shards(graph: Graph, memory_layout: MemoryLayout, shard_size: int,
+                 filename_format: str) -> List[WeightShard]:
+    """split_shards(graph, memory_layout, shard_size, filename_format)
+
+    Split constant variables into shards whose raw (float32) size is at most :code:`shard_size` bytes. Constant variables are
+    ordered by the first operator which uses them, so that shards are downloaded and decoded in order of execution.
+    Single constant variable is never split, and one larger than :code:`shard_size` makes its own shard.
+
+    Args:
+        graph (:class:`~webdnn.graph.graph.Graph`): graph
+        memory_layout (:class:`~webdnn.backend.code_generator.allocator.MemoryLayout`): memory layout
+        shard_size (int): max size of each shard in bytes
+        filename_format (str): format of file name, formatted with shard index (ex. :code:`"weight_webgpu_{}.bin"`)
+
+    Returns:
+        (list of :class:`WeightShard`) shards. Data is not encoded yet.
+    """
+    groups = []  # type: List[List[Allocation]]
+    current = []  # type: List[Allocation]
+    current_bytes = 0
+
+    for v in _constants_in_first_use_order(graph, memory_layout):
+        alloc = memory_layout[v]
+        nbytes = v.size * 4
+
+        if len(current) > 0 and current_bytes + nbytes > shard_size:
+            groups.append(current)
+            current = []
+            current_bytes = 0
+
+        # Allocation of WebGL contains the padding of texture, but only the data of variable is packed.
+        current.append(Allocation(size=v.size, offset=alloc.offset, name=alloc.name))
+        current_bytes += nbytes
+
+    if len(current) > 0:
+        groups.append(current)
+
+    return [WeightShard(filename_format.format(i), group) for i, group in enumerate(groups)]
+
+
+def encode_shard(encoder: ConstantEncoder, memory_layout: MemoryLayout, shard: WeightShard):
+    """encode_shard(encoder, memory_layout, shard)
+
+    Encode data of the shard. Allocations of the shard are packed contiguously from offset :code:`0` into a temporary memory
+    layout, and it's encoded by the encoder. Therefore any encoder can be used without modification.
+
+    Args:
+        encoder (:class:`~webdnn.encoder.constant_encoder.ConstantEncoder`): encoder
+        memory_layout (:class:`~webdnn.backend.code_generator.allocator.MemoryLayout`): memory layout of whole graph
+        shard (:class:`WeightShard`): shard
+    """
+    constants = {memory_layout[v].name: v for v in memory_layout.allocations.keys() if isinstance(v, ConstantVariable)}
+
+    data = np.empty((shard.size,), dtype=np.float32)
+    allocations = {}
+    shard_offset = 0
+    for a in shard.allocations:
+        data[shard_offset:shard_offset + a.size] = memory_layout.data[a.offset:a.offset + a.size]
+        allocations[constants[a.name]] = Allocation(size=a.size, offset=shard_offset, name=a.name)
+        shard_offset += a.size
+
+    shard.data = encoder.encode(MemoryLayout(allocations, data))
+
+
+def encode_constants(encoder: ConstantEncoder, graph: Graph, memory_layout: MemoryLayout, shard_size: int,
+                     filename_format: str) -> Tuple[Optional[EncodedConstants], Optional[List[WeightShard]]]:
+    """encode_constants(encoder, graph, memory_layout, shard_size, filename_format)
+
+    Encode constants into shards if :code:`shard_size` is positive. Otherwise, constants are encoded into single file when they
+    are saved.
+
+    Returns:
+        (tuple of :class:`EncodedConstants` and list of :class:`WeightShard`) If sharded, :code:`None` and shards. Otherwise,
+        constants and :code:`None`.
+    """
+    if shard_size <= 0:
+        return EncodedConstants(encoder, memory_layout), None
+
+    shards = split_shards(graph, memory_layout, shard_size, filename_format)
+    for shard in shards:
+        encode_shard(encoder, memory_layout, shard)
+
+    console.debug(f"[WeightShard] constants are split into {len(shards)} shards, "
+                  f"encoded size: {sum(len(shard.data) for shard in shards)}[B]")
+
+    return None, shards
+
+
+def write_constants(dirname: str, filename: str, constants: Optional[EncodedConstants], shards: Optional[List[WeightShard]]):
+    """write_constants(dirname, filename, constants, shards)
+
+    Write constants returned by :func:`encode_constants` into :code:`filename`, or write each shard into the file.
+    """
+    if shards is None:
+        with open(path.join(dirname, filename), "wb") as f:
+            constants.write(f)
+
+    else:
+        write_shards(dirname, shards)
+
+
+def write_shards(dirname: str, shards: List[WeightShard]):
+    """write_shards(dirname, shards)
+
+    Write each shard into the file.
+    """
+    for shard in shards:
+        with open(path.join(dirname, shard.filename), "wb") as f:
+            f.write(shard.data)
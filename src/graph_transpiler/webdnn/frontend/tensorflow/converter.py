@@ -1,18 +1,20 @@
 # -*- coding:utf-8 -*-
 import traceback
-from typing import List, Union, Optional, Dict, Sequence, Tuple
+from typing import List, Union, Optional, Dict, Sequence, Set, Tuple
+
+import numpy as np
 
 from webdnn.frontend.converter import Converter, CyclicGraphError
+from webdnn.frontend.util import fold_constants, prefetch_constants
 from webdnn.graph.axis import Axis
 from webdnn.graph.graph import Graph
-from webdnn.graph.optimize_rule import OptimizeRuleGroup
+from webdnn.graph.operator import Operator
 from webdnn.graph.order import Order
 from webdnn.graph.placeholder import Placeholder
 from webdnn.graph.variable import Variable
 from webdnn.graph.variables.attributes.input import Input
 from webdnn.graph.variables.attributes.output import Output
 from webdnn.graph.variables.constant_variable import ConstantVariable
-from webdnn.optimizer.sub_rules.constant_folding import ConstantFolding
 from webdnn.optimizer.tensorflow_frontend_optimize_rule import TensorFlowFrontendOptimizeRule
 from webdnn.util import console
 
@@ -22,6 +24,7 @@ try:
     import tensorflow as tf
 
 except Exception as e:
+    FLAG_TF_INSTALLED = False
     console.warning(traceback.format_exc())
 
 
@@ -33,7 +36,11 @@ class TensorFlowConverter(Converter["tf.Operation"]):
     Args:
         session (:code:`tf.Session`): Session
 
+    Attributes:
+        prefetch_op_types (tuple of str): types of operations whose output values are fetched from the session before conversion
+            by single :code:`session.run`. Handlers get them by :func:`convert_to_constant_variable` without session round-trip.
     """
+    prefetch_op_types = ("VariableV2",)
 
     def __init__(self, session: "tf.Session", batch_size: int = 1):
         super(TensorFlowConverter, self).__init__()
@@ -43,6 +50,8 @@ class TensorFlowConverter(Converter["tf.Operation"]):
 
         self.session = session
         self._batch_size = Placeholder(label=Axis.N.name, value=batch_size)
+        self._constant_cache = {}  # type: Dict[tf.Tensor, np.ndarray]
+        self._visited_operators = set()  # type: Set[Operator]
 
     def serialize_operator_type(self, op: "tf.Operation") -> str:
         return op.type
@@ -79,26 +88,18 @@ class TensorFlowConverter(Converter["tf.Operation"]):
             self.set_variable(tensor, Variable(shape, Order([None] * len(shape))))
 
         ops = _listup_operations(inputs, outputs)
-        for op in ops:
-            self._convert_operator(op)
-            sub_graph = Graph([self.get_variable(tf_tensor) for tf_tensor in op.inputs if self.has_variable(tf_tensor)],
-                              [self.get_variable(tf_tensor) for tf_tensor in op.outputs if self.has_variable(tf_tensor)])
-            old_outputs = list(sub_graph.outputs)
-
-            # Constant folding improves possibility of conversion, because many tensors are used not only for main input variable but also
-            # for other parameter like indices of operation, and WebDNN doesn't support dynamic indices operation.
-            OptimizeRuleGroup([ConstantFolding()], repeat=True).optimize(sub_graph)
-
-            # After constant folding, it need to replace old variable with new constant variable
-            for tf_tensor in op.outputs:
-                if not self.has_variable(tf_tensor):
-                    # This tensor is not converted (ignored)
-                    continue
-
-                old_v = self.get_variable(tf_tensor)
-                new_v = sub_graph.outputs[old_outputs.index(old_v)]
-                if old_v != new_v:
-                    self.set_variable(tf_tensor, new_v, overwrite=True)
+        self._prefetch_constants(ops)
+        try:
+            for op in ops:
+                self._convert_operator(op)
+
+                # Constant folding improves possibility of conversion, because many tensors are used not only for main input variable
+                # but also for other parameter like indices of operation, and WebDNN doesn't support dynamic indices operation.
+                self._fold_constants(op)
+
+        finally:
+            self._constant_cache = {}
+            self._visited_operators = set()
 
         if order_hints:
             for tensor, order in order_hints.items():
@@ -140,7 +141,11 @@ class TensorFlowConverter(Converter["tf.Operation"]):
             (:class:`~webdnn.graph.variables.constant_variable.ConstantVariable`): converted variable.
         """
 
-        data, = self.session.run([tensor])
+        if tensor in self._constant_cache:
+            data = self._constant_cache[tensor]
+
+        else:
+            data, = self.session.run([tensor])
 
         if self.has_variable(tensor):
             variable = self.get_variable(tensor)
@@ -162,8 +167,33 @@ class TensorFlowConverter(Converter["tf.Operation"]):
 
         return variable
 
+    def _prefetch_constants(self, ops: Sequence["tf.Operation"]):
+        """
+        Fetch values of all constant tensors used in the graph by single :code:`session.run`, instead of fetching them one by one
+        in :func:`convert_to_constant_variable`.
+        """
+        self._constant_cache = prefetch_constants(self.session, ops, self.prefetch_op_types)
+
+    def _fold_constants(self, tf_op: "tf.Operation"):
+        """
+        Fold constant operators created by the handler of :code:`tf_op`, and replace variables of the output tensors with folded
+        constant variables. Handlers of following operations can use them as constant parameters.
+
+        Only operators which are not visited yet are checked (see :func:`~webdnn.frontend.util.fold_constants`), so whole graph is
+        folded by single incremental pass without listing up all operators for each TensorFlow operation.
+        """
+        bound = [self.get_variable(tf_tensor) for tf_tensor in tf_op.inputs if self.has_variable(tf_tensor)]
+        tf_tensors = [tf_tensor for tf_tensor in tf_op.outputs if self.has_variable(tf_tensor)]
+        old_outputs = [self.get_variable(tf_tensor) for tf_tensor in tf_tensors]
+        new_outputs = fold_constants(bound, old_outputs, self._visited_operators)
+
+        # After constant folding, it need to replace old variable with new constant variable
+        for tf_tensor, old_v, new_v in zip(tf_tensors, old_outputs, new_outputs):
+            if old_v != new_v:
+                self.set_variable(tf_tensor, new_v, overwrite=True)
+
 
-T_NODE = Union[tf.Tensor, tf.Operation]
+T_NODE = Union["tf.Tensor", "tf.Operation"]
 
 
 def _listup_operations(inputs: Sequence[T_NODE], outputs: Sequence[T_NODE]):
@@ -1,5 +1,12 @@
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from webdnn.graph.graph import Graph
+from webdnn.graph.operator import Operator
 from webdnn.graph.placeholder import Placeholder
 from webdnn.graph.variable import Variable
+from webdnn.optimizer.sub_rules.constant_folding import ConstantFolding
 
 
 def check_broadcast_constraints(a: Variable, b: Variable):
@@ -29,3 +36,72 @@ Shape mismatch: a.shape[{i_a}] != b.shape[{i_b}]
 
         else:
             raise ValueError(f"Broadcast is failed: (a.shape)={a.shape}, (b.shape)={b.shape}")
+
+
+def prefetch_constants(session: Any, ops: Sequence[Any], op_types: Sequence[str]) -> Dict[Any, np.ndarray]:
+    """prefetch_constants(session, ops, op_types)
+
+    Fetch values of all constant tensors (the first output of each operation whose type is in :code:`op_types`) by single
+    :code:`session.run`, instead of fetching them one by one.
+
+    Args:
+        session: session object which has :code:`run(fetches)` method (ex. :code:`tf.Session`)
+        ops (list of operation): operations in the graph
+        op_types (list of str): types of constant operations
+
+    Returns:
+        (dict) fetched values keyed by tensor
+    """
+    tensors = [op.outputs[0] for op in ops if op.type in op_types]
+    if len(tensors) == 0:
+        return {}
+
+    return dict(zip(tensors, session.run(tensors)))
+
+
+def fold_constants(bound: Iterable[Variable], outputs: Sequence[Variable], visited: Set[Operator]) -> List[Variable]:
+    """fold_constants(bound, outputs, visited)
+
+    Fold constant operators which compute :code:`outputs` from :code:`bound`. Only operators which are not in :code:`visited` are
+    checked in topological order, and they are added into :code:`visited`. Therefore when this function is called for each
+    converted operation with same :code:`visited`, whole graph is folded by single incremental pass.
+
+    Args:
+        bound (iterable of :class:`~webdnn.graph.variable.Variable`): input variables of the sub graph
+        outputs (list of :class:`~webdnn.graph.variable.Variable`): output variables of the sub graph
+        visited (set of :class:`~webdnn.graph.operator.Operator`): operators which are already checked
+
+    Returns:
+        (list of :class:`~webdnn.graph.variable.Variable`) output variables after folding. If an output is folded, it's replaced
+        with the folded constant variable.
+    """
+    rule = ConstantFolding()
+    if not all(rule.flags()):
+        return list(outputs)
+
+    bound = set(bound)
+    sub_graph = Graph(list(bound), list(outputs))
+
+    def get_prev_operators(op: Operator) -> List[Operator]:
+        return [v.output_from for v in op.inputs.values()
+                if v not in bound and v.output_from is not None and v.output_from not in visited]
+
+    # list up new operators in topological order
+    new_ops = []  # type: List[Operator]
+    stack = [(v.output_from, False) for v in outputs
+             if v not in bound and v.output_from is not None]  # type: List[Tuple[Operator, bool]]
+    while len(stack) > 0:
+        op, flag_expanded = stack.pop()
+        if flag_expanded:
+            new_ops.append(op)
+            continue
+
+        if op in visited:
+            continue
+
+        visited.add(op)
+        stack.append((op, True))
+        stack.extend((prev_op, False) for prev_op in get_prev_operators(op))
+
+    rule.optimize_nodes(sub_graph, new_ops)
+    return list(sub_graph.outputs)
@@ -1,5 +1,9 @@
-from typing import Iterable
+import copy
+from typing import Dict, Iterable, List, Set, Tuple
 
+import numpy as np
+
+from webdnn.graph import node
 from webdnn.graph.variable import Variable
 
 WEBDNN_LICENSE = "(C) Machine Intelligence Laboratory (The University of Tokyo), MIT License"
@@ -10,6 +14,9 @@ class Graph:
 
     Computation graph of DNN model.
 
+    Graph caches the topological order of nodes computed by :func:`~webdnn.graph.traverse.listup_nodes`. The cache is
+    invalidated when connection between any nodes or graph inputs / outputs are changed.
+
     Args:
         inputs (list of :class:`~webdnn.Variable`): input variables
         outputs (list of :class:`~webdnn.Variable`): output variables
@@ -21,9 +28,100 @@ class Graph:
         self.inputs = list(inputs)
         self.outputs = list(outputs)
         self.licenses = {"webdnn": WEBDNN_LICENSE}
+        self._topological_order_cache = {}  # type: Dict[Tuple[bool, bool], Tuple[int, tuple, tuple, List[node.Node]]]
+
+    def get_cached_topological_order(self, key: Tuple[bool, bool]):
+        """get_cached_topological_order(key)
+
+        Return the cached topological order if it's still valid, otherwise :code:`None`.
+
+        Args:
+            key (tuple of bool): flags used to compute the topological order
+
+        Returns:
+            (list of :class:`~webdnn.graph.node.Node` or :code:`None`) cached topological order
+        """
+        cache = getattr(self, "_topological_order_cache", {}).get(key, None)
+        if cache is None:
+            return None
+
+        version, inputs, outputs, nodes = cache
+        if version != node.get_structure_version() or inputs != tuple(self.inputs) or outputs != tuple(self.outputs):
+            return None
+
+        return list(nodes)
+
+    def set_cached_topological_order(self, key: Tuple[bool, bool], nodes: List["node.Node"]):
+        """set_cached_topological_order(key, nodes)
+
+        Cache the topological order.
+
+        Args:
+            key (tuple of bool): flags used to compute the topological order
+            nodes (list of :class:`~webdnn.graph.node.Node`): topological order
+        """
+        if not hasattr(self, "_topological_order_cache"):
+            self._topological_order_cache = {}
+
+        self._topological_order_cache[key] = (node.get_structure_version(), tuple(self.inputs), tuple(self.outputs), list(nodes))
+
+    def clone(self) -> "Graph":
+        """clone()
+
+        Clone this graph. All nodes, connections, and attributes are copied, but unlike :func:`copy.deepcopy`, nodes are traversed
+        without recursion, so deep graphs (ex. ResNet) can be cloned without increasing the recursion limit.
+
+        Array data held by nodes (ex. :attr:`ConstantVariable.data<webdnn.graph.variables.constant_variable.ConstantVariable.data>`) is
+        not copied. Cloned graph shares the array with this graph as a read-only view, so the data is duplicated only when an
+        optimize rule replaces it with new array (copy-on-write). Modifying shared data in-place raises an error.
+
+        Returns:
+            (:class:`~webdnn.Graph`) cloned graph
+        """
+        nodes = _listup_connected_nodes(self.inputs + self.outputs)
+
+        memo = {}  # type: Dict[int, object]
+        for n in nodes:
+            memo[id(n)] = n.__class__.__new__(n.__class__)
+
+            for value in n.__getstate__().values():
+                if isinstance(value, np.ndarray) and id(value) not in memo:
+                    memo[id(value)] = _readonly_view(value)
+
+        # Because all nodes are already registered in memo, deepcopy never follows connections between nodes recursively.
+        for n in nodes:
+            memo[id(n)].__setstate__(copy.deepcopy(n.__getstate__(), memo))
+
+        new_graph = Graph([memo[id(v)] for v in self.inputs], [memo[id(v)] for v in self.outputs])
+        new_graph.licenses = dict(self.licenses)
+        return new_graph
 
     def __repr__(self):
         return f"""<{self.__class__.__name__} inputs={self.inputs}, outputs={self.outputs}>"""
 
     def __str__(self):
         return self.__repr__()
+
+
+def _listup_connected_nodes(seeds: Iterable["node.Node"]) -> List["node.Node"]:
+    result = []  # type: List[node.Node]
+    visited = set()  # type: Set[node.Node]
+    stack = list(seeds)
+
+    while len(stack) > 0:
+        n = stack.pop()
+        if n in visited:
+            continue
+
+        visited.add(n)
+        result.append(n)
+        stack.extend(n._prevs)
+        stack.extend(n._nexts)
+
+    return result
+
+
+def _readonly_view(data: np.ndarray) -> np.ndarray:
+    view = data.view()
+    view.flags.writeable = False
+    return view
@@ -1,4 +1,5 @@
-from typing import Dict, Set, Type, Optional, List, TypeVar
+from functools import lru_cache
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Type, TypeVar
 
 from webdnn.graph import attribute
 
@@ -15,38 +16,254 @@ def _generate_name(node: "Node"):
     return name
 
 
+def get_name_counters() -> Dict[Type["Node"], int]:
+    """get_name_counters()
+
+    Return the snapshot of serial counters used to generate default node names.
+
+    Returns:
+        (dict) snapshot of counters
+    """
+    return dict(_node_serial_counter_dict)
+
+
+def set_name_counters(counters: Dict[Type["Node"], int]):
+    """set_name_counters(counters)
+
+    Restore serial counters used to generate default node names from the snapshot. Generating descriptor from same counter state
+    produces same node names, and therefore same output, regardless of what has been generated before.
+
+    Args:
+        counters (dict): snapshot returned by :func:`~webdnn.graph.node.get_name_counters`
+    """
+    _node_serial_counter_dict.clear()
+    _node_serial_counter_dict.update(counters)
+
+
 _TAttr = TypeVar("T", bound="attribute.Attribute")
 
+_structure_version = 0
+
+
+def get_structure_version() -> int:
+    """get_structure_version()
+
+    Return the counter which is incremented every time when connection between any nodes or name of any node is changed. It's used
+    to check whether cached information about graph structure (ex. topological order, which depends on node names) is still valid
+    or not.
+
+    Returns:
+        (int) current version
+    """
+    return _structure_version
+
+
+def _update_structure_version():
+    global _structure_version
+    _structure_version += 1
+
+
+_modification_version = 0
+
+
+def get_modification_version() -> int:
+    """get_modification_version()
+
+    Return the counter which is incremented every time when any node is modified (connection is changed, variable order is
+    changed, etc.). Each node remembers the value when it's modified last as :code:`node.modified_version`.
+
+    Returns:
+        (int) current version
+    """
+    return _modification_version
+
+
+class AttributeSet(set):
+    """AttributeSet(attributes=())
+
+    Set of attributes of a node. It's a :class:`set`, but also keeps attributes grouped by type, which is used by
+    :func:`Node.get_attribute<webdnn.graph.node.Node.get_attribute>`. The grouping is discarded whenever the set is modified.
+    """
+
+    def __init__(self, attributes: Iterable["attribute.Attribute"] = ()):
+        super(AttributeSet, self).__init__(attributes)
+        self._by_type = {}  # type: Dict[type, List["attribute.Attribute"]]
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+    def get_by_type(self, Attr: Type[_TAttr]) -> List[_TAttr]:
+        """get_by_type(Attr)
+
+        Return attributes which are instances of given type.
+
+        Args:
+            Attr (type): attribute type
+
+        Returns:
+            (list of :class:`~webdnn.graph.attribute.Attribute`) attributes. The list must not be modified.
+        """
+        result = self._by_type.get(Attr, None)
+        if result is None:
+            result = [attr for attr in self if isinstance(attr, Attr)]
+            self._by_type[Attr] = result
+
+        return result
+
+
+def _invalidate_attribute_cache(name):
+    method = getattr(set, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._by_type.clear()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in ["add", "remove", "discard", "pop", "clear", "update", "difference_update", "intersection_update",
+              "symmetric_difference_update", "__ior__", "__iand__", "__isub__", "__ixor__"]:
+    setattr(AttributeSet, _name, _invalidate_attribute_cache(_name))
+
+
+@lru_cache(maxsize=None)
+def _get_state_slots(klass: type) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Returns slot descriptors of the class which are included in the state, as the tuple of :code:`(name, descriptor)`.
+    """
+    result = []
+    for base in klass.__mro__:
+        cache_slots = base.__dict__.get("_cache_slots", ())
+        for name in base.__dict__.get("__slots__", ()):
+            if name not in ("__dict__", "__weakref__") and name not in cache_slots:
+                result.append((name, base.__dict__[name]))
+
+    return tuple(result)
+
+
+@lru_cache(maxsize=None)
+def _get_cache_slots(klass: type) -> Tuple[Any, ...]:
+    return tuple(base.__dict__[name] for base in klass.__mro__ for name in base.__dict__.get("_cache_slots", ()))
+
 
 class Node:
     """
     Basic graph node class.
+
+    Adjacency views (:attr:`prevs` and :attr:`nexts`) are cached as :class:`frozenset`, and invalidated when connection is changed.
+    Cached values are not included in the state used by :mod:`copy`, :mod:`pickle` and :meth:`Graph.clone<webdnn.Graph.clone>`.
     """
+    __slots__ = ("parameters", "attributes", "_name", "_prevs", "_nexts", "_modified_version", "_prevs_view", "_nexts_view",
+                 "__weakref__")
+
+    # slots which hold derived values. They are not included in the state.
+    _cache_slots = ("_prevs_view", "_nexts_view")
 
     def __init__(self, name: Optional[str] = None):
         if name is None:
             name = _generate_name(self)
         self.parameters = {}  # type: Dict[str, any]
-        self.attributes = set()  # type: Set["attribute.Attribute"]
+        self.attributes = AttributeSet()  # type: Set["attribute.Attribute"]
         self.name = name
         self._prevs = []  # type: List["Node"]
         self._nexts = []  # type: List["Node"]
+        self._prevs_view = None  # type: Optional[FrozenSet["Node"]]
+        self._nexts_view = None  # type: Optional[FrozenSet["Node"]]
+        self._modified_version = 0
+        self.mark_modified()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(getattr(self, "__dict__", {}))
+        for name, slot in _get_state_slots(self.__class__):
+            try:
+                state[name] = slot.__get__(self)
+
+            except AttributeError:
+                # not initialized, or shadowed by a property in subclass (ex. Variable.name)
+                pass
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        slots = dict(_get_state_slots(self.__class__))
+        for slot in _get_cache_slots(self.__class__):
+            slot.__set__(self, None)
+
+        for name, value in state.items():
+            if name in slots:
+                slots[name].__set__(self, value)
+
+            elif isinstance(getattr(self.__class__, name, None), property):
+                # states created before the slot is wrapped by a property (ex. "name")
+                setattr(self, name, value)
+
+            else:
+                self.__dict__[name] = value
+
+        if not isinstance(self.attributes, AttributeSet):
+            # states created before attributes are grouped by type
+            self.attributes = AttributeSet(self.attributes)
 
     @property
-    def prevs(self) -> Set["Node"]:
-        return set(self._prevs)
+    def name(self) -> str:
+        """name of this node"""
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        # Topological order is sorted by node names, so renaming invalidates cached order as well as connection changes.
+        self._name = name
+        _update_structure_version()
 
     @property
-    def nexts(self) -> Set["Node"]:
-        return set(self._nexts)
+    def prevs(self) -> AbstractSet["Node"]:
+        """read-only set of previous nodes"""
+        if self._prevs_view is None:
+            self._prevs_view = frozenset(self._prevs)
+
+        return self._prevs_view
+
+    @property
+    def nexts(self) -> AbstractSet["Node"]:
+        """read-only set of next nodes"""
+        if self._nexts_view is None:
+            self._nexts_view = frozenset(self._nexts)
+
+        return self._nexts_view
+
+    @property
+    def modified_version(self) -> int:
+        """the value of :func:`~webdnn.graph.node.get_modification_version` when this node is modified last"""
+        return getattr(self, "_modified_version", 0)
+
+    def mark_modified(self):
+        """mark_modified()
+
+        Mark this node as modified. Connection changes are marked automatically.
+        """
+        global _modification_version
+        _modification_version += 1
+        self._modified_version = _modification_version
 
     def append_prev(self, prev: "Node"):
         prev._nexts.append(self)
+        prev._nexts_view = None
         self._prevs.append(prev)
+        self._prevs_view = None
+        _update_structure_version()
+        self.mark_modified()
+        prev.mark_modified()
 
     def remove_prev(self, prev: "Node"):
         prev._nexts.remove(self)
+        prev._nexts_view = None
         self._prevs.remove(prev)
+        self._prevs_view = None
+        _update_structure_version()
+        self.mark_modified()
+        prev.mark_modified()
 
     def append_next(self, next: "Node"):
         next.append_prev(self)
@@ -61,7 +278,14 @@ class Node:
         return self.__repr__()
 
     def get_attribute(self, Attr: Type[_TAttr]) -> List[_TAttr]:
-        return [attr for attr in self.attributes if isinstance(attr, Attr)]
+        return list(self._get_attribute_set().get_by_type(Attr))
 
     def has_attribute(self, Attr: Type["attribute.Attribute"]) -> bool:
-        return len(self.get_attribute(Attr)) > 0
+        return len(self._get_attribute_set().get_by_type(Attr)) > 0
+
+    def _get_attribute_set(self) -> AttributeSet:
+        if not isinstance(self.attributes, AttributeSet):
+            # replaced by plain set (ex. `node.attributes = node.attributes | {attr}`)
+            self.attributes = AttributeSet(self.attributes)
+
+        return self.attributes
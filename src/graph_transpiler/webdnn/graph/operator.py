@@ -1,4 +1,5 @@
-from typing import Dict, Tuple, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Optional
 
 from webdnn.graph import variable, graph
 from webdnn.graph.node import Node
@@ -12,11 +13,15 @@ class Operator(Node):
     Args:
         name (str): the name. If :code:`None`, automatically generated name is used.
     """
+    __slots__ = ("_inputs", "_outputs", "_inputs_view", "_outputs_view")
+    _cache_slots = ("_inputs_view", "_outputs_view")
 
     def __init__(self, name: Optional[str] = None):
         super().__init__(name)
         self._inputs = {}  # type: Dict[str, "variable.Variable"]
         self._outputs = {}  # type: Dict[str, "variable.Variable"]
+        self._inputs_view = None  # type: Optional[Mapping[str, "variable.Variable"]]
+        self._outputs_view = None  # type: Optional[Mapping[str, "variable.Variable"]]
 
     def copy(self):
         """copy()
@@ -28,14 +33,20 @@ class Operator(Node):
         return self.__class__(None, **self.parameters)
 
     @property
-    def inputs(self) -> Dict[str, "variable.Variable"]:
-        """input variables"""
-        return dict(self._inputs)
+    def inputs(self) -> Mapping[str, "variable.Variable"]:
+        """input variables (read-only snapshot, which is not changed when inputs are changed later)"""
+        if self._inputs_view is None:
+            self._inputs_view = MappingProxyType(dict(self._inputs))
+
+        return self._inputs_view
 
     @property
-    def outputs(self) -> Dict[str, "variable.Variable"]:
-        """output variables"""
-        return dict(self._outputs)
+    def outputs(self) -> Mapping[str, "variable.Variable"]:
+        """output variables (read-only snapshot, which is not changed when outputs are changed later)"""
+        if self._outputs_view is None:
+            self._outputs_view = MappingProxyType(dict(self._outputs))
+
+        return self._outputs_view
 
     def get_input_name(self, var: "variable.Variable"):
         for name, v in self.inputs.items():
@@ -67,6 +78,7 @@ class Operator(Node):
 
         self.append_prev(var)
         self._inputs[name] = var
+        self._inputs_view = None
 
     def remove_input(self, var: "variable.Variable"):
         """remove_input(var)
@@ -83,6 +95,7 @@ class Operator(Node):
 
         self.remove_prev(var)
         self._inputs.pop(name)
+        self._inputs_view = None
 
     def replace_input(self, v_old: "variable.Variable", v_new: "variable.Variable", with_assert: bool = True):
         """replace_input(v_old, v_new)
@@ -129,6 +142,7 @@ class Operator(Node):
 
         self.append_next(var)
         self._outputs[name] = var
+        self._outputs_view = None
 
     def remove_output(self, var: "variable.Variable"):
         """remove_output(var)
@@ -144,6 +158,7 @@ class Operator(Node):
 
         self.remove_next(var)
         self._outputs.pop(name)
+        self._outputs_view = None
 
     def replace_output(self, v_old: "variable.Variable", v_new: "variable.Variable", with_assert: bool = True):
         """replace_output(v_old, v_new)
@@ -0,0 +1,108 @@
+from typing import Dict, List
+
+from webdnn.graph.attribute import Attribute
+from webdnn.graph.operator import Operator
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+class TensordotEpilogue(Attribute[Operator]):
+    """TensordotEpilogue(base)
+
+    Elementwise operators which are applied to the result of :class:`~webdnn.graph.operators.tensordot.Tensordot` before it's
+    stored into the output variable. The result is not written into memory and read again by another kernel.
+
+    Before:
+
+    ... code-block:: text
+
+        -{Tensordot}- C -{op1}- h -{op2}- y
+
+    After:
+
+    ... code-block:: text
+
+        -{Tensordot}- y
+
+                 epilogue
+          +----------------------+
+        x-|-{op1}- h' -{op2}- y'-|
+          +----------------------+
+
+    Operators in the epilogue are connected to dummy variables like
+    :class:`~webdnn.graph.operators.fused_elementwise.FusedElementwise`. Other input variables of the operators (ex. bias) are
+    appended into inputs of the tensordot operator as :code:`epilogue_x0`, :code:`epilogue_x1`, ..., so that memory allocation
+    and execution order consider them.
+
+    Attributes:
+        x (:class:`~webdnn.graph.variable.Variable`): dummy variable which represents the result of tensordot
+        y (:class:`~webdnn.graph.variable.Variable`): dummy variable which represents the result of the last operator
+        ops (list of :class:`~webdnn.graph.operators.elementwise.Elementwise`): operators in order of execution
+        dummy2real (dict): mapping from dummy input variables to real input variables of the tensordot operator
+    """
+
+    def __init__(self, base: Operator):
+        super(TensordotEpilogue, self).__init__(base)
+        C = base.outputs["C"]
+        self.x = Variable(C.shape, C.order)
+        self.y = self.x
+        self.ops = []  # type: List[Operator]
+        self.real2dummy = {}  # type: Dict[Variable, Variable]
+        self.dummy2real = {}  # type: Dict[Variable, Variable]
+
+    def __str__(self):
+        return f"TensordotEpilogue[{', '.join(op.__class__.__name__ for op in self.ops)}]"
+
+    @staticmethod
+    def get(base: Operator) -> "TensordotEpilogue":
+        """get(base)
+
+        Get the epilogue attribute of the operator. If it's not registered, new empty epilogue is registered.
+        """
+        if not base.has_attribute(TensordotEpilogue):
+            attribute = TensordotEpilogue(base)
+            base.attributes.add(attribute)
+
+        else:
+            attribute = base.get_attribute(TensordotEpilogue)[0]
+
+        return attribute
+
+    def append(self, op: Operator):
+        """append(op)
+
+        Move the operator, which consumes the output of the tensordot operator, into the epilogue. The output variable of the operator
+        becomes the output of the tensordot operator.
+        """
+        C = self.base.outputs["C"]
+
+        for name, x in list(op.inputs.items()):
+            if x is C:
+                op.replace_input(x, self.y)
+
+            else:
+                op.replace_input(x, self._create_dummy(x))
+
+        y = op.outputs["y"]
+        dummy_y = Variable(y.shape, y.order)
+        op.replace_output(y, dummy_y)
+        self.base.replace_output(C, y)
+
+        self.ops.append(op)
+        self.y = dummy_y
+
+    def _create_dummy(self, v: Variable):
+        if v in self.real2dummy:
+            return self.real2dummy[v]
+
+        if isinstance(v, ConstantVariable):
+            dummy = ConstantVariable(v.data, v.order)
+
+        else:
+            dummy = Variable(v.shape, v.order)
+
+        self.base.append_input(f"epilogue_x{len(self.real2dummy)}", v)
+        self.real2dummy[v] = dummy
+        self.dummy2real[dummy] = v
+
+        return dummy
@@ -37,6 +37,7 @@ class ScalarAffine(Elementwise):
     @scale.setter
     def scale(self, value: float):
         self.parameters["scale"] = value
+        self.mark_modified()
 
     @property
     def bias(self) -> float:
@@ -45,6 +46,7 @@ class ScalarAffine(Elementwise):
     @bias.setter
     def bias(self, value: float):
         self.parameters["bias"] = value
+        self.mark_modified()
 
     def fold_constance(self, graph: Graph):
         x0 = self.inputs["x0"]  # type: ConstantVariable
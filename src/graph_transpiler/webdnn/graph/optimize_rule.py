@@ -1,16 +1,34 @@
-from typing import List, Tuple
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+from webdnn.graph import node as _node
+from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
+from webdnn.graph.node import Node
 from webdnn.graph.operator import Operator
 from webdnn.graph.variable import Variable
-from webdnn.util import console
+from webdnn.util import console, flags, profiler
 
 
 class OptimizeRule:
     """OptimizeRule()
 
     :code:`OptimizeRule` transforms IR graph. This class used not only for just optimization, but also analysis, fallback supports, and so on.
+
+    Attributes:
+        targets (list of node or attribute type, optional): Types of node which this rule matches. If specified, the worklist scheduler
+            in :class:`~webdnn.graph.optimize_rule.OptimizeRuleGroup` applies this rule only when nodes of these types are modified,
+            and passes them to :func:`optimize_nodes(graph, nodes)<OptimizeRule.optimize_nodes>`. If :code:`None`, the rule is
+            applied to whole graph when any node is modified.
+        pattern_length (int, optional): Number of nodes in the longest path from a target node to the nodes which this rule
+            inspects, including the target node itself (ex. :code:`3` for :code:`SplitAxis - Variable - SplitAxis`). The worklist
+            scheduler re-checks target nodes within :code:`pattern_length - 1` hops from modified nodes. If :code:`None` (ex. the rule
+            follows chains of arbitrary length), all target nodes are re-checked when any node is modified. Rules which change
+            parameters or attributes of nodes in place must call :func:`~webdnn.graph.node.Node.mark_modified` for them.
     """
+    targets = None  # type: Optional[List[traverse.Query]]
+    pattern_length = None  # type: Optional[int]
 
     @staticmethod
     def replace_input(graph: Graph, op: Operator, old_var: Variable, new_var: Variable, with_assert: bool = True):
@@ -66,6 +84,22 @@ class OptimizeRule:
         """
         raise NotImplementedError
 
+    def optimize_nodes(self, graph: Graph, nodes: List[Node]) -> Tuple[Graph, bool]:
+        """optimize_nodes(graph, nodes)
+
+        Optimize the given graph focusing only on the given nodes. It is called by the worklist scheduler with nodes which match
+        :attr:`targets` and were modified after the last application. By default, whole graph is optimized by
+        :func:`optimize(graph)<OptimizeRule.optimize>`.
+
+        args:
+            graph(:class:`~webdnn.Graph`): Computational graph
+            nodes(list of :class:`~webdnn.graph.node.Node`): Nodes to be optimized, in topological order
+
+        returns:
+            (tuple of :class:`~webdnn.Graph` and bool): Optimized graph and flag whether the graph is changed or not.
+        """
+        return self.optimize(graph)
+
 
 class OptimizeRuleGroup(OptimizeRule):
     """OptimizeRuleGroup()
@@ -74,14 +108,26 @@ class OptimizeRuleGroup(OptimizeRule):
 
     When :func:`optimize(graph)<OptimizeRuleGroup.optimize>` is called, the transform rule is applied for given graph.
 
+    Two schedulers are supported, and both of them apply sub rules until the graph reaches to the same fixpoint.
+
+    - :code:`"sweep"`: Whenever any sub rule changes the graph, all sub rules are applied to whole graph again.
+    - :code:`"worklist"`: Nested groups are flattened, and each sub rule is applied again only when nodes which match its
+      :attr:`~OptimizeRule.targets` are modified after its last application.
+
     Attributes:
         repeat(bool): If `True`, sub rules are applied multiple times in the single `optimize()` call until the graph will be not changed.
+        scheduler(str, optional): :code:`"sweep"` or :code:`"worklist"`. If :code:`None`, the environment variable
+            :code:`OPTIMIZE_RULE_SCHEDULER` is used.
+        invocation_counts(dict of str and int): Number of applications of each sub rule in the last
+            :func:`optimize(graph)<OptimizeRuleGroup.optimize>` call, keyed by class name of the rule.
     """
 
-    def __init__(self, rules: List["OptimizeRule"], repeat: bool = True):
+    def __init__(self, rules: List["OptimizeRule"], repeat: bool = True, scheduler: Optional[str] = None):
         super(OptimizeRuleGroup, self).__init__()
         self.repeat = repeat
+        self.scheduler = scheduler
         self.sub_rules = rules  # type: List["OptimizeRule"]
+        self.invocation_counts = Counter()  # type: Dict[str, int]
 
     def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
         """optimize(graph)
@@ -94,9 +140,22 @@ class OptimizeRuleGroup(OptimizeRule):
         returns:
             (tuple of :class:`~webdnn.Graph` and bool): Optimized graph and flag whether the graph is changed or not.
         """
+        self.invocation_counts = Counter()
+
         if not all(self.flags()):
             return graph, False
 
+        scheduler = flags.optimize.OPTIMIZE_RULE_SCHEDULER if self.scheduler is None else self.scheduler
+        if scheduler == "sweep":
+            return self._optimize_sweep(graph)
+
+        elif scheduler == "worklist":
+            return self._optimize_worklist(graph)
+
+        else:
+            raise NotImplementedError(f"[{self.__class__.__name__}] Unknown scheduler: {scheduler}")
+
+    def _optimize_sweep(self, graph: Graph) -> Tuple[Graph, bool]:
         flag_retry = True
         flag_totally_changed = False
 
@@ -107,10 +166,63 @@ class OptimizeRuleGroup(OptimizeRule):
                 if not all(sub_rule.flags()):
                     continue
 
-                graph, flag_changed = sub_rule.optimize(graph)
+                graph, flag_changed = self._apply_sub_rule(sub_rule, graph)
+                if flag_changed:
+                    console.debug(f"[OptimizeRule] apply: {sub_rule.__class__.__name__}")
+
+                flag_retry |= flag_changed
+
+            flag_totally_changed |= flag_retry
+
+            if not self.repeat:
+                break
+
+        return graph, flag_totally_changed
+
+    def _optimize_worklist(self, graph: Graph) -> Tuple[Graph, bool]:
+        rules = self._flatten_sub_rules()
+        last_versions = {}  # type: Dict[int, int]
+
+        flag_retry = True
+        flag_totally_changed = False
+
+        while flag_retry:
+            flag_retry = False
+
+            for i, sub_rule in enumerate(rules):
+                if not all(sub_rule.flags()):
+                    continue
+
+                version = _node.get_modification_version()
+
+                if i not in last_versions:
+                    graph, flag_changed = self._apply_sub_rule(sub_rule, graph)
+
+                elif last_versions[i] == version:
+                    # Nothing is modified after last application
+                    continue
+
+                elif sub_rule.targets is None:
+                    graph, flag_changed = self._apply_sub_rule(sub_rule, graph)
+
+                else:
+                    nodes = _listup_dirty_nodes(graph, last_versions[i], sub_rule.targets, sub_rule.pattern_length)
+                    if len(nodes) == 0:
+                        last_versions[i] = version
+                        continue
+
+                    graph, flag_changed = self._apply_sub_rule(sub_rule, graph, nodes)
+
+                last_versions[i] = version
+
                 if flag_changed:
                     console.debug(f"[OptimizeRule] apply: {sub_rule.__class__.__name__}")
 
+                    if _node.get_modification_version() == version:
+                        # The graph is changed but no node is marked as modified (ex. only parameters are changed).
+                        # All rules have to be applied again to whole graph.
+                        last_versions.clear()
+
                 flag_retry |= flag_changed
 
             flag_totally_changed |= flag_retry
@@ -120,6 +232,43 @@ class OptimizeRuleGroup(OptimizeRule):
 
         return graph, flag_totally_changed
 
+    def _apply_sub_rule(self, sub_rule: "OptimizeRule", graph: Graph, nodes: Optional[List[Node]] = None) -> Tuple[Graph, bool]:
+        # Statistics of nested groups are recorded by each sub rules in the group.
+        flag_profile = profiler.is_enabled() and not isinstance(sub_rule, OptimizeRuleGroup)
+        if flag_profile:
+            start = time.perf_counter()
+
+        if nodes is None:
+            graph, flag_changed = sub_rule.optimize(graph)
+
+        else:
+            graph, flag_changed = sub_rule.optimize_nodes(graph, nodes)
+
+        if flag_profile:
+            profiler.record_rule(sub_rule.__class__.__name__, time.perf_counter() - start, flag_changed)
+
+        self._count_invocation(sub_rule)
+        return graph, flag_changed
+
+    def _flatten_sub_rules(self) -> List["OptimizeRule"]:
+        rules = []  # type: List[OptimizeRule]
+        for sub_rule in self.sub_rules:
+            if isinstance(sub_rule, OptimizeRuleGroup) and sub_rule.repeat and type(sub_rule).optimize is OptimizeRuleGroup.optimize:
+                if all(sub_rule.flags()):
+                    rules.extend(sub_rule._flatten_sub_rules())
+
+            else:
+                rules.append(sub_rule)
+
+        return rules
+
+    def _count_invocation(self, sub_rule: "OptimizeRule"):
+        if isinstance(sub_rule, OptimizeRuleGroup):
+            self.invocation_counts.update(sub_rule.invocation_counts)
+
+        else:
+            self.invocation_counts[sub_rule.__class__.__name__] += 1
+
     def append_sub_rule(self, rule: "OptimizeRule"):
         """append_sub_rule(rule)
 
@@ -129,3 +278,29 @@ class OptimizeRuleGroup(OptimizeRule):
             rule(:class:`~webdnn.OptimizeRule`): new sub rule
         """
         self.sub_rules.append(rule)
+
+
+def _listup_dirty_nodes(graph: Graph, version: int, targets: Iterable[traverse.Query], pattern_length: Optional[int]) -> List[Node]:
+    """
+    List up nodes which match any of targets and locate within :code:`pattern_length - 1` hops from the nodes modified after the
+    specified version. If :code:`pattern_length` is :code:`None`, all nodes which match any of targets are listed up when any node
+    is modified.
+    """
+    nodes = traverse.listup_nodes(graph)
+    if pattern_length is None:
+        return [n for n in nodes if any(traverse.check_match(n, query) for query in targets)]
+
+    dirty = set(n for n in nodes if n.modified_version > version)  # type: Set[Node]
+
+    frontier = list(dirty)
+    for _ in range(pattern_length - 1):
+        next_frontier = []
+        for n in frontier:
+            for n2 in n.prevs | n.nexts:
+                if n2 not in dirty:
+                    dirty.add(n2)
+                    next_frontier.append(n2)
+
+        frontier = next_frontier
+
+    return [n for n in nodes if n in dirty and any(traverse.check_match(n, query) for query in targets)]
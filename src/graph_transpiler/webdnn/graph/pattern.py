@@ -0,0 +1,341 @@
+"""
+Sub graph pattern matching.
+
+Optimize rules usually look for small sub structures (ex. :code:`Tensordot` followed by :code:`ElementwiseMul`) in a large graph.
+:class:`~webdnn.graph.pattern.NodeIndex` indexes nodes by their class and attribute types, and :class:`~webdnn.graph.pattern.Pattern`
+starts searching only from candidates of the most selective pattern node. Therefore, the cost of searching is proportional to the
+number of candidates, not to the size of graph.
+
+.. code-block:: python
+
+    pattern = Pattern()
+    tensordot = pattern.add(Tensordot)
+    h = pattern.add(Variable, predicate=lambda v: len(v.input_to) == 1, prevs=[tensordot])
+    mul = pattern.add(ElementwiseMul, prevs=[h])
+
+    for tensordot, h, mul in pattern.match(graph):
+        ...
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from webdnn.graph import node as _node
+from webdnn.graph import traverse
+from webdnn.graph.attribute import Attribute
+from webdnn.graph.graph import Graph
+from webdnn.graph.node import Node
+
+Predicate = Callable[[Node], bool]
+
+
+class NodeIndex:
+    """NodeIndex(graph)
+
+    Index of nodes in the graph keyed by node class and attribute type. Use :func:`NodeIndex.get(graph)<NodeIndex.get>` to reuse
+    the index until connection between any nodes is changed.
+
+    Because attributes can be added without changing connection, attribute types are indexed again when any node is modified
+    (see :func:`~webdnn.graph.node.Node.mark_modified`).
+
+    Args:
+        graph (:class:`~webdnn.Graph`): graph
+    """
+
+    def __init__(self, graph: Graph):
+        self.nodes = traverse.listup_nodes(graph)
+        self._position = {n: i for i, n in enumerate(self.nodes)}  # type: Dict[Node, int]
+        self._nodes_by_class = {}  # type: Dict[type, List[Node]]
+        self._cache = {}  # type: Dict[type, List[Node]]
+        self._nodes_by_attribute = {}  # type: Dict[type, List[Node]]
+        self._attribute_version = None  # type: Optional[int]
+
+        for n in self.nodes:
+            self._nodes_by_class.setdefault(n.__class__, []).append(n)
+
+    @staticmethod
+    def get(graph: Graph) -> "NodeIndex":
+        """get(graph)
+
+        Return the cached index of the graph if it's still valid, otherwise create new index.
+
+        Args:
+            graph (:class:`~webdnn.Graph`): graph
+
+        Returns:
+            (:class:`~webdnn.graph.pattern.NodeIndex`) the index
+        """
+        cache = getattr(graph, "_node_index_cache", None)
+        if cache is not None:
+            version, inputs, outputs, index = cache
+            if version == _node.get_structure_version() and inputs == tuple(graph.inputs) and outputs == tuple(graph.outputs):
+                return index
+
+        index = NodeIndex(graph)
+        graph._node_index_cache = (_node.get_structure_version(), tuple(graph.inputs), tuple(graph.outputs), index)
+        return index
+
+    def position(self, n: Node) -> int:
+        """position(n)
+
+        Return the position of the node in topological order.
+
+        Args:
+            n (:class:`~webdnn.graph.node.Node`): indexed node
+
+        Returns:
+            (int) the position
+        """
+        return self._position[n]
+
+    def find(self, query: traverse.Query) -> List[Node]:
+        """find(query)
+
+        Return nodes which match the query, in topological order.
+
+        Args:
+            query: node class or attribute type
+
+        Returns:
+            (list of :class:`~webdnn.graph.node.Node`) matched nodes
+        """
+        if issubclass(query, Attribute):
+            self._update_attribute_index()
+            table = self._nodes_by_attribute
+
+        else:
+            table = self._nodes_by_class
+
+        if query not in self._cache:
+            classes = [klass for klass in table.keys() if issubclass(klass, query)]
+            nodes = [n for klass in classes for n in table[klass]]
+            if len(classes) > 1:
+                nodes = sorted(set(nodes), key=self._position.__getitem__)
+
+            self._cache[query] = nodes
+
+        if issubclass(query, Attribute):
+            # attributes may be removed after indexed
+            return [n for n in self._cache[query] if traverse.check_attribute_match(n, query)]
+
+        return list(self._cache[query])
+
+    def _update_attribute_index(self):
+        version = _node.get_modification_version()
+        if self._attribute_version == version:
+            return
+
+        self._attribute_version = version
+        self._nodes_by_attribute = {}
+        for n in self.nodes:
+            for attr in n.attributes:
+                nodes = self._nodes_by_attribute.setdefault(attr.__class__, [])
+                if len(nodes) == 0 or nodes[-1] is not n:
+                    nodes.append(n)
+
+        for query in [query for query in self._cache.keys() if issubclass(query, Attribute)]:
+            del self._cache[query]
+
+
+def find_nodes(graph: Graph, query: traverse.Query) -> List[Node]:
+    """find_nodes(graph, query)
+
+    Return nodes in the graph which match the query, in topological order. It's same as
+    :code:`traverse.filter_nodes(traverse.listup_nodes(graph), query)`, but uses the cached
+    :class:`~webdnn.graph.pattern.NodeIndex`.
+
+    Args:
+        graph (:class:`~webdnn.Graph`): graph
+        query: node class or attribute type
+
+    Returns:
+        (list of :class:`~webdnn.graph.node.Node`) matched nodes
+    """
+    return NodeIndex.get(graph).find(query)
+
+
+class Pattern:
+    """Pattern()
+
+    Sub graph pattern. Each pattern node has a query (node class or attribute type) and optional predicate, and pattern nodes are
+    connected by edges in direction of computation. Any DAG can be described, including multiple inputs and outputs.
+
+    Matched nodes are distinct from each other, and each edge of pattern corresponds to a connection between matched nodes. Nodes
+    matched to a pattern node may have other connections which are not described in the pattern.
+    """
+
+    def __init__(self):
+        self._queries = []  # type: List[traverse.Query]
+        self._predicates = []  # type: List[Optional[Predicate]]
+        self._edges = []  # type: List[Tuple[int, int]]
+
+    @staticmethod
+    def sequence(queries: Sequence[traverse.Query]) -> "Pattern":
+        """sequence(queries)
+
+        Create the pattern of the sequence of nodes, same as the query of :func:`~webdnn.graph.traverse.search_sub_structure`.
+
+        Args:
+            queries (list of query): queries of each node
+
+        Returns:
+            (:class:`~webdnn.graph.pattern.Pattern`) the pattern
+        """
+        pattern = Pattern()
+        prev = None
+        for query in queries:
+            prev = pattern.add(query, prevs=[] if prev is None else [prev])
+
+        return pattern
+
+    def add(self, query: traverse.Query, predicate: Optional[Predicate] = None, prevs: Sequence[int] = (),
+            nexts: Sequence[int] = ()) -> int:
+        """add(query, predicate=None, prevs=(), nexts=())
+
+        Add a pattern node.
+
+        Args:
+            query: node class or attribute type
+            predicate (callable, optional): additional condition of the node
+            prevs (list of int): pattern nodes connected to this node as previous nodes
+            nexts (list of int): pattern nodes connected to this node as next nodes
+
+        Returns:
+            (int) index of the pattern node, which is also the position of matched node in each match
+        """
+        index = len(self._queries)
+        self._queries.append(query)
+        self._predicates.append(predicate)
+
+        for prev in prevs:
+            self.connect(prev, index)
+
+        for next in nexts:
+            self.connect(index, next)
+
+        return index
+
+    def connect(self, prev: int, next: int):
+        """connect(prev, next)
+
+        Add an edge between pattern nodes.
+
+        Args:
+            prev (int): index of previous pattern node
+            next (int): index of next pattern node
+        """
+        assert 0 <= prev < len(self._queries) and 0 <= next < len(self._queries) and prev != next, \
+            f"[Pattern] Invalid edge: ({prev}, {next})"
+
+        self._edges.append((prev, next))
+
+    def match(self, graph: Graph) -> Iterator[Tuple[Node, ...]]:
+        """match(graph)
+
+        Yield matches in the graph lazily. Each match is a tuple of nodes in order of pattern nodes.
+
+        The graph can be modified while iterating matches. Each match is verified with the current graph just before it's yielded,
+        so nodes which are removed or disconnected by previous modification are never yielded. Nodes created after the iteration
+        started may not be found.
+
+        Args:
+            graph (:class:`~webdnn.Graph`): graph
+
+        Returns:
+            (iterator of tuple of :class:`~webdnn.graph.node.Node`) matches
+        """
+        if len(self._queries) == 0:
+            return
+
+        index = NodeIndex.get(graph)
+        anchor = min(range(len(self._queries)), key=lambda i: len(index.find(self._queries[i])))
+        plan = self._make_plan(anchor)
+        bounds = set(graph.inputs + graph.outputs)
+
+        for n in index.find(self._queries[anchor]):
+            if len(n._prevs) == 0 and len(n._nexts) == 0 and n not in bounds:
+                # removed from the graph
+                continue
+
+            if not self._check_node(anchor, n):
+                continue
+
+            matched = [None] * len(self._queries)  # type: List[Optional[Node]]
+            matched[anchor] = n
+            for result in self._extend(plan, 1, matched):
+                if self._verify(result):
+                    yield tuple(result)
+
+    def _make_plan(self, anchor: int) -> List[Tuple[int, int, bool]]:
+        """
+        Returns the order to match pattern nodes as the list of :code:`(pattern node, matched pattern node, is_next)`. Each
+        pattern node is matched from candidates connected to the already matched pattern node.
+        """
+        plan = [(anchor, -1, False)]
+        visited = {anchor}
+        i = 0
+        while i < len(plan):
+            current = plan[i][0]
+            for prev, next in self._edges:
+                if prev == current and next not in visited:
+                    plan.append((next, current, True))
+                    visited.add(next)
+
+                elif next == current and prev not in visited:
+                    plan.append((prev, current, False))
+                    visited.add(prev)
+
+            i += 1
+
+        if len(plan) != len(self._queries):
+            raise ValueError("[Pattern] Pattern must be connected")
+
+        return plan
+
+    def _check_node(self, i: int, n: Node) -> bool:
+        predicate = self._predicates[i]
+        return traverse.check_match(n, self._queries[i]) and (predicate is None or predicate(n))
+
+    def _extend(self, plan: List[Tuple[int, int, bool]], step: int, matched: List[Optional[Node]]) -> Iterator[List[Node]]:
+        if step == len(plan):
+            yield list(matched)
+            return
+
+        i, base, is_next = plan[step]
+        candidates = matched[base]._nexts if is_next else matched[base]._prevs
+
+        for n in _unique(candidates):
+            if any(m is n for m in matched) or not self._check_node(i, n):
+                continue
+
+            matched[i] = n
+            if self._check_edges(i, matched):
+                yield from self._extend(plan, step + 1, matched)
+
+            matched[i] = None
+
+    def _check_edges(self, i: int, matched: List[Optional[Node]]) -> bool:
+        for prev, next in self._edges:
+            if (prev == i or next == i) and matched[prev] is not None and matched[next] is not None:
+                if not any(n is matched[next] for n in matched[prev]._nexts):
+                    return False
+
+        return True
+
+    def _verify(self, matched: List[Node]) -> bool:
+        for prev, next in self._edges:
+            if not any(n is matched[next] for n in matched[prev]._nexts):
+                return False
+
+        return all(self._check_node(i, n) for i, n in enumerate(matched))
+
+
+def _unique(nodes: List[Node]) -> List[Node]:
+    # an operator can take the same variable as multiple inputs
+    result = []
+    seen = set()
+    for n in nodes:
+        if n not in seen:
+            seen.add(n)
+            result.append(n)
+
+    return result
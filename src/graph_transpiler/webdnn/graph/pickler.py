@@ -0,0 +1,124 @@
+"""
+Pickle utility for transferring IR graph objects between processes.
+
+Standard :mod:`pickle` follows connections between nodes recursively, so pickling a deep graph raises RecursionError. Also
+:class:`~webdnn.graph.axis.Axis` is identified by the global table in each process, so axes created in other process cannot be
+restored as is.
+
+:func:`dumps` pickles nodes as references at first, and pickles the state of each node one by one after that. Axes are pickled as
+references too, and restored as the predefined axes (ex. :attr:`Axis.N<webdnn.graph.axis.Axis.N>`) or new axes which keep the
+equality between axes in the pickled object.
+"""
+
+import io
+import pickle
+from typing import Any, Dict, List
+
+from webdnn.graph.axis import Axis
+from webdnn.graph.node import Node
+
+
+def _predefined_axes() -> Dict[str, Axis]:
+    return {name: value for name, value in vars(Axis).items() if isinstance(value, Axis)}
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file):
+        super(_Pickler, self).__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.nodes = []  # type: List[Node]
+        self._node_index = {}  # type: Dict[int, int]
+        self._predefined_axis_names = {axis.id: name for name, axis in _predefined_axes().items()}
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Node):
+            index = self._node_index.get(id(obj), None)
+            if index is None:
+                index = len(self.nodes)
+                self._node_index[id(obj)] = index
+                self.nodes.append(obj)
+
+            return "node", index, obj.__class__
+
+        if isinstance(obj, Axis):
+            if obj.id in self._predefined_axis_names:
+                return "predefined_axis", self._predefined_axis_names[obj.id]
+
+            return "axis", obj.id, obj.name if obj.resolved else None
+
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file):
+        super(_Unpickler, self).__init__(file)
+        self.nodes = {}  # type: Dict[int, Node]
+        self._axes = {}  # type: Dict[int, Axis]
+        self._predefined_axes = _predefined_axes()
+
+    def persistent_load(self, pid):
+        if pid[0] == "node":
+            _, index, klass = pid
+            if index not in self.nodes:
+                self.nodes[index] = klass.__new__(klass)
+
+            return self.nodes[index]
+
+        if pid[0] == "predefined_axis":
+            return self._predefined_axes[pid[1]]
+
+        if pid[0] == "axis":
+            _, axis_id, name = pid
+            if axis_id not in self._axes:
+                self._axes[axis_id] = Axis(name)
+
+            return self._axes[axis_id]
+
+        raise pickle.UnpicklingError(f"Unsupported persistent id: {pid}")
+
+
+def dumps(obj: Any) -> bytes:
+    """dumps(obj)
+
+    Pickle the object which may contain IR graph objects.
+
+    Args:
+        obj: object
+
+    Returns:
+        (bytes) pickled data
+    """
+    f = io.BytesIO()
+    pickler = _Pickler(f)
+    pickler.dump(obj)
+
+    # Nodes found while pickling states are appended into `pickler.nodes`. Memo is shared over all `dump()` calls, so objects
+    # referred from multiple nodes are pickled only once.
+    i = 0
+    while i < len(pickler.nodes):
+        pickler.dump(pickler.nodes[i].__getstate__())
+        i += 1
+
+    return f.getvalue()
+
+
+def loads(data: bytes) -> Any:
+    """loads(data)
+
+    Unpickle the data pickled by :func:`~webdnn.graph.pickler.dumps`.
+
+    Args:
+        data (bytes): pickled data
+
+    Returns:
+        unpickled object
+    """
+    f = io.BytesIO(data)
+    unpickler = _Unpickler(f)
+    obj = unpickler.load()
+
+    i = 0
+    while i < len(unpickler.nodes):
+        unpickler.nodes[i].__setstate__(unpickler.load())
+        i += 1
+
+    return obj
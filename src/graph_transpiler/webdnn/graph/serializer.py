@@ -0,0 +1,381 @@
+"""
+Persistent file format of IR graph, used for passing graphs between conversion stages (ex. frontend and backend) running in different
+processes or machines.
+
+Unlike :mod:`~webdnn.graph.pickler`, the topology is stored as human-readable JSON, and all arrays (ex.
+:attr:`ConstantVariable.data<webdnn.graph.variables.constant_variable.ConstantVariable.data>`) are stored in single binary blob. When
+loading, the blob is mapped into memory by :class:`numpy.memmap`, so opening a graph with large constants costs only parsing the
+topology, and array data is read lazily when it's accessed.
+
+Layout (all integers are little-endian):
+
+.. code-block:: text
+
+    +-------+----------------+-----------------------+---------------------+---------------------+-------------+-----+------------+
+    | magic | version        | header_length         | blob_offset         | blob_length         | header      | pad | blob       |
+    | WDIR  | uint32         | uint64                | uint64              | uint64              | (UTF-8 JSON)|     | (aligned)  |
+    +-------+----------------+-----------------------+---------------------+---------------------+-------------+-----+------------+
+
+The header has following fields.
+
+- :code:`inputs`, :code:`outputs`: indices of graph input / output variables in :code:`nodes`
+- :code:`licenses`: :attr:`Graph.licenses<webdnn.Graph.licenses>`
+- :code:`nodes`: list of :code:`{"class": class name, "state": attributes of the node}`. Operators' parameters, variables' shape,
+  order and attributes, and connections are all included in the state.
+- :code:`objects`: other objects referred from nodes (ex. :class:`~webdnn.graph.attribute.Attribute`,
+  :class:`~webdnn.Order` and :class:`~webdnn.Placeholder`), in same format as :code:`nodes`.
+- :code:`axes`: list of axes. Predefined axes (ex. :attr:`Axis.N<webdnn.graph.axis.Axis.N>`) are stored by the name, and restored as
+  the predefined axes.
+- :code:`arrays`: list of :code:`{"dtype", "shape", "offset"}`, where :code:`offset` is byte offset in the blob.
+
+Values in states are encoded as JSON values, except following tagged objects: :code:`{"$node": index}`, :code:`{"$object": index}`,
+:code:`{"$axis": index}`, :code:`{"$array": index}`, :code:`{"$tuple": [...]}`, :code:`{"$set": [...]}`,
+:code:`{"$dict": [[key, value], ...]}` (dictionary which has non-string keys), :code:`{"$enum": [class name, member name]}`,
+:code:`{"$class": class name}` and :code:`{"$scalar": [dtype, value]}` (numpy scalar).
+
+Like :mod:`pickle`, loading a file instantiates classes written in it. Don't load files from untrusted sources.
+"""
+
+import importlib
+import io
+import json
+import struct
+from enum import Enum
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, List, Tuple, Union
+
+import numpy as np
+
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.node import Node
+
+MAGIC = b"WDIR"
+VERSION = 1
+ALIGNMENT = 64
+
+_PREAMBLE = struct.Struct("<4sIQQQ")
+
+
+def _align(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _predefined_axes() -> Dict[str, Axis]:
+    return {name: value for name, value in vars(Axis).items() if isinstance(value, Axis)}
+
+
+def _class_name(klass: type) -> str:
+    return f"{klass.__module__}:{klass.__qualname__}"
+
+
+@lru_cache(maxsize=None)
+def _find_class(name: str) -> type:
+    module_name, qualname = name.split(":")
+    value = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        value = getattr(value, attr)
+
+    return value
+
+
+class _Encoder:
+    def __init__(self):
+        self.nodes = []  # type: List[Node]
+        self.objects = []  # type: List[object]
+        self.axes = []  # type: List[Dict[str, Any]]
+        self.arrays = []  # type: List[Dict[str, Any]]
+        self.array_data = []  # type: List[np.ndarray]
+        self.blob_length = 0
+        self._node_index = {}  # type: Dict[int, int]
+        self._object_index = {}  # type: Dict[int, int]
+        self._axis_index = {}  # type: Dict[int, int]
+        self._array_index = {}  # type: Dict[int, int]
+        self._predefined_axis_names = {axis.id: name for name, axis in _predefined_axes().items()}
+
+    def encode_node(self, n: Node) -> Dict[str, int]:
+        index = self._node_index.get(id(n), None)
+        if index is None:
+            index = len(self.nodes)
+            self._node_index[id(n)] = index
+            self.nodes.append(n)
+
+        return {"$node": index}
+
+    def __call__(self, value: Any) -> Any:
+        # enums and numpy scalars may be subclasses of int or float
+        if isinstance(value, Enum):
+            return {"$enum": [_class_name(value.__class__), value.name]}
+
+        if isinstance(value, np.generic):
+            return {"$scalar": [value.dtype.str, value.item()]}
+
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+
+        if isinstance(value, Node):
+            return self.encode_node(value)
+
+        if isinstance(value, Axis):
+            return {"$axis": self._encode_axis(value)}
+
+        if isinstance(value, np.ndarray):
+            return {"$array": self._encode_array(value)}
+
+        if isinstance(value, type):
+            return {"$class": _class_name(value)}
+
+        if isinstance(value, list):
+            return [self(v) for v in value]
+
+        if isinstance(value, tuple):
+            return {"$tuple": [self(v) for v in value]}
+
+        if isinstance(value, (set, frozenset)):
+            return {"$set": [self(v) for v in value]}
+
+        if isinstance(value, dict):
+            if all(isinstance(k, str) and not k.startswith("$") for k in value.keys()):
+                return {k: self(v) for k, v in value.items()}
+
+            return {"$dict": [[self(k), self(v)] for k, v in value.items()]}
+
+        if hasattr(value, "__dict__") and not callable(value):
+            index = self._object_index.get(id(value), None)
+            if index is None:
+                index = len(self.objects)
+                self._object_index[id(value)] = index
+                self.objects.append(value)
+
+            return {"$object": index}
+
+        raise TypeError(f"[serializer] Object of type '{type(value).__name__}' cannot be serialized: {value}")
+
+    def _encode_axis(self, axis: Axis) -> int:
+        index = self._axis_index.get(axis.id, None)
+        if index is None:
+            index = len(self.axes)
+            self._axis_index[axis.id] = index
+            if axis.id in self._predefined_axis_names:
+                self.axes.append({"predefined": self._predefined_axis_names[axis.id]})
+
+            else:
+                self.axes.append({"name": axis.name if axis.resolved else None})
+
+        return index
+
+    def _encode_array(self, array: np.ndarray) -> int:
+        index = self._array_index.get(id(array), None)
+        if index is None:
+            if array.dtype.hasobject:
+                raise TypeError(f"[serializer] Array of objects cannot be serialized: {array}")
+
+            index = len(self.arrays)
+            self._array_index[id(array)] = index
+
+            offset = _align(self.blob_length)
+            self.blob_length = offset + array.nbytes
+            self.arrays.append({"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset})
+            self.array_data.append(array)
+
+        return index
+
+
+def _encode(graph: Graph) -> Tuple[Dict[str, Any], _Encoder]:
+    encoder = _Encoder()
+    header = {
+        "inputs": [encoder.encode_node(v)["$node"] for v in graph.inputs],
+        "outputs": [encoder.encode_node(v)["$node"] for v in graph.outputs],
+        "licenses": dict(graph.licenses),
+    }
+
+    # Nodes and objects found while encoding states are appended into the lists, and encoded one by one. Therefore, deep graphs are
+    # encoded without recursion.
+    nodes = []
+    objects = []
+    while len(nodes) < len(encoder.nodes) or len(objects) < len(encoder.objects):
+        while len(nodes) < len(encoder.nodes):
+            n = encoder.nodes[len(nodes)]
+            nodes.append({"class": _class_name(n.__class__), "state": encoder(n.__getstate__())})
+
+        while len(objects) < len(encoder.objects):
+            obj = encoder.objects[len(objects)]
+            objects.append({"class": _class_name(obj.__class__), "state": encoder(obj.__dict__)})
+
+    header["nodes"] = nodes
+    header["objects"] = objects
+    header["axes"] = encoder.axes
+    header["arrays"] = encoder.arrays
+    return header, encoder
+
+
+class _Decoder:
+    def __init__(self, header: Dict[str, Any], blob: Union[np.ndarray, bytes]):
+        predefined_axes = _predefined_axes()
+
+        self.nodes = [_find_class(n["class"]).__new__(_find_class(n["class"])) for n in header["nodes"]]
+        self.objects = [_find_class(o["class"]).__new__(_find_class(o["class"])) for o in header["objects"]]
+        self.axes = [predefined_axes[a["predefined"]] if "predefined" in a else Axis(a["name"]) for a in header["axes"]]
+        self.arrays = [np.ndarray(a["shape"], dtype=np.dtype(a["dtype"]), buffer=blob, offset=a["offset"]) for a in header["arrays"]]
+
+    def __call__(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self(v) for v in value]
+
+        if not isinstance(value, dict):
+            return value
+
+        if len(value) == 1:
+            key, body = next(iter(value.items()))
+            if key == "$node":
+                return self.nodes[body]
+
+            if key == "$object":
+                return self.objects[body]
+
+            if key == "$axis":
+                return self.axes[body]
+
+            if key == "$array":
+                return self.arrays[body]
+
+            if key == "$scalar":
+                return np.dtype(body[0]).type(body[1])
+
+            if key == "$enum":
+                return getattr(_find_class(body[0]), body[1])
+
+            if key == "$class":
+                return _find_class(body)
+
+            if key == "$tuple":
+                return tuple(self(v) for v in body)
+
+            if key == "$set":
+                return set(self(v) for v in body)
+
+            if key == "$dict":
+                return {self(k): self(v) for k, v in body}
+
+        return {k: self(v) for k, v in value.items()}
+
+
+def _decode(header: Dict[str, Any], blob: Union[np.ndarray, bytes]) -> Graph:
+    decoder = _Decoder(header, blob)
+
+    # States are restored after all instances are created, because states refer each other.
+    for n, state in zip(decoder.nodes, header["nodes"]):
+        n.__setstate__(decoder(state["state"]))
+
+    for obj, state in zip(decoder.objects, header["objects"]):
+        obj.__dict__.update(decoder(state["state"]))
+
+    graph = Graph([decoder.nodes[i] for i in header["inputs"]], [decoder.nodes[i] for i in header["outputs"]])
+    graph.licenses = dict(header["licenses"])
+    return graph
+
+
+def _write(graph: Graph, f: BinaryIO):
+    header, encoder = _encode(graph)
+    header_data = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    blob_offset = _align(_PREAMBLE.size + len(header_data))
+    f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header_data), blob_offset, encoder.blob_length))
+    f.write(header_data)
+    f.write(b"\0" * (blob_offset - _PREAMBLE.size - len(header_data)))
+
+    # arrays are written one by one without concatenating them in memory
+    position = 0
+    for info, array in zip(encoder.arrays, encoder.array_data):
+        f.write(b"\0" * (info["offset"] - position))
+        f.write(np.ascontiguousarray(array).data)
+        position = info["offset"] + array.nbytes
+
+
+def dumps(graph: Graph) -> bytes:
+    """dumps(graph)
+
+    Serialize the graph into bytes in IR file format.
+
+    Args:
+        graph (:class:`~webdnn.Graph`): graph
+
+    Returns:
+        (bytes) serialized graph
+    """
+    f = io.BytesIO()
+    _write(graph, f)
+    return f.getvalue()
+
+
+def save(graph: Graph, filename: str):
+    """save(graph, filename)
+
+    Save the graph into the file in IR file format.
+
+    Args:
+        graph (:class:`~webdnn.Graph`): graph
+        filename (str): file name
+    """
+    with open(filename, "wb") as f:
+        _write(graph, f)
+
+
+def _parse_preamble(data: Union[bytes, np.ndarray]) -> Tuple[int, int, int]:
+    if len(data) < _PREAMBLE.size:
+        raise ValueError("[serializer] Data is too short to be an IR file")
+
+    magic, version, header_length, blob_offset, blob_length = _PREAMBLE.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"[serializer] Invalid magic: {magic!r}")
+
+    if version != VERSION:
+        raise ValueError(f"[serializer] Unsupported version: {version}")
+
+    return header_length, blob_offset, blob_length
+
+
+def loads(data: bytes) -> Graph:
+    """loads(data)
+
+    Deserialize the graph from bytes serialized by :func:`~webdnn.graph.serializer.dumps`. Arrays share memory with :code:`data`, and
+    they are read-only.
+
+    Args:
+        data (bytes): serialized graph
+
+    Returns:
+        (:class:`~webdnn.Graph`) deserialized graph
+    """
+    header_length, blob_offset, blob_length = _parse_preamble(data)
+    header = json.loads(bytes(data[_PREAMBLE.size:_PREAMBLE.size + header_length]).decode("utf-8"))
+    blob = np.frombuffer(data, dtype=np.uint8, count=blob_length, offset=blob_offset)
+    return _decode(header, blob)
+
+
+def load(filename: str, mmap: bool = True) -> Graph:
+    """load(filename, mmap=True)
+
+    Load the graph from the file saved by :func:`~webdnn.graph.serializer.save`.
+
+    Args:
+        filename (str): file name
+        mmap (bool): If :code:`True`, the file is mapped into memory by :class:`numpy.memmap` and arrays in the graph are read-only
+            views of it, so array data is not read until it's accessed. Otherwise, whole file is read into memory.
+
+    Returns:
+        (:class:`~webdnn.Graph`) loaded graph
+    """
+    if not mmap:
+        with open(filename, "rb") as f:
+            return loads(f.read())
+
+    with open(filename, "rb") as f:
+        header_length, blob_offset, blob_length = _parse_preamble(f.read(_PREAMBLE.size))
+        header = json.loads(f.read(header_length).decode("utf-8"))
+
+    if blob_length == 0:
+        return _decode(header, b"")
+
+    blob = np.memmap(filename, dtype=np.uint8, mode="r", offset=blob_offset, shape=(blob_length,))
+    return _decode(header, blob)
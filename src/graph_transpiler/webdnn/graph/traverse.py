@@ -35,23 +35,24 @@ def check_node_type_match(node: Node, query: Type[Node]):
     return isinstance(node, query)
 
 
-def search_sub_structure(graph: Graph, query: List[Query]) -> List[List[Operator]]:
-    matches: List[List[Operator]] = []
-    queue: List[Tuple(Node, int, List[Node])] = [(node, 0, []) for node in listup_nodes(graph)]
+def search_sub_structure(graph: Graph, query: List[Query]) -> List[List[Node]]:
+    """search_sub_structure(graph, query)
 
-    while len(queue) > 0:
-        node, index, matched = queue.pop(0)
-        if check_match(node, query[index]):
-            matched.append(node)
+    List up all sequences of nodes which match the query, in topological order of the first node. Matches are searched by
+    :class:`~webdnn.graph.pattern.Pattern`. To search DAG patterns or to iterate matches lazily, use it directly.
 
-            if index == len(query) - 1:
-                matches.append(matched)
+    Args:
+        graph (:class:`~webdnn.Graph`): graph
+        query (list of query): queries of each node in the sequence
 
-            else:
-                for next in node.nexts:
-                    queue.append((next, index + 1, list(matched)))
+    Returns:
+        (list of list of :class:`~webdnn.graph.node.Node`) matched sequences
+    """
+    from webdnn.graph.pattern import NodeIndex, Pattern
 
-    return matches
+    index = NodeIndex.get(graph)
+    matches = [list(match) for match in Pattern.sequence(query).match(graph)]
+    return sorted(matches, key=lambda match: index.position(match[0]))
 
 
 T = TypeVar("T", bound=Node)
@@ -87,6 +88,11 @@ def listup_nodes(graph: Graph, ignore_internal_input_bound=False, ignore_interna
       # >>> ignore_internal_input_bound=True,  ignore_internal_output_bound=True  : [1, 2, 3, 4, 5, 6]
     """
 
+    cache_key = (ignore_internal_input_bound, ignore_internal_output_bound)
+    result = graph.get_cached_topological_order(cache_key)
+    if result is not None:
+        return result
+
     input_bound = graph.inputs
     output_bound = graph.outputs
 
@@ -162,6 +168,7 @@ def listup_nodes(graph: Graph, ignore_internal_input_bound=False, ignore_interna
             stack.append(node)
             stack += unresolved_prev
 
+    graph.set_cached_topological_order(cache_key, result)
     return result
 
 
@@ -1,11 +1,11 @@
-from typing import Union, List, Set, Tuple, Sequence
+from typing import AbstractSet, Optional, Union, List, Tuple, Sequence
 
 import numpy as np
 
 import webdnn.graph
 from webdnn.graph import operator
 from webdnn.graph.axis import AxisKeyDict
-from webdnn.graph.node import Node
+from webdnn.graph.node import Node, _update_structure_version
 from webdnn.graph.order import Order
 from webdnn.graph.placeholder import Placeholder
 from webdnn.util.misc import mul
@@ -30,7 +30,11 @@ class Variable(Node):
         #   x1 -+
         #       +-[ElementwiseAdd]-> h -[ElementwiseAbs]-> y
         #   x2 -+
+
+    Once all placeholders in the shape are resolved, :attr:`shape` and :attr:`size` are cached until the order is changed.
     """
+    __slots__ = ("_shape", "_order", "_shape_cache", "_size_cache")
+    _cache_slots = ("_shape_cache", "_size_cache")
 
     def __init__(self, shape: Sequence[Union[int, Placeholder]], order: Order):
         super().__init__()
@@ -39,21 +43,30 @@ class Variable(Node):
 
         self._shape = tuple(shape)  # type: Tuple[Union[int, Placeholder]]
         self._order = order  # type: Order
+        self._shape_cache = None  # type: Optional[Tuple[int, ...]]
+        self._size_cache = None  # type: Optional[int]
 
     @property
     def shape(self) -> Tuple[Union[int, Placeholder], ...]:
         """variable's shape"""
-        return tuple(Placeholder.to_int(v) for v in self._shape)
+        if self._shape_cache is not None:
+            return self._shape_cache
+
+        shape = tuple(Placeholder.to_int(v) for v in self._shape)
+        if all(isinstance(v, int) for v in shape):
+            self._shape_cache = shape
+
+        return shape
 
     @property
-    def input_to(self) -> Set["operator.Operator"]:
-        """operators which this variable is input to"""
-        return set(self.nexts)
+    def input_to(self) -> AbstractSet["operator.Operator"]:
+        """operators which this variable is input to (read-only)"""
+        return self.nexts
 
     @property
     def output_from(self) -> "operator.Operator":
         """operator which this variable is output from"""
-        return None if len(self.prevs) == 0 else list(self.prevs)[0]
+        return self._prevs[0] if len(self._prevs) > 0 else None
 
     @property
     def order(self) -> Order:
@@ -68,11 +81,19 @@ class Variable(Node):
     @name.setter
     def name(self, name: str):
         self.parameters["name"] = name
+        _update_structure_version()
 
     @property
     def size(self) -> Union[int, Placeholder]:
         """number of elements"""
-        return Placeholder.to_int(mul(self.shape))
+        if self._size_cache is not None:
+            return self._size_cache
+
+        size = Placeholder.to_int(mul(self.shape))
+        if isinstance(size, int):
+            self._size_cache = size
+
+        return size
 
     @property
     def ndim(self):
@@ -117,6 +138,9 @@ class Variable(Node):
                                       f"variable={self}, shape_dict[{axis}]={size}, new_order={order}."
         self._order = order
         self._shape = new_shape
+        self._shape_cache = None
+        self._size_cache = None
+        self.mark_modified()
 
         return self
 
@@ -3,6 +3,7 @@ from webdnn.optimizer.sub_rules.concat_zero_padding import ConcatZeroPadding
 from webdnn.optimizer.sub_rules.constant_folding import ConstantFolding
 from webdnn.optimizer.sub_rules.conv_filter_pruning import ConvFilterPruning
 from webdnn.optimizer.sub_rules.convolution2d_svd_compression import Convolution2DSvdCompression
+from webdnn.optimizer.sub_rules.fold_axiswise_affine_into_weight import FoldAxiswiseAffineIntoWeight
 from webdnn.optimizer.sub_rules.remove_no_effect_operator import RemoveNoEffectOperator
 from webdnn.optimizer.sub_rules.remove_redundant_operator import RemoveRedundantOperator
 from webdnn.optimizer.sub_rules.replace_scalar_operator import ReplaceScalarOperator
@@ -23,6 +24,7 @@ class GeneralOptimizeRule(OptimizeRuleGroup):
             SimplifySplitAxis(),
             SimplifyAssociativeOperator(),
             ConcatZeroPadding(),
+            FoldAxiswiseAffineIntoWeight(),
             ConstantFolding(),
             Convolution2DSvdCompression(),
             ConvFilterPruning(),
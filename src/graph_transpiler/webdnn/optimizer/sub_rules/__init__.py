@@ -4,6 +4,8 @@ from webdnn.optimizer.sub_rules import conv_filter_pruning
 from webdnn.optimizer.sub_rules import convolution2d_svd_compression
 from webdnn.optimizer.sub_rules import dump_graph
 from webdnn.optimizer.sub_rules import elementwise_kernel_fusion
+from webdnn.optimizer.sub_rules import fold_axiswise_affine_into_weight
+from webdnn.optimizer.sub_rules import fuse_tensordot_epilogue
 from webdnn.optimizer.sub_rules import merge_tensordot_and_elementwise_mul
 from webdnn.optimizer.sub_rules import remove_no_effect_operator
 from webdnn.optimizer.sub_rules import remove_redundant_operator
@@ -1,7 +1,8 @@
-from typing import Tuple
+from typing import List, Tuple
 
 from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
+from webdnn.graph.node import Node
 from webdnn.graph.operator import Operator
 from webdnn.graph.optimize_rule import OptimizeRule
 from webdnn.graph.variables.constant_variable import ConstantVariable
@@ -12,6 +13,8 @@ class ConstantFolding(OptimizeRule):
     """
     Calculate constant expression in compile time
     """
+    targets = [Operator]
+    pattern_length = 2
 
     def flags(self):
         return [
@@ -32,3 +35,21 @@ class ConstantFolding(OptimizeRule):
                 flag_changed = True
 
         return graph, flag_changed
+
+    def optimize_nodes(self, graph: Graph, nodes: List[Node]) -> Tuple[Graph, bool]:
+        flag_changed = False
+
+        for op in traverse.filter_nodes(nodes, Operator):  # type: Operator
+            if getattr(op.fold_constance, '__func__', None) is Operator.fold_constance:
+                # fold_constance is not implemented
+                continue
+
+            if len(op.outputs) == 0:
+                # Already removed
+                continue
+
+            if all(isinstance(v, ConstantVariable) for v in op.inputs.values()):
+                op.fold_constance(graph)
+                flag_changed = True
+
+        return graph, flag_changed
@@ -117,6 +117,7 @@ class ConvFilterPruning(OptimizeRule):
             flag_changed = True
             c2_removed_list = np.argsort(filter_weights, axis=0)[:(attr.limit - attr.removed)].tolist()
             attr.removed += len(c2_removed_list)
+            conv1.mark_modified()
 
             for c2_removed in sorted(c2_removed_list, reverse=True):
                 new_w1 = ConstantVariable(np.delete(w1.data, c2_removed, axis=w1.order.axes_dict[Axis.N]), w1.order)
@@ -152,6 +152,8 @@ class Convolution2DSvdCompression(OptimizeRule):
 
             conv1.attributes.add(Convolution2DSvdCompressed(conv1))
             conv2.attributes.add(Convolution2DSvdCompressed(conv2))
+            conv1.mark_modified()
+            conv2.mark_modified()
             OptimizeRule.replace_variable(graph, y_new.transpose_like(y), y)
 
             flag_changed = True
@@ -0,0 +1,180 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from webdnn.graph import traverse
+from webdnn.graph.axis import Axis, AxisKeyDict
+from webdnn.graph.graph import Graph
+from webdnn.graph.operator import Operator
+from webdnn.graph.operators.attributes.tensordot_epilogue import TensordotEpilogue
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.deconvolution2d import Deconvolution2D
+from webdnn.graph.operators.elementwise_add import ElementwiseAdd
+from webdnn.graph.operators.elementwise_mul import ElementwiseMul
+from webdnn.graph.operators.linear import Linear
+from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.optimize_rule import OptimizeRule
+from webdnn.graph.order import Order
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import flags
+
+
+def _get_weight(op: Operator) -> Tuple[Optional[ConstantVariable], AxisKeyDict[Axis]]:
+    """
+    Returns the constant weight variable of the operator and the mapping from axes of the output variable to corresponding axes of
+    the weight. If the operator has no constant weight, :code:`None` is returned.
+    """
+    if isinstance(op, (Convolution2D, Deconvolution2D, Linear)):
+        w = op.inputs["w"]
+        if not isinstance(w, ConstantVariable):
+            return None, AxisKeyDict()
+
+        return w, AxisKeyDict([Axis.C], [Axis.N])
+
+    elif isinstance(op, Tensordot):
+        if op.has_attribute(TensordotEpilogue):
+            # output is not the product of the weight any more
+            return None, AxisKeyDict()
+
+        A = op.inputs["A"]
+        B = op.inputs["B"]
+        if isinstance(A, ConstantVariable) and not isinstance(B, ConstantVariable):
+            axes = [a for a in A.order.axes if a not in op.axes[0]]
+            return A, AxisKeyDict(axes, axes)
+
+        elif isinstance(B, ConstantVariable) and not isinstance(A, ConstantVariable):
+            axes = [a for a in B.order.axes if a not in op.axes[1]]
+            return B, AxisKeyDict(axes, axes)
+
+        else:
+            return None, AxisKeyDict()
+
+    else:
+        return None, AxisKeyDict()
+
+
+def _get_coefficient(op: Operator, x: Variable, axes: Tuple[Axis, ...]) -> Optional[np.ndarray]:
+    """
+    Returns the other constant operand of the binary elementwise operator as an array in order of :code:`axes`. If the operand is
+    not constant or not broadcasted along axes other than :code:`axes`, :code:`None` is returned.
+    """
+    if len(op.inputs) != 2:
+        return None
+
+    x0, x1 = op.inputs["x0"], op.inputs["x1"]
+    if x0 is x and isinstance(x1, ConstantVariable):
+        c = x1
+
+    elif x1 is x and isinstance(x0, ConstantVariable):
+        c = x0
+
+    else:
+        return None
+
+    if any(a not in x.order.axes for a in c.order.axes):
+        return None
+
+    if any(c.shape_dict[a] != 1 for a in c.order.axes if a not in axes):
+        return None
+
+    return c.copy().change_order(Order(list(axes))).data
+
+
+class FoldAxiswiseAffineIntoWeight(OptimizeRule):
+    """
+    Fold constant per-channel scale and bias following a weighted operator into the weight and a single bias vector. Batch
+    normalization is typically converted into such chain by frontends.
+
+    ... code-block:: text
+
+        x -+
+           +-{Convolution2D}- h1 -{mul}- h2 -{add}- h3 -{mul}- y
+        w -+                   s1 -+      b1 -+      s2 -+
+
+    In above sub structure, the chain is computed as :code:`h1 * s1 * s2 + b1 * s2`. Therefore it can be simplified as follows,
+
+    ... code-block:: text
+
+                      x -+
+                         +-{Convolution2D}- h1 -{add}- y
+        w * (s1 * s2) ---+          b1 * s2 ---+
+
+    :class:`~webdnn.graph.operators.convolution2d.Convolution2D`, :class:`~webdnn.graph.operators.deconvolution2d.Deconvolution2D`,
+    :class:`~webdnn.graph.operators.linear.Linear` and :class:`~webdnn.graph.operators.tensordot.Tensordot` with constant weight
+    are supported. Coefficients must be broadcasted along all axes except output channel axes, and each intermediate variable must
+    be consumed only by the next operator. If the weight is shared with other operators, new weight variable is created.
+    """
+    targets = [Convolution2D, Deconvolution2D, Linear, Tensordot, ElementwiseAdd, ElementwiseMul]
+    pattern_length = None  # the chain of elementwise operators can be arbitrarily long
+
+    def flags(self):
+        return [
+            flags.optimize.OPTIMIZE,
+            flags.optimize.FOLD_AXISWISE_AFFINE_INTO_WEIGHT,
+        ]
+
+    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
+        flag_changed = False
+
+        for op in traverse.listup_operators(graph):
+            w, axes_map = _get_weight(op)
+            if w is None:
+                continue
+
+            h = list(op.outputs.values())[0]
+            axes = tuple(a for a in h.order.axes if a in axes_map)
+            if len(axes) == 0 or any(a not in w.order.axes for a in axes_map.values()):
+                continue
+
+            scale = np.ones([h.shape_dict[a] for a in axes], dtype=np.float32)
+            bias = np.zeros([h.shape_dict[a] for a in axes], dtype=np.float32)
+            flag_bias = False
+            chain = []
+
+            y = h
+            while y not in graph.outputs and len(y.input_to) == 1:
+                next_op = list(y.input_to)[0]
+                if not isinstance(next_op, (ElementwiseAdd, ElementwiseMul)):
+                    break
+
+                next_y = next_op.outputs["y"]
+                if next_y.order != y.order or next_y.shape != y.shape:
+                    break
+
+                c = _get_coefficient(next_op, y, axes)
+                if c is None:
+                    break
+
+                if isinstance(next_op, ElementwiseMul):
+                    scale = scale * c
+                    bias = bias * c
+
+                else:
+                    bias = bias + c
+                    flag_bias = True
+
+                chain.append(next_op)
+                y = next_y
+
+            if len(chain) == 0 or (len(chain) == 1 and flag_bias):
+                # nothing to be folded
+                continue
+
+            flag_changed = True
+
+            # scale is multiplied along corresponding axes of the weight
+            w_scale = ConstantVariable(scale, Order([axes_map[a] for a in axes])).change_order(w.order)
+            op.replace_input(w, ConstantVariable(w.data * w_scale.data, w.order))
+
+            for chain_op in chain:
+                chain_op.remove_all()
+
+            if flag_bias:
+                h_new = h + ConstantVariable(bias, Order(list(axes)))
+                OptimizeRule.replace_variable(graph, h_new, y)
+
+            else:
+                OptimizeRule.replace_variable(graph, h, y)
+
+        return graph, flag_changed
@@ -0,0 +1,112 @@
+from typing import Callable, Tuple
+
+from webdnn.graph import traverse
+from webdnn.graph.graph import Graph
+from webdnn.graph.operator import Operator
+from webdnn.graph.operators.attributes.tensordot_epilogue import TensordotEpilogue
+from webdnn.graph.operators.elementwise import Elementwise
+from webdnn.graph.operators.fused_elementwise import FusedElementwise
+from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.optimize_rule import OptimizeRule
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import flags
+
+
+def _check_broadcastable(x: Variable, C: Variable) -> bool:
+    """
+    Check whether :code:`x` is broadcasted to :code:`C` along leading axes of :code:`C`, that is, axes of :code:`x` whose size is not
+    :code:`1` are same as trailing axes of :code:`C`. Then the element of :code:`x` is accessed as :code:`x[index % x.size]`.
+    """
+    if x.order == C.order and x.shape == C.shape:
+        return True
+
+    if not Placeholder.check_resolved(x.size):
+        return False
+
+    axes = [a for a in x.order.axes if x.shape_dict[a] != 1]
+    if len(axes) == 0:
+        return True
+
+    if len(axes) > C.ndim or tuple(axes) != C.order.axes[-len(axes):]:
+        return False
+
+    return all(x.shape_dict[a] == C.shape_dict[a] for a in axes)
+
+
+class FuseTensordotEpilogue(OptimizeRule):
+    """FuseTensordotEpilogue(is_supported=None)
+
+    Fuse a chain of elementwise operators following tensordot into the tensordot kernel as
+    :class:`~webdnn.graph.operators.attributes.tensordot_epilogue.TensordotEpilogue`. Bias, activation and scaling are applied
+    before the result is stored, and one read/write pass of the tensordot output is removed.
+
+    ... code-block:: text
+
+        x -+
+           +-{Tensordot}- h1 -{ElementwiseAdd}- h2 -{Relu}- y    =>   x -+
+        w -+                      |                                      +-{Tensordot (epilogue: ElementwiseAdd, Relu)}- y
+                           bias --+                                   w -+
+                                                                    bias-+
+
+    Operator is fused if all following conditions are satisfied:
+
+    - The tensordot output is consumed only by the operator, and it's not an output of the graph.
+    - The operator is elementwise operator and supported by the backend.
+    - The output of the operator has same shape and order as the tensordot output.
+    - Other inputs of the operator are broadcasted along leading axes of the tensordot output (ex. bias vector of output channels).
+
+    Args:
+        is_supported (callable, optional): function which returns whether the backend can compute the operator in the epilogue.
+            If :code:`None`, all elementwise operators are fused.
+    """
+
+    def __init__(self, is_supported: Callable[[Elementwise], bool] = None):
+        self.is_supported = is_supported
+
+    def flags(self):
+        return [
+            flags.optimize.OPTIMIZE,
+            flags.optimize.TENSORDOT_EPILOGUE_FUSION
+        ]
+
+    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
+        flag_changed = False
+
+        for tensordot in traverse.filter_nodes(traverse.listup_operators(graph), Tensordot):  # type: Tensordot
+            if isinstance(tensordot.inputs["A"], ConstantVariable) and isinstance(tensordot.inputs["B"], ConstantVariable):
+                # It will be folded as constant
+                continue
+
+            while True:
+                C = tensordot.outputs["C"]
+                if C in graph.outputs or len(C.input_to) != 1:
+                    break
+
+                op = list(C.input_to)[0]
+                if not self._check_fusible(op, C):
+                    break
+
+                TensordotEpilogue.get(tensordot).append(op)
+                flag_changed = True
+
+        return graph, flag_changed
+
+    def _check_fusible(self, op: Operator, C: Variable) -> bool:
+        if not isinstance(op, Elementwise) or isinstance(op, FusedElementwise):
+            return False
+
+        y = op.outputs["y"]
+        if y.order != C.order or y.shape != C.shape:
+            return False
+
+        xs = list(op.inputs.values())
+        if len(set(xs)) != len(xs):
+            # same variable is used multiple times
+            return False
+
+        if any(x is not C and not _check_broadcastable(x, C) for x in xs):
+            return False
+
+        return self.is_supported is None or self.is_supported(op)
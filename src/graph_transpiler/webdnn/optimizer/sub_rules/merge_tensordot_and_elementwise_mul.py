@@ -1,10 +1,11 @@
 from typing import Tuple
 
-from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
+from webdnn.graph.operators.attributes.tensordot_epilogue import TensordotEpilogue
 from webdnn.graph.operators.elementwise_mul import ElementwiseMul
 from webdnn.graph.operators.tensordot import Tensordot
 from webdnn.graph.optimize_rule import OptimizeRule
+from webdnn.graph.pattern import Pattern
 from webdnn.graph.variable import Variable
 from webdnn.graph.variables.constant_variable import ConstantVariable
 from webdnn.util import flags
@@ -38,13 +39,16 @@ class MergeTensordotAndElementwiseMul(OptimizeRule):
 
     def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
         flag_changed = False
-        matches = traverse.search_sub_structure(graph, [Tensordot, Variable, ElementwiseMul, Variable])
-        while len(matches) > 0:
-            tensordot, h, elementwise_mul, y = matches.pop()  # type: Tensordot, Variable, ElementwiseMul, Variable
+        pattern = Pattern.sequence([Tensordot, Variable, ElementwiseMul, Variable])
+        for tensordot, h, elementwise_mul, y in pattern.match(graph):  # type: Tensordot, Variable, ElementwiseMul, Variable
             if len(h.input_to) != 1:
                 # h will be removed by this optimization rule
                 continue
 
+            if tensordot.has_attribute(TensordotEpilogue):
+                # h is not the product of w1 any more
+                continue
+
             if isinstance(tensordot.inputs["A"], ConstantVariable):
                 w1 = tensordot.inputs["A"]
                 reduced_axes = tensordot.axes[0]
@@ -1,9 +1,10 @@
-from typing import Tuple, Type
+from typing import List, Tuple, Type
 
 import numpy as np
 
 from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
+from webdnn.graph.node import Node
 from webdnn.graph.operator import Operator
 from webdnn.graph.operators.broadcast import Broadcast
 from webdnn.graph.operators.elementwise import Elementwise
@@ -56,6 +57,10 @@ def _remove_binary_elementwise(graph: Graph, op: Operator, v: Variable):
 class RemoveNoEffectOperatorBase(OptimizeRule):
     pattern = Operator  # type: Type[Operator]
 
+    @property
+    def targets(self):
+        return [self.pattern]
+
     def flags(self):
         return [
             flags.optimize.OPTIMIZE,
@@ -71,6 +76,18 @@ class RemoveNoEffectOperatorBase(OptimizeRule):
 
         return graph, flag_changed
 
+    def optimize_nodes(self, graph: Graph, nodes: List[Node]) -> Tuple[Graph, bool]:
+        flag_changed = False
+
+        for op in traverse.filter_nodes(nodes, self.pattern):  # type: Operator
+            if len(op.outputs) == 0:
+                # Already removed
+                continue
+
+            flag_changed |= self.optimize_operator(graph, op)
+
+        return graph, flag_changed
+
     def optimize_operator(self, graph: Graph, op: Operator):
         raise NotImplementedError
 
@@ -2,7 +2,7 @@ from typing import Tuple
 
 import numpy as np
 
-from webdnn.graph import traverse
+from webdnn.graph import pattern
 from webdnn.graph.graph import Graph
 from webdnn.graph.operators.scalar_add import ScalarAdd
 from webdnn.graph.operators.scalar_affine import ScalarAffine
@@ -18,6 +18,8 @@ class ReplaceScalarAffine(OptimizeRule):
     """
     Replace :class:`ScalarAffine` into :class:`ElementwiseMul` and :class:`ElementwiseAdd`
     """
+    targets = [ScalarAffine]
+    pattern_length = 2
 
     def flags(self):
         return [
@@ -27,7 +29,7 @@ class ReplaceScalarAffine(OptimizeRule):
 
     def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
         flag_changed = False
-        for op in traverse.filter_nodes(traverse.listup_operators(graph), ScalarAffine):  # type: ScalarAffine
+        for op in pattern.find_nodes(graph, ScalarAffine):  # type: ScalarAffine
             x = op.inputs["x0"]
             y = op.outputs["y"]
 
@@ -52,6 +54,8 @@ class ReplaceScalarAdd(OptimizeRule):
     """
     Replace :class:`ScalarAdd` into :class:`ElementwiseAdd`
     """
+    targets = [ScalarAdd]
+    pattern_length = 2
 
     def flags(self):
         return [
@@ -61,7 +65,7 @@ class ReplaceScalarAdd(OptimizeRule):
 
     def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
         flag_changed = False
-        for op in traverse.filter_nodes(traverse.listup_operators(graph), ScalarAdd):  # type: ScalarAdd
+        for op in pattern.find_nodes(graph, ScalarAdd):  # type: ScalarAdd
             x = op.inputs["x0"]
             y = op.outputs["y"]
 
@@ -85,6 +89,8 @@ class ReplaceScalarMul(OptimizeRule):
     """
     Replace :class:`ScalarMul` into :class:`ElementwiseMul`
     """
+    targets = [ScalarMul]
+    pattern_length = 2
 
     def flags(self):
         return [
@@ -94,7 +100,7 @@ class ReplaceScalarMul(OptimizeRule):
 
     def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
         flag_changed = False
-        for op in traverse.filter_nodes(traverse.listup_operators(graph), ScalarMul):  # type: ScalarMul
+        for op in pattern.find_nodes(graph, ScalarMul):  # type: ScalarMul
             x = op.inputs["x0"]
             y = op.outputs["y"]
 
@@ -118,6 +124,8 @@ class ReplaceScalarPow(OptimizeRule):
     """
     Replace :class:`ScalarMul` into :class:`ElementwiseMul`
     """
+    targets = [ScalarPow]
+    pattern_length = 2
 
     def flags(self):
         return [
@@ -127,7 +135,7 @@ class ReplaceScalarPow(OptimizeRule):
 
     def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
         flag_changed = False
-        for op in traverse.filter_nodes(traverse.listup_operators(graph), ScalarPow):  # type: ScalarPow
+        for op in pattern.find_nodes(graph, ScalarPow):  # type: ScalarPow
             x = op.inputs["x0"]
             y = op.outputs["y"]
 
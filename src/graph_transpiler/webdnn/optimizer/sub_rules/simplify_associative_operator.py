@@ -19,6 +19,8 @@ class SimplifyAssociativeOperatorLeftHand(OptimizeRule):
     b. If either `v1` or `v2` is constant variable, sweep out it as `(v1 + v3) + v2`. This optimization improves potential of
         constant folding.
     """
+    targets = [Associative]
+    pattern_length = 4
 
     def flags(self):
         return [
@@ -161,6 +163,8 @@ class SimplifyAssociativeOperatorRightHand(OptimizeRule):
     b. If either `v1` or `v3` is constant variable, sweep out it as `(v2 + v1) + v3`. This optimization improves potential of
         constant folding.
     """
+    targets = [Associative]
+    pattern_length = 4
 
     def flags(self):
         return [
@@ -8,7 +8,7 @@ from webdnn.graph.operators.elementwise_div import ElementwiseDiv
 from webdnn.graph.operators.elementwise_mul import ElementwiseMul
 from webdnn.graph.optimize_rule import OptimizeRule, OptimizeRuleGroup
 from webdnn.graph.order import Order
-from webdnn.graph.traverse import search_sub_structure
+from webdnn.graph.pattern import Pattern
 from webdnn.graph.variable import Variable
 from webdnn.graph.variables.constant_variable import ConstantVariable
 from webdnn.util import flags
@@ -28,6 +28,10 @@ def _get_constant_and_variable(op, key1, key2):
 class SimplifyOperatorBase(OptimizeRule):
     pattern = [Operator, Operator]  # type: List[Operator, Operator]
 
+    @property
+    def targets(self):
+        return list(self.pattern)
+
     def __init__(self):
         super(SimplifyOperatorBase, self).__init__()
 
@@ -41,16 +45,20 @@ class SimplifyOperatorBase(OptimizeRule):
     def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
         flag_changed = False
 
-        matches = search_sub_structure(graph, [self.pattern[0], Variable, self.pattern[1]])
-        while len(matches) > 0:
-            op1, v1, op2 = matches.pop()  # type: Operator, Variable, Operator
+        pattern = Pattern.sequence([self.pattern[0], Variable, self.pattern[1]])
+
+        # operators created by optimization may make new matches
+        flag_retry = True
+        while flag_retry:
+            flag_retry = False
 
-            if len(v1.input_to) > 1:
-                continue
+            for op1, v1, op2 in pattern.match(graph):  # type: Operator, Variable, Operator
+                if len(v1.input_to) > 1:
+                    continue
 
-            if self.optimize_pair(graph, op1, op2):
-                flag_changed = True
-                matches = search_sub_structure(graph, [self.pattern[0], Variable, self.pattern[1]])
+                if self.optimize_pair(graph, op1, op2):
+                    flag_changed = True
+                    flag_retry = True
 
         return graph, flag_changed
 
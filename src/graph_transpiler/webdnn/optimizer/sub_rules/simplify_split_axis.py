@@ -1,6 +1,6 @@
-from webdnn.graph import traverse
 from webdnn.graph.operators.split_axis import SplitAxis
 from webdnn.graph.optimize_rule import OptimizeRule
+from webdnn.graph.pattern import Pattern
 from webdnn.graph.variable import Variable
 from webdnn.util import flags
 
@@ -20,6 +20,8 @@ class SimplifySplitAxis(OptimizeRule):
                         |
                         +- v5
     """
+    targets = [SplitAxis]
+    pattern_length = 3
 
     def flags(self):
         return [
@@ -29,45 +31,48 @@ class SimplifySplitAxis(OptimizeRule):
 
     def optimize(self, graph):
         flag_changed = False
-        matches = traverse.search_sub_structure(graph, [SplitAxis, Variable, SplitAxis])
 
-        while len(matches) > 0:
-            op1, h, op2 = matches.pop()  # type: SplitAxis, Variable, SplitAxis
+        pattern = Pattern.sequence([SplitAxis, Variable, SplitAxis])
 
-            if len(h.input_to) > 1:
-                # `h` will be removed by this optimization
-                continue
+        # merged SplitAxis may make new matches
+        flag_retry = True
+        while flag_retry:
+            flag_retry = False
 
-            if op1.axis != op2.axis:
-                # These operations cannot be merged.
-                continue
+            for op1, h, op2 in pattern.match(graph):  # type: SplitAxis, Variable, SplitAxis
+                if len(h.input_to) > 1:
+                    # `h` will be removed by this optimization
+                    continue
 
-            flag_changed = True
-            x = op1.inputs["x"]
+                if op1.axis != op2.axis:
+                    # These operations cannot be merged.
+                    continue
 
-            hs = [op1.outputs[f"y{i}"] for i in range(len(op1.outputs))]
-            i_h = hs.index(h)
+                flag_changed = True
+                flag_retry = True
+                x = op1.inputs["x"]
 
-            original_ys = list(hs)
-            new_sections = op1.sections
+                hs = [op1.outputs[f"y{i}"] for i in range(len(op1.outputs))]
+                i_h = hs.index(h)
 
-            original_ys.remove(h)
-            section_offset = ([0] + op1.sections)[i_h]
-            op2_sections = [0] + op2.sections
-            for i in range(len(op2.outputs)):
-                original_ys.insert(i_h + i, op2.outputs[f"y{i}"])
-                new_sections.insert(i_h + i, section_offset + op2_sections[i])
+                original_ys = list(hs)
+                new_sections = op1.sections
 
-            new_sections.remove(section_offset)
+                original_ys.remove(h)
+                section_offset = ([0] + op1.sections)[i_h]
+                op2_sections = [0] + op2.sections
+                for i in range(len(op2.outputs)):
+                    original_ys.insert(i_h + i, op2.outputs[f"y{i}"])
+                    new_sections.insert(i_h + i, section_offset + op2_sections[i])
 
-            op1.remove_all()
-            op2.remove_all()
+                new_sections.remove(section_offset)
 
-            new_ys = SplitAxis(None, axis=op1.axis, sections=new_sections)(x)
+                op1.remove_all()
+                op2.remove_all()
 
-            for original_y, new_y in zip(original_ys, new_ys):
-                OptimizeRule.replace_variable(graph, new_y.transpose_like(original_y), original_y)
+                new_ys = SplitAxis(None, axis=op1.axis, sections=new_sections)(x)
 
-            matches = traverse.search_sub_structure(graph, [SplitAxis, Variable, SplitAxis])
+                for original_y, new_y in zip(original_ys, new_ys):
+                    OptimizeRule.replace_variable(graph, new_y.transpose_like(original_y), original_y)
 
         return graph, flag_changed
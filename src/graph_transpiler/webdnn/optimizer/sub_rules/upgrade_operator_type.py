@@ -12,6 +12,8 @@ class UpgradeOperatorType(OptimizeRule):
     """
     Upgrade operator type which is deprecated to new operator type.
     """
+    targets = [AxiswiseBias, AxiswiseScale]
+    pattern_length = 1
 
     def flags(self):
         return [
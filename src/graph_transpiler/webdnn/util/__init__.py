@@ -4,3 +4,4 @@ from webdnn.util import console
 from webdnn.util import flags
 from webdnn.util import json
 from webdnn.util import misc
+from webdnn.util import profiler
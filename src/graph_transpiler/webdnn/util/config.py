@@ -1 +1,45 @@
+import threading
+from contextlib import contextmanager
+
 WEBGL_MAX_TEXTURE_SIZE = 4096
+
+_local = threading.local()
+
+
+def get_webgl_max_texture_size() -> int:
+    """get_webgl_max_texture_size()
+
+    Returns:
+        (int) max texture size in WebGL backend. If it's overridden by :func:`~webdnn.util.config.webgl_max_texture_size` in current
+        thread, overridden value is returned. Otherwise :code:`WEBGL_MAX_TEXTURE_SIZE` is returned.
+    """
+    return getattr(_local, "webgl_max_texture_size", WEBGL_MAX_TEXTURE_SIZE)
+
+
+@contextmanager
+def webgl_max_texture_size(size: int):
+    """webgl_max_texture_size(size)
+
+    Context manager which overrides max texture size in WebGL backend in current thread.
+
+    .. code::
+
+        with config.webgl_max_texture_size(8192):
+            graph, _ = WebGLOptimizeRule(max_texture_size=8192).optimize(graph)
+
+    Args:
+        size (int): max texture size
+    """
+    has_previous = hasattr(_local, "webgl_max_texture_size")
+    previous = getattr(_local, "webgl_max_texture_size", None)
+    _local.webgl_max_texture_size = size
+
+    try:
+        yield
+
+    finally:
+        if has_previous:
+            _local.webgl_max_texture_size = previous
+
+        else:
+            del _local.webgl_max_texture_size
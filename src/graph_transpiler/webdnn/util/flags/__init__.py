@@ -6,3 +6,8 @@ from webdnn.util.flags import test
 DEBUG = os.environ.get("DEBUG", "0") == "1"
 VISUALIZE_MEMORY_ALLOCATION = os.environ.get("VISUALIZE_MEMORY_ALLOCATION", "0") == "1"
 AUTO_UPGRADE_OPERATOR_TYPE = os.environ.get("AUTO_UPGRADE_OPERATOR_TYPE", "1") == "1"
+PROFILE = os.environ.get("PROFILE", "0") == "1"
+CONSTANT_MEMMAP_THRESHOLD = int(os.environ.get("CONSTANT_MEMMAP_THRESHOLD", str(256 * 1024 * 1024)))
+DESCRIPTOR_CACHE_DIR = os.environ.get("DESCRIPTOR_CACHE_DIR", None)
+DESCRIPTOR_CACHE_SIZE = int(os.environ.get("DESCRIPTOR_CACHE_SIZE", str(4 * 1024 * 1024 * 1024)))
+WEIGHT_SHARD_SIZE = int(os.environ.get("WEIGHT_SHARD_SIZE", "0"))
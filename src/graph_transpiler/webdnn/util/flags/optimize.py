@@ -1,6 +1,7 @@
 import os
 
 OPTIMIZE = os.environ.get("OPTIMIZE", "1") == "1"
+OPTIMIZE_RULE_SCHEDULER = os.environ.get("OPTIMIZE_RULE_SCHEDULER", "sweep")
 
 # basic (non-accuracy loss) optimization
 REMOVE_REDUNDANT_OPERATOR = os.environ.get("REMOVE_REDUNDANT_OPERATOR", "1") == "1"
@@ -30,6 +31,8 @@ SIMPLIFY_IN_OUT_CHANNEL_MODE_CONVERSION = os.environ.get("SIMPLIFY_IN_OUT_CHANNE
 SIMPLIFY_COMMUTATIVE_OPERATOR = os.environ.get("SIMPLIFY_COMMUTATIVE_OPERATOR", "1") == "1"
 MERGE_TENSORDOT_AND_ELEMENTWISE_MUL = os.environ.get("MERGE_TENSORDOT_AND_ELEMENTWISE_MUL", "1") == "1"
 MERGE_TENSORDOT_AND_ELEMENTWISE_ADD = os.environ.get("MERGE_TENSORDOT_AND_ELEMENTWISE_ADD", "1") == "1"
+FOLD_AXISWISE_AFFINE_INTO_WEIGHT = os.environ.get("FOLD_AXISWISE_AFFINE_INTO_WEIGHT", "1") == "1"
+TENSORDOT_EPILOGUE_FUSION = os.environ.get("TENSORDOT_EPILOGUE_FUSION", "1") == "1"
 OPTIMIZE_CHANNEL_MODE = os.environ.get("OPTIMIZE_CHANNEL_MODE", "1") == "1"
 EXTRACT_UNIFORM_LITERAL = os.environ.get("EXTRACT_UNIFORM_LITERAL", "0") == "1"
 CONSTANT_FOLDING = os.environ.get("CONSTANT_FOLDING", "1") == "1"
@@ -42,6 +45,11 @@ CONV_SVD_COMPRESSION = os.environ.get("CONV_SVD_COMPRESSION", "0") == "1"
 VALIDATE_GENERATED_SOURCE = os.environ.get("VALIDATE_GENERATED_SOURCE", "1") == "1"
 OPTIMIZE_INPLACE_OPERATION = os.environ.get("OPTIMIZE_INPLACE_OPERATION", "1") == "1"
 OPTIMIZE_MEMORY_ALLOCATION = os.environ.get("OPTIMIZE_MEMORY_ALLOCATION", "1") == "1"
+MEMORY_ALLOCATION_STRATEGY = os.environ.get("MEMORY_ALLOCATION_STRATEGY", "greedy")
+COMPARE_MEMORY_ALLOCATION_STRATEGY = os.environ.get("COMPARE_MEMORY_ALLOCATION_STRATEGY", "0") == "1"
 
 # webgl backend
 WEBGL_OPTIMIZE_TEXTURE_SIZE = os.environ.get("WEBGL_OPTIMIZE_TEXTURE_SIZE", "1") == "1"
+
+# webassembly backend
+WEBASSEMBLY_USE_EIGEN = os.environ.get("WEBASSEMBLY_USE_EIGEN", "1") == "1"
@@ -2,3 +2,6 @@ from json import *
 from webdnn.util.json.json import dump
 from webdnn.util.json.json import dumps
 from webdnn.util.json.json import SerializableMixin
+from webdnn.util.json.binary import dump_binary
+from webdnn.util.json.binary import dumps_binary
+from webdnn.util.json.binary import loads_binary
@@ -0,0 +1,274 @@
+"""
+Compact binary container of JSON-serializable object, used for graph descriptors.
+
+Layout (all integers are little-endian uint32):
+
+.. code-block:: text
+
+    +-------+---------+---------------+-------------+-------------+---------------------+-----+---------------------------+
+    | magic | version | header_length | body_offset | body_length | header (ASCII JSON) | pad | body (blobs, 16B-aligned) |
+    | WDNB  | 1       |               |             |             |                     |     |                           |
+    +-------+---------+---------------+-------------+-------------+---------------------+-----+---------------------------+
+
+The header is minified JSON of the object (non-ASCII characters are escaped) except following two cases:
+
+- A list of integers which has at least :code:`BLOB_MIN_LENGTH` elements (ex. meta buffers) is stored in the body as a blob, and
+  replaced by :code:`{"$blob": [offset, length, dtype]}`, where :code:`offset` is byte offset from the beginning of the body and
+  :code:`dtype` is :code:`"uint8"` or :code:`"int32"`.
+- A list or a dictionary of at least :code:`TABLE_MIN_ROWS` dictionaries which have same keys in same order (ex. allocation tables
+  and kernel execution information) is stored in column-major order as
+  :code:`{"$table": {"index": [keys of the dictionary] or null, "columns": [[name, column], ...]}}`. Each column is encoded
+  recursively, so integer columns are also stored as blobs.
+
+Both are restored while the header is parsed, so the object is deserialized in single pass.
+"""
+import struct
+import time
+from json import JSONEncoder, dumps as original_dumps, loads as original_loads
+from typing import Any, BinaryIO, Callable, Dict, List, NamedTuple, Union
+
+import numpy as np
+
+from webdnn.util.json.json import CustomJSONEncoder, dumps
+
+MAGIC = b"WDNB"
+VERSION = 1
+ALIGNMENT = 16
+BLOB_MIN_LENGTH = 16
+TABLE_MIN_ROWS = 4
+
+_PREAMBLE = struct.Struct("<4sIIII")
+_DTYPES = {"uint8": np.dtype("<u1"), "int32": np.dtype("<i4")}
+_INT32_MIN = -2 ** 31
+_INT32_MAX = 2 ** 31 - 1
+
+
+def _align(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _to_plain(obj: Any, encoder: JSONEncoder) -> Any:
+    """
+    Convert the object into the tree of dict, list, str, int, float, bool and None, in same manner as
+    :class:`~webdnn.util.json.json.CustomJSONEncoder`.
+    """
+    if obj is None or isinstance(obj, (str, bool, int, float)):
+        return obj
+
+    if isinstance(obj, dict):
+        return {(k if isinstance(k, str) else original_dumps(k).strip('"')): _to_plain(v, encoder) for k, v in obj.items()}
+
+    if isinstance(obj, (list, tuple)):
+        return [_to_plain(v, encoder) for v in obj]
+
+    return _to_plain(encoder.default(obj), encoder)
+
+
+def _get_int_dtype(values: List[Any]) -> Union[str, None]:
+    if not all(type(v) is int for v in values):
+        return None
+
+    vmin = min(values)
+    vmax = max(values)
+    if 0 <= vmin and vmax <= 255:
+        return "uint8"
+
+    if _INT32_MIN <= vmin and vmax <= _INT32_MAX:
+        return "int32"
+
+    return None
+
+
+def _get_table_columns(rows: List[Any]) -> Union[List[str], None]:
+    if len(rows) < TABLE_MIN_ROWS or not all(isinstance(row, dict) for row in rows):
+        return None
+
+    columns = list(rows[0].keys())
+    if len(columns) == 0 or not all(list(row.keys()) == columns for row in rows):
+        return None
+
+    return columns
+
+
+class _Packer:
+    def __init__(self):
+        self.body = bytearray()
+
+    def pack(self, value: Any) -> Any:
+        if isinstance(value, list):
+            if len(value) >= BLOB_MIN_LENGTH:
+                dtype = _get_int_dtype(value)
+                if dtype is not None:
+                    return self._pack_blob(np.array(value, dtype=dtype))
+
+            columns = _get_table_columns(value)
+            if columns is not None:
+                return self._pack_table(None, value, columns)
+
+            return [self.pack(v) for v in value]
+
+        if isinstance(value, dict):
+            rows = list(value.values())
+            columns = _get_table_columns(rows)
+            if columns is not None:
+                return self._pack_table(list(value.keys()), rows, columns)
+
+            return {k: self.pack(v) for k, v in value.items()}
+
+        return value
+
+    def _pack_blob(self, array: np.ndarray) -> Dict[str, List[Union[int, str]]]:
+        offset = _align(len(self.body))
+        self.body += b"\0" * (offset - len(self.body))
+        self.body += array.astype(_DTYPES[array.dtype.name]).tobytes()
+        return {"$blob": [offset, array.size, array.dtype.name]}
+
+    def _pack_table(self, index: Union[List[str], None], rows: List[Dict[str, Any]], columns: List[str]) -> Dict[str, Any]:
+        return {"$table": {
+            "index": index,
+            "columns": [[c, self.pack([row[c] for row in rows])] for c in columns]
+        }}
+
+
+def _create_object_hook(body: memoryview, typed_array: bool) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Create :code:`object_hook` of :func:`json.loads` which restores blobs and tables. Because the hook is called from inner objects,
+    columns of a table have been already restored when the table is restored.
+    """
+
+    def object_hook(value: Dict[str, Any]) -> Any:
+        if len(value) != 1:
+            return value
+
+        if "$blob" in value:
+            offset, length, dtype = value["$blob"]
+            array = np.frombuffer(body, dtype=_DTYPES[dtype], count=length, offset=offset)
+            return array if typed_array else array.tolist()
+
+        if "$table" in value:
+            index = value["$table"]["index"]
+            names = [c[0] for c in value["$table"]["columns"]]
+            # elements of table are scalars, even if the column is stored as blob
+            columns = [c[1].tolist() if isinstance(c[1], np.ndarray) else c[1] for c in value["$table"]["columns"]]
+            rows = [dict(zip(names, row)) for row in zip(*columns)]
+            return rows if index is None else dict(zip(index, rows))
+
+        return value
+
+    return object_hook
+
+
+def dumps_binary(obj: Any) -> bytes:
+    """dumps_binary(obj)
+
+    Serialize the object into the binary container. Objects are converted as same as :func:`~webdnn.util.json.dump`.
+
+    Args:
+        obj: object to be serialized
+
+    Returns:
+        (bytes) serialized data
+    """
+    packer = _Packer()
+    root = packer.pack(_to_plain(obj, CustomJSONEncoder()))
+    header = original_dumps(root, separators=(",", ":")).encode("ascii")
+
+    body_offset = _align(_PREAMBLE.size + len(header))
+    return b"".join([
+        _PREAMBLE.pack(MAGIC, VERSION, len(header), body_offset, len(packer.body)),
+        header,
+        b"\0" * (body_offset - _PREAMBLE.size - len(header)),
+        bytes(packer.body)
+    ])
+
+
+def dump_binary(obj: Any, fp: BinaryIO):
+    """dump_binary(obj, fp)
+
+    Serialize the object into the binary container, and write it into the file.
+
+    Args:
+        obj: object to be serialized
+        fp: binary file object
+    """
+    fp.write(dumps_binary(obj))
+
+
+def loads_binary(data: Union[bytes, bytearray, memoryview], typed_array: bool = False) -> Any:
+    """loads_binary(data, typed_array=False)
+
+    Deserialize the binary container. The result is same as :code:`json.loads(json.dumps(obj))`.
+
+    Args:
+        data: serialized data
+        typed_array (bool): if :code:`True`, blobs are returned as read-only numpy arrays which share memory with :code:`data`
+            instead of lists, as the runtime uses them as typed arrays.
+
+    Returns:
+        deserialized object
+    """
+    data = memoryview(data)
+    if len(data) < _PREAMBLE.size:
+        raise ValueError("Data is too short to be a binary descriptor")
+
+    magic, version, header_length, body_offset, body_length = _PREAMBLE.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Invalid magic: {magic!r}")
+
+    if version != VERSION:
+        raise ValueError(f"Unsupported version: {version}")
+
+    header = bytes(data[_PREAMBLE.size:_PREAMBLE.size + header_length]).decode("ascii")
+    return original_loads(header, object_hook=_create_object_hook(data[body_offset:body_offset + body_length], typed_array))
+
+
+class FormatComparison(NamedTuple):
+    """
+    Size and parse time of an object serialized as indented JSON and as the binary container.
+
+    Attributes:
+        json_size (int): byte size of JSON
+        binary_size (int): byte size of the binary container
+        json_parse_time (float): seconds to parse JSON
+        binary_parse_time (float): seconds to parse the binary container
+    """
+    json_size: int
+    binary_size: int
+    json_parse_time: float
+    binary_parse_time: float
+
+    def __str__(self):
+        return f"JSON: {self.json_size} bytes, {self.json_parse_time * 1000:.2f} ms / " \
+               f"binary: {self.binary_size} bytes, {self.binary_parse_time * 1000:.2f} ms"
+
+
+def compare_formats(obj: Any, repeat: int = 5) -> FormatComparison:
+    """compare_formats(obj, repeat=5)
+
+    Serialize the object in both JSON (same format as graph descriptor file) and the binary container, and compare the size and
+    parse time. Parse time is the best of :code:`repeat` trials. Blobs in the binary container are parsed as typed arrays, as the
+    runtime does.
+
+    Args:
+        obj: object to be compared
+        repeat (int): number of trials
+
+    Returns:
+        (:class:`~webdnn.util.json.binary.FormatComparison`) the result
+    """
+    json_data = dumps(obj, indent=2).encode("utf-8")
+    binary_data = dumps_binary(obj)
+
+    def measure(fn):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+
+        return best
+
+    return FormatComparison(json_size=len(json_data),
+                            binary_size=len(binary_data),
+                            json_parse_time=measure(lambda: original_loads(json_data.decode("utf-8"))),
+                            binary_parse_time=measure(lambda: loads_binary(binary_data, typed_array=True)))
@@ -0,0 +1,196 @@
+"""
+Simple profiler for graph transpiling.
+
+Profiling is enabled while :func:`profile` context is active, or when the environment variable :code:`PROFILE=1` is set.
+Elapsed time of each phase (frontend conversion, optimization, memory allocation, constant encoding, kernel generation, etc.) and
+statistics of each optimize rule are recorded into all active :class:`Profiler` instances.
+
+.. code::
+
+    with profiler.profile() as p:
+        exec_data = generate_descriptor("webgpu", graph)
+
+    p.save("./profile.json")
+    console.stderr(p.summary())
+"""
+
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from webdnn.util import flags
+from webdnn.util.json import json
+
+_active_profilers = []  # type: List[Profiler]
+
+
+class Profiler:
+    """Profiler()
+
+    Container of profiling records.
+
+    Attributes:
+        phases(dict): Statistics of each phase, keyed by phase name. Each statistic has :code:`time` (elapsed seconds) and :code:`count`.
+        rules(dict): Statistics of each optimize rule, keyed by class name of the rule. Each statistic has :code:`time`, :code:`count`,
+            and :code:`changed` (number of applications which changed the graph).
+    """
+
+    def __init__(self):
+        self.phases = OrderedDict()  # type: Dict[str, Dict[str, float]]
+        self.rules = OrderedDict()  # type: Dict[str, Dict[str, float]]
+
+    def record_phase(self, name: str, elapsed: float):
+        if name not in self.phases:
+            self.phases[name] = {"time": 0.0, "count": 0}
+
+        record = self.phases[name]
+        record["time"] += elapsed
+        record["count"] += 1
+
+    def record_rule(self, name: str, elapsed: float, changed: bool):
+        if name not in self.rules:
+            self.rules[name] = {"time": 0.0, "count": 0, "changed": 0}
+
+        record = self.rules[name]
+        record["time"] += elapsed
+        record["count"] += 1
+        record["changed"] += 1 if changed else 0
+
+    def merge(self, other: "Profiler"):
+        """merge(other)
+
+        Add records of other profiler into this profiler. It's used to collect records from worker processes.
+
+        Args:
+            other (:class:`Profiler`): profiler
+        """
+        for name, record in other.phases.items():
+            if name not in self.phases:
+                self.phases[name] = {"time": 0.0, "count": 0}
+
+            for key in ("time", "count"):
+                self.phases[name][key] += record[key]
+
+        for name, record in other.rules.items():
+            if name not in self.rules:
+                self.rules[name] = {"time": 0.0, "count": 0, "changed": 0}
+
+            for key in ("time", "count", "changed"):
+                self.rules[name][key] += record[key]
+
+    def to_dict(self):
+        return {
+            "phases": self.phases,
+            "rules": self.rules
+        }
+
+    def save(self, filename: str):
+        """save(filename)
+
+        Save profiling records as JSON file.
+
+        Args:
+            filename (str): destination file name
+        """
+        with open(filename, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def summary(self, num_rules: int = 10) -> str:
+        """summary(num_rules=10)
+
+        Returns human-readable summary of profiling records.
+
+        Args:
+            num_rules (int): number of optimize rules shown in the summary, in descending order of elapsed time.
+
+        Returns:
+            (str) summary text
+        """
+        lines = ["Phases:"]
+        for name, record in self.phases.items():
+            lines.append(f"  {name:<40s} {record['time'] * 1000:10.1f} [ms] ({record['count']} calls)")
+
+        lines.append(f"Optimize rules (top {num_rules}):")
+        rules = sorted(self.rules.items(), key=lambda item: item[1]["time"], reverse=True)[:num_rules]
+        for name, record in rules:
+            lines.append(f"  {name:<40s} {record['time'] * 1000:10.1f} [ms] ({record['count']} calls, {record['changed']} changed)")
+
+        return "\n".join(lines)
+
+
+def is_enabled() -> bool:
+    """is_enabled()
+
+    Returns:
+        (bool) :code:`True` if profiling is enabled
+    """
+    return flags.PROFILE or len(_active_profilers) > 0
+
+
+def get_active_profilers() -> List[Profiler]:
+    return list(_active_profilers)
+
+
+@contextmanager
+def profile(profiler: Optional[Profiler] = None):
+    """profile(profiler=None)
+
+    Context manager which enables profiling. Records are stored also into outer active profilers.
+
+    Args:
+        profiler (:class:`Profiler`, optional): profiler which stores records. If :code:`None`, new profiler is created.
+
+    Returns:
+        (:class:`Profiler`) profiler
+    """
+    if profiler is None:
+        profiler = Profiler()
+
+    _active_profilers.append(profiler)
+    try:
+        yield profiler
+
+    finally:
+        _active_profilers.remove(profiler)
+
+
+@contextmanager
+def phase(name: str):
+    """phase(name)
+
+    Context manager which records elapsed time of the phase into all active profilers.
+
+    Args:
+        name (str): phase name
+    """
+    if len(_active_profilers) == 0:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+
+    finally:
+        elapsed = time.perf_counter() - start
+        for profiler in _active_profilers:
+            profiler.record_phase(name, elapsed)
+
+
+def record_rule(name: str, elapsed: float, changed: bool):
+    """record_rule(name, elapsed, changed)
+
+    Record statistics of the optimize rule application into all active profilers.
+    """
+    for profiler in _active_profilers:
+        profiler.record_rule(name, elapsed, changed)
+
+
+def record_profile(profiler: Profiler):
+    """record_profile(profiler)
+
+    Merge records of the profiler into all active profilers.
+    """
+    for active_profiler in _active_profilers:
+        active_profiler.merge(profiler)
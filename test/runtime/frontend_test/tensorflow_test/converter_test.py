@@ -0,0 +1,52 @@
+import numpy as np
+
+from test.runtime.frontend_test.tensorflow_test.util import TensorFlowConverter, tf
+from test.util import generate_kernel_test_case
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+class _CountingSession:
+    def __init__(self, sess):
+        self.sess = sess
+        self.num_run = 0
+
+    def run(self, *args, **kwargs):
+        self.num_run += 1
+        return self.sess.run(*args, **kwargs)
+
+
+def test_prefetch_constants():
+    x = tf.placeholder(np.float32, [2, 4])
+    h = x
+    ws = []
+    for _ in range(5):
+        w = tf.Variable(np.random.rand(4, 4).astype(np.float32))
+        ws.append(w)
+        h = tf.nn.relu(tf.matmul(h, w))
+
+    # shape is computed from constants, which is folded while conversion
+    y = tf.reshape(h, tf.shape(h) * tf.constant([1, 2]) // tf.constant([1, 2]))
+
+    vx = np.random.rand(2, 4).astype(np.float32)
+    with tf.Session() as sess:
+        sess.run(tf.global_variables_initializer())
+        vy, = sess.run([y], {x: vx})
+        vws = sess.run(ws)
+
+        counting_sess = _CountingSession(sess)
+        converter = TensorFlowConverter(counting_sess, batch_size=2)
+        graph = converter.convert([x], [y])
+
+    assert counting_sess.num_run == 1
+
+    for w, vw in zip(ws, vws):
+        v = converter.get_variable(w.op.outputs[0])
+        assert isinstance(v, ConstantVariable)
+        np.testing.assert_array_equal(v.data, vw)
+
+    generate_kernel_test_case(
+        description="[TensorFlow] Prefetch constants",
+        graph=graph,
+        inputs={graph.inputs[0]: vx},
+        expected={graph.outputs[0]: vy},
+    )
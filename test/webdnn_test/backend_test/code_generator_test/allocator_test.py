@@ -0,0 +1,196 @@
+import io
+import json
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import Allocation, BufferType, _optimize_buffer_reuse_best_fit, _peak_size, allocate
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.encoder.constant_encoder_raw import ConstantEncoderRaw
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.attributes.inplace import InplaceOperator
+from webdnn.graph.operators.elementwise_add import ElementwiseAdd
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import OrderC, OrderNC, OrderCN
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import flags
+from webdnn.util.json import json as webdnn_json
+
+
+def _check_no_conflict(allocations):
+    for i, a1 in enumerate(allocations):
+        for a2 in allocations[i + 1:]:
+            if a1.end <= a2.begin or a2.end <= a1.begin:
+                continue
+
+            assert a1.offset + a1.size <= a2.offset or a2.offset + a2.size <= a1.offset, f"{a1} and {a2} are conflicted"
+
+
+def _random_allocations(n: int):
+    allocations = []
+    for _ in range(n):
+        begin = np.random.randint(0, n)
+        allocations.append(Allocation(size=np.random.randint(1, 100), begin=begin, end=begin + np.random.randint(1, 10)))
+
+    return allocations
+
+
+def test_best_fit():
+    # Example in the docstring of _optimize_buffer_reuse_greedy
+    a = Allocation(size=5, begin=0, end=2)
+    b = Allocation(size=4, begin=2, end=4)
+    c = Allocation(size=2, begin=3, end=5)
+    d = Allocation(size=1, begin=6, end=8)
+    e = Allocation(size=3, begin=0, end=5)
+    allocations = [a, b, c, d, e]
+
+    _optimize_buffer_reuse_best_fit(allocations)
+
+    _check_no_conflict(allocations)
+    assert a.offset == 0
+    assert b.offset == 0
+    assert d.offset == 0
+    assert _peak_size(allocations) < sum(a.size for a in allocations)
+
+
+def test_best_fit_random():
+    allocations = _random_allocations(200)
+    _optimize_buffer_reuse_best_fit(allocations)
+    _check_no_conflict(allocations)
+
+
+def test_allocate_with_best_fit():
+    x = Variable([2, 3], OrderNC)
+    h = x
+    for _ in range(5):
+        h, = Relu(None)(h + 1)
+    y = h
+
+    vx = np.random.rand(2, 3) - 0.5
+    layout_greedy = allocate(Graph([x], [y]), strategy="greedy")
+    layout_best_fit = allocate(Graph([x], [y]), strategy="best_fit")
+
+    assert np.allclose(ReferenceExecutor.run(Graph([x], [y]), {x: vx}, layout_best_fit)[y],
+                       ReferenceExecutor.run(Graph([x], [y]), {x: vx}, layout_greedy)[y])
+
+
+def _build_chain_graph(N, T):
+    x = Variable([N, 16], OrderNC)
+    z = Variable([T, 4], OrderNC)
+    hx = x
+    hz = z
+    for _ in range(4):
+        hx, = Relu(None)(hx + 1)
+        hz, = Relu(None)(hz * 2)
+
+    return Graph([x, z], [hx, hz])
+
+
+def test_update_offset_without_reuse():
+    N = Placeholder(label="N")
+    graph = _build_chain_graph(N, N)
+
+    optimize = flags.optimize.OPTIMIZE
+    flags.optimize.OPTIMIZE = False
+    try:
+        layout = allocate(graph)
+
+    finally:
+        flags.optimize.OPTIMIZE = optimize
+
+    N.value = 3
+    allocations = list(set(layout.allocations.values()))
+    assert all(a.buffer_type == BufferType.Dynamic for a in allocations)
+
+    # dynamic allocations are stacked without gaps
+    offsets = sorted((int(a.offset), int(a.size)) for a in allocations)
+    for (offset1, size1), (offset2, _) in zip(offsets, offsets[1:]):
+        assert offset1 + size1 == offset2
+
+    assert int(layout.dynamic_size) == sum(size for _, size in offsets)
+
+
+def test_dynamic_buffer_reuse():
+    N = Placeholder(label="N")
+    T = Placeholder(label="T")
+    layout_dynamic = allocate(_build_chain_graph(N, T), strategy="best_fit")
+    layout_static = allocate(_build_chain_graph(1, 1), strategy="best_fit")
+
+    # Offsets are placeholder expressions, and they are resolved at runtime
+    serialized = json.loads(webdnn_json.dumps(layout_dynamic))
+    assert "eval" in json.dumps(serialized["dynamic"]["size"])
+    assert serialized["static"]["allocations"] == {}
+
+    N.value = 5
+    T.value = 7
+    allocations = list(set(layout_dynamic.allocations.values()))
+    resolved = [Allocation(size=int(a.size), offset=int(a.offset), begin=a.begin, end=a.end) for a in allocations]
+    _check_no_conflict(resolved)
+
+    # buffers are reused as same as the static version
+    dynamic_size = int(layout_dynamic.dynamic_size)
+    assert _peak_size(resolved) <= dynamic_size
+    assert dynamic_size < sum(a.size for a in resolved)
+    assert dynamic_size <= layout_static.static_size * 7
+
+
+def test_inplace_broadcast_input():
+    for batch_size in [2, Placeholder(label="N")]:
+        x = Variable([batch_size, 3], OrderNC)
+        z = Variable([3], OrderC)
+        b, = Relu(None)(z)
+        op = ElementwiseAdd(None)
+        y, = op(b, x)  # first operand "b" is broadcasted, and it's updated inplace
+        op.get_attribute(InplaceOperator)[0].toggle_status(True)
+
+        layout = allocate(Graph([x, z], [y]))
+
+        assert layout[b] is layout[y]
+        if Placeholder.check_resolved(batch_size):
+            assert layout[y].size == 6
+
+        else:
+            batch_size.value = 5
+            assert int(layout[y].size) == 15
+
+
+def _build_constant_graph():
+    x = Variable([2, 3], OrderNC)
+    c1 = ConstantVariable(np.random.rand(2, 3), OrderNC)
+    c2 = ConstantVariable(np.random.rand(3, 2), OrderCN)
+    c2.change_order(OrderNC)
+    y = x + c1 + c2
+
+    return Graph([x], [y]), [c1, c2]
+
+
+def test_pack_constants():
+    graph, constants = _build_constant_graph()
+    layout = allocate(graph)
+
+    assert layout.data.dtype == np.float32
+    for c in constants:
+        a = layout[c]
+        assert np.array_equal(layout.data[a.offset:a.offset + a.size], c.data.flatten())
+
+
+def test_pack_constants_memmap():
+    graph, constants = _build_constant_graph()
+
+    threshold = flags.CONSTANT_MEMMAP_THRESHOLD
+    flags.CONSTANT_MEMMAP_THRESHOLD = 0
+    try:
+        layout = allocate(graph)
+
+    finally:
+        flags.CONSTANT_MEMMAP_THRESHOLD = threshold
+
+    assert isinstance(layout.data, np.memmap)
+    for c in constants:
+        a = layout[c]
+        assert np.array_equal(layout.data[a.offset:a.offset + a.size], c.data.flatten())
+
+    f = io.BytesIO()
+    ConstantEncoderRaw().encode_into(layout, f)
+    assert f.getvalue() == ConstantEncoderRaw().encode(layout)
@@ -0,0 +1,212 @@
+import os.path as path
+import shutil
+import subprocess
+import tempfile
+import unittest
+from typing import List
+
+import numpy as np
+
+from webdnn.backend.interface.generator import generate_descriptor
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.im2col import Im2Col
+from webdnn.graph.operators.linear import Linear
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.order import Order, OrderNC, OrderNCHW, OrderNHWC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util.json import json
+
+# Minimal runner which executes the descriptor as same as DescriptorRunnerFallback
+_runner_source = """
+var fs = require("fs");
+var descriptor = JSON.parse(fs.readFileSync(process.argv[2], "utf8"));
+var toFloat32Array = function(buffer) {
+    return new Float32Array(buffer.buffer.slice(buffer.byteOffset, buffer.byteOffset + buffer.length));
+};
+var weights = toFloat32Array(fs.readFileSync(process.argv[3]));
+var inputs = toFloat32Array(fs.readFileSync(process.argv[4]));
+
+var dnn_fallback_kernel = null;
+eval(descriptor.kernel_source);
+
+var variableMap = {};
+["static", "dynamic"].forEach(function(key) {
+    var layout = descriptor.memory_layout[key];
+    var buffer = new Float32Array(layout.size);
+    if (key == "static") buffer.set(weights);
+
+    Object.keys(layout.allocations).forEach(function(name) {
+        var allocation = layout.allocations[name];
+        variableMap[name] = new Float32Array(buffer.buffer, allocation.offset * 4, allocation.size);
+    });
+});
+
+var offset = 0;
+descriptor.inputs.forEach(function(name) {
+    var view = variableMap[name];
+    view.set(inputs.subarray(offset, offset + view.length));
+    offset += view.length;
+});
+
+descriptor.exec_infos.forEach(function(info) {
+    dnn_fallback_kernel[info.entry_func_name](info.inputs.map(function(name) { return variableMap[name]; }),
+                                              info.outputs.map(function(name) { return variableMap[name]; }),
+                                              info.call_option);
+});
+
+descriptor.outputs.forEach(function(name) {
+    process.stdout.write(Buffer.from(variableMap[name].slice().buffer));
+});
+"""
+
+
+def _run(graph: Graph, inputs: List[np.ndarray]) -> List[np.ndarray]:
+    node = shutil.which("node") or shutil.which("nodejs")
+    if node is None:
+        raise unittest.SkipTest("node is not found")
+
+    outputs = graph.outputs
+    exec_info = generate_descriptor("fallback", graph, cache=False)
+
+    dirname = tempfile.mkdtemp()
+    try:
+        with open(path.join(dirname, "runner.js"), "w") as f:
+            f.write(_runner_source)
+
+        with open(path.join(dirname, "graph.json"), "w") as f:
+            json.dump(exec_info.descriptor, f)
+
+        with open(path.join(dirname, "weight.bin"), "wb") as f:
+            exec_info.constants.write(f)
+
+        with open(path.join(dirname, "input.bin"), "wb") as f:
+            for x in inputs:
+                f.write(x.astype(np.float32).tobytes())
+
+        stdout = subprocess.run([node, path.join(dirname, "runner.js"), path.join(dirname, "graph.json"),
+                                 path.join(dirname, "weight.bin"), path.join(dirname, "input.bin")],
+                                stdout=subprocess.PIPE, check=True).stdout
+
+    finally:
+        shutil.rmtree(dirname)
+
+    result = []
+    data = np.frombuffer(stdout, dtype=np.float32)
+    for v in outputs:
+        result.append(data[:v.size].reshape(v.shape))
+        data = data[v.size:]
+
+    return result, exec_info
+
+
+def _conv2d_reference(x: np.ndarray, w: np.ndarray, stride, padding):
+    # x: NHWC, w: NKhKwC
+    x = np.pad(x, ((0, 0), (padding, padding), (padding, padding), (0, 0)), mode="constant")
+    N, H, W, _ = x.shape
+    K, KH, KW, _ = w.shape
+    H2 = (H - KH) // stride + 1
+    W2 = (W - KW) // stride + 1
+    y = np.zeros((N, H2, W2, K))
+    for kh in range(KH):
+        for kw in range(KW):
+            patch = x[:, kh:kh + H2 * stride:stride, kw:kw + W2 * stride:stride, :]
+            y += np.tensordot(patch, w[:, kh, kw, :], axes=([3], [1]))
+
+    return y
+
+
+def test_convolution_lowered_to_im2col():
+    vx = np.random.rand(2, 7, 6, 3).astype(np.float32) - 0.5
+    vw = np.random.rand(4, 3, 3, 3).astype(np.float32) - 0.5
+
+    x = Variable(vx.shape, OrderNHWC)
+    w = ConstantVariable(vw, Order([Axis.N, Axis.KH, Axis.KW, Axis.C]))
+    y, = Convolution2D(None, ksize=3, stride=2, padding=1)(x, w)
+    y, = Relu(None)(y)
+    y.change_order(OrderNCHW)
+
+    (vy,), exec_info = _run(Graph([x], [y]), [vx])
+
+    entry_func_names = [kernel.exec_info.entry_func_name for kernel in exec_info.descriptor.kernels]
+    assert "im2col" in entry_func_names
+    assert "tensordot" in entry_func_names
+    assert "convolution_2d" not in entry_func_names
+
+    expected = np.maximum(_conv2d_reference(vx, vw, stride=2, padding=1), 0).transpose((0, 3, 1, 2))
+    np.testing.assert_allclose(vy, expected, rtol=1e-4, atol=1e-5)
+
+
+def test_convolution_projection():
+    vx = np.random.rand(1, 4, 5, 6).astype(np.float32) - 0.5
+    vw = np.random.rand(3, 1, 1, 6).astype(np.float32) - 0.5
+
+    x = Variable(vx.shape, OrderNHWC)
+    w = ConstantVariable(vw, Order([Axis.N, Axis.KH, Axis.KW, Axis.C]))
+    y, = Convolution2D(None, ksize=1, stride=1, padding=0)(x, w)
+
+    (vy,), _ = _run(Graph([x], [y]), [vx])
+
+    np.testing.assert_allclose(vy, _conv2d_reference(vx, vw, stride=1, padding=0), rtol=1e-4, atol=1e-5)
+
+
+def test_linear_lowered_to_tensordot():
+    vx = np.random.rand(3, 5).astype(np.float32) - 0.5
+    vw = np.random.rand(5, 4).astype(np.float32) - 0.5
+
+    x = Variable(vx.shape, OrderNC)
+    w = ConstantVariable(vw, Order([Axis.C, Axis.N]))
+    y, = Linear(None)(x, w)
+
+    (vy,), exec_info = _run(Graph([x], [y]), [vx])
+
+    assert [kernel.exec_info.entry_func_name for kernel in exec_info.descriptor.kernels] == ["tensordot"]
+    np.testing.assert_allclose(vy, vx @ vw, rtol=1e-4, atol=1e-5)
+
+
+def test_tensordot_transposed_operands():
+    va = np.random.rand(4, 3, 5).astype(np.float32) - 0.5
+    vb = np.random.rand(3, 6).astype(np.float32) - 0.5
+
+    a = Variable(va.shape, Order([Axis.N, Axis.C, Axis.H]))
+    b = ConstantVariable(vb, Order([Axis.C, Axis.W]))
+    c, = Tensordot(None, axes=[Axis.C, Axis.C])(a, b)
+    c.change_order(Order([Axis.W, Axis.H, Axis.N]))
+
+    (vc,), _ = _run(Graph([a], [c]), [va])
+
+    np.testing.assert_allclose(vc, np.tensordot(va, vb, axes=([1], [0])).transpose((2, 1, 0)), rtol=1e-4, atol=1e-5)
+
+
+def test_im2col_nchw_input():
+    vx = np.random.rand(1, 2, 5, 4).astype(np.float32)
+
+    x = Variable(vx.shape, OrderNCHW)
+    col, = Im2Col(None, ksize=2, stride=1, padding=1, dilation_rate=2)(x)
+
+    (vcol,), _ = _run(Graph([x], [col]), [vx])
+
+    vx_nhwc = np.pad(vx.transpose((0, 2, 3, 1)), ((0, 0), (1, 1), (1, 1), (0, 0)), mode="constant")
+    expected = np.zeros(col.shape, dtype=np.float32)
+    for kh in range(2):
+        for kw in range(2):
+            expected[:, :, :, kh, kw, :] = vx_nhwc[:, kh * 2:kh * 2 + col.shape[1], kw * 2:kw * 2 + col.shape[2], :]
+
+    np.testing.assert_array_equal(vcol, expected)
+
+
+def test_elementwise_fused():
+    vx = np.random.rand(2, 3).astype(np.float32) - 0.5
+
+    x = Variable(vx.shape, OrderNC)
+    h, = Relu(None)(x * 2)
+    y = h + 1
+
+    (vy,), exec_info = _run(Graph([x], [y]), [vx])
+
+    assert len(exec_info.descriptor.kernels) == 1
+    assert "function(){" not in exec_info.descriptor.concat_kernel_sources()
+    np.testing.assert_allclose(vy, np.maximum(vx * 2, 0) + 1, rtol=1e-5)
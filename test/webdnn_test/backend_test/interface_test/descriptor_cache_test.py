@@ -0,0 +1,130 @@
+import os
+import tempfile
+
+import numpy as np
+
+from webdnn.backend.interface.descriptor_cache import DescriptorCache, descriptor_key, graph_hash
+from webdnn.backend.interface.generator import generate_descriptor, generate_descriptors
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import Order, OrderNC, OrderNHWC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import profiler
+
+
+def _build_graph(vw: np.ndarray, scale: float = 2):
+    # names of inputs, outputs and constants are part of the hash
+    x = Variable([1, 8, 8, 3], OrderNHWC)
+    x.name = "x"
+    w = ConstantVariable(vw, Order([Axis.N, Axis.C, Axis.KH, Axis.KW]))
+    w.name = "w"
+    h, = Convolution2D(None, ksize=3, stride=1, padding=1)(x, w)
+    y, = Relu(None)(h * scale)
+    y.name = "y"
+    return Graph([x], [y])
+
+
+def _build_named_graph(prefix: str):
+    x = Variable([2, 3], OrderNC)
+    x.name = f"{prefix}_in"
+    y, = Relu(None)(x)
+    y.name = f"{prefix}_out"
+    return Graph([x], [y])
+
+
+def test_graph_hash():
+    vw = np.random.rand(4, 3, 3, 3)
+
+    assert graph_hash(_build_graph(vw)) == graph_hash(_build_graph(vw))
+    assert graph_hash(_build_graph(vw)) != graph_hash(_build_graph(vw + 1))
+    assert graph_hash(_build_graph(vw)) != graph_hash(_build_graph(vw, scale=3))
+
+
+def test_graph_hash_names():
+    assert graph_hash(_build_named_graph("a")) == graph_hash(_build_named_graph("a"))
+    assert graph_hash(_build_named_graph("a")) != graph_hash(_build_named_graph("b"))
+
+    # names of intermediate nodes are not included
+    graph1 = _build_named_graph("a")
+    graph2 = _build_named_graph("a")
+    graph2.outputs[0].output_from.name = "renamed"
+    assert graph_hash(graph1) == graph_hash(graph2)
+
+
+def test_cache_different_names():
+    with tempfile.TemporaryDirectory() as dirname:
+        cache = DescriptorCache(dirname)
+
+        generate_descriptor("webgl", _build_named_graph("a"), cache=cache, max_texture_sizes=[4096])
+        exec_data = generate_descriptor("webgl", _build_named_graph("b"), cache=cache, max_texture_sizes=[4096])
+        descriptor, _ = exec_data.data_dict[4096]
+
+        assert (cache.hits, cache.misses) == (0, 2)
+        assert [v.name for v in descriptor.inputs] == ["b_in"]
+        assert [v.name for v in descriptor.outputs] == ["b_out"]
+
+
+def test_descriptor_key():
+    digest = graph_hash(_build_graph(np.random.rand(4, 3, 3, 3)))
+
+    assert descriptor_key("webgpu", digest) == descriptor_key("webgpu", digest)
+    assert descriptor_key("webgpu", digest) != descriptor_key("webassembly", digest)
+    assert descriptor_key("webgpu", digest) != descriptor_key("webgpu", digest, constant_encoder_name="eightbit")
+
+
+def test_cache_hit():
+    vw = np.random.rand(4, 3, 3, 3)
+
+    with tempfile.TemporaryDirectory() as dirname:
+        cache = DescriptorCache(dirname)
+
+        exec_data1 = generate_descriptor("webgpu", _build_graph(vw), cache=cache)
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        with profiler.profile() as p:
+            exec_data2 = generate_descriptor("webgpu", _build_graph(vw), cache=cache)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert "general_optimize" not in p.phases
+        assert bytes(exec_data2.constants) == bytes(exec_data1.constants)
+        assert [k.exec_info.entry_func_name for k in exec_data2.descriptor.kernels] == \
+               [k.exec_info.entry_func_name for k in exec_data1.descriptor.kernels]
+
+
+def test_generate_descriptors_with_cache():
+    vw = np.random.rand(4, 3, 3, 3)
+
+    with tempfile.TemporaryDirectory() as dirname:
+        cache = DescriptorCache(dirname)
+
+        generate_descriptor("webgpu", _build_graph(vw), cache=cache)
+        results = generate_descriptors(["webgpu", "fallback"], _build_graph(vw), processes=2, cache=cache)
+
+        assert list(results.keys()) == ["webgpu", "fallback"]
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert len(os.listdir(dirname)) == 2
+
+
+def test_lru_eviction():
+    vw = np.random.rand(4, 3, 3, 3)
+
+    with tempfile.TemporaryDirectory() as dirname:
+        cache = DescriptorCache(dirname)
+        exec_data = generate_descriptor("webgpu", _build_graph(vw), cache=False)
+
+        cache.put("a", exec_data)
+        entry_size = os.path.getsize(os.path.join(dirname, "a.pkl"))
+        cache.max_size = entry_size * 2
+
+        os.utime(os.path.join(dirname, "a.pkl"), (0, 0))
+        cache.put("b", exec_data)
+        os.utime(os.path.join(dirname, "b.pkl"), (1, 1))
+        assert cache.get("a") is not None  # "a" becomes most recently used
+
+        cache.put("c", exec_data)
+
+        assert sorted(os.listdir(dirname)) == ["a.pkl", "c.pkl"]
+        assert cache.get("b") is None
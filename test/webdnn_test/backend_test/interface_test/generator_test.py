@@ -0,0 +1,66 @@
+import json
+
+import numpy as np
+
+from webdnn.backend.interface.generator import generate_descriptor, generate_descriptors
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import Order, OrderNHWC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import json as webdnn_json
+
+_backends = ["webgpu", "webgl", "webassembly", "fallback"]
+
+
+def _build_graph():
+    x = Variable([1, 8, 8, 3], OrderNHWC)
+    w = ConstantVariable(np.random.rand(4, 3, 3, 3), Order([Axis.N, Axis.C, Axis.KH, Axis.KW]))
+    h, = Convolution2D(None, ksize=3, stride=1, padding=1)(x, w)
+    y, = Relu(None)(h * 2 + 1)
+    return Graph([x], [y])
+
+
+def _serialize(exec_data):
+    if hasattr(exec_data, "data_dict"):
+        items = [(descriptor, constants) for descriptor, constants in exec_data.data_dict.values()]
+
+    else:
+        items = [(exec_data.descriptor, exec_data.constants)]
+
+    result = []
+    for descriptor, constants in items:
+        descriptor = json.loads(webdnn_json.dumps(descriptor))
+        descriptor.pop("converted_at", None)
+        result.append((json.dumps(descriptor, sort_keys=True), bytes(constants)))
+
+    return result
+
+
+def test_generate_descriptor_is_deterministic():
+    graph = _build_graph()
+
+    for backend in _backends:
+        assert _serialize(generate_descriptor(backend, graph)) == _serialize(generate_descriptor(backend, graph))
+
+
+def test_generate_descriptors_parallel():
+    graph = _build_graph()
+
+    serial = {backend: _serialize(generate_descriptor(backend, graph)) for backend in _backends}
+    parallel = generate_descriptors(_backends, graph, processes=2)
+
+    assert list(parallel.keys()) == _backends
+    for backend in _backends:
+        assert _serialize(parallel[backend]) == serial[backend]
+
+
+def test_generate_descriptors_return_exceptions():
+    graph = _build_graph()
+
+    results = generate_descriptors(["fallback", "unknown"], graph, processes=2, return_exceptions=True)
+
+    assert not isinstance(results["fallback"], Exception)
+    assert isinstance(results["unknown"], Exception)
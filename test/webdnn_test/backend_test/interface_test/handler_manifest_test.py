@@ -0,0 +1,90 @@
+import subprocess
+import sys
+import textwrap
+
+_generators = {
+    "webgpu": "webdnn.backend.webgpu.generator.WebGPUDescriptorGenerator",
+    "webassembly": "webdnn.backend.webassembly.generator.WebassemblyDescriptorGenerator",
+    "webgl": "webdnn.backend.webgl.generator.WebGLDescriptorGenerator",
+    "fallback": "webdnn.backend.fallback.generator.FallbackDescriptorGenerator",
+    "reference": "webdnn.backend.reference.executor.ReferenceExecutor",
+}
+
+
+def _run(code: str):
+    # Each check runs in new process, because kernel modules are loaded only once per process.
+    result = subprocess.run([sys.executable, "-c", textwrap.dedent(code)], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert result.returncode == 0, result.stderr.decode()
+
+
+def test_import_webdnn_does_not_load_kernels():
+    _run("""
+        import sys
+        import webdnn
+
+        loaded = [name for name in sys.modules if ".kernels." in name]
+        assert len(loaded) == 0, loaded
+    """)
+
+
+def test_import_webdnn_does_not_load_reference_backend():
+    _run("""
+        import sys
+        import webdnn
+
+        loaded = [name for name in sys.modules if name.startswith("webdnn.backend.reference")]
+        assert len(loaded) == 0, loaded
+    """)
+
+
+def test_manifest():
+    for backend, generator in _generators.items():
+        module_name, class_name = generator.rsplit(".", 1)
+        _run(f"""
+            import sys
+            from {module_name} import {class_name} as Generator
+            from webdnn.backend.{backend} import kernels
+
+            for key in sorted(kernels.MANIFEST.keys()):
+                assert Generator.get_handler(key) is not None, key
+
+            loaded = {{name for name in sys.modules if name.startswith(kernels.__name__ + ".")}}
+            expected = {{kernels.__name__ + "." + name for name in kernels.MANIFEST.values()}}
+            assert loaded >= expected, expected - loaded
+        """)
+
+
+def test_only_required_kernels_are_loaded():
+    _run("""
+        import sys
+        import numpy as np
+        from webdnn.backend.interface.generator import generate_descriptor
+        from webdnn.graph.graph import Graph
+        from webdnn.graph.operators.relu import Relu
+        from webdnn.graph.order import OrderNC
+        from webdnn.graph.variable import Variable
+
+        x = Variable([2, 3], OrderNC)
+        y, = Relu(None)(x)
+        generate_descriptor("webgpu", Graph([x], [y]), cache=False)
+
+        loaded = [name for name in sys.modules if ".kernels." in name]
+        assert "webdnn.backend.webgpu.kernels.relu" in loaded, loaded
+        assert not any(name.startswith("webdnn.backend.webassembly.") for name in loaded), loaded
+        assert "webdnn.backend.webgpu.kernels.tensordot" not in loaded, loaded
+    """)
+
+
+def test_user_handler_takes_precedence():
+    _run("""
+        from webdnn.backend.webgpu.generator import WebGPUDescriptorGenerator
+        from webdnn.graph.operators.relu import Relu
+
+        def custom_handler(op, memory_layout):
+            return []
+
+        WebGPUDescriptorGenerator.register_handler(Relu)(custom_handler)
+        WebGPUDescriptorGenerator.load_all_handlers()
+
+        assert WebGPUDescriptorGenerator.get_handler("Relu") is custom_handler
+    """)
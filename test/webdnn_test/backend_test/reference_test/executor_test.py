@@ -0,0 +1,166 @@
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.graph import traverse
+from webdnn.graph.operators.attributes.tensordot_epilogue import TensordotEpilogue
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.average_pooling_2d import AveragePooling2D
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.linear import Linear
+from webdnn.graph.operators.max_pooling_2d import MaxPooling2D
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.order import Order, OrderC, OrderNC, OrderCN, OrderNCHW, OrderNHWC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.optimizer.sub_rules.fuse_tensordot_epilogue import FuseTensordotEpilogue
+from webdnn.optimizer.sub_rules.replace_convolution_by_im2col import ReplaceConvolutionByIm2Col
+
+
+def _conv2d_reference(x: np.ndarray, w: np.ndarray, stride: int, padding: int):
+    # x: NCHW, w: [N, C, KH, KW]
+    x = np.pad(x, ((0, 0), (0, 0), (padding, padding), (padding, padding)), mode="constant")
+    N, C, H, W = x.shape
+    C2, _, KH, KW = w.shape
+    H2 = (H - KH) // stride + 1
+    W2 = (W - KW) // stride + 1
+    y = np.zeros((N, C2, H2, W2))
+    for h in range(H2):
+        for w2 in range(W2):
+            patch = x[:, :, h * stride:h * stride + KH, w2 * stride:w2 * stride + KW]
+            y[:, :, h, w2] = np.tensordot(patch, w, axes=((1, 2, 3), (1, 2, 3)))
+
+    return y
+
+
+def test_elementwise():
+    x1 = Variable([2, 3, 4, 5], OrderNCHW)
+    x2 = Variable([2, 3, 4, 5], OrderNCHW)
+    x2.change_order(OrderNHWC)
+    h = x1 + x2
+    y, = Relu(None)(h * 2)
+
+    vx1 = np.random.rand(2, 3, 4, 5) - 0.5
+    vx2 = np.random.rand(2, 4, 5, 3) - 0.5
+
+    outputs = ReferenceExecutor.run(Graph([x1, x2], [y]), {x1: vx1, x2: vx2})
+    expected = np.maximum((vx1 + vx2.transpose(0, 3, 1, 2)) * 2, 0)
+
+    assert np.allclose(outputs[y], expected.transpose([OrderNCHW.axes_dict[a] for a in y.order.axes]), atol=1e-5)
+
+
+def test_convolution2d():
+    vx = np.random.rand(2, 3, 7, 7) - 0.5
+    vw = np.random.rand(4, 3, 3, 3) - 0.5
+
+    x = Variable(vx.shape, OrderNCHW)
+    w = ConstantVariable(vw, Order([Axis.N, Axis.C, Axis.KH, Axis.KW]))
+    y, = Convolution2D(None, ksize=3, stride=2, padding=1)(x, w)
+
+    outputs = ReferenceExecutor.run(Graph([x], [y]), {x: vx})
+
+    assert np.allclose(outputs[y], _conv2d_reference(vx, vw, 2, 1), atol=1e-5)
+
+
+def test_convolution2d_lowered_by_im2col():
+    vx = np.random.rand(2, 3, 7, 7) - 0.5
+    vw = np.random.rand(4, 3, 3, 3) - 0.5
+
+    x = Variable(vx.shape, OrderNCHW)
+    w = ConstantVariable(vw, Order([Axis.N, Axis.C, Axis.KH, Axis.KW]))
+    y, = Convolution2D(None, ksize=3, stride=1, padding=1)(x, w)
+    graph = Graph([x], [y])
+
+    expected = ReferenceExecutor.run(graph, {x: vx})[y]
+
+    graph, _ = ReplaceConvolutionByIm2Col().optimize(graph)
+    assert len(traverse.filter_nodes(traverse.listup_operators(graph), Convolution2D)) == 0
+
+    assert np.allclose(ReferenceExecutor.run(graph, {x: vx})[graph.outputs[0]], expected, atol=1e-5)
+
+
+def test_linear():
+    vx = np.random.rand(2, 3)
+    vw = np.random.rand(3, 4)
+
+    x = Variable(vx.shape, OrderNC)
+    w = ConstantVariable(vw, OrderCN)
+    y, = Linear(None)(x, w)
+
+    outputs = ReferenceExecutor.run(Graph([x], [y]), {x: vx})
+
+    assert np.allclose(outputs[y], np.dot(vx, vw), atol=1e-5)
+
+
+def test_pooling():
+    vx = np.random.rand(2, 4, 4, 3)
+
+    x = Variable(vx.shape, OrderNHWC)
+    y1, = MaxPooling2D(None, ksize=2, stride=2, padding=0)(x)
+    y2, = AveragePooling2D(None, ksize=2, stride=2, padding=0)(x)
+
+    outputs = ReferenceExecutor.run(Graph([x], [y1, y2]), {x: vx})
+
+    assert np.allclose(outputs[y1], vx.reshape(2, 2, 2, 2, 2, 3).max(axis=(2, 4)), atol=1e-5)
+    assert np.allclose(outputs[y2], vx.reshape(2, 2, 2, 2, 2, 3).mean(axis=(2, 4)), atol=1e-5)
+
+
+def test_buffer_reuse():
+    vx = np.random.rand(2, 3, 4, 5) - 0.5
+
+    x = Variable(vx.shape, OrderNCHW)
+    h = x
+    for _ in range(5):
+        h, = Relu(None)(h + 1)
+    y = h
+
+    outputs = ReferenceExecutor.run(Graph([x], [y]), {x: vx})
+    expected = vx
+    for _ in range(5):
+        expected = np.maximum(expected + 1, 0)
+
+    assert np.allclose(outputs[y], expected, atol=1e-5)
+
+
+def test_tensordot_epilogue():
+    vx = np.random.rand(5, 12) - 0.5
+    vs = np.random.rand(5, 7)
+
+    x = Variable(vx.shape, OrderNC)
+    s = Variable(vs.shape, Order([Axis.N, Axis.H]))
+    w = ConstantVariable(np.random.rand(12, 7) - 0.5, Order([Axis.C, Axis.H]))
+    b = ConstantVariable(np.random.rand(7) - 0.5, Order([Axis.H]))
+    h, = Tensordot(None, axes=[Axis.C, Axis.C])(x, w)
+    h, = Relu(None)(h + b)
+    y = h * s
+    graph = Graph([x, s], [y])
+
+    expected = ReferenceExecutor.run(graph, {x: vx, s: vs})[y]
+
+    graph, flag_changed = FuseTensordotEpilogue().optimize(graph)
+    assert flag_changed
+    assert len(traverse.listup_operators(graph)) == 1
+
+    assert np.allclose(ReferenceExecutor.run(graph, {x: vx, s: vs})[graph.outputs[0]], expected, atol=1e-5)
+
+
+def test_convolution2d_bias_relu_with_epilogue():
+    vx = np.random.rand(2, 7, 7, 3) - 0.5
+    vw = np.random.rand(4, 3, 3, 3) - 0.5
+    vb = np.random.rand(4) - 0.5
+
+    x = Variable(vx.shape, OrderNHWC)
+    w = ConstantVariable(vw, Order([Axis.N, Axis.C, Axis.KH, Axis.KW]))
+    h, = Convolution2D(None, ksize=3, stride=1, padding=1)(x, w)
+    y, = Relu(None)(h + ConstantVariable(vb, OrderC))
+    graph = Graph([x], [y])
+
+    expected = ReferenceExecutor.run(graph, {x: vx})[y]
+
+    graph, _ = ReplaceConvolutionByIm2Col().optimize(graph)
+    graph, flag_changed = FuseTensordotEpilogue().optimize(graph)
+    assert flag_changed
+    assert any(op.has_attribute(TensordotEpilogue) for op in traverse.listup_operators(graph))
+
+    assert np.allclose(ReferenceExecutor.run(graph, {x: vx})[graph.outputs[0]], expected, atol=1e-5)
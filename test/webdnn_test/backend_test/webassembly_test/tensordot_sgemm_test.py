@@ -0,0 +1,246 @@
+import os.path as path
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import BufferType
+from webdnn.backend.interface.generator import generate_descriptor
+from webdnn.backend.webassembly.kernels.tensordot import KC_MAX, MC_MAX, MR, NC_MAX, NR, select_block_size, \
+    sgemm_packed_header
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.order import Order, OrderNC
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import flags
+
+_harness_source = sgemm_packed_header + """
+#include <stdio.h>
+#include <stdlib.h>
+
+int main(int argc, char **argv)
+{
+    const int M = atoi(argv[1]), N = atoi(argv[2]), K = atoi(argv[3]);
+    const int mc = atoi(argv[4]), nc = atoi(argv[5]), kc = atoi(argv[6]);
+
+    float *A = (float *)malloc(sizeof(float) * (M * K + 1));
+    float *B = (float *)malloc(sizeof(float) * (N * K + 1));
+    float *C = (float *)malloc(sizeof(float) * (M * N + 1));
+    for (int i = 0; i < M * N; i++) C[i] = 12345.0f;
+
+    if (fread(A, sizeof(float), M * K, stdin) != (size_t)(M * K)) return 1;
+    if (fread(B, sizeof(float), N * K, stdin) != (size_t)(N * K)) return 1;
+
+    webdnn_sgemm_packed(A, K, 1, B, K, 1, C, M, N, K, mc, nc, kc, 0, 0);
+
+    fwrite(C, sizeof(float), M * N, stdout);
+    return 0;
+}
+"""
+
+# Executes the whole generated source. Static buffer and values of variables are given from stdin, and each variable is specified
+# as (is_static, offset, size) in arguments. The last one is the output variable.
+_graph_harness_main = """
+#include <stdio.h>
+
+int main(int argc, char **argv)
+{
+    const int static_size = atoi(argv[1]);
+    const int dynamic_size = atoi(argv[2]);
+    const int num_variables = (argc - 3) / 3;
+
+    if (fread(get_static_buffer(), sizeof(float), static_size, stdin) != (size_t)static_size) return 1;
+    allocate_dynamic_buffer(dynamic_size + 1);
+
+    for (int i = 0; i < num_variables; i++) {
+        float *buffer = (atoi(argv[3 + i * 3]) ? get_static_buffer() : get_dynamic_buffer()) + atoi(argv[4 + i * 3]);
+        const int size = atoi(argv[5 + i * 3]);
+
+        if (i < num_variables - 1) {
+            if (fread(buffer, sizeof(float), size, stdin) != (size_t)size) return 1;
+        } else {
+            run();
+            fwrite(buffer, sizeof(float), size, stdout);
+        }
+    }
+
+    return 0;
+}
+"""
+
+_harness_dir = None
+_harness_path = None
+
+
+def setup_module():
+    global _harness_dir, _harness_path
+    compiler = shutil.which("g++")
+    if compiler is None:
+        return
+
+    _harness_dir = tempfile.mkdtemp()
+    source_path = path.join(_harness_dir, "sgemm.cpp")
+    with open(source_path, "w") as f:
+        f.write(_harness_source)
+
+    _harness_path = path.join(_harness_dir, "sgemm")
+    subprocess.check_call([compiler, "-O2", "-o", _harness_path, source_path])
+
+
+def teardown_module():
+    if _harness_dir is not None:
+        shutil.rmtree(_harness_dir)
+
+
+def _run_sgemm(M, N, K, block_size=None):
+    if _harness_path is None:
+        raise unittest.SkipTest("g++ is not found")
+
+    A = np.random.rand(M, K).astype(np.float32) - 0.5
+    B = np.random.rand(N, K).astype(np.float32) - 0.5
+    mc, nc, kc = select_block_size(M, N, K) if block_size is None else block_size
+
+    stdout = subprocess.run([_harness_path, str(M), str(N), str(K), str(mc), str(nc), str(kc)],
+                            input=A.tobytes() + B.tobytes(), stdout=subprocess.PIPE, check=True).stdout
+    C = np.frombuffer(stdout, dtype=np.float32).reshape(M, N)
+
+    np.testing.assert_allclose(C, A.astype(np.float64) @ B.astype(np.float64).T, rtol=1e-4, atol=1e-4)
+
+
+def test_sgemm_small():
+    _run_sgemm(1, 1, 1)
+
+
+def test_sgemm_edge():
+    # sizes which are not multiples of micro kernel size
+    _run_sgemm(MR + 1, NR + 3, 7)
+
+
+def test_sgemm_multiple_blocks():
+    # multiple cache blocks on every axis, including partial blocks
+    _run_sgemm(MC_MAX * 2 + 5, NC_MAX + 9, KC_MAX * 2 + 3)
+
+
+def test_sgemm_small_blocks():
+    _run_sgemm(37, 29, 41, block_size=(MR, NR, 5))
+
+
+def test_sgemm_k_zero():
+    _run_sgemm(3, 5, 0)
+
+
+def test_select_block_size():
+    mc, nc, kc = select_block_size(3136, 64, 576)
+    assert mc % MR == 0 and mc <= MC_MAX
+    assert nc == 64
+    assert kc == 192
+
+
+def test_select_block_size_placeholder():
+    assert select_block_size(Placeholder(label="M"), 16, 16) == (MC_MAX, 16, 16)
+
+
+def test_generate_descriptor():
+    x = Variable([5, 12], Order([Axis.N, Axis.C]))
+    w = ConstantVariable(np.random.rand(12, 7), Order([Axis.C, Axis.H]))
+    y, = Tensordot(None, axes=[Axis.C, Axis.C])(x, w)
+
+    use_eigen = flags.optimize.WEBASSEMBLY_USE_EIGEN
+    flags.optimize.WEBASSEMBLY_USE_EIGEN = False
+    try:
+        exec_info = generate_descriptor("webassembly", Graph([x], [y]), cache=False)
+
+    finally:
+        flags.optimize.WEBASSEMBLY_USE_EIGEN = use_eigen
+
+    source = exec_info.descriptor.concat_kernel_sources()
+
+    assert "webdnn_sgemm_packed(A" in source
+    assert source.count("#define INCLUDE_WEBDNN_SGEMM_PACKED") == 1
+
+    compiler = shutil.which("g++")
+    if compiler is None:
+        raise unittest.SkipTest("g++ is not found")
+
+    subprocess.run([compiler, "-fsyntax-only", "-x", "c++", "-"], input=source.encode(), check=True)
+
+
+def _run_graph(graph: Graph, inputs):
+    compiler = shutil.which("g++")
+    if compiler is None:
+        raise unittest.SkipTest("g++ is not found")
+
+    use_eigen = flags.optimize.WEBASSEMBLY_USE_EIGEN
+    flags.optimize.WEBASSEMBLY_USE_EIGEN = False
+    try:
+        descriptor = generate_descriptor("webassembly", graph, cache=False).descriptor
+
+    finally:
+        flags.optimize.WEBASSEMBLY_USE_EIGEN = use_eigen
+
+    assert len(descriptor.kernels) == 1
+    assert descriptor.kernels[0].exec_info.entry_func_name.startswith("tensordot")
+
+    memory_layout = descriptor.memory_layout
+    static_buffer = np.zeros((memory_layout.static_size,), dtype=np.float32)
+    static_buffer[:memory_layout.data.size] = memory_layout.data
+
+    args = [str(memory_layout.static_size), str(memory_layout.dynamic_size)]
+    stdin = static_buffer.tobytes()
+    # graph is cloned in generate_descriptor, so variables in the descriptor are used
+    for v in list(descriptor.inputs) + list(descriptor.outputs):
+        allocation = memory_layout[v]
+        args += ["1" if allocation.buffer_type == BufferType.Static else "0", str(allocation.offset), str(v.size)]
+
+    for v in graph.inputs:
+        stdin += inputs[v].astype(np.float32).tobytes()  # same order as descriptor.inputs
+
+    with tempfile.TemporaryDirectory() as dirname:
+        source_path = path.join(dirname, "graph.cpp")
+        with open(source_path, "w") as f:
+            f.write(descriptor.concat_kernel_sources() + _graph_harness_main)
+
+        binary_path = path.join(dirname, "graph")
+        subprocess.check_call([compiler, "-O1", "-o", binary_path, source_path])
+        stdout = subprocess.run([binary_path] + args, input=stdin, stdout=subprocess.PIPE, check=True).stdout
+
+    return np.frombuffer(stdout, dtype=np.float32).reshape(graph.outputs[0].shape)
+
+
+def test_epilogue():
+    # multiple cache blocks, so that the epilogue is applied for each block
+    M, N, K = MC_MAX + 22, NC_MAX + 44, 20
+    x = Variable([M, K], OrderNC)
+    w = np.random.rand(K, N) - 0.5
+    b = np.random.rand(N) - 0.5
+    h, = Tensordot(None, axes=[Axis.C, Axis.C])(x, ConstantVariable(w, Order([Axis.C, Axis.H])))
+    h, = Relu(None)(h + ConstantVariable(b, Order([Axis.H])))
+    y = h * 2
+    graph = Graph([x], [y])
+
+    x_data = np.random.rand(M, K) - 0.5
+    expected = np.maximum(x_data @ w + b, 0) * 2
+
+    np.testing.assert_allclose(_run_graph(graph, {x: x_data}), expected, rtol=1e-4, atol=1e-4)
+
+
+def test_epilogue_full_shape_input():
+    M, N, K = 9, 13, 5
+    x = Variable([M, K], OrderNC)
+    r = Variable([M, N], Order([Axis.N, Axis.H]))
+    w = np.random.rand(K, N) - 0.5
+    h, = Tensordot(None, axes=[Axis.C, Axis.C])(x, ConstantVariable(w, Order([Axis.C, Axis.H])))
+    y, = Relu(None)(h + r)
+    graph = Graph([x, r], [y])
+
+    x_data = np.random.rand(M, K) - 0.5
+    r_data = np.random.rand(M, N) - 0.5
+    expected = np.maximum(x_data @ w + r_data, 0)
+
+    np.testing.assert_allclose(_run_graph(graph, {x: x_data, r: r_data}), expected, rtol=1e-4, atol=1e-4)
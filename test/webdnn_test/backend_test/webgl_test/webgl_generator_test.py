@@ -0,0 +1,85 @@
+import json
+
+import numpy as np
+
+from webdnn.backend.interface.generator import generate_descriptor
+from webdnn.backend.webgl.generator import _generate_for_texture_size
+from webdnn.backend.webgl.optimize_rules.webgl_optimize_rule import WebGLTextureSizeIndependentOptimizeRule
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.concat import Concat
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import Order, OrderNHWC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.optimizer.general_optimize_rule import GeneralOptimizeRule
+from webdnn.util import config, profiler
+from webdnn.util import json as webdnn_json
+
+
+def _build_graph():
+    # Im2Col output of this graph is larger than 4096, so texture is split only when max texture size is 4096.
+    x = Variable([1, 72, 72, 3], OrderNHWC)
+    w = ConstantVariable(np.random.rand(4, 3, 3, 3), Order([Axis.N, Axis.C, Axis.KH, Axis.KW]))
+    h, = Convolution2D(None, ksize=3, stride=1, padding=1)(x, w)
+    y, = Concat(None, axis=Axis.C)(h, h * 2)
+    y, = Relu(None)(y)
+    return Graph([x], [y])
+
+
+def _serialize(exec_data):
+    result = {}
+    for max_texture_size, (descriptor, constants) in exec_data.data_dict.items():
+        descriptor = json.loads(webdnn_json.dumps(descriptor))
+        descriptor.pop("converted_at", None)
+        result[max_texture_size] = (json.dumps(descriptor, sort_keys=True), bytes(constants))
+
+    return result
+
+
+def test_parallel_texture_sizes():
+    graph = _build_graph()
+
+    serial = generate_descriptor("webgl", graph, parallel_texture_sizes=False)
+    parallel = generate_descriptor("webgl", graph, parallel_texture_sizes=True)
+
+    assert list(parallel.data_dict.keys()) == [4096, 8192, 16384]
+    assert _serialize(parallel) == _serialize(serial)
+
+
+def test_max_texture_sizes():
+    graph = _build_graph()
+
+    exec_data = generate_descriptor("webgl", graph, max_texture_sizes=[4096, 8192])
+    descriptor_4096, _ = exec_data.data_dict[4096]
+    descriptor_8192, _ = exec_data.data_dict[8192]
+
+    assert list(exec_data.data_dict.keys()) == [4096, 8192]
+    assert len(descriptor_4096.kernels) > len(descriptor_8192.kernels)
+
+
+def test_global_config_is_not_modified():
+    default_size = config.get_webgl_max_texture_size()
+
+    generate_descriptor("webgl", _build_graph(), parallel_texture_sizes=False)
+
+    assert config.get_webgl_max_texture_size() == default_size
+
+
+def test_worker_profiles_are_merged():
+    with profiler.profile() as p:
+        generate_descriptor("webgl", _build_graph(), parallel_texture_sizes=True)
+
+    assert p.phases["allocate"]["count"] == 3
+
+
+def test_texture_size_independent_rule():
+    graph, _ = GeneralOptimizeRule().optimize(_build_graph())
+
+    for max_texture_size in [4096, 16384]:
+        split_graph, _ = WebGLTextureSizeIndependentOptimizeRule().optimize(graph.clone())
+        _, split_descriptor, _ = _generate_for_texture_size(split_graph, max_texture_size)
+        _, descriptor, _ = _generate_for_texture_size(graph.clone(), max_texture_size)
+
+        assert [k.exec_info.shader_name for k in split_descriptor.kernels] == [k.exec_info.shader_name for k in descriptor.kernels]
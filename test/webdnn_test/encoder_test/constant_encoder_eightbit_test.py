@@ -0,0 +1,104 @@
+import io
+import zlib
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import allocate
+from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.encoder.constant_encoder_eightbit import ConstantEncoderEightbit, threshold_array, tbl_floats
+from webdnn.graph.graph import Graph
+from webdnn.graph.order import OrderC, OrderNC
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def _build_memory_layout():
+    x = Variable([2, 3], OrderNC)
+    h = x
+    for i in range(5):
+        h = h * ConstantVariable(np.random.rand(2, 3) - 0.5, OrderNC)
+    h = h + ConstantVariable(np.zeros((2, 3)), OrderNC)
+
+    return allocate(Graph([x], [h]))
+
+
+def _reference_encode(memory_layout):
+    # Serial implementation of eightbit encoder before multi-threading
+    all_code = b""
+    for alloc in memory_layout.allocations.values():
+        if alloc.offset >= memory_layout.data.size:
+            continue
+
+        single_data = memory_layout.data[alloc.offset:alloc.offset + alloc.size]
+        maxval = np.max(np.abs(single_data))
+        maxval = np.maximum(maxval, 1e-20)
+        abs_scaled_data = np.abs(single_data) / maxval
+        code = np.searchsorted(threshold_array, abs_scaled_data)
+        code += (single_data < 0.0).astype(np.int32) * 128
+        code_bytes = zlib.compress(code.astype(np.uint8).tobytes("C"), level=9)
+
+        all_code += np.array([alloc.offset, len(code_bytes)], dtype=np.int32).tobytes()
+        all_code += np.array([maxval], dtype=np.float32).tobytes()
+        all_code += np.array([0], dtype=np.int32).tobytes()
+        all_code += code_bytes
+
+    return all_code
+
+
+def _decode(data: bytes, size: int):
+    table = np.array([0.0] + tbl_floats + [1.0], dtype=np.float32)
+    result = np.zeros(size, dtype=np.float32)
+    i = 0
+    while i < len(data):
+        offset, code_size = np.frombuffer(data[i:i + 8], dtype=np.int32)
+        scale, = np.frombuffer(data[i + 8:i + 12], dtype=np.float32)
+        code = np.frombuffer(zlib.decompress(data[i + 16:i + 16 + code_size]), dtype=np.uint8)
+        value = table[code % 128] * scale
+        value[code >= 128] *= -1
+        result[offset:offset + len(code)] = value
+        i += 16 + code_size
+
+    return result
+
+
+def test_bit_compatible():
+    memory_layout = _build_memory_layout()
+    expected = _reference_encode(memory_layout)
+
+    assert ConstantEncoderEightbit(num_threads=1).encode(memory_layout) == expected
+    assert ConstantEncoderEightbit(num_threads=4).encode(memory_layout) == expected
+
+
+def test_encode_into():
+    memory_layout = _build_memory_layout()
+    encoder = ConstantEncoderEightbit(num_threads=4)
+
+    f = io.BytesIO()
+    encoder.encode_into(memory_layout, f)
+
+    assert f.getvalue() == encoder.encode(memory_layout)
+
+
+def test_compression_level():
+    memory_layout = _build_memory_layout()
+    encoder = ConstantEncoder.get_encoder("eightbit", compression_level=1)
+
+    decoded = _decode(encoder.encode(memory_layout), memory_layout.data.size)
+    expected = _decode(_reference_encode(memory_layout), memory_layout.data.size)
+
+    assert encoder.compression_level == 1
+    assert np.array_equal(decoded, expected)
+    assert np.allclose(decoded, memory_layout.data, atol=0.05)
+
+
+def test_dynamic_batch():
+    # allocations in dynamic buffer have placeholder offsets, and they must not be encoded
+    x = Variable([Placeholder(label="N"), 3], OrderNC)
+    h = x * ConstantVariable(np.random.rand(3) - 0.5, OrderC)
+    h = h + ConstantVariable(np.random.rand(3) - 0.5, OrderC)
+    memory_layout = allocate(Graph([x], [h]))
+
+    decoded = _decode(ConstantEncoderEightbit().encode(memory_layout), memory_layout.data.size)
+
+    assert np.allclose(decoded, memory_layout.data, atol=0.05)
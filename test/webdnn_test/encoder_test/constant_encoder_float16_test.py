@@ -0,0 +1,106 @@
+import io
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import allocate
+from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.encoder.constant_encoder_float16 import ConstantEncoderFloat16, decode
+from webdnn.graph.graph import Graph
+from webdnn.graph.order import OrderC, OrderNC
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def _build_memory_layout(*values: np.ndarray):
+    x = Variable([2, 3], OrderNC)
+    h = x
+    for value in values:
+        h = h * ConstantVariable(value, OrderNC)
+
+    return allocate(Graph([x], [h]))
+
+
+def test_get_encoder():
+    encoder = ConstantEncoder.get_encoder("float16", compression_level=1)
+    assert isinstance(encoder, ConstantEncoderFloat16)
+    assert encoder.name == "float16"
+    assert encoder.compression_level == 1
+
+
+def test_round_trip_exact():
+    # all values are representable in float16
+    values = [np.arange(6, dtype=np.float16).reshape(2, 3).astype(np.float32) * 0.25,
+              np.array([[-65504, 65504, 6.103515625e-05], [5.960464477539063e-08, -0.0, 1025]], dtype=np.float32)]
+    memory_layout = _build_memory_layout(*values)
+
+    for compression_level in [0, 9]:
+        decoded = decode(ConstantEncoderFloat16(compression_level).encode(memory_layout))
+        np.testing.assert_array_equal(decoded[:memory_layout.data.size], memory_layout.data)
+
+
+def test_round_trip_rounding():
+    memory_layout = _build_memory_layout(np.random.rand(2, 3) - 0.5, np.random.rand(2, 3) * 1000)
+    data = memory_layout.data
+
+    decoded = decode(ConstantEncoderFloat16().encode(memory_layout))
+
+    np.testing.assert_array_equal(decoded[:data.size], data.astype(np.float16).astype(np.float32))
+
+
+def test_clip_out_of_range():
+    memory_layout = _build_memory_layout(np.array([[1e6, -1e6, 1], [2, 3, 4]]))
+
+    decoded = decode(ConstantEncoderFloat16().encode(memory_layout))
+
+    assert np.all(np.isfinite(decoded))
+    assert decoded.max() == 65504 and decoded.min() == -65504
+
+
+def test_compression_is_optional_per_allocation():
+    # compressible (all zero) and incompressible (random) allocations
+    memory_layout = _build_memory_layout(np.zeros((2, 3)), np.random.rand(2, 3))
+
+    encoded = ConstantEncoderFloat16(compression_level=9).encode(memory_layout)
+
+    flags = []
+    src_offset = 0
+    while src_offset < len(encoded):
+        _, size, body_size, flag = np.frombuffer(encoded, dtype="<i4", count=4, offset=src_offset).tolist()
+        assert body_size <= size * 2
+        flags.append(flag)
+        src_offset += 16 + body_size
+
+    assert 0 in flags and 1 in flags
+
+
+def test_uncompressed_size():
+    memory_layout = _build_memory_layout(np.random.rand(2, 3), np.random.rand(2, 3))
+    num_allocations = len([a for a in memory_layout.allocations.values() if a.offset < memory_layout.data.size])
+
+    encoded = ConstantEncoderFloat16(compression_level=0).encode(memory_layout)
+
+    assert len(encoded) == num_allocations * 16 + memory_layout.data.size * 2
+
+
+def test_encode_into():
+    memory_layout = _build_memory_layout(np.random.rand(2, 3), np.random.rand(2, 3))
+    encoder = ConstantEncoderFloat16()
+
+    stream = io.BytesIO()
+    encoder.encode_into(memory_layout, stream)
+
+    assert stream.getvalue() == encoder.encode(memory_layout)
+
+
+def test_dynamic_batch():
+    # allocations in dynamic buffer have placeholder offsets, and they must not be encoded
+    x = Variable([Placeholder(label="N"), 3], OrderNC)
+    h = x * ConstantVariable(np.array([0.25, -0.5, 2]), OrderC)
+    h = h + ConstantVariable(np.array([1, 2, 3]), OrderC)
+    memory_layout = allocate(Graph([x], [h]))
+
+    decoded = decode(ConstantEncoderFloat16().encode(memory_layout))
+
+    np.testing.assert_array_equal(decoded, memory_layout.data[:decoded.size])
+    assert np.all(memory_layout.data[decoded.size:] == 0)
@@ -0,0 +1,194 @@
+import io
+import json
+import os.path as path
+import tempfile
+import warnings
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import allocate
+from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.encoder.constant_encoder_int8 import ConstantEncoderInt8, decode, dequantize, quantize
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.order import Order, OrderC, OrderNC, OrderNHWC
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def _conv_weight(channel_scales):
+    # filter whose per-output-channel ranges differ by orders of magnitude
+    w = np.random.rand(len(channel_scales), 3, 3, 4) - 0.5
+    return w * np.array(channel_scales)[:, None, None, None]
+
+
+def _build_memory_layout(w: np.ndarray, b: np.ndarray = None):
+    x = Variable([1, 5, 5, w.shape[3]], OrderNHWC)
+    h, = Convolution2D(None, ksize=3, stride=1, padding=1)(x, ConstantVariable(w, Order([Axis.N, Axis.KH, Axis.KW, Axis.C])))
+    if b is not None:
+        h = h + ConstantVariable(b, OrderC)
+
+    return allocate(Graph([x], [h]))
+
+
+def _snr(data, decoded):
+    return 10 * np.log10(np.sum(np.square(data.astype(np.float64))) / np.sum(np.square(decoded - data.astype(np.float64))))
+
+
+def test_get_encoder():
+    encoder = ConstantEncoder.get_encoder("int8", snr_threshold=10)
+    assert isinstance(encoder, ConstantEncoderInt8)
+    assert encoder.name == "int8"
+    assert encoder.snr_threshold == 10
+
+
+def test_quantize_per_channel():
+    data = _conv_weight([1e-3, 1, 1e3]).astype(np.float32)
+    code, scale, zero_point = quantize(data, 0)
+
+    assert code.dtype == np.uint8 and code.shape == data.shape
+    assert scale.shape == (3,) and zero_point.shape == (3,)
+
+    decoded = dequantize(code, scale, zero_point, 0)
+    for c in range(3):
+        # error of each channel is bounded by half of its own quantization step
+        assert np.max(np.abs(decoded[c] - data[c])) <= scale[c] * 0.5 + 1e-6 * np.abs(data[c]).max()
+
+
+def test_quantize_zero_is_exact():
+    data = np.array([[0, 1, 2], [0, -3, 5]], dtype=np.float32)
+    code, scale, zero_point = quantize(data, 0)
+
+    decoded = dequantize(code, scale, zero_point, 0)
+    assert decoded[0, 0] == 0 and decoded[1, 0] == 0
+
+
+def test_quantize_constant_channel():
+    data = np.zeros((2, 3), dtype=np.float32)
+    code, scale, zero_point = quantize(data, 0)
+
+    np.testing.assert_array_equal(dequantize(code, scale, zero_point, 0), data)
+
+
+def test_round_trip():
+    memory_layout = _build_memory_layout(_conv_weight([1e-3, 1, 1e3, 10]), np.random.rand(4) - 0.5)
+
+    for compression_level in [0, 9]:
+        encoder = ConstantEncoderInt8(compression_level=compression_level)
+        decoded = decode(encoder.encode(memory_layout))
+
+        for v, alloc in memory_layout.allocations.items():
+            if not isinstance(v, ConstantVariable):
+                continue
+
+            data = memory_layout.data[alloc.offset:alloc.offset + v.size].reshape(v.shape)
+            # bias has only channel axis, so it's quantized as single channel
+            axis = None if v.ndim == 1 else v.order.axes_dict[Axis.N]
+            expected = dequantize(*quantize(data, axis), axis)
+            np.testing.assert_array_equal(decoded[alloc.offset:alloc.offset + v.size].reshape(v.shape), expected)
+
+
+def test_bias_single_channel():
+    b = np.random.rand(64).astype(np.float32) - 0.5
+    x = Variable([1, 64], OrderNC)
+    h = x + ConstantVariable(b, OrderC)
+    memory_layout = allocate(Graph([x], [h]))
+
+    encoder = ConstantEncoderInt8(compression_level=0)
+    encoded = encoder.encode(memory_layout)
+
+    num_channels, channel_stride = np.frombuffer(encoded, dtype="<i4", count=2, offset=8).tolist()
+    assert num_channels == 1 and channel_stride == 1
+    assert encoder.reports[0].axis is None
+    # header + scale + zero point + code, smaller than raw float32 data
+    assert len(encoded) == 24 + 4 + 1 + 64
+    assert len(encoded) < b.nbytes
+
+    np.testing.assert_array_equal(decode(encoded)[:b.size], dequantize(*quantize(b, None), None))
+
+
+def test_zero_points_stored_as_uint8():
+    memory_layout = _build_memory_layout(_conv_weight([1e-3, 1, 1e3, 10]))
+
+    encoded = ConstantEncoderInt8(compression_level=0).encode(memory_layout)
+    data = memory_layout.data
+
+    num_channels = np.frombuffer(encoded, dtype="<i4", count=1, offset=8)[0]
+    _, _, zero_point = quantize(data.reshape(4, 3, 3, 4), 0)
+    assert num_channels == 4
+    assert encoded[24 + 4 * 4:24 + 5 * 4] == zero_point.astype(np.uint8).tobytes()
+    assert len(encoded) == 24 + 5 * 4 + data.size
+
+
+def test_small_channels_preserved():
+    w = _conv_weight([1e-3, 1e-2, 1, 1e2])
+    memory_layout = _build_memory_layout(w)
+    data = memory_layout.data
+
+    encoder = ConstantEncoderInt8()
+    decoded = decode(encoder.encode(memory_layout))[:data.size]
+
+    # small channels are not lost, unlike single scale per allocation
+    assert _snr(data[:w.size // 4], decoded[:w.size // 4]) > 30
+    assert encoder.reports[0].snr > 30
+
+
+def test_report():
+    memory_layout = _build_memory_layout(_conv_weight([1, 2, 3, 4]), np.random.rand(4) - 0.5)
+
+    encoder = ConstantEncoderInt8()
+    decoded = decode(encoder.encode(memory_layout))
+
+    assert len(encoder.reports) == 2
+    report_w, report_b = encoder.reports
+    assert report_w.shape == (4, 3, 3, 4) and report_w.axis == "N"
+    assert report_b.shape == (4,) and report_b.axis is None
+
+    data = memory_layout.data[:4 * 3 * 3 * 4]
+    error = np.abs(decoded[:data.size] - data)
+    assert np.isclose(report_w.max_abs_error, error.max(), rtol=1e-5)
+    assert np.isclose(report_w.mean_abs_error, error.mean(), rtol=1e-5)
+    assert np.isclose(report_w.snr, _snr(data, decoded[:data.size]), rtol=1e-3)
+
+
+def test_report_warning_and_file():
+    memory_layout = _build_memory_layout(_conv_weight([1, 2, 3, 4]))
+
+    with tempfile.TemporaryDirectory() as dirname:
+        report_path = path.join(dirname, "report.json")
+        encoder = ConstantEncoderInt8(snr_threshold=1000, report_path=report_path)
+
+        with warnings.catch_warnings(record=True) as records:
+            warnings.simplefilter("always")
+            encoder.encode(memory_layout)
+
+        assert any("Quantization error" in str(record.message) for record in records)
+
+        with open(report_path) as f:
+            reports = json.load(f)
+
+        assert len(reports) == 1
+        assert reports[0]["name"] == encoder.reports[0].name
+
+
+def test_encode_into():
+    memory_layout = _build_memory_layout(_conv_weight([1, 2, 3, 4]), np.random.rand(4))
+    encoder = ConstantEncoderInt8()
+
+    stream = io.BytesIO()
+    encoder.encode_into(memory_layout, stream)
+
+    assert stream.getvalue() == encoder.encode(memory_layout)
+
+
+def test_dynamic_batch():
+    x = Variable([Placeholder(label="N"), 3], OrderNC)
+    h = x * ConstantVariable(np.random.rand(3) - 0.5, OrderC)
+    h = h + ConstantVariable(np.random.rand(3) - 0.5, OrderC)
+    memory_layout = allocate(Graph([x], [h]))
+
+    decoded = decode(ConstantEncoderInt8().encode(memory_layout))
+
+    assert np.allclose(decoded, memory_layout.data[:decoded.size], atol=0.01)
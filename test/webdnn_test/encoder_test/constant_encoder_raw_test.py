@@ -0,0 +1,47 @@
+import io
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import allocate
+from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.encoder.constant_encoder_raw import ConstantEncoderRaw
+from webdnn.graph.graph import Graph
+from webdnn.graph.order import OrderC, OrderNC
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def _build_memory_layout(batch_size=2):
+    x = Variable([batch_size, 3], OrderNC)
+    h = x * ConstantVariable(np.random.rand(3) - 0.5, OrderC)
+    h = h + ConstantVariable(np.random.rand(3) - 0.5, OrderC)
+
+    return allocate(Graph([x], [h]))
+
+
+def test_get_encoder():
+    assert isinstance(ConstantEncoder.get_encoder(), ConstantEncoderRaw)
+    assert isinstance(ConstantEncoder.get_encoder("raw"), ConstantEncoderRaw)
+
+
+def test_encode():
+    memory_layout = _build_memory_layout()
+
+    assert ConstantEncoderRaw().encode(memory_layout) == memory_layout.data.astype(np.float32).tobytes()
+
+
+def test_encode_into():
+    memory_layout = _build_memory_layout()
+    encoder = ConstantEncoderRaw()
+
+    stream = io.BytesIO()
+    encoder.encode_into(memory_layout, stream)
+
+    assert stream.getvalue() == encoder.encode(memory_layout)
+
+
+def test_dynamic_batch():
+    memory_layout = _build_memory_layout(Placeholder(label="N"))
+
+    assert ConstantEncoderRaw().encode(memory_layout) == memory_layout.data.astype(np.float32).tobytes()
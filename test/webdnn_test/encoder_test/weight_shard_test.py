@@ -0,0 +1,172 @@
+import json
+import os
+import os.path as path
+import tempfile
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import allocate
+from webdnn.backend.interface.generator import generate_descriptor
+from webdnn.encoder import constant_encoder_float16, constant_encoder_int8
+from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.encoder.constant_encoder_raw import ConstantEncoderRaw
+from webdnn.encoder.weight_shard import EncodedConstants, encode_constants, split_shards, write_constants
+from webdnn.graph import traverse
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def _build_chain(num_constants, size):
+    x = Variable([2, size], OrderNC)
+    h = x
+    for _ in range(num_constants):
+        # Relu prevents constants from being folded into single constant
+        h, = Relu(None)(h * ConstantVariable(np.random.rand(2, size) - 0.5, OrderNC))
+
+    return Graph([x], [h])
+
+
+def _assemble(shards, decode, size):
+    result = np.zeros((size,), dtype=np.float32)
+    for shard in shards:
+        decoded = decode(shard.data)
+        shard_offset = 0
+        for a in shard.allocations:
+            result[a.offset:a.offset + a.size] = decoded[shard_offset:shard_offset + a.size]
+            shard_offset += a.size
+
+    return result
+
+
+def test_shard_size_bound():
+    graph = _build_chain(10, 16)  # each constant is 2*16*4 = 128 bytes
+    memory_layout = allocate(graph)
+
+    shards = split_shards(graph, memory_layout, 300, "weight_{}.bin")
+
+    assert [len(shard.allocations) for shard in shards] == [2, 2, 2, 2, 2]
+    assert [shard.filename for shard in shards] == [f"weight_{i}.bin" for i in range(5)]
+    assert all(shard.size * 4 <= 300 for shard in shards)
+
+
+def test_large_constant_makes_own_shard():
+    graph = _build_chain(3, 16)
+    memory_layout = allocate(graph)
+
+    shards = split_shards(graph, memory_layout, 100, "weight_{}.bin")
+
+    assert [len(shard.allocations) for shard in shards] == [1, 1, 1]
+
+
+def test_first_use_order():
+    graph = _build_chain(6, 4)
+    memory_layout = allocate(graph)
+
+    shards = split_shards(graph, memory_layout, 64, "weight_{}.bin")
+
+    expected = []
+    for op in traverse.listup_operators(graph):
+        for v in op.inputs.values():
+            if isinstance(v, ConstantVariable) and memory_layout[v].name not in expected:
+                expected.append(memory_layout[v].name)
+
+    assert [a.name for shard in shards for a in shard.allocations] == expected
+
+
+def test_not_sharded():
+    graph = _build_chain(3, 4)
+    memory_layout = allocate(graph)
+    encoder = ConstantEncoder.get_encoder("raw")
+
+    constants, shards = encode_constants(encoder, graph, memory_layout, 0, "weight_{}.bin")
+
+    assert shards is None
+    assert bytes(constants) == encoder.encode(memory_layout)
+
+
+def test_round_trip():
+    graph = _build_chain(7, 8)
+    memory_layout = allocate(graph)
+    data = memory_layout.data
+
+    decoders = {
+        "raw": lambda b: np.frombuffer(b, dtype=np.float32),
+        "float16": constant_encoder_float16.decode,
+        "int8": constant_encoder_int8.decode,
+    }
+    for name, decode in decoders.items():
+        encoder = ConstantEncoder.get_encoder(name)
+        _, shards = encode_constants(encoder, graph, memory_layout, 150, "weight_{}.bin")
+        assert len(shards) > 1
+
+        # each shard is decoded independently, and the result is same as the one of non-sharded constants
+        expected = decode(encoder.encode(memory_layout))[:data.size]
+        np.testing.assert_array_equal(_assemble(shards, decode, data.size), expected)
+
+
+def test_save():
+    graph = _build_chain(5, 16)
+
+    with tempfile.TemporaryDirectory() as dirname:
+        exec_info = generate_descriptor("fallback", graph, weight_shard_size=300, cache=False)
+        exec_info.save(dirname)
+
+        with open(path.join(dirname, "graph_fallback.json")) as f:
+            descriptor = json.load(f)
+
+        shards = descriptor["weight_shards"]
+        assert len(shards) == 3
+        assert not path.exists(path.join(dirname, "weight_fallback.bin"))
+
+        static_allocations = descriptor["memory_layout"]["static"]["allocations"]
+        for shard in shards:
+            assert os.stat(path.join(dirname, shard["filename"])).st_size == shard["byte_length"]
+            assert shard["size"] == sum(a["size"] for a in shard["allocations"])
+
+            for a in shard["allocations"]:
+                assert static_allocations[a["name"]]["offset"] == a["offset"]
+
+
+def test_save_without_shards():
+    graph = _build_chain(2, 4)
+
+    with tempfile.TemporaryDirectory() as dirname:
+        exec_info = generate_descriptor("fallback", graph, cache=False)
+        exec_info.save(dirname)
+
+        with open(path.join(dirname, "graph_fallback.json")) as f:
+            descriptor = json.load(f)
+
+        assert descriptor["weight_shards"] is None
+        assert path.exists(path.join(dirname, "weight_fallback.bin"))
+
+
+def test_save_with_encoder():
+    graph = _build_chain(3, 8)
+
+    for name in ["raw", "eightbit", "float16", "int8"]:
+        with tempfile.TemporaryDirectory() as dirname:
+            exec_info = generate_descriptor("fallback", graph, constant_encoder_name=name, cache=False)
+            exec_info.save(dirname)
+
+            with open(path.join(dirname, "weight_fallback.bin"), "rb") as f:
+                assert f.read() == ConstantEncoder.get_encoder(name).encode(exec_info.descriptor.memory_layout)
+
+
+class _StreamOnlyEncoder(ConstantEncoderRaw):
+    def encode(self, memory_layout):
+        raise AssertionError("constants must be streamed into the file without encoding into bytes")
+
+
+def test_write_constants_streams_encoded_data():
+    graph = _build_chain(2, 4)
+    memory_layout = allocate(graph)
+
+    with tempfile.TemporaryDirectory() as dirname:
+        write_constants(dirname, "weight.bin", EncodedConstants(_StreamOnlyEncoder(), memory_layout), None)
+
+        with open(path.join(dirname, "weight.bin"), "rb") as f:
+            assert f.read() == ConstantEncoderRaw().encode(memory_layout)
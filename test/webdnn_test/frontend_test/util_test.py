@@ -0,0 +1,66 @@
+import numpy as np
+
+from webdnn.frontend.util import fold_constants, prefetch_constants
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+class _StubSession:
+    def __init__(self, values):
+        self.values = values
+        self.run_count = 0
+
+    def run(self, fetches):
+        self.run_count += 1
+        return [self.values[tensor] for tensor in fetches]
+
+
+class _StubOperation:
+    def __init__(self, op_type, outputs):
+        self.type = op_type
+        self.outputs = outputs
+
+
+def test_prefetch_constants():
+    values = {f"w{i}": np.random.rand(3, 4) for i in range(3)}
+    ops = [_StubOperation("VariableV2", [f"w{i}"]) for i in range(3)] + [_StubOperation("MatMul", ["y"])]
+    session = _StubSession(values)
+
+    cache = prefetch_constants(session, ops, ("VariableV2",))
+
+    assert session.run_count == 1
+    assert sorted(cache.keys()) == ["w0", "w1", "w2"]
+    for key, value in values.items():
+        assert cache[key] is value
+
+
+def test_prefetch_constants_without_constants():
+    session = _StubSession({})
+
+    assert prefetch_constants(session, [_StubOperation("MatMul", ["y"])], ("VariableV2",)) == {}
+    assert session.run_count == 0
+
+
+def test_fold_constants():
+    visited = set()
+
+    # operators created by the handler of 1st operation: all inputs are constant
+    c = ConstantVariable(np.arange(6).reshape(2, 3), OrderNC)
+    h = c * 2 + 1
+    h_folded, = fold_constants([], [h], visited)
+
+    assert isinstance(h_folded, ConstantVariable)
+    assert np.allclose(h_folded.data, np.arange(6).reshape(2, 3) * 2 + 1)
+
+    # 2nd operation: not constant
+    x = Variable([2, 3], OrderNC)
+    y = x * h_folded
+    assert fold_constants([x, h_folded], [y], visited) == [y]
+    num_visited = len(visited)
+
+    # 3rd operation: only the operator created by this operation is checked
+    z, = Relu(None)(y)
+    assert fold_constants([y], [z], visited) == [z]
+    assert len(visited) == num_visited + 1
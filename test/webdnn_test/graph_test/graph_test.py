@@ -0,0 +1,84 @@
+import sys
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.graph import traverse
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import OrderNC, OrderCN
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.optimizer.general_optimize_rule import GeneralOptimizeRule
+
+
+def _build_graph():
+    x = Variable([2, 3], OrderNC)
+    c = ConstantVariable(np.random.rand(2, 3), OrderNC)
+    h, = Relu(None)(x * 2 + c)
+    y = h + c
+    return Graph([x], [y])
+
+
+def test_clone():
+    graph = _build_graph()
+    graph2 = graph.clone()
+
+    nodes1 = traverse.listup_nodes(graph)
+    nodes2 = traverse.listup_nodes(graph2)
+
+    assert len(nodes1) == len(nodes2)
+    assert all(n1.__class__ == n2.__class__ for n1, n2 in zip(nodes1, nodes2))
+    assert all(n1 is not n2 for n1, n2 in zip(nodes1, nodes2))
+    assert set(nodes1).isdisjoint(nodes2)
+
+    for n2 in nodes2:
+        for attr in n2.attributes:
+            assert attr.base is n2
+
+
+def test_clone_independence():
+    graph = _build_graph()
+    vx = np.random.rand(2, 3)
+    expected = ReferenceExecutor.run(graph, {graph.inputs[0]: vx})[graph.outputs[0]]
+
+    graph2 = graph.clone()
+    graph2, _ = GeneralOptimizeRule().optimize(graph2)
+    graph2.outputs[0].change_order(OrderCN)
+
+    assert graph.outputs[0].order == OrderNC
+    assert np.allclose(ReferenceExecutor.run(graph, {graph.inputs[0]: vx})[graph.outputs[0]], expected)
+    assert np.allclose(ReferenceExecutor.run(graph2, {graph2.inputs[0]: vx})[graph2.outputs[0]], expected.T)
+
+
+def test_clone_shares_constant_data():
+    graph = _build_graph()
+    graph2 = graph.clone()
+
+    c1, = traverse.filter_nodes(traverse.listup_variables(graph), ConstantVariable)
+    c2, = traverse.filter_nodes(traverse.listup_variables(graph2), ConstantVariable)
+
+    assert np.shares_memory(c1.data, c2.data)
+    assert not c2.data.flags.writeable
+
+    try:
+        c2.data[0, 0] = 0
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Shared constant data must not be modified in-place")
+
+    c2.change_order(OrderCN)
+    assert c1.order == OrderNC
+    assert np.allclose(c1.data.T, c2.data)
+
+
+def test_clone_deep_graph():
+    x = Variable([2, 3], OrderNC)
+    h = x
+    for _ in range(sys.getrecursionlimit()):
+        h, = Relu(None)(h)
+
+    graph2 = Graph([x], [h]).clone()
+
+    assert len(traverse.listup_operators(graph2)) == sys.getrecursionlimit()
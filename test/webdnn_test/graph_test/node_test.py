@@ -1,4 +1,8 @@
-from webdnn.graph.node import Node
+import copy
+import pickle
+
+from webdnn.graph.attribute import Attribute
+from webdnn.graph.node import AttributeSet, Node
 
 
 def test_append_prev():
@@ -45,3 +49,79 @@ def test_remove_next():
     assert n1.nexts == set()
     assert n2.prevs == set()
     assert n2.nexts == set()
+
+
+def test_cached_adjacency_view():
+    n1 = Node()
+    n2 = Node()
+    n3 = Node()
+    n2.append_prev(n1)
+
+    nexts = n1.nexts
+    assert n1.nexts is nexts
+    assert isinstance(nexts, frozenset)
+
+    n3.append_prev(n1)
+    assert nexts == {n2}
+    assert n1.nexts == {n2, n3}
+
+    n2.remove_prev(n1)
+    assert n1.nexts == {n3}
+    assert n2.prevs == set()
+
+
+def test_get_attribute():
+    class Attr1(Attribute):
+        pass
+
+    class Attr2(Attribute):
+        pass
+
+    n = Node()
+    a1 = Attr1(n)
+    n.attributes.add(a1)
+
+    assert n.get_attribute(Attr1) == [a1]
+    assert n.get_attribute(Attr2) == []
+    assert n.has_attribute(Attribute)
+
+    a2 = Attr2(n)
+    n.attributes.add(a2)
+    assert n.get_attribute(Attr2) == [a2]
+    assert set(n.get_attribute(Attribute)) == {a1, a2}
+
+    n.attributes.remove(a1)
+    assert not n.has_attribute(Attr1)
+
+    n.attributes |= {a1}
+    assert n.get_attribute(Attr1) == [a1]
+
+    n.attributes.clear()
+    assert n.get_attribute(Attribute) == []
+
+
+def test_state():
+    n1 = Node()
+    n2 = Node()
+    n2.append_prev(n1)
+    assert n1.nexts == {n2}
+
+    n3 = copy.copy(n1)
+    assert n3.name == n1.name
+    assert n3.nexts == {n2}
+    assert isinstance(n3.attributes, AttributeSet)
+    assert "_nexts_view" not in n1.__getstate__()
+
+    n3 = pickle.loads(pickle.dumps(n1))
+    assert n3.name == n1.name
+    assert len(n3.nexts) == 1
+    assert isinstance(n3.attributes, AttributeSet)
+
+
+def test_get_attribute_replaced_set():
+    n = Node()
+    a = Attribute(n)
+    n.attributes = n.attributes | {a}
+
+    assert n.get_attribute(Attribute) == [a]
+    assert isinstance(n.attributes, AttributeSet)
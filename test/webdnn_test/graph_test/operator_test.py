@@ -1,3 +1,5 @@
+from nose.tools import raises
+
 from webdnn.graph.operator import Operator
 from webdnn.graph.order import OrderNHWC
 from webdnn.graph.variable import Variable
@@ -126,3 +128,28 @@ def test_replace_all():
     assert len(op2.outputs) == 1 and op2.outputs["v2"] == v2
     assert v1.input_to == {op2}
     assert v2.output_from == op2
+
+
+def test_inputs_snapshot():
+    op = Operator("op")
+    v1 = Variable((1, 2, 3, 4), OrderNHWC)
+    v2 = Variable((1, 2, 3, 4), OrderNHWC)
+
+    op.append_input("v1", v1)
+    inputs = op.inputs
+    assert op.inputs is inputs
+
+    op.append_input("v2", v2)
+    assert dict(inputs) == {"v1": v1}
+    assert dict(op.inputs) == {"v1": v1, "v2": v2}
+
+    for _, v in op.inputs.items():
+        op.remove_input(v)
+
+    assert len(op.inputs) == 0
+
+
+@raises(TypeError)
+def test_inputs_read_only():
+    op = Operator("op")
+    op.inputs["v1"] = Variable((1, 2, 3, 4), OrderNHWC)
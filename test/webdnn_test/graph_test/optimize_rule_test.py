@@ -0,0 +1,187 @@
+from typing import List
+
+import numpy as np
+
+from webdnn.backend.reference.executor import ReferenceExecutor
+from webdnn.graph import traverse
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.node import Node
+from webdnn.graph.operators.average_pooling_2d import AveragePooling2D
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.linear import Linear
+from webdnn.graph.operators.max_pooling_2d import MaxPooling2D
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.softmax import Softmax
+from webdnn.graph.operators.tanh import Tanh
+from webdnn.graph.operators.zero_padding_2d import ZeroPadding2D
+from webdnn.graph.order import Order, OrderC, OrderCN, OrderNC, OrderNHWC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.graph.optimize_rule import OptimizeRule, OptimizeRuleGroup
+from webdnn.optimizer.general_optimize_rule import GeneralOptimizeRule
+
+
+def _build_graph(vc: np.ndarray):
+    x = Variable([2, 3], OrderNC)
+    c = ConstantVariable(vc, OrderNC)
+    h = x
+    for _ in range(3):
+        h = (h * 1 + 0) * 2 + 3
+        h, = Relu(None)(h)
+        h = h + (c * 2 + 1)
+        h = h ** 1
+        h, = Tanh(None)(h - 1)
+
+    return Graph([x], [h])
+
+
+def _conv_bn(x: Variable, out_channels: int, ksize: int, stride: int = 1, relu: bool = True):
+    # Keras-style convolution block: padding is a separate layer, and batch normalization is converted into per-channel affine
+    if ksize > 1:
+        x, = ZeroPadding2D(None, padding=ksize // 2)(x)
+
+    w = ConstantVariable(np.random.rand(out_channels, x.shape_dict[Axis.C], ksize, ksize) - 0.5,
+                         Order([Axis.N, Axis.C, Axis.KH, Axis.KW]))
+    h, = Convolution2D(None, ksize=ksize, stride=stride, padding=0)(x, w)
+
+    # coefficients are constant expressions, which are folded while optimization
+    mean = ConstantVariable(np.random.rand(out_channels), OrderC)
+    variance = ConstantVariable(np.random.rand(out_channels), OrderC)
+    gamma = ConstantVariable(np.random.rand(out_channels) + 0.5, OrderC)
+    beta = ConstantVariable(np.random.rand(out_channels), OrderC)
+    h = (h - mean) * (gamma * (variance + 1e-3) ** -0.5) + beta
+
+    if relu:
+        h, = Relu(None)(h)
+
+    return h
+
+
+def _build_resnet():
+    x = Variable([1, 32, 32, 3], OrderNHWC)
+
+    h = _conv_bn(x, 8, 7, stride=2)
+    h, = ZeroPadding2D(None, padding=1)(h)
+    h, = MaxPooling2D(None, ksize=3, stride=2, padding=0)(h)
+
+    for channels, stride in [(8, 1), (8, 1), (16, 2), (16, 1)]:
+        shortcut = h
+        if stride != 1 or channels * 2 != h.shape_dict[Axis.C]:
+            shortcut = _conv_bn(h, channels * 2, 1, stride=stride, relu=False)
+
+        b = _conv_bn(h, channels, 1, stride=stride)
+        b = _conv_bn(b, channels, 3)
+        b = _conv_bn(b, channels * 2, 1, relu=False)
+        h, = Relu(None)(b + shortcut)
+
+    h, = AveragePooling2D(None, ksize=h.shape_dict[Axis.H], stride=1, padding=0)(h)
+    h = h.reshape([1, h.size], OrderNC)
+    h, = Linear(None)(h, ConstantVariable(np.random.rand(h.size, 10) - 0.5, OrderCN))
+    h, = Softmax(None, axis=Axis.C)(h + ConstantVariable(np.random.rand(10), OrderC))
+
+    return Graph([x], [h])
+
+
+def _optimize(graph: Graph, scheduler: str):
+    rule = GeneralOptimizeRule()
+    rule.scheduler = scheduler
+    graph, _ = rule.optimize(graph)
+    return graph, rule
+
+
+def test_worklist_scheduler():
+    vc = np.random.rand(2, 3)
+    vx = np.random.rand(2, 3) - 0.5
+
+    graph1 = _build_graph(vc)
+    expected = ReferenceExecutor.run(graph1, {graph1.inputs[0]: vx})[graph1.outputs[0]]
+    graph1, rule1 = _optimize(graph1, "sweep")
+
+    graph2 = _build_graph(vc)
+    graph2, rule2 = _optimize(graph2, "worklist")
+
+    ops1 = [op.__class__.__name__ for op in traverse.listup_operators(graph1)]
+    ops2 = [op.__class__.__name__ for op in traverse.listup_operators(graph2)]
+    assert ops1 == ops2
+
+    assert np.allclose(ReferenceExecutor.run(graph1, {graph1.inputs[0]: vx})[graph1.outputs[0]], expected, atol=1e-5)
+    assert np.allclose(ReferenceExecutor.run(graph2, {graph2.inputs[0]: vx})[graph2.outputs[0]], expected, atol=1e-5)
+
+    assert sum(rule2.invocation_counts.values()) <= sum(rule1.invocation_counts.values())
+
+
+def test_worklist_scheduler_unchanged_graph():
+    x = Variable([2, 3], OrderNC)
+    y, = Relu(None)(x)
+
+    _, rule1 = _optimize(Graph([x], [y]), "sweep")
+    graph, rule2 = _optimize(Graph([x], [y]), "worklist")
+
+    assert [op.__class__.__name__ for op in traverse.listup_operators(graph)] == ["Relu"]
+    assert rule2.invocation_counts == rule1.invocation_counts
+
+
+def test_worklist_scheduler_resnet():
+    graph1 = _build_resnet()
+    graph2 = graph1.clone()
+    vx = np.random.rand(1, 32, 32, 3)
+    expected = ReferenceExecutor.run(graph1, {graph1.inputs[0]: vx})[graph1.outputs[0]]
+
+    graph1, rule1 = _optimize(graph1, "sweep")
+    graph2, rule2 = _optimize(graph2, "worklist")
+
+    def summarize(graph):
+        return sorted((op.__class__.__name__, repr(sorted((k, repr(v)) for k, v in op.parameters.items() if k != "name")),
+                       tuple((name, v.shape, v.order.axes, isinstance(v, ConstantVariable)) for name, v in sorted(op.inputs.items())))
+                      for op in traverse.listup_operators(graph))
+
+    assert summarize(graph1) == summarize(graph2)
+    assert rule1.invocation_counts["FoldAxiswiseAffineIntoWeight"] > 0
+    assert rule1.invocation_counts["ConcatZeroPadding"] > 0
+
+    assert np.allclose(ReferenceExecutor.run(graph1, {graph1.inputs[0]: vx})[graph1.outputs[0]], expected, atol=1e-5)
+    assert np.allclose(ReferenceExecutor.run(graph2, {graph2.inputs[0]: vx})[graph2.outputs[0]], expected, atol=1e-5)
+
+
+class _RecordRelu(OptimizeRule):
+    targets = [Relu]
+
+    def __init__(self, pattern_length):
+        self.pattern_length = pattern_length
+        self.records = []
+
+    def optimize(self, graph: Graph):
+        return graph, False
+
+    def optimize_nodes(self, graph: Graph, nodes: List[Node]):
+        self.records.append(nodes)
+        return graph, False
+
+
+class _ModifyInput(OptimizeRule):
+    def __init__(self):
+        self.done = False
+
+    def optimize(self, graph: Graph):
+        if self.done:
+            return graph, False
+
+        self.done = True
+        graph.inputs[0].mark_modified()
+        return graph, True
+
+
+def test_worklist_scheduler_pattern_length():
+    x = Variable([2, 3], OrderNC)
+    h1, = Relu(None)(x)
+    h2, = Relu(None)(h1)
+    y, = Relu(None)(h2)
+    relu1, relu2, relu3 = h1.output_from, h2.output_from, y.output_from
+
+    for pattern_length, expected in [(2, [relu1]), (4, [relu1, relu2]), (None, [relu1, relu2, relu3])]:
+        rule = _RecordRelu(pattern_length)
+        OptimizeRuleGroup([rule, _ModifyInput()], scheduler="worklist").optimize(Graph([x], [y]))
+
+        # the first application is whole graph optimization
+        assert rule.records == [expected], pattern_length
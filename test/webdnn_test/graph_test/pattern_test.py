@@ -0,0 +1,161 @@
+import numpy as np
+from nose.tools import raises
+
+from webdnn.graph.attribute import Attribute
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.elementwise import Elementwise
+from webdnn.graph.operators.elementwise_add import ElementwiseAdd
+from webdnn.graph.operators.elementwise_mul import ElementwiseMul
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.sigmoid import Sigmoid
+from webdnn.graph.order import OrderNC
+from webdnn.graph.pattern import NodeIndex, Pattern, find_nodes
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+class TestAttribute(Attribute):
+    pass
+
+
+def test_find_nodes():
+    """
+    x -{relu}- h1 -{sigmoid}- h2 -{relu}- y
+    """
+    x = Variable([2, 3], OrderNC)
+    h1, = Relu(None)(x)
+    h2, = Sigmoid(None)(h1)
+    y, = Relu(None)(h2)
+    graph = Graph([x], [y])
+
+    assert find_nodes(graph, Relu) == [h1.output_from, y.output_from]
+    assert find_nodes(graph, Elementwise) == [h1.output_from, h2.output_from, y.output_from]
+    assert find_nodes(graph, TestAttribute) == []
+
+    h2.output_from.attributes.add(TestAttribute(h2.output_from))
+    h2.output_from.mark_modified()
+    assert find_nodes(graph, TestAttribute) == [h2.output_from]
+
+
+def test_index_cache():
+    x = Variable([2, 3], OrderNC)
+    y, = Relu(None)(x)
+    graph = Graph([x], [y])
+
+    index = NodeIndex.get(graph)
+    assert NodeIndex.get(graph) is index
+
+    y2, = Sigmoid(None)(y)
+    graph.outputs = [y2]
+    assert NodeIndex.get(graph) is not index
+    assert find_nodes(graph, Sigmoid) == [y2.output_from]
+
+
+def test_sequence():
+    x = Variable([2, 3], OrderNC)
+    h, = Relu(None)(x)
+    y, = Sigmoid(None)(h)
+    graph = Graph([x], [y])
+
+    matches = list(Pattern.sequence([Relu, Variable, Sigmoid]).match(graph))
+    assert matches == [(h.output_from, h, y.output_from)]
+    assert list(Pattern.sequence([Sigmoid, Variable, Relu]).match(graph)) == []
+
+
+def test_dag():
+    """
+    x0 -{relu}- h0 -+
+                    +-{add}- y
+    x1 -{relu}- h1 -+
+    """
+    x0 = Variable([2, 3], OrderNC)
+    x1 = Variable([2, 3], OrderNC)
+    h0, = Relu(None)(x0)
+    h1, = Relu(None)(x1)
+    y = h0 + h1
+    graph = Graph([x0, x1], [y])
+
+    pattern = Pattern()
+    relu0 = pattern.add(Relu)
+    relu1 = pattern.add(Relu)
+    v0 = pattern.add(Variable, prevs=[relu0])
+    v1 = pattern.add(Variable, prevs=[relu1])
+    pattern.add(ElementwiseAdd, prevs=[v0, v1])
+
+    matches = list(pattern.match(graph))
+    assert len(matches) == 2
+    assert set((m[2], m[3]) for m in matches) == {(h0, h1), (h1, h0)}
+    assert all(m[4] is y.output_from for m in matches)
+
+
+def test_predicate():
+    x = Variable([2, 3], OrderNC)
+    c = ConstantVariable(np.ones([2, 3]), OrderNC)
+    y1 = x * c
+    y2 = x * x
+    graph = Graph([x], [y1, y2])
+
+    pattern = Pattern()
+    mul = pattern.add(ElementwiseMul)
+    pattern.add(ConstantVariable, nexts=[mul])
+    assert list(pattern.match(graph)) == [(y1.output_from, c)]
+
+    # a variable which is used twice by the same operator is matched only once
+    pattern = Pattern()
+    v = pattern.add(Variable, predicate=lambda v: v is x)
+    pattern.add(ElementwiseMul, predicate=lambda op: op.outputs["y"] is y2, prevs=[v])
+    assert list(pattern.match(graph)) == [(x, y2.output_from)]
+
+
+def test_modify_while_matching():
+    """
+    x -{relu}- h1 -{relu}- h2 -{relu}- y
+    """
+    x = Variable([2, 3], OrderNC)
+    h1, = Relu(None)(x)
+    h2, = Relu(None)(h1)
+    y, = Relu(None)(h2)
+    graph = Graph([x], [y])
+    relu1, relu2 = h1.output_from, h2.output_from
+
+    matches = []
+    for op1, v, op2 in Pattern.sequence([Relu, Variable, Relu]).match(graph):
+        matches.append((op1, op2))
+        op2.remove_all()
+
+    # (relu2, h2, relu3) is not matched because relu2 is removed
+    assert matches == [(relu1, relu2)]
+
+
+def test_candidates_only():
+    x = Variable([2, 3], OrderNC)
+    h = x
+    for _ in range(100):
+        h, = Relu(None)(h)
+
+    y, = Sigmoid(None)(h)
+    graph = Graph([x], [y])
+
+    count = [0]
+
+    def predicate(v):
+        count[0] += 1
+        return True
+
+    pattern = Pattern()
+    v = pattern.add(Variable, predicate=predicate)
+    pattern.add(Sigmoid, prevs=[v])
+
+    assert len(list(pattern.match(graph))) == 1
+    assert count[0] == 2  # once while searching, once while verifying
+
+
+@raises(ValueError)
+def test_disconnected_pattern():
+    x = Variable([2, 3], OrderNC)
+    y, = Relu(None)(x)
+
+    pattern = Pattern()
+    pattern.add(Relu)
+    pattern.add(Sigmoid)
+    list(pattern.match(Graph([x], [y])))
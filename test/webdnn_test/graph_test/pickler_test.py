@@ -0,0 +1,53 @@
+import sys
+
+import numpy as np
+
+from webdnn.graph import pickler, traverse
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import Order, OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def test_dumps_loads():
+    x = Variable([2, 3], OrderNC)
+    c = ConstantVariable(np.random.rand(2, 3), OrderNC)
+    y, = Relu(None)(x + c)
+    graph = Graph([x], [y])
+
+    graph2 = pickler.loads(pickler.dumps(graph))
+
+    ops1 = traverse.listup_operators(graph)
+    ops2 = traverse.listup_operators(graph2)
+    assert [op.__class__ for op in ops1] == [op.__class__ for op in ops2]
+    assert graph2.inputs[0] in ops2[0].inputs.values()
+    assert all(attr.base is n for n in traverse.listup_nodes(graph2) for attr in n.attributes)
+
+    c2, = traverse.filter_nodes(traverse.listup_variables(graph2), ConstantVariable)
+    assert np.all(c2.data == c.data)
+    assert graph2.inputs[0].order == OrderNC
+
+
+def test_anonymous_axis():
+    axis = Axis()
+    x = Variable([2, 3], Order([Axis.N, axis]))
+    y, = Relu(None)(x)
+
+    x2, y2 = pickler.loads(pickler.dumps([x, y]))
+
+    assert x2.order.axes[0] == Axis.N
+    assert x2.order.axes[1] == y2.order.axes[1]
+    assert x2.order.axes[1] != axis
+
+
+def test_deep_graph():
+    x = Variable([2, 3], OrderNC)
+    h = x
+    for _ in range(sys.getrecursionlimit()):
+        h, = Relu(None)(h)
+
+    graph2 = pickler.loads(pickler.dumps(Graph([x], [h])))
+
+    assert len(traverse.listup_operators(graph2)) == sys.getrecursionlimit()
@@ -0,0 +1,162 @@
+import os.path as path
+import struct
+import sys
+import tempfile
+
+import numpy as np
+from nose.tools import raises
+
+from webdnn.backend.interface.generator import generate_descriptor
+from webdnn.graph import node, serializer, traverse
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import Order, OrderC, OrderNC, OrderNCHW
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import json
+
+
+def _build_graph():
+    x = Variable([2, 3, 8, 8], OrderNCHW)
+    w = ConstantVariable(np.random.rand(4, 3, 3, 3), Order([Axis.N, Axis.C, Axis.KH, Axis.KW]))
+    h, = Convolution2D(None, ksize=3, stride=1, padding=1)(x, w)
+    h, = Relu(None)(h)
+    y = h * ConstantVariable(np.random.rand(4), OrderC)
+    return Graph([x], [y])
+
+
+def test_dumps_loads():
+    x = Variable([2, 3], OrderNC)
+    c = ConstantVariable(np.random.rand(2, 3), OrderNC)
+    y, = Relu(None)(x + c)
+    graph = Graph([x], [y])
+
+    graph2 = serializer.loads(serializer.dumps(graph))
+
+    ops1 = traverse.listup_operators(graph)
+    ops2 = traverse.listup_operators(graph2)
+    assert [op.__class__ for op in ops1] == [op.__class__ for op in ops2]
+    assert [op.name for op in ops1] == [op.name for op in ops2]
+    assert graph2.inputs[0] in ops2[0].inputs.values()
+    assert all(attr.base is n for n in traverse.listup_nodes(graph2) for attr in n.attributes)
+    assert graph2.licenses == graph.licenses
+
+    c2, = traverse.filter_nodes(traverse.listup_variables(graph2), ConstantVariable)
+    assert np.all(c2.data == c.data)
+    assert c2.data.dtype == np.float32
+    assert graph2.inputs[0].order == OrderNC
+
+
+def test_save_load():
+    graph = _build_graph()
+
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = path.join(dirname, "graph.wdir")
+        serializer.save(graph, filename)
+
+        for mmap in [True, False]:
+            graph2 = serializer.load(filename, mmap=mmap)
+
+            constants1 = traverse.filter_nodes(traverse.listup_variables(graph), ConstantVariable)
+            constants2 = traverse.filter_nodes(traverse.listup_variables(graph2), ConstantVariable)
+            for c1, c2 in zip(constants1, constants2):
+                assert np.all(c1.data == c2.data)
+                assert not c2.data.flags.writeable
+                assert isinstance(c2.data.base, np.memmap) == mmap
+
+            del graph2, constants2
+
+
+def test_alignment():
+    x = Variable([2, 3], OrderNC)
+    y = x * ConstantVariable(np.random.rand(2, 3), OrderNC) + ConstantVariable(np.random.rand(3), OrderC)
+    data = serializer.dumps(Graph([x], [y]))
+    magic, version, header_length, blob_offset, blob_length = struct.unpack_from("<4sIQQQ", data, 0)
+    header = json.loads(data[32:32 + header_length].decode("utf-8"))
+
+    assert magic == b"WDIR"
+    assert version == serializer.VERSION
+    assert blob_offset % serializer.ALIGNMENT == 0
+    assert len(data) == blob_offset + blob_length
+    assert len(header["arrays"]) == 2
+    assert all(a["offset"] % serializer.ALIGNMENT == 0 for a in header["arrays"])
+
+
+def test_anonymous_axis():
+    axis = Axis()
+    x = Variable([2, 3], Order([Axis.N, axis]))
+    y, = Relu(None)(x)
+
+    graph2 = serializer.loads(serializer.dumps(Graph([x], [y])))
+    x2, y2 = graph2.inputs[0], graph2.outputs[0]
+
+    assert x2.order.axes[0] == Axis.N
+    assert x2.order.axes[1] == y2.order.axes[1]
+    assert x2.order.axes[1] != axis
+
+
+def test_placeholder():
+    N = Placeholder(label="N")
+    x = Variable([N, 3], OrderNC)
+    y, = Relu(None)(x)
+
+    graph2 = serializer.loads(serializer.dumps(Graph([x], [y])))
+    N2 = graph2.inputs[0].shape[0]
+
+    assert isinstance(N2, Placeholder)
+    assert N2 is graph2.outputs[0].shape[0]
+    assert N2.label == "N"
+    assert not N2.is_resolved
+
+    N2.value = 4
+    assert graph2.outputs[0].shape == (4, 3)
+    assert not Placeholder.check_resolved(N)
+
+
+def test_deep_graph():
+    x = Variable([2, 3], OrderNC)
+    h = x
+    for _ in range(sys.getrecursionlimit()):
+        h, = Relu(None)(h)
+
+    graph2 = serializer.loads(serializer.dumps(Graph([x], [h])))
+
+    assert len(traverse.listup_operators(graph2)) == sys.getrecursionlimit()
+
+
+def test_generate_descriptor():
+    graph = _build_graph()
+
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = path.join(dirname, "graph.wdir")
+        serializer.save(graph, filename)
+        graph2 = serializer.load(filename)
+
+        for backend in ["webassembly", "fallback"]:
+            counters = node.get_name_counters()
+            expected = generate_descriptor(backend, graph, cache=False).descriptor
+
+            node.set_name_counters(counters)
+            actual = generate_descriptor(backend, graph2, cache=False).descriptor
+
+            assert json.dumps(actual) == json.dumps(expected), backend
+
+        del graph2
+
+
+@raises(ValueError)
+def test_invalid_magic():
+    data = serializer.dumps(_build_graph())
+    serializer.loads(b"XXXX" + data[4:])
+
+
+@raises(TypeError)
+def test_unsupported_parameter():
+    x = Variable([2, 3], OrderNC)
+    y, = Relu(None)(x)
+    y.output_from.parameters["callback"] = lambda: None
+
+    serializer.dumps(Graph([x], [y]))
@@ -263,3 +263,70 @@ def test_ignore_internal_bound_flag():
     assert result.index(n4) < result.index(n5)
     assert result.index(n5) < result.index(n6)
     assert result.index(n1) < result.index(n6)
+
+
+@with_setup(setup_graph_sequential)
+def test_listup_nodes_cache():
+    global graph, op1, op2, op3, v0, v1, v2, v3
+    nodes1 = listup_nodes(graph)
+    nodes1.pop()
+    nodes2 = listup_nodes(graph)
+
+    assert tuple(nodes2) == (v0, op1, v1, op2, v2, op3, v3)
+
+
+@with_setup(setup_graph_sequential)
+def test_listup_nodes_cache_invalidated_by_connection_change():
+    global graph, op1, op2, op3, v0, v1, v2, v3
+    assert tuple(listup_nodes(graph)) == (v0, op1, v1, op2, v2, op3, v3)
+
+    op4 = Operator("op4")
+    v4 = Variable((1, 4), OrderNC)
+    op3.replace_output(v3, v4)
+    op4.append_input("v4", v4)
+    op4.append_output("v3", v3)
+
+    assert tuple(listup_nodes(graph)) == (v0, op1, v1, op2, v2, op3, v4, op4, v3)
+
+
+@with_setup(setup_graph_sequential)
+def test_listup_nodes_cache_invalidated_by_output_change():
+    global graph, op1, op2, op3, v0, v1, v2, v3
+    assert tuple(listup_nodes(graph)) == (v0, op1, v1, op2, v2, op3, v3)
+
+    graph.outputs = [v2]
+
+    assert tuple(listup_nodes(graph)) == (v0, op1, v1, op2, v2)
+
+
+def _listup_nodes_without_cache(graph: Graph):
+    return listup_nodes(Graph(graph.inputs, graph.outputs))
+
+
+def test_listup_nodes_cache_invalidated_by_rename():
+    v0 = Variable((1, 1), OrderNC)
+    op1 = Operator("op1")
+    v1 = Variable((1, 1), OrderNC)
+    op2 = Operator("op2")
+    v2 = Variable((1, 1), OrderNC)
+    op3 = Operator("op3")
+    v3 = Variable((1, 1), OrderNC)
+
+    op1.append_input("x", v0)
+    op1.append_output("y", v1)
+    op2.append_input("x", v0)
+    op2.append_output("y", v2)
+    op3.append_input("x0", v1)
+    op3.append_input("x1", v2)
+    op3.append_output("y", v3)
+
+    graph = Graph([v0], [v3])
+    nodes1 = tuple(listup_nodes(graph))
+
+    # branches are ordered by node names, so swap names of operators and variables in each branch
+    op1.name, op2.name = op2.name, op1.name
+    v1.name, v2.name = v2.name, v1.name
+    nodes2 = tuple(listup_nodes(graph))
+
+    assert nodes2 != nodes1
+    assert nodes2 == tuple(_listup_nodes_without_cache(graph))
@@ -1,7 +1,9 @@
 from nose.tools import raises
 
 from webdnn.graph.axis import Axis
+from webdnn.graph.operators.relu import Relu
 from webdnn.graph.order import OrderNHWC, OrderHWCN, OrderNC, OrderCHWN, OrderCN
+from webdnn.graph.placeholder import Placeholder
 from webdnn.graph.variable import Variable
 
 
@@ -62,3 +64,32 @@ def test_change_order_with_compression():
 def test_change_order_with_invalid_compression():
     v = Variable([3, 2, 2, 4], OrderNHWC)
     v.change_order(OrderCN)
+
+
+def test_shape_cache():
+    v = Variable([1, 2, 3, 4], OrderNHWC)
+    assert v.shape is v.shape
+    assert v.size == 24
+
+    v.change_order(OrderHWCN)
+    assert v.shape == (2, 3, 4, 1)
+    assert v.size == 24
+
+
+def test_shape_cache_with_placeholder():
+    p = Placeholder(label="N")
+    v = Variable([p, 3], OrderNC)
+    assert v.shape[0] is p
+
+    p.value = 2
+    assert v.shape == (2, 3)
+    assert v.size == 6
+
+
+def test_output_from():
+    x = Variable([2, 3], OrderNC)
+    assert x.output_from is None
+
+    y, = Relu(None)(x)
+    op, = x.input_to
+    assert y.output_from is op
@@ -0,0 +1,173 @@
+import numpy as np
+
+from webdnn.graph import traverse
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.axiswise_bias import AxiswiseBias
+from webdnn.graph.operators.axiswise_scale import AxiswiseScale
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.elementwise_add import ElementwiseAdd
+from webdnn.graph.operators.linear import Linear
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.order import Order, OrderC, OrderNC, OrderNCHW
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.optimizer.sub_rules.fold_axiswise_affine_into_weight import FoldAxiswiseAffineIntoWeight
+
+
+def _linear(x_data, w_data):
+    x = Variable(x_data.shape, OrderNC)
+    w = ConstantVariable(w_data, OrderNC)
+    h, = Linear(None)(x, w)
+    return x, h
+
+
+def _get_bias(y):
+    op = y.output_from
+    assert isinstance(op, ElementwiseAdd)
+    b = op.inputs["x1"]
+    assert isinstance(b, ConstantVariable)
+    return op.inputs["x0"], b
+
+
+def test_linear_scale_bias_scale():
+    """
+    before)
+
+    x -{Linear}- h1 -{mul}- h2 -{add}- h3 -{mul}- y
+
+    after)
+
+    x -{Linear}- h1 -{add}- y
+    """
+    x_data = np.random.rand(2, 5)
+    w_data = np.random.rand(4, 5)
+    s1 = np.random.rand(4)
+    b1 = np.random.rand(4)
+    s2 = np.random.rand(4)
+
+    x, h = _linear(x_data, w_data)
+    linear = h.output_from
+    y = ((h * ConstantVariable(s1, OrderC)) + ConstantVariable(b1, OrderC)) * ConstantVariable(s2, OrderC)
+    graph = Graph([x], [y])
+
+    graph, flag_changed = FoldAxiswiseAffineIntoWeight().optimize(graph)
+
+    assert flag_changed
+    assert len(traverse.listup_operators(graph)) == 2
+    h, b = _get_bias(y)
+    assert h.output_from is linear
+
+    expected = ((x_data @ w_data.T) * s1 + b1) * s2
+    actual = x_data @ linear.inputs["w"].data.T + b.data
+    np.testing.assert_allclose(actual, expected, rtol=1e-5)
+
+
+def test_linear_scale_only():
+    x, h = _linear(np.random.rand(2, 5), np.random.rand(4, 5))
+    linear = h.output_from
+    y = h * ConstantVariable(np.random.rand(4), OrderC)
+    graph = Graph([x], [y])
+
+    graph, flag_changed = FoldAxiswiseAffineIntoWeight().optimize(graph)
+
+    assert flag_changed
+    assert traverse.listup_operators(graph) == [linear]
+    assert linear.outputs["y"] is y
+
+
+def test_single_bias_not_changed():
+    x, h = _linear(np.random.rand(2, 5), np.random.rand(4, 5))
+    y = h + ConstantVariable(np.random.rand(4), OrderC)
+    graph = Graph([x], [y])
+
+    graph, flag_changed = FoldAxiswiseAffineIntoWeight().optimize(graph)
+
+    assert not flag_changed
+
+
+def test_convolution2d_axiswise():
+    x = Variable([1, 3, 6, 6], OrderNCHW)
+    w_data = np.random.rand(8, 3, 3, 3)
+    w = ConstantVariable(w_data, Order([Axis.N, Axis.KH, Axis.KW, Axis.C]))
+    s = np.random.rand(8)
+    b = np.random.rand(8)
+
+    h, = Convolution2D(None, ksize=3, stride=1, padding=1)(x, w)
+    conv = h.output_from
+    h, = AxiswiseScale(None, axis=Axis.C)(h, ConstantVariable(s, OrderC))
+    y, = AxiswiseBias(None, axis=Axis.C)(h, ConstantVariable(b, OrderC))
+    graph = Graph([x], [y])
+
+    graph, flag_changed = FoldAxiswiseAffineIntoWeight().optimize(graph)
+
+    assert flag_changed
+    _, new_b = _get_bias(y)
+    np.testing.assert_allclose(conv.inputs["w"].data, w_data * s[:, None, None, None], rtol=1e-6)
+    np.testing.assert_allclose(new_b.data, b, rtol=1e-6)
+
+
+def test_tensordot():
+    x = Variable([2, 5], OrderNC)
+    w_data = np.random.rand(5, 7)
+    w = ConstantVariable(w_data, Order([Axis.C, Axis.H]))
+    h, = Tensordot(None, axes=[Axis.C, Axis.C])(x, w)
+    tensordot = h.output_from
+    s = np.random.rand(7)
+    y = h * ConstantVariable(s, Order([Axis.H]))
+    graph = Graph([x], [y])
+
+    FoldAxiswiseAffineIntoWeight().optimize(graph)
+
+    assert tensordot.outputs["C"] is y
+    np.testing.assert_allclose(tensordot.inputs["B"].data, w_data * s[None, :], rtol=1e-6)
+
+
+def test_shared_weight_not_modified():
+    x1 = Variable([2, 5], OrderNC)
+    x2 = Variable([2, 5], OrderNC)
+    w_data = np.random.rand(4, 5)
+    w = ConstantVariable(w_data, OrderNC)
+    h1, = Linear(None)(x1, w)
+    h2, = Linear(None)(x2, w)
+    y1 = h1 * ConstantVariable(np.random.rand(4), OrderC)
+    graph = Graph([x1, x2], [y1, h2])
+
+    FoldAxiswiseAffineIntoWeight().optimize(graph)
+
+    assert h2.output_from.inputs["w"] is w
+    assert y1.output_from.inputs["w"] is not w
+    np.testing.assert_array_equal(w.data, w_data.astype(np.float32))
+
+
+def test_not_folded_non_channel_coefficient():
+    x, h = _linear(np.random.rand(2, 5), np.random.rand(4, 5))
+    y = h * ConstantVariable(np.random.rand(2), Order([Axis.N]))
+    graph = Graph([x], [y])
+
+    graph, flag_changed = FoldAxiswiseAffineIntoWeight().optimize(graph)
+
+    assert not flag_changed
+
+
+def test_not_folded_after_nonlinear():
+    x, h = _linear(np.random.rand(2, 5), np.random.rand(4, 5))
+    h, = Relu(None)(h)
+    y = h * ConstantVariable(np.random.rand(4), OrderC)
+    graph = Graph([x], [y])
+
+    graph, flag_changed = FoldAxiswiseAffineIntoWeight().optimize(graph)
+
+    assert not flag_changed
+
+
+def test_not_folded_multiple_consumers():
+    x, h = _linear(np.random.rand(2, 5), np.random.rand(4, 5))
+    y1 = h * ConstantVariable(np.random.rand(4), OrderC)
+    y2, = Relu(None)(h)
+    graph = Graph([x], [y1, y2])
+
+    graph, flag_changed = FoldAxiswiseAffineIntoWeight().optimize(graph)
+
+    assert not flag_changed
@@ -0,0 +1,152 @@
+import numpy as np
+
+from webdnn.backend.interface.generator import generate_descriptor
+from webdnn.graph import traverse
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.attributes.tensordot_epilogue import TensordotEpilogue
+from webdnn.graph.operators.elementwise_add import ElementwiseAdd
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.scalar_mul import ScalarMul
+from webdnn.graph.operators.sigmoid import Sigmoid
+from webdnn.graph.operators.tensordot import Tensordot
+from webdnn.graph.order import Order, OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.optimizer.sub_rules.fuse_tensordot_epilogue import FuseTensordotEpilogue
+
+
+def _tensordot(x):
+    w = ConstantVariable(np.random.rand(12, 7), Order([Axis.C, Axis.H]))
+    h, = Tensordot(None, axes=[Axis.C, Axis.C])(x, w)
+    return h
+
+
+def test_fuse_bias_relu_scale():
+    """
+    test_fuse_bias_relu_scale
+
+    before)
+
+    x -{Tensordot}- h1 -{ElementwiseAdd}- h2 -{Relu}- h3 -{ScalarMul}- y
+                               b -+
+
+    after)
+
+    x -+
+       +-{Tensordot (epilogue: ElementwiseAdd, Relu, ScalarMul)}- y
+    b -+
+    """
+    x = Variable([5, 12], OrderNC)
+    h = _tensordot(x)
+    tensordot = h.output_from
+    b = ConstantVariable(np.random.rand(7), Order([Axis.H]))
+    h, = Relu(None)(h + b)
+    y, = ScalarMul(None, value=2.0)(h)
+    graph = Graph([x], [y])
+
+    graph, flag_changed = FuseTensordotEpilogue().optimize(graph)
+
+    assert flag_changed
+    assert traverse.listup_operators(graph) == [tensordot]
+    assert tensordot.outputs["C"] is y
+    assert tensordot.inputs["epilogue_x0"] is b
+
+    epilogue = tensordot.get_attribute(TensordotEpilogue)[0]
+    assert [op.__class__ for op in epilogue.ops] == [ElementwiseAdd, Relu, ScalarMul]
+    assert epilogue.dummy2real[epilogue.ops[0].inputs["x1"]] is b
+    assert epilogue.ops[-1].outputs["y"] is epilogue.y
+
+
+def test_fuse_full_shape_input():
+    x = Variable([5, 12], OrderNC)
+    r = Variable([5, 7], Order([Axis.N, Axis.H]))
+    h = _tensordot(x)
+    y = h + r
+    graph = Graph([x, r], [y])
+
+    FuseTensordotEpilogue().optimize(graph)
+
+    assert h.output_from is None
+    assert y.output_from.inputs["epilogue_x0"] is r
+
+
+def test_not_fused_leading_axis_input():
+    # Variable which is not broadcasted along leading axes cannot be loaded as `x[index % x.size]`
+    x = Variable([5, 12], OrderNC)
+    h = _tensordot(x)
+    y = h + ConstantVariable(np.random.rand(5), Order([Axis.N]))
+    graph = Graph([x], [y])
+
+    graph, flag_changed = FuseTensordotEpilogue().optimize(graph)
+
+    assert not flag_changed
+    assert isinstance(y.output_from, ElementwiseAdd)
+
+
+def test_not_fused_multiple_consumers():
+    x = Variable([5, 12], OrderNC)
+    h = _tensordot(x)
+    y1, = Relu(None)(h)
+    y2, = Sigmoid(None)(h)
+    graph = Graph([x], [y1, y2])
+
+    graph, flag_changed = FuseTensordotEpilogue().optimize(graph)
+
+    assert not flag_changed
+
+
+def test_not_fused_graph_output():
+    x = Variable([5, 12], OrderNC)
+    h = _tensordot(x)
+    y, = Relu(None)(h)
+    graph = Graph([x], [h, y])
+
+    graph, flag_changed = FuseTensordotEpilogue().optimize(graph)
+
+    assert not flag_changed
+
+
+def test_stop_at_unsupported_operator():
+    x = Variable([5, 12], OrderNC)
+    h = _tensordot(x)
+    tensordot = h.output_from
+    h, = Relu(None)(h)
+    y, = Sigmoid(None)(h)
+    graph = Graph([x], [y])
+
+    FuseTensordotEpilogue(lambda op: not isinstance(op, Sigmoid)).optimize(graph)
+
+    assert tensordot.outputs["C"] is h
+    assert [op.__class__ for op in tensordot.get_attribute(TensordotEpilogue)[0].ops] == [Relu]
+    assert isinstance(y.output_from, Sigmoid)
+
+
+def _build_linear_graph():
+    x = Variable([5, 12], OrderNC)
+    h = _tensordot(x)
+    h, = Relu(None)(h + ConstantVariable(np.random.rand(7), Order([Axis.H])))
+    return Graph([x], [h])
+
+
+def test_generate_descriptor_webgpu():
+    descriptor = generate_descriptor("webgpu", _build_linear_graph(), cache=False).descriptor
+
+    # input is transposed for the tensordot kernel
+    assert [kernel.exec_info.entry_func_name.split("_")[0] for kernel in descriptor.kernels] == ["transpose", "tensordot"]
+    assert "epilogue_v" in descriptor.concat_kernel_sources()
+
+
+def test_generate_descriptor_webassembly():
+    descriptor = generate_descriptor("webassembly", _build_linear_graph(), cache=False).descriptor
+
+    assert len(descriptor.kernels) == 1
+    assert "epilogue_v" in descriptor.concat_kernel_sources()
+
+
+def test_generate_descriptor_webgl():
+    exec_data = generate_descriptor("webgl", _build_linear_graph(), cache=False, max_texture_sizes=[4096])
+    descriptor, _ = exec_data.data_dict[4096]
+
+    assert len(descriptor.kernels) == 1
+    assert "epilogue_v" in descriptor.kernels[0].source
@@ -0,0 +1,121 @@
+import io
+import os
+import os.path as path
+import struct
+import tempfile
+
+import numpy as np
+from nose.tools import raises
+
+from webdnn.backend.interface.generator import generate_descriptor
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import json
+from webdnn.util.json import binary
+
+
+def _build_graph(num_layers=20):
+    x = Variable([2, 8], OrderNC)
+    h = x
+    for _ in range(num_layers):
+        h, = Relu(None)(h * ConstantVariable(np.random.rand(2, 8) - 0.5, OrderNC))
+
+    return Graph([x], [h])
+
+
+def _round_trip(obj):
+    return binary.loads_binary(binary.dumps_binary(obj))
+
+
+def test_round_trip_plain():
+    obj = {
+        "str": "kernel source\nあ",
+        "int": 1,
+        "float": 0.1,
+        "bool": True,
+        "none": None,
+        "short": [1, 2, 3],
+        "uint8": list(range(256)),
+        "int32": list(range(-100, 100)),
+        "int64": [2 ** 40] * 20,
+        "mixed": [1] * 20 + [1.5],
+        "bool_list": [True] * 20,
+        "nested": [[1, 2], {"a": list(range(30))}],
+        "table": {f"v{i}": {"name": f"v{i}", "offset": i * 4, "size": 4} for i in range(20)},
+        "list_table": [{"x": i, "y": [i], "z": {"w": i}} for i in range(5)],
+        "not_table": [{"x": 1}, {"y": 2}, {"x": 3}, {"x": 4}],
+    }
+
+    assert _round_trip(obj) == json.loads(json.dumps(obj))
+
+
+def test_blob_and_table_encoding():
+    data = binary.dumps_binary({"meta_buffer": list(range(100)), "allocations": {f"v{i}": {"offset": i} for i in range(4)}})
+    magic, version, header_length, body_offset, body_length = struct.unpack_from("<4sIIII", data, 0)
+    header = json.loads(data[20:20 + header_length].decode("ascii"))
+
+    assert magic == b"WDNB"
+    assert version == binary.VERSION
+    assert body_offset % binary.ALIGNMENT == 0
+    assert len(data) == body_offset + body_length
+    assert header["meta_buffer"] == {"$blob": [0, 100, "uint8"]}
+    assert header["allocations"]["$table"]["index"] == ["v0", "v1", "v2", "v3"]
+
+
+def test_typed_array():
+    meta_buffer = list(range(0, 4000, 10))
+    obj = binary.loads_binary(binary.dumps_binary({"meta_buffer": meta_buffer}), typed_array=True)
+
+    assert isinstance(obj["meta_buffer"], np.ndarray)
+    assert obj["meta_buffer"].dtype == np.int32
+    assert obj["meta_buffer"].tolist() == meta_buffer
+
+
+@raises(ValueError)
+def test_invalid_magic():
+    binary.loads_binary(b"XXXX" + binary.dumps_binary({})[4:])
+
+
+def test_dump_binary():
+    f = io.BytesIO()
+    json.dump_binary({"a": [1, 2]}, f)
+
+    assert f.getvalue() == json.dumps_binary({"a": [1, 2]})
+
+
+def test_descriptor_round_trip():
+    graph = _build_graph()
+    for backend in ["webgpu", "webassembly", "fallback"]:
+        descriptor = generate_descriptor(backend, graph, cache=False).descriptor
+        assert _round_trip(descriptor) == json.loads(json.dumps(descriptor)), backend
+
+    descriptor, _ = generate_descriptor("webgl", graph, cache=False, max_texture_sizes=[4096]).data_dict[4096]
+    assert _round_trip(descriptor) == json.loads(json.dumps(descriptor))
+
+
+def test_compare_formats():
+    descriptor = generate_descriptor("webgpu", _build_graph(), cache=False).descriptor
+    result = binary.compare_formats(descriptor, repeat=1)
+
+    assert result.binary_size < result.json_size
+    assert result.json_parse_time > 0 and result.binary_parse_time > 0
+
+
+def test_save():
+    graph = _build_graph()
+
+    with tempfile.TemporaryDirectory() as dirname:
+        generate_descriptor("fallback", graph, cache=False).save(dirname)
+        generate_descriptor("webgl", graph, cache=False, max_texture_sizes=[4096]).save(dirname)
+
+        for name in ["graph_fallback", "graph_webgl_4096"]:
+            with open(path.join(dirname, f"{name}.json")) as f:
+                expected = json.load(f)
+
+            with open(path.join(dirname, f"{name}.wdnb"), "rb") as f:
+                assert binary.loads_binary(f.read()) == expected
+
+            assert os.stat(path.join(dirname, f"{name}.wdnb")).st_size < os.stat(path.join(dirname, f"{name}.json")).st_size
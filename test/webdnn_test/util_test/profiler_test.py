@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+
+from webdnn.backend.interface.generator import generate_descriptor
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.util import profiler
+
+
+def test_phase():
+    with profiler.profile() as outer:
+        with profiler.profile() as inner:
+            with profiler.phase("foo"):
+                pass
+
+        with profiler.phase("foo"):
+            pass
+
+    assert inner.phases["foo"]["count"] == 1
+    assert outer.phases["foo"]["count"] == 2
+    assert len(profiler.get_active_profilers()) == 0
+
+
+def test_phase_without_profiler():
+    with profiler.phase("foo"):
+        pass
+
+    assert len(profiler.get_active_profilers()) == 0
+
+
+def test_generate_descriptor():
+    x = Variable([2, 3], OrderNC)
+    y, = Relu(None)(x * 2 + 1)
+
+    with profiler.profile() as p:
+        exec_data = generate_descriptor("fallback", Graph([x], [y]))
+
+    for name in ["generate_descriptor", "general_optimize", "allocate", "encode_constants", "generate_kernels"]:
+        assert p.phases[name]["count"] == 1
+
+    assert "ReplaceScalarAffine" in p.rules
+    assert all(record["changed"] <= record["count"] for record in p.rules.values())
+    assert exec_data.profile is not None
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        exec_data.save(tmpdir)
+        with open(os.path.join(tmpdir, "profile_fallback.json")) as f:
+            data = json.load(f)
+
+    assert data["phases"].keys() == exec_data.profile.phases.keys()
+    assert data["rules"].keys() == exec_data.profile.rules.keys()